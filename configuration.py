@@ -7,11 +7,15 @@ import json
 import logging
 import os
 import re
+import stat
+import threading
 from dataclasses import dataclass
 from functools import lru_cache
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+from urllib.parse import urlsplit
 
 LOGGER = logging.getLogger(__name__)
 
@@ -51,8 +55,50 @@ REQUEST_SECTION = "Request"
 REQUEST_TIMEOUT_KEY = "timeout"
 REQUEST_TIMEOUT_ENV = "REQUEST_TIMEOUT"
 DEFAULT_REQUEST_TIMEOUT = 10.0
-
-SUPPORTED_MONITOR_TYPES = frozenset({"GET", "POST", "SERVER"})
+REQUEST_WORKER_POOL_KEY = "worker_pool_size"
+DEFAULT_WORKER_POOL_SIZE = 16
+REQUEST_OVERRUN_POLICY_KEY = "overrun_policy"
+OVERRUN_POLICIES = ("skip", "coalesce", "immediate")
+DEFAULT_OVERRUN_POLICY = "coalesce"
+REQUEST_PHASE_SPREAD_KEY = "phase_spread"
+DEFAULT_PHASE_SPREAD = True
+REQUEST_START_JITTER_KEY = "start_jitter"
+DEFAULT_START_JITTER = 0.0
+REQUEST_KEEP_ALIVE_KEY = "keep_alive"
+DEFAULT_KEEP_ALIVE = True
+REQUEST_POOL_MAXSIZE_KEY = "pool_maxsize"
+DEFAULT_POOL_MAXSIZE = 4
+REQUEST_POOL_MAX_HOSTS_KEY = "pool_max_hosts"
+DEFAULT_POOL_MAX_HOSTS = 256
+REQUEST_POOL_IDLE_TIMEOUT_KEY = "pool_idle_timeout"
+DEFAULT_POOL_IDLE_TIMEOUT = 60.0
+REQUEST_MAX_BODY_BYTES_KEY = "max_body_bytes"
+DEFAULT_MAX_BODY_BYTES = 64 * 1024
+REQUEST_SERVER_LAYERS_KEY = "server_layers"
+SERVER_PROBE_LAYERS = ("socket", "ping", "icmp", "http")
+DEFAULT_SERVER_LAYERS = ("socket", "ping", "http")
+REQUEST_SWEEP_RATE_KEY = "sweep_rate"
+DEFAULT_SWEEP_RATE = 1000
+REQUEST_DNS_TTL_KEY = "dns_ttl"
+DEFAULT_DNS_TTL = 60.0
+REQUEST_DNS_NEGATIVE_TTL_KEY = "dns_negative_ttl"
+DEFAULT_DNS_NEGATIVE_TTL = 10.0
+REQUEST_PROBE_SHARE_WINDOW_KEY = "probe_share_window"
+DEFAULT_PROBE_SHARE_WINDOW = 2.0
+REQUEST_EVENT_QUEUE_SIZE_KEY = "event_queue_size"
+DEFAULT_EVENT_QUEUE_SIZE = 1024
+REQUEST_EVENT_BACKPRESSURE_KEY = "event_backpressure"
+EVENT_BACKPRESSURE_POLICIES = ("block", "drop_oldest", "drop_newest")
+DEFAULT_EVENT_BACKPRESSURE = "block"
+HISTORY_SECTION = "History"
+HISTORY_ENABLED_KEY = "enabled"
+DEFAULT_HISTORY_ENABLED = False
+HISTORY_CSV_KEY = "csv"
+DEFAULT_HISTORY_CSV = True
+HISTORY_RETENTION_DAYS_KEY = "retention_days"
+DEFAULT_HISTORY_RETENTION_DAYS = 30.0
+
+SUPPORTED_MONITOR_TYPES = frozenset({"GET", "POST", "SERVER", "HOSTS", "TCP"})
 
 
 @dataclass(frozen=True)
@@ -67,6 +113,9 @@ class MonitorItem:
     payload: Optional[Dict[str, str]] = None
     headers: Optional[Dict[str, str]] = None
     language: Optional[str] = None
+    keep_alive: bool = True
+    head_request: bool = False
+    server_layers: Optional[Tuple[str, ...]] = None
 
     def normalised_email(self) -> Optional[str]:
         if self.email:
@@ -268,8 +317,12 @@ TEMPLATE_DEFAULTS: Dict[str, Dict[str, TemplateResource]] = {
              "{details}"),
         ),
         "csv_header":
-        TemplateResource("Template.log",
-                         "Time,API,Type,url,Interval,Code,Status"),
+        TemplateResource(
+            "Template.log",
+            ("Time,API,Type,url,Interval,Code,Status,"
+             "HTTP,Bytes,DNS(ms),Connect(ms),TLS(ms),TTFB(ms),Total(ms),"
+             "Family"),
+        ),
     },
 }
 
@@ -441,10 +494,8 @@ def set_language(language: str) -> None:
 
 
 def _load_language_setting() -> str:
-    config_path = _config_file_path()
-    parser = configparser.RawConfigParser()
-    read_files = parser.read(os.fspath(config_path))
-    if not read_files:
+    parser = get_config_snapshot()
+    if not parser.exists:
         return DEFAULT_LANGUAGE
 
     if not parser.has_section(LANGUAGE_SECTION):
@@ -466,6 +517,134 @@ def _config_file_path() -> Path:
     return Path(get_logdir()) / "Config" / "Config.ini"
 
 
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Immutable parsed view of one INI file.
+
+    ``stamp`` is the file's ``(mtime_ns, size, inode)`` when it was read, or
+    ``None`` when it did not exist. Option names are lower-cased like
+    :class:`configparser.RawConfigParser` does.
+    """
+
+    path: Path
+    stamp: Optional[Tuple[int, int, int]]
+    sections: Mapping[str, Mapping[str, str]]
+
+    @property
+    def exists(self) -> bool:
+        return self.stamp is not None
+
+    def has_section(self, section: str) -> bool:
+        return section in self.sections
+
+    def has_option(self, section: str, option: str) -> bool:
+        return option.lower() in self.sections.get(section, {})
+
+    def get(self,
+            section: str,
+            option: str,
+            fallback: Optional[str] = None) -> Optional[str]:
+        return self.sections.get(section, {}).get(option.lower(), fallback)
+
+    def items(self, section: str) -> List[Tuple[str, str]]:
+        return list(self.sections.get(section, {}).items())
+
+    def parser(self) -> configparser.RawConfigParser:
+        """Return a mutable parser holding a copy of the snapshot."""
+
+        parser = configparser.RawConfigParser()
+        parser.read_dict(self.sections)
+        return parser
+
+
+_SNAPSHOTS: Dict[Path, ConfigSnapshot] = {}
+_SNAPSHOT_LOCK = threading.Lock()
+_CONFIG_LISTENERS: List[Callable[[Path], None]] = []
+
+
+def _file_stamp(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        info = os.stat(path)
+    except OSError:
+        return None
+    if not stat.S_ISREG(info.st_mode):
+        return None
+    return info.st_mtime_ns, info.st_size, info.st_ino
+
+
+def get_config_snapshot(path: Union[str, Path, None] = None) -> ConfigSnapshot:
+    """Return the parsed content of ``path`` (default: ``Config.ini``).
+
+    The file is parsed once and re-parsed only when its mtime, size or inode
+    changed; each call costs one ``stat``. A change to a file that was read
+    before is reported to the :func:`add_config_listener` callbacks.
+    """
+
+    key = Path(os.path.abspath(_config_file_path() if path is None else path))
+    stamp = _file_stamp(key)
+    with _SNAPSHOT_LOCK:
+        cached = _SNAPSHOTS.get(key)
+    if cached is not None and cached.stamp == stamp:
+        return cached
+
+    parser = configparser.RawConfigParser()
+    if stamp is not None:
+        parser.read(os.fspath(key))
+    snapshot = ConfigSnapshot(
+        path=key,
+        stamp=stamp,
+        sections=MappingProxyType({
+            section: MappingProxyType(dict(parser.items(section)))
+            for section in parser.sections()
+        }),
+    )
+    with _SNAPSHOT_LOCK:
+        previous = _SNAPSHOTS.get(key)
+        _SNAPSHOTS[key] = snapshot
+        listeners = list(_CONFIG_LISTENERS)
+    if previous is not None and previous.stamp != stamp:
+        LOGGER.info("Configuration file %s changed on disk", key)
+        for listener in listeners:
+            try:
+                listener(key)
+            except Exception as exc:  # pragma: no cover - defensive logging
+                LOGGER.warning("Configuration listener %r failed: %s",
+                               listener, exc)
+    return snapshot
+
+
+def invalidate_config_snapshots(path: Union[str, Path, None] = None) -> None:
+    """Forget the snapshot of ``path``, or of every file when ``None``.
+
+    The next read re-parses the file without notifying listeners; use it
+    after writing a file within the same mtime tick.
+    """
+
+    with _SNAPSHOT_LOCK:
+        if path is None:
+            _SNAPSHOTS.clear()
+        else:
+            _SNAPSHOTS.pop(Path(os.path.abspath(path)), None)
+
+
+def add_config_listener(listener: Callable[[Path], None]) -> None:
+    """Call ``listener(path)`` when a configuration file changes on disk.
+
+    Listeners run on whichever thread noticed the change and must not block.
+    Changes written through this module are not reported.
+    """
+
+    with _SNAPSHOT_LOCK:
+        if listener not in _CONFIG_LISTENERS:
+            _CONFIG_LISTENERS.append(listener)
+
+
+def remove_config_listener(listener: Callable[[Path], None]) -> None:
+    with _SNAPSHOT_LOCK:
+        if listener in _CONFIG_LISTENERS:
+            _CONFIG_LISTENERS.remove(listener)
+
+
 def _load_config_parser(
         *,
         ensure_dir: bool = False) -> Tuple[configparser.RawConfigParser, Path]:
@@ -475,16 +654,14 @@ def _load_config_parser(
         if not config_path.exists():
             writeconfig(str(config_path.parent))
 
-    parser = configparser.RawConfigParser()
-    if config_path.exists():
-        parser.read(os.fspath(config_path))
-    return parser, config_path
+    return get_config_snapshot(config_path).parser(), config_path
 
 
 def _write_config_parser(parser: configparser.RawConfigParser,
                          path: Path) -> None:
     with path.open("w", encoding="utf-8") as configfile:
         parser.write(configfile)
+    invalidate_config_snapshots(path)
 
 
 def _set_config_value(
@@ -708,11 +885,10 @@ def get_logdir():
         if not config_path.is_file():
             continue
 
-        config = configparser.RawConfigParser()
-        resolved_path = config_path.resolve()
-        config.read(os.fspath(resolved_path))
+        config = get_config_snapshot(config_path)
         if not config.has_option("Logging", "log_file"):
             continue
+        resolved_path = config_path.resolve()
 
         raw_value = config.get("Logging", "log_file", fallback="").strip()
         if not raw_value:
@@ -741,7 +917,7 @@ def get_config_directory() -> Path:
 def get_logging_settings() -> LoggingSettings:
     """Read and parse logging configuration into ``LoggingSettings``."""
 
-    parser, _ = _load_config_parser()
+    parser = get_config_snapshot()
     section = "Logging"
     has_section = parser.has_section(section)
 
@@ -816,7 +992,7 @@ def get_logging_settings() -> LoggingSettings:
 
 def get_logging_preferences() -> Dict[str, object]:
     settings = get_logging_settings()
-    parser, _ = _load_config_parser()
+    parser = get_config_snapshot()
     section = "Logging"
     filename = _DEFAULT_LOG_FILENAME
     directory = settings.file_path.parent
@@ -1175,6 +1351,31 @@ def _build_monitor_item(config: configparser.RawConfigParser,
     else:
         language_code = None
 
+    keep_alive = _read_monitor_flag(config, section_name, "keep_alive",
+                                    default=True)
+    head_request = _read_monitor_flag(config, section_name, "head_request",
+                                      default=False)
+    if raw_type in ("HOSTS", "TCP"):
+        parse_targets = (parse_host_list
+                         if raw_type == "HOSTS" else parse_tcp_targets)
+        try:
+            parse_targets(url)
+        except ValueError as exc:
+            raise ValueError(
+                f"{section_name}.url configuration is invalid: {exc}") from exc
+
+    server_layers = None
+    layers_text = config.get(section_name,
+                             REQUEST_SERVER_LAYERS_KEY,
+                             fallback="").strip()
+    if layers_text:
+        try:
+            server_layers = _parse_server_layers(layers_text)
+        except ValueError as exc:
+            raise ValueError(
+                f"{section_name}.{REQUEST_SERVER_LAYERS_KEY} configuration is invalid: {exc}"
+            ) from exc
+
     return MonitorItem(
         name=name,
         url=url,
@@ -1184,9 +1385,22 @@ def _build_monitor_item(config: configparser.RawConfigParser,
         payload=payload,
         headers=headers,
         language=language_code,
+        keep_alive=keep_alive,
+        head_request=head_request,
+        server_layers=server_layers,
     )
 
 
+def _read_monitor_flag(config: configparser.RawConfigParser, section: str,
+                       option: str, *, default: bool) -> bool:
+    try:
+        return _parse_bool_option(config.get(section, option, fallback=""),
+                                  default=default)
+    except ValueError as exc:
+        raise ValueError(
+            f"{section}.{option} configuration is invalid: {exc}") from exc
+
+
 def _require_non_empty(config: configparser.RawConfigParser, section: str,
                        option: str) -> str:
     value = config.get(section, option, fallback="")
@@ -1302,11 +1516,10 @@ def get_request_timeout():
         path_obj = Path(path)
         if not path_obj.is_file():
             continue
-        config = configparser.RawConfigParser()
-        config.read(os.fspath(path_obj))
+        config = get_config_snapshot(path_obj)
         if config.has_option(REQUEST_SECTION, REQUEST_TIMEOUT_KEY):
-            timeout_value = config.getfloat(REQUEST_SECTION,
-                                            REQUEST_TIMEOUT_KEY)
+            timeout_value = float(
+                config.get(REQUEST_SECTION, REQUEST_TIMEOUT_KEY))
             if timeout_value <= 0:
                 raise ValueError(
                     f"{REQUEST_SECTION}.{REQUEST_TIMEOUT_KEY} in {path_obj} must be positive"
@@ -1317,12 +1530,425 @@ def get_request_timeout():
 
 
 def reset_request_timeout_cache() -> float:
-    """Clear the cached request-timeout value and return the refreshed result."""
+    """Clear the cached request-timeout value and return the refreshed result.
+
+    Every configuration snapshot is dropped too, so the value is re-read
+    from disk.
+    """
 
+    invalidate_config_snapshots()
+    _clear_request_timeout_cache()
+    return get_request_timeout()
+
+
+def _clear_request_timeout_cache(_changed: Optional[Path] = None) -> None:
     cache_clear = getattr(get_request_timeout, "cache_clear", None)
     if callable(cache_clear):
         cache_clear()
-    return get_request_timeout()
+
+
+# An edited timeout applies from the next probe on.
+add_config_listener(_clear_request_timeout_cache)
+
+
+def _read_request_option(option: str) -> Optional[Tuple[str, Path]]:
+    """Return the raw ``[Request]`` value for ``option`` and the file it came from."""
+
+    return _read_section_option(REQUEST_SECTION, option)
+
+
+def _read_section_option(section: str,
+                         option: str) -> Optional[Tuple[str, Path]]:
+    config_paths = [
+        _config_file_path(),
+        Path("config.ini"),
+    ]
+
+    for path_obj in config_paths:
+        if not path_obj.is_file():
+            continue
+        config = get_config_snapshot(path_obj)
+        if config.has_option(section, option):
+            return config.get(section, option), path_obj
+    return None
+
+
+def get_worker_pool_size() -> int:
+    """Return the scheduler worker-pool size from ``[Request].worker_pool_size``.
+
+    ``0`` sizes the pool to the number of monitors, which mirrors the legacy
+    one-thread-per-monitor behaviour.
+    """
+
+    found = _read_request_option(REQUEST_WORKER_POOL_KEY)
+    if found is None:
+        return DEFAULT_WORKER_POOL_SIZE
+
+    raw_value, path_obj = found
+    try:
+        return _parse_int_option(raw_value,
+                                 default=DEFAULT_WORKER_POOL_SIZE,
+                                 minimum=0)
+    except ValueError as exc:
+        LOGGER.warning(
+            "%s.%s in %s is invalid (%s); using default %s",
+            REQUEST_SECTION,
+            REQUEST_WORKER_POOL_KEY,
+            path_obj,
+            exc,
+            DEFAULT_WORKER_POOL_SIZE,
+        )
+        return DEFAULT_WORKER_POOL_SIZE
+
+
+def get_overrun_policy() -> str:
+    """Return how the scheduler treats ticks missed by slow probes.
+
+    One of ``skip`` (drop missed ticks), ``coalesce`` (run once right away,
+    then realign to the schedule) or ``immediate`` (run every missed tick
+    back-to-back).
+    """
+
+    found = _read_request_option(REQUEST_OVERRUN_POLICY_KEY)
+    if found is None:
+        return DEFAULT_OVERRUN_POLICY
+
+    raw_value, path_obj = found
+    policy = str(raw_value).strip().lower()
+    if not policy:
+        return DEFAULT_OVERRUN_POLICY
+    if policy not in OVERRUN_POLICIES:
+        LOGGER.warning(
+            "%s.%s in %s must be one of %s; using default %s",
+            REQUEST_SECTION,
+            REQUEST_OVERRUN_POLICY_KEY,
+            path_obj,
+            ", ".join(OVERRUN_POLICIES),
+            DEFAULT_OVERRUN_POLICY,
+        )
+        return DEFAULT_OVERRUN_POLICY
+    return policy
+
+
+def get_phase_spread() -> bool:
+    """Return whether first probes are spread across each monitor's interval."""
+
+    found = _read_request_option(REQUEST_PHASE_SPREAD_KEY)
+    if found is None:
+        return DEFAULT_PHASE_SPREAD
+
+    raw_value, path_obj = found
+    try:
+        return _parse_bool_option(raw_value, default=DEFAULT_PHASE_SPREAD)
+    except ValueError as exc:
+        LOGGER.warning("%s.%s in %s is invalid (%s); using default %s",
+                       REQUEST_SECTION, REQUEST_PHASE_SPREAD_KEY, path_obj,
+                       exc, DEFAULT_PHASE_SPREAD)
+        return DEFAULT_PHASE_SPREAD
+
+
+def get_start_jitter() -> float:
+    """Return the maximum random delay (seconds) added to each first probe."""
+
+    return _get_non_negative_float_request_option(REQUEST_START_JITTER_KEY,
+                                                  DEFAULT_START_JITTER)
+
+
+def get_keep_alive() -> bool:
+    """Return whether HTTP probes reuse pooled keep-alive connections.
+
+    Individual monitors can still opt out with ``keep_alive = false`` in their
+    own section.
+    """
+
+    found = _read_request_option(REQUEST_KEEP_ALIVE_KEY)
+    if found is None:
+        return DEFAULT_KEEP_ALIVE
+
+    raw_value, path_obj = found
+    try:
+        return _parse_bool_option(raw_value, default=DEFAULT_KEEP_ALIVE)
+    except ValueError as exc:
+        LOGGER.warning("%s.%s in %s is invalid (%s); using default %s",
+                       REQUEST_SECTION, REQUEST_KEEP_ALIVE_KEY, path_obj, exc,
+                       DEFAULT_KEEP_ALIVE)
+        return DEFAULT_KEEP_ALIVE
+
+
+def _get_positive_int_request_option(option: str, default: int) -> int:
+    found = _read_request_option(option)
+    if found is None:
+        return default
+
+    raw_value, path_obj = found
+    try:
+        return _parse_int_option(raw_value, default=default, minimum=1)
+    except ValueError as exc:
+        LOGGER.warning("%s.%s in %s is invalid (%s); using default %s",
+                       REQUEST_SECTION, option, path_obj, exc, default)
+        return default
+
+
+def get_pool_maxsize() -> int:
+    """Return how many idle keep-alive connections are kept per host."""
+
+    return _get_positive_int_request_option(REQUEST_POOL_MAXSIZE_KEY,
+                                            DEFAULT_POOL_MAXSIZE)
+
+
+def get_pool_max_hosts() -> int:
+    """Return how many hosts keep a pooled session before LRU eviction."""
+
+    return _get_positive_int_request_option(REQUEST_POOL_MAX_HOSTS_KEY,
+                                            DEFAULT_POOL_MAX_HOSTS)
+
+
+def get_pool_idle_timeout() -> float:
+    """Return after how many idle seconds a pooled host session is closed."""
+
+    return _get_non_negative_float_request_option(
+        REQUEST_POOL_IDLE_TIMEOUT_KEY,
+        DEFAULT_POOL_IDLE_TIMEOUT,
+        positive=True)
+
+
+def get_max_body_bytes() -> int:
+    """Return the cap on response-body bytes an HTTP probe reads.
+
+    Accepts sizes such as ``65536`` or ``64KB``. ``0`` reads no body at all;
+    only the status line and headers are received.
+    """
+
+    found = _read_request_option(REQUEST_MAX_BODY_BYTES_KEY)
+    if found is None:
+        return DEFAULT_MAX_BODY_BYTES
+
+    raw_value, path_obj = found
+    try:
+        return _parse_size_value(raw_value, default=DEFAULT_MAX_BODY_BYTES)
+    except ValueError as exc:
+        LOGGER.warning("%s.%s in %s is invalid (%s); using default %s",
+                       REQUEST_SECTION, REQUEST_MAX_BODY_BYTES_KEY, path_obj,
+                       exc, DEFAULT_MAX_BODY_BYTES)
+        return DEFAULT_MAX_BODY_BYTES
+
+
+def _parse_server_layers(value: Any) -> Tuple[str, ...]:
+    if isinstance(value, str):
+        names = value.split(",")
+    else:
+        names = [str(name) for name in value]
+    layers = tuple(
+        dict.fromkeys(name.strip().lower() for name in names if name.strip()))
+    if not layers:
+        raise ValueError("at least one layer is required")
+    unknown = [name for name in layers if name not in SERVER_PROBE_LAYERS]
+    if unknown:
+        raise ValueError(f"unknown layer(s) {', '.join(unknown)}; expected "
+                         f"{', '.join(SERVER_PROBE_LAYERS)}")
+    return layers
+
+
+def get_server_layers() -> Tuple[str, ...]:
+    """Return the probe layers SERVER monitors run, e.g. ``socket, ping, http``.
+
+    Layers run concurrently; see :func:`monitoring.api_monitor.probe_server`.
+    Monitors can override the list with their own ``server_layers`` option.
+    """
+
+    found = _read_request_option(REQUEST_SERVER_LAYERS_KEY)
+    if found is None:
+        return DEFAULT_SERVER_LAYERS
+
+    raw_value, path_obj = found
+    if not str(raw_value).strip():
+        return DEFAULT_SERVER_LAYERS
+    try:
+        return _parse_server_layers(raw_value)
+    except ValueError as exc:
+        LOGGER.warning("%s.%s in %s is invalid (%s); using default %s",
+                       REQUEST_SECTION, REQUEST_SERVER_LAYERS_KEY, path_obj,
+                       exc, ", ".join(DEFAULT_SERVER_LAYERS))
+        return DEFAULT_SERVER_LAYERS
+
+
+def parse_host_list(value: str) -> Tuple[str, ...]:
+    """Split a HOSTS monitor's ``url`` into hosts, e.g. ``10.0.0.1, db1``.
+
+    Hosts may be separated by commas or whitespace; duplicates are dropped.
+    """
+
+    hosts = tuple(dict.fromkeys(token for token in re.split(r"[\s,]+", value)
+                                if token))
+    if not hosts:
+        raise ValueError("at least one host is required")
+    return hosts
+
+
+def parse_tcp_targets(value: str) -> Tuple[Tuple[str, int], ...]:
+    """Split a TCP monitor's ``url`` into ``(host, port)`` pairs.
+
+    Targets look like ``db1:5432`` or ``[2001:db8::1]:22`` and are separated
+    by commas or whitespace; every target needs a port.
+    """
+
+    targets = []
+    for token in parse_host_list(value):
+        try:
+            parts = urlsplit(f"//{token}")
+            host, port = parts.hostname, parts.port
+        except ValueError as exc:
+            raise ValueError(f"invalid TCP target {token!r}: {exc}") from exc
+        if not host or port is None or not 0 < port < 65536:
+            raise ValueError(
+                f"invalid TCP target {token!r}; expected host:port")
+        targets.append((host, port))
+    return tuple(dict.fromkeys(targets))
+
+
+def get_sweep_rate() -> int:
+    """Return how many echo requests per second a HOSTS sweep sends at most."""
+
+    return _get_positive_int_request_option(REQUEST_SWEEP_RATE_KEY,
+                                            DEFAULT_SWEEP_RATE)
+
+
+def _get_non_negative_float_request_option(option: str,
+                                           default: float,
+                                           *,
+                                           positive: bool = False) -> float:
+    """Read a float ``[Request]`` option, falling back to ``default``.
+
+    With ``positive`` set, ``0`` is rejected as well.
+    """
+
+    found = _read_request_option(option)
+    if found is None:
+        return default
+
+    raw_value, path_obj = found
+    text = str(raw_value).strip()
+    if not text:
+        return default
+    try:
+        value = float(text)
+        if value < 0:
+            raise ValueError("value must not be negative")
+        if positive and value == 0:
+            raise ValueError("value must be positive")
+    except ValueError as exc:
+        LOGGER.warning("%s.%s in %s is invalid (%s); using default %s",
+                       REQUEST_SECTION, option, path_obj, exc, default)
+        return default
+    return value
+
+
+def get_dns_ttl() -> float:
+    """Return how many seconds a resolved host name stays cached."""
+
+    return _get_non_negative_float_request_option(REQUEST_DNS_TTL_KEY,
+                                                  DEFAULT_DNS_TTL)
+
+
+def get_dns_negative_ttl() -> float:
+    """Return how many seconds a failed host name lookup stays cached."""
+
+    return _get_non_negative_float_request_option(
+        REQUEST_DNS_NEGATIVE_TTL_KEY, DEFAULT_DNS_NEGATIVE_TTL)
+
+
+def get_probe_share_window() -> float:
+    """Return for how many seconds identical monitors reuse a probe result.
+
+    ``0`` still shares probes that are in flight at the same time.
+    """
+
+    return _get_non_negative_float_request_option(
+        REQUEST_PROBE_SHARE_WINDOW_KEY, DEFAULT_PROBE_SHARE_WINDOW)
+
+
+def get_event_queue_size() -> int:
+    """Return how many events each log/notification/UI sink may queue."""
+
+    return _get_positive_int_request_option(REQUEST_EVENT_QUEUE_SIZE_KEY,
+                                            DEFAULT_EVENT_QUEUE_SIZE)
+
+
+def _get_history_flag(option: str, default: bool) -> bool:
+    found = _read_section_option(HISTORY_SECTION, option)
+    if found is None:
+        return default
+
+    raw_value, path_obj = found
+    try:
+        return _parse_bool_option(raw_value, default=default)
+    except ValueError as exc:
+        LOGGER.warning("%s.%s in %s is invalid (%s); using default %s",
+                       HISTORY_SECTION, option, path_obj, exc, default)
+        return default
+
+
+def get_history_enabled() -> bool:
+    """Return whether probe results are stored in the SQLite history."""
+
+    return _get_history_flag(HISTORY_ENABLED_KEY, DEFAULT_HISTORY_ENABLED)
+
+
+def get_csv_log_enabled() -> bool:
+    """Return whether probe results are still written to the daily CSVs."""
+
+    return _get_history_flag(HISTORY_CSV_KEY, DEFAULT_HISTORY_CSV)
+
+
+def get_history_retention_days() -> float:
+    """Return after how many days history rows are deleted (``0`` keeps them)."""
+
+    found = _read_section_option(HISTORY_SECTION, HISTORY_RETENTION_DAYS_KEY)
+    if found is None:
+        return DEFAULT_HISTORY_RETENTION_DAYS
+
+    raw_value, path_obj = found
+    text = str(raw_value).strip()
+    if not text:
+        return DEFAULT_HISTORY_RETENTION_DAYS
+    try:
+        value = float(text)
+        if value < 0:
+            raise ValueError("value must not be negative")
+    except ValueError as exc:
+        LOGGER.warning("%s.%s in %s is invalid (%s); using default %s",
+                       HISTORY_SECTION, HISTORY_RETENTION_DAYS_KEY, path_obj,
+                       exc, DEFAULT_HISTORY_RETENTION_DAYS)
+        return DEFAULT_HISTORY_RETENTION_DAYS
+    return value
+
+
+def get_event_backpressure() -> str:
+    """Return what happens to a new event when a sink's queue is full.
+
+    One of ``block`` (the probe thread waits for room), ``drop_oldest`` or
+    ``drop_newest``.
+    """
+
+    found = _read_request_option(REQUEST_EVENT_BACKPRESSURE_KEY)
+    if found is None:
+        return DEFAULT_EVENT_BACKPRESSURE
+
+    raw_value, path_obj = found
+    policy = str(raw_value).strip().lower()
+    if not policy:
+        return DEFAULT_EVENT_BACKPRESSURE
+    if policy not in EVENT_BACKPRESSURE_POLICIES:
+        LOGGER.warning(
+            "%s.%s in %s must be one of %s; using default %s",
+            REQUEST_SECTION,
+            REQUEST_EVENT_BACKPRESSURE_KEY,
+            path_obj,
+            ", ".join(EVENT_BACKPRESSURE_POLICIES),
+            DEFAULT_EVENT_BACKPRESSURE,
+        )
+        return DEFAULT_EVENT_BACKPRESSURE
+    return policy
 
 
 def read_mail_configuration():
@@ -1414,8 +2040,7 @@ def _load_mail_config_from_external_file():
         raise FileNotFoundError(
             f"Specified mail configuration file does not exist: {path}")
 
-    config = configparser.RawConfigParser()
-    config.read(path)
+    config = get_config_snapshot(path)
 
     if not config.has_section(MAIL_SECTION):
         raise ValueError(
@@ -1457,8 +2082,7 @@ def _load_mail_config_from_project_file():
         if not path.is_file():
             continue
 
-        config = configparser.RawConfigParser()
-        config.read(os.fspath(path))
+        config = get_config_snapshot(path)
 
         if not config.has_section(MAIL_SECTION):
             continue
@@ -1495,9 +2119,10 @@ def _load_mail_config_from_project_file():
 
 
 def get_timezone():
-    parser, config_path = _load_config_parser()
+    parser = get_config_snapshot()
+    config_path = parser.path
 
-    if not config_path.exists():
+    if not parser.exists:
         LOGGER.warning("Timezone config %s not found; using default %s",
                        config_path, DEFAULT_TIMEZONE)
         return DEFAULT_TIMEZONE
@@ -1558,7 +2183,7 @@ def set_timezone(timezone):
 
 
 def get_preferences() -> Dict[str, Optional[str]]:
-    parser, _ = _load_config_parser()
+    parser = get_config_snapshot()
 
     theme_value: Optional[str] = None
     theme_display: Optional[str] = None
@@ -1749,6 +2374,14 @@ def write_monitor_list(monitors: List[Dict[str, object]]) -> None:
             config.set(section, "payload", payload_text)
         if headers_text:
             config.set(section, "headers", headers_text)
+        if not _parse_bool_option(monitor.get("keep_alive"), default=True):
+            config.set(section, "keep_alive", "false")
+        if _parse_bool_option(monitor.get("head_request"), default=False):
+            config.set(section, "head_request", "true")
+        server_layers = monitor.get(REQUEST_SERVER_LAYERS_KEY)
+        if server_layers:
+            config.set(section, REQUEST_SERVER_LAYERS_KEY,
+                       ", ".join(_parse_server_layers(server_layers)))
 
     _write_config_parser(config, config_path)
 
@@ -1803,11 +2436,47 @@ def writeconfig(configDir: str) -> None:
     info.add_section(REQUEST_SECTION)
     info.set(REQUEST_SECTION, REQUEST_TIMEOUT_KEY,
              str(DEFAULT_REQUEST_TIMEOUT))
+    info.set(REQUEST_SECTION, REQUEST_WORKER_POOL_KEY,
+             str(DEFAULT_WORKER_POOL_SIZE))
+    info.set(REQUEST_SECTION, REQUEST_OVERRUN_POLICY_KEY,
+             DEFAULT_OVERRUN_POLICY)
+    info.set(REQUEST_SECTION, REQUEST_PHASE_SPREAD_KEY,
+             str(DEFAULT_PHASE_SPREAD).lower())
+    info.set(REQUEST_SECTION, REQUEST_START_JITTER_KEY,
+             str(DEFAULT_START_JITTER))
+    info.set(REQUEST_SECTION, REQUEST_KEEP_ALIVE_KEY,
+             str(DEFAULT_KEEP_ALIVE).lower())
+    info.set(REQUEST_SECTION, REQUEST_POOL_MAXSIZE_KEY,
+             str(DEFAULT_POOL_MAXSIZE))
+    info.set(REQUEST_SECTION, REQUEST_POOL_MAX_HOSTS_KEY,
+             str(DEFAULT_POOL_MAX_HOSTS))
+    info.set(REQUEST_SECTION, REQUEST_POOL_IDLE_TIMEOUT_KEY,
+             str(DEFAULT_POOL_IDLE_TIMEOUT))
+    info.set(REQUEST_SECTION, REQUEST_MAX_BODY_BYTES_KEY,
+             _format_size_token(DEFAULT_MAX_BODY_BYTES))
+    info.set(REQUEST_SECTION, REQUEST_SWEEP_RATE_KEY, str(DEFAULT_SWEEP_RATE))
+    info.set(REQUEST_SECTION, REQUEST_DNS_TTL_KEY, str(DEFAULT_DNS_TTL))
+    info.set(REQUEST_SECTION, REQUEST_DNS_NEGATIVE_TTL_KEY,
+             str(DEFAULT_DNS_NEGATIVE_TTL))
+    info.set(REQUEST_SECTION, REQUEST_PROBE_SHARE_WINDOW_KEY,
+             str(DEFAULT_PROBE_SHARE_WINDOW))
+    info.set(REQUEST_SECTION, REQUEST_EVENT_QUEUE_SIZE_KEY,
+             str(DEFAULT_EVENT_QUEUE_SIZE))
+    info.set(REQUEST_SECTION, REQUEST_EVENT_BACKPRESSURE_KEY,
+             DEFAULT_EVENT_BACKPRESSURE)
+
+    info.add_section(HISTORY_SECTION)
+    info.set(HISTORY_SECTION, HISTORY_ENABLED_KEY,
+             str(DEFAULT_HISTORY_ENABLED).lower())
+    info.set(HISTORY_SECTION, HISTORY_CSV_KEY, str(DEFAULT_HISTORY_CSV).lower())
+    info.set(HISTORY_SECTION, HISTORY_RETENTION_DAYS_KEY,
+             str(DEFAULT_HISTORY_RETENTION_DAYS))
 
     info.add_section("MonitorNum")
     info.set("MonitorNum", "total", "0")
 
     with config_file_path.open("w", encoding="utf-8") as config_file:
         info.write(config_file)
+    invalidate_config_snapshots(config_file_path)
 
     _ensure_templates_file(config_dir)
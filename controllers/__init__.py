@@ -16,6 +16,7 @@ class ControllerEventBus(QtCore.QObject):
     timezoneChanged = QtCore.Signal(int)
     languageChanged = QtCore.Signal(str)
     themeChanged = QtCore.Signal(str)
+    configChanged = QtCore.Signal(str)
 
     def __init__(self, parent: QtCore.QObject | None = None) -> None:
         super().__init__(parent)
@@ -6,24 +6,30 @@
 
 from __future__ import annotations
 
-import threading
+import heapq
+import itertools
+import time
 from typing import Dict, Optional, Tuple
 
 from PySide6 import QtCore
 
 import configuration
 from configuration import SUPPORTED_MONITOR_TYPES
-from monitoring import log_recorder
+from monitoring import history_store, log_recorder
 from monitoring.service import (
     MonitorScheduler,
     parse_network_address as service_parse_network_address,
 )
 from monitoring.state_machine import MonitorEvent
+from monitoring.worker_pool import WorkerPool
 
 from . import ControllerEventBus
 
 PeriodicMonitorKey = Tuple[str, str, str]
 
+# Upper bound, in seconds, on how long stopping the scheduler may block the UI.
+STOP_TIMEOUT_SECONDS = 3.0
+
 
 class DashboardController(QtCore.QObject):
     """Manage the primary monitoring scheduler and periodic jobs."""
@@ -42,7 +48,15 @@ class DashboardController(QtCore.QObject):
         self._periodic_scheduler = self._create_scheduler()
         self._periodic_monitors: Dict[PeriodicMonitorKey,
                                       configuration.MonitorItem] = {}
-        self._periodic_timers: Dict[PeriodicMonitorKey, QtCore.QTimer] = {}
+        # Periodic jobs share one single-shot timer, re-armed for the earliest
+        # deadline in the heap, and run on a bounded worker pool.
+        self._periodic_due: Dict[PeriodicMonitorKey, float] = {}
+        self._periodic_heap: list[tuple[float, int, PeriodicMonitorKey]] = []
+        self._periodic_sequence = itertools.count()
+        self._periodic_timer = QtCore.QTimer(self)
+        self._periodic_timer.setSingleShot(True)
+        self._periodic_timer.timeout.connect(self._on_periodic_timer)
+        self._periodic_pool: Optional[WorkerPool] = None
         self._running_periodic: set[PeriodicMonitorKey] = set()
 
         self._event_bus.timezoneChanged.connect(self._on_timezone_changed)
@@ -78,20 +92,63 @@ class DashboardController(QtCore.QObject):
                 self.tr("No valid monitor configuration was found"), 4000)
             return False
 
-        scheduler = self._create_scheduler()
+        scheduler = self._create_scheduler(
+            worker_count=configuration.get_worker_pool_size(),
+            overrun_policy=configuration.get_overrun_policy(),
+            phase_spread=configuration.get_phase_spread(),
+            start_jitter=configuration.get_start_jitter(),
+            dns_prewarm=True,
+            probe_share_window=configuration.get_probe_share_window(),
+            event_queue_size=configuration.get_event_queue_size(),
+            event_backpressure=configuration.get_event_backpressure(),
+        )
         scheduler.start(monitors)
         self._scheduler = scheduler
         self._event_bus.monitoringToggled.emit(True)
         self._event_bus.statusMessage.emit(self.tr("Monitoring started"), 3000)
         return True
 
+    def reconcile_monitoring(self) -> bool:
+        """Apply the saved monitor list to the running scheduler in place.
+
+        Only added and removed monitors are started or stopped; unchanged and
+        edited monitors keep their state machines. Return ``False`` when
+        monitoring is not running.
+        """
+
+        scheduler = self._scheduler
+        if scheduler is None:
+            return False
+
+        monitors = configuration.read_monitor_list()
+        result = scheduler.reconcile(monitors)
+        if result.changed:
+            self._event_bus.logMessage.emit(
+                self.
+                tr("Monitor set updated: {added} added, {removed} removed, {updated} changed"
+                   ).format(
+                       added=len(result.added),
+                       removed=len(result.removed),
+                       updated=len(result.updated),
+                   ))
+        if not monitors:
+            self.stop_monitoring()
+        return True
+
     def stop_monitoring(self) -> None:
         scheduler = self._scheduler
         if scheduler is None:
             return
 
-        scheduler.stop()
+        abandoned = scheduler.stop(timeout=STOP_TIMEOUT_SECONDS)
         self._scheduler = None
+        log_recorder.flush()
+        history_store.flush()
+        if abandoned:
+            self._event_bus.logMessage.emit(
+                self.tr("Stopped without waiting for {count} running checks: {names}"
+                        ).format(count=len(abandoned),
+                                 names=", ".join(abandoned)))
         self._event_bus.monitoringToggled.emit(False)
         self._event_bus.statusMessage.emit(self.tr("Monitoring stopped"), 3000)
 
@@ -115,9 +172,7 @@ class DashboardController(QtCore.QObject):
                                   monitor_key: PeriodicMonitorKey) -> None:
         monitor = self._periodic_monitors.get(monitor_key)
         if not monitor:
-            timer = self._periodic_timers.pop(monitor_key, None)
-            if timer:
-                timer.stop()
+            self._periodic_due.pop(monitor_key, None)
             self._sync_periodic_state()
             return
 
@@ -132,44 +187,78 @@ class DashboardController(QtCore.QObject):
             finally:
                 self._running_periodic.discard(monitor_key)
 
-        thread = threading.Thread(
-            name=f"Monitor:{monitor.name}",
-            target=_run_cycle,
-            daemon=True,
-        )
-        thread.start()
+        self._ensure_periodic_pool().submit(_run_cycle)
 
     def _schedule_periodic_monitor(
         self,
         monitor: configuration.MonitorItem,
         monitor_key: PeriodicMonitorKey,
     ) -> None:
-        interval_ms = max(int(monitor.interval), 0) * 1000
-        timer = self._periodic_timers.get(monitor_key)
-
-        if interval_ms == 0:
-            if timer:
-                timer.stop()
+        interval_seconds = max(int(monitor.interval), 0)
+        if interval_seconds == 0:
+            self._periodic_due.pop(monitor_key, None)
+            self._arm_periodic_timer()
             return
 
-        if timer is None:
-            timer = QtCore.QTimer(self.parent())
-            timer.setSingleShot(False)
-            timer.timeout.connect(
-                lambda key=monitor_key: self._trigger_periodic_monitor(key))
-            self._periodic_timers[monitor_key] = timer
+        due = time.monotonic() + interval_seconds
+        self._periodic_due[monitor_key] = due
+        heapq.heappush(self._periodic_heap,
+                       (due, next(self._periodic_sequence), monitor_key))
+        self._arm_periodic_timer()
+
+    def _on_periodic_timer(self) -> None:
+        now = time.monotonic()
+        while self._periodic_heap and self._periodic_heap[0][0] <= now:
+            due, _, monitor_key = heapq.heappop(self._periodic_heap)
+            if self._periodic_due.get(monitor_key) != due:
+                continue  # Rescheduled or removed since it was queued.
+
+            self._trigger_periodic_monitor(monitor_key)
+            monitor = self._periodic_monitors.get(monitor_key)
+            if monitor is None:
+                continue
+            interval_seconds = max(int(monitor.interval), 0)
+            if interval_seconds == 0:
+                self._periodic_due.pop(monitor_key, None)
+                continue
+            next_due = due + interval_seconds
+            if next_due <= now:
+                next_due = now + interval_seconds
+            self._periodic_due[monitor_key] = next_due
+            heapq.heappush(
+                self._periodic_heap,
+                (next_due, next(self._periodic_sequence), monitor_key))
+        self._arm_periodic_timer()
+
+    def _arm_periodic_timer(self) -> None:
+        """Point the shared timer at the earliest live periodic deadline."""
+
+        heap = self._periodic_heap
+        while heap and self._periodic_due.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+        if not heap:
+            self._periodic_timer.stop()
+            return
+        delay_ms = max(int((heap[0][0] - time.monotonic()) * 1000), 0)
+        self._periodic_timer.start(delay_ms)
 
-        timer.setInterval(interval_ms)
-        if not timer.isActive():
-            timer.start()
+    def _ensure_periodic_pool(self) -> WorkerPool:
+        if self._periodic_pool is None:
+            size = (configuration.get_worker_pool_size()
+                    or configuration.DEFAULT_WORKER_POOL_SIZE)
+            self._periodic_pool = WorkerPool(size, name="Monitor:Periodic")
+        return self._periodic_pool
 
     def _stop_periodic_monitors(self) -> None:
-        for timer in self._periodic_timers.values():
-            timer.stop()
-        self._periodic_timers.clear()
+        self._periodic_timer.stop()
+        self._periodic_heap.clear()
+        self._periodic_due.clear()
         self._periodic_monitors.clear()
         self._running_periodic.clear()
-        self._periodic_scheduler.stop()
+        if self._periodic_pool is not None:
+            self._periodic_pool.shutdown(STOP_TIMEOUT_SECONDS)
+            self._periodic_pool = None
+        self._periodic_scheduler.stop(timeout=STOP_TIMEOUT_SECONDS)
         self._periodic_scheduler = self._create_scheduler()
 
     def _sync_periodic_state(self) -> None:
@@ -177,10 +266,15 @@ class DashboardController(QtCore.QObject):
             self._periodic_monitors.values())
 
     # --- Helper methods ----------------------------------------------
-    def _create_scheduler(self) -> MonitorScheduler:
+    def _create_scheduler(self, **options) -> MonitorScheduler:
+        history = (history_store.shared_store()
+                   if configuration.get_history_enabled() else None)
         return MonitorScheduler(
             event_handler=self._handle_monitor_event,
             timezone_getter=lambda: self._timezone,
+            history=history,
+            csv_log=configuration.get_csv_log_enabled(),
+            **options,
         )
 
     def _handle_monitor_event(self, event: MonitorEvent) -> None:
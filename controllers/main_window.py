@@ -7,6 +7,7 @@
 from __future__ import annotations
 
 import datetime
+import os
 from typing import Optional, TYPE_CHECKING
 
 from PySide6 import QtCore, QtWidgets, QtGui
@@ -18,6 +19,7 @@ from datamonitor import __version__ as APP_VERSION
 from . import ControllerEventBus
 from .dashboard import DashboardController
 from .preferences import PreferencesController
+from monitoring import http_probe, log_recorder
 from monitoring.service import parse_network_address as service_parse_network_address
 from ui.main_window import MainWindowUI
 
@@ -113,6 +115,8 @@ class MainWindowController(QtCore.QObject):
         self.events.monitoringToggled.connect(self._handle_monitoring_toggled)
         self.events.timezoneChanged.connect(self._handle_timezone_changed)
         self.events.languageChanged.connect(self._handle_language_changed)
+        self.events.configChanged.connect(self._handle_config_changed)
+        configuration.add_config_listener(self._notify_config_changed)
 
         self.preferences.setup()
 
@@ -262,6 +266,8 @@ class MainWindowController(QtCore.QObject):
             configuration.reset_request_timeout_cache()
         except ValueError as exc:
             timeout_error = exc
+        http_probe.reset_session_pool()
+        log_recorder.reset_writer()
 
         self._reload_monitors()
 
@@ -304,6 +310,8 @@ class MainWindowController(QtCore.QObject):
 
             self.events.statusMessage.emit(message, duration)
             self._reload_monitors()
+            if self.dashboard.is_running:
+                self.dashboard.reconcile_monitoring()
             self.ui.show_monitor_page()
 
     def _reload_monitors(self) -> None:
@@ -330,12 +338,29 @@ class MainWindowController(QtCore.QObject):
         self.ui.localTimeLabel.setText(
             current_time.strftime('%Y-%m-%d %H:%M:%S'))
         self.ui.utcTimeLabel.setText(utc_time.strftime('%Y-%m-%d %H:%M:%S'))
+        try:
+            # One stat per tick; an edited Config.ini notifies the listener.
+            configuration.get_config_snapshot()
+        except Exception:
+            # A half-written file is picked up on a later tick.
+            pass
+
+    def _notify_config_changed(self, path) -> None:
+        # Runs on whichever thread noticed the change; the queued signal
+        # brings it to the GUI thread.
+        self.events.configChanged.emit(os.fspath(path))
+
+    def _handle_config_changed(self, _path: str) -> None:
+        self.reload_configuration()
+        if self.dashboard.is_running:
+            self.dashboard.reconcile_monitoring()
 
     # --- Miscellaneous -------------------------------------------------
     def parse_network_address(self, address):
         return service_parse_network_address(address)
 
     def on_close(self) -> None:
+        configuration.remove_config_listener(self._notify_config_changed)
         self.dashboard.on_close()
         self.preferences.on_close()
 
@@ -13,6 +13,7 @@ from typing import Optional
 from PySide6 import QtCore, QtWidgets
 
 import configuration
+from monitoring import log_recorder
 
 from . import ControllerEventBus
 
@@ -606,6 +607,8 @@ class PreferencesController(QtCore.QObject):
 
         self._time_zone = int(time_zone)
         configuration.set_preferences({"timezone": self._time_zone})
+        # Log timestamps and file dates follow the new timezone.
+        log_recorder.reset_writer()
         if isinstance(self._preferences, dict):
             self._preferences["timezone"] = str(self._time_zone)
         self._update_timezone_display()
@@ -1,11 +1,20 @@
 # -*- codeing = utf-8 -*-
 # @Create: 2023-03-29 3:23 p.m.
-# @Update: 2025-10-24 11:53 p.m.
+# @Update: 2026-10-17 11:50 p.m.
 # @Author: John Zhao
 """Components related to the monitoring scheduler."""
 
-from . import api_monitor, http_probe, icmp_probe, log_recorder, network_probe, send_email
-from .service import MonitorScheduler, default_notification_dispatcher, default_notification_templates
+from . import api_monitor, async_probe, dns_cache, event_pipeline, history_store, http_probe, icmp_engine, icmp_probe, icmp_sweep, log_recorder, log_writer, network_probe, probe_sharing, send_email, tcp_engine, timeseries
+from .async_service import AsyncMonitorScheduler
+from .probe_result import ProbeResult
+from .service import (
+    MonitorScheduler,
+    OverrunPolicy,
+    ReconcileResult,
+    TickStats,
+    default_notification_dispatcher,
+    default_notification_templates,
+)
 from .state_machine import (
     MonitorEvent,
     MonitorState,
@@ -15,18 +24,33 @@ from .state_machine import (
 )
 
 __all__ = [
+    "AsyncMonitorScheduler",
     "MonitorEvent",
     "MonitorScheduler",
     "MonitorState",
     "MonitorStateMachine",
     "NotificationMessage",
     "NotificationTemplates",
+    "OverrunPolicy",
+    "ProbeResult",
+    "ReconcileResult",
+    "TickStats",
     "api_monitor",
+    "async_probe",
+    "dns_cache",
+    "event_pipeline",
+    "history_store",
     "log_recorder",
+    "log_writer",
     "http_probe",
+    "icmp_engine",
     "icmp_probe",
+    "icmp_sweep",
     "network_probe",
+    "probe_sharing",
     "send_email",
+    "tcp_engine",
+    "timeseries",
     "default_notification_dispatcher",
     "default_notification_templates",
 ]
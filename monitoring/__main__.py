@@ -0,0 +1,251 @@
+# -*- codeing = utf-8 -*-
+# @Create: 2026-10-17 2:25 p.m.
+# @Update: 2026-10-17 11:30 p.m.
+# @Author: John Zhao
+"""Headless entry point: ``python -m monitoring``.
+
+Runs :class:`MonitorScheduler` against the monitors in ``Config.ini`` without
+importing Qt, for probe hosts that have no display. ``SIGINT``/``SIGTERM``
+stop the scheduler; ``SIGHUP`` reloads the monitor list in place.
+``python -m monitoring history ...`` queries the stored probe history
+instead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as _dt
+import logging
+import os
+import signal
+import sys
+import threading
+from typing import Optional, Sequence
+
+import configuration
+
+from . import dns_cache
+from . import history_store
+from . import http_probe
+from . import icmp_engine
+from . import log_recorder
+from .service import MonitorScheduler, monitor_hosts
+from .state_machine import MonitorEvent, MonitorState
+
+LOGGER = logging.getLogger("monitoring.daemon")
+
+STOP_TIMEOUT_SECONDS = 10.0
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m monitoring",
+        description="Run DataMonitor monitors without the desktop client.",
+    )
+    parser.add_argument(
+        "--home",
+        help="application home holding Config/ and Log/ "
+        "(overrides the APIMONITOR_HOME environment variable)",
+    )
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="run every monitor once and exit; the exit status is 2 when any "
+        "monitor is failing",
+    )
+    commands = parser.add_subparsers(dest="command")
+    history = commands.add_parser(
+        "history", help="query the probe history instead of monitoring")
+    queries = history.add_subparsers(dest="query", required=True)
+    latest = queries.add_parser("latest", help="newest results first")
+    latest.add_argument("--monitor", help="only this monitor")
+    latest.add_argument("--count", type=int, default=20)
+    changes = queries.add_parser("changes", help="outages and recoveries")
+    changes.add_argument("--monitor", help="only this monitor")
+    changes.add_argument("--hours",
+                         type=float,
+                         default=24.0,
+                         help="how far back to look (default: 24)")
+    between = queries.add_parser("range",
+                                 help="one monitor's results, oldest first")
+    between.add_argument("--monitor", required=True)
+    between.add_argument("--hours",
+                         type=float,
+                         default=24.0,
+                         help="how far back to look (default: 24)")
+    queries.add_parser("prune", help="delete results past the retention")
+    return parser
+
+
+def _read_timezone() -> int:
+    raw_value = configuration.get_timezone()
+    try:
+        return int(str(raw_value).strip())
+    except (TypeError, ValueError):
+        LOGGER.warning("monitor.daemon.invalid_timezone value=%s", raw_value)
+        return int(configuration.DEFAULT_TIMEZONE)
+
+
+def _log_event(event: MonitorEvent) -> None:
+    LOGGER.info("monitor.daemon.event monitor=%s status=%s message=%s",
+                event.monitor.name, event.status.name, event.message)
+
+
+def _create_scheduler(timezone: int) -> MonitorScheduler:
+    history = (history_store.shared_store()
+               if configuration.get_history_enabled() else None)
+    return MonitorScheduler(
+        event_handler=_log_event,
+        timezone_getter=lambda: timezone,
+        worker_count=configuration.get_worker_pool_size(),
+        overrun_policy=configuration.get_overrun_policy(),
+        phase_spread=configuration.get_phase_spread(),
+        start_jitter=configuration.get_start_jitter(),
+        dns_prewarm=True,
+        probe_share_window=configuration.get_probe_share_window(),
+        history=history,
+        csv_log=configuration.get_csv_log_enabled(),
+        event_queue_size=configuration.get_event_queue_size(),
+        event_backpressure=configuration.get_event_backpressure(),
+    )
+
+
+def _run_once(scheduler: MonitorScheduler, monitors) -> int:
+    failing = 0
+    for monitor in monitors:
+        event = scheduler.run_single_cycle(monitor)
+        if event.status in (MonitorState.OUTAGE, MonitorState.OUTAGE_ONGOING):
+            failing += 1
+    LOGGER.info("monitor.daemon.once monitors=%s failing=%s", len(monitors),
+                failing)
+    return 2 if failing else 0
+
+
+def _run_history(args: argparse.Namespace) -> int:
+    store = history_store.shared_store()
+    if args.query == "prune":
+        removed = store.prune()
+        print(f"removed {removed} rows from {store.path}")
+        return 0
+
+    if args.query == "latest":
+        records = store.latest(args.monitor, args.count)
+    else:
+        end = _dt.datetime.now(_dt.UTC).replace(tzinfo=None)
+        start = end - _dt.timedelta(hours=args.hours)
+        if args.query == "changes":
+            records = store.state_changes(args.monitor, start, end)
+        else:
+            records = store.records_between(args.monitor, start, end)
+    for record in records:
+        print("\t".join(history_store.summarize(record)))
+    return 0
+
+
+def _install_signal_handlers(stop_requested: threading.Event,
+                             reload_requested: threading.Event) -> None:
+
+    def _request_stop(signum, _frame) -> None:
+        LOGGER.info("monitor.daemon.signal signal=%s action=stop", signum)
+        stop_requested.set()
+
+    def _request_reload(signum, _frame) -> None:
+        LOGGER.info("monitor.daemon.signal signal=%s action=reload", signum)
+        reload_requested.set()
+
+    signal.signal(signal.SIGINT, _request_stop)
+    signal.signal(signal.SIGTERM, _request_stop)
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, _request_reload)
+
+
+def _serve(scheduler: MonitorScheduler, monitors) -> int:
+    stop_requested = threading.Event()
+    reload_requested = threading.Event()
+    _install_signal_handlers(stop_requested, reload_requested)
+
+    def _request_reload(path) -> None:
+        LOGGER.info("monitor.daemon.config_changed path=%s", path)
+        reload_requested.set()
+
+    # Editing Config.ini reloads like SIGHUP does.
+    configuration.add_config_listener(_request_reload)
+    config_error: Optional[str] = None
+    scheduler.start(monitors)
+    LOGGER.info("monitor.daemon.started monitors=%s", len(monitors))
+    try:
+        while not stop_requested.is_set():
+            # Short waits keep the main thread responsive to signals.
+            stop_requested.wait(0.5)
+            try:
+                configuration.get_config_snapshot()
+                config_error = None
+            except Exception as exc:
+                if str(exc) != config_error:
+                    config_error = str(exc)
+                    LOGGER.warning("monitor.daemon.invalid_config error=%s",
+                                   exc)
+            if reload_requested.is_set():
+                reload_requested.clear()
+                try:
+                    configuration.reset_request_timeout_cache()
+                except ValueError as exc:
+                    LOGGER.warning("monitor.daemon.invalid_timeout error=%s",
+                                   exc)
+                http_probe.reset_session_pool()
+                # Reopen the logs in case the folder or timezone changed.
+                log_recorder.reset_writer()
+                # Re-read the TTLs; the fresh cache is warmed for every monitor.
+                dns_cache.reset_shared_cache()
+                monitors = configuration.read_monitor_list()
+                result = scheduler.reconcile(monitors)
+                dns_cache.prewarm(monitor_hosts(monitors))
+                LOGGER.info(
+                    "monitor.daemon.reloaded added=%s removed=%s updated=%s",
+                    len(result.added), len(result.removed),
+                    len(result.updated))
+    finally:
+        configuration.remove_config_listener(_request_reload)
+        abandoned = scheduler.stop(timeout=STOP_TIMEOUT_SECONDS)
+        http_probe.reset_session_pool()
+        log_recorder.reset_writer()
+        history_store.close_shared_store()
+        stats = dns_cache.shared_cache().stats()
+        LOGGER.info(
+            "monitor.dns.stats hits=%s misses=%s negative_hits=%s "
+            "coalesced=%s entries=%s", stats.hits, stats.misses,
+            stats.negative_hits, stats.coalesced, stats.entries)
+        for sink, sink_stats in scheduler.event_stats().items():
+            LOGGER.info(
+                "monitor.events.stats sink=%s delivered=%s failed=%s "
+                "dropped=%s max_lag=%.3f", sink, sink_stats.delivered,
+                sink_stats.failed, sink_stats.dropped, sink_stats.max_lag)
+        LOGGER.info("monitor.daemon.stopped abandoned=%s",
+                    ",".join(abandoned))
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if args.home:
+        os.environ[configuration.LOG_DIR_ENV] = args.home
+
+    configuration.configure_logging(install_console=True)
+    if args.command == "history":
+        return _run_history(args)
+    monitors = configuration.read_monitor_list()
+    if not monitors:
+        LOGGER.error("monitor.daemon.no_monitors config=%s",
+                     configuration.get_config_directory())
+        return 1
+
+    # Settle raw vs. unprivileged ping sockets once, before the first probe.
+    icmp_engine.detect_socket_modes()
+    scheduler = _create_scheduler(_read_timezone())
+    if args.once:
+        return _run_once(scheduler, monitors)
+    return _serve(scheduler, monitors)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,13 +3,24 @@
 # @Update: 2025-10-24 11:53 p.m.
 # @Author: John Zhao
 
+import dataclasses
 import logging
+import queue
+import threading
+import time
+
+import configuration
 
 from . import http_probe
 from . import network_probe
+from .probe_result import ProbeResult
+from .worker_pool import WorkerPool
 
 LOGGER = logging.getLogger(__name__)
 
+_STAGE_POOL = None
+_STAGE_POOL_LOCK = threading.Lock()
+_STAGES_IN_FLIGHT = 0
 
 def _compose_service_url(protocol, host, port, suffix, explicit_port):
     base_url = f"{protocol}://{host}"
@@ -20,20 +31,161 @@ def _compose_service_url(protocol, host, port, suffix, explicit_port):
     return base_url
 
 
-def monitor_get(url, timeout=None):
-    return http_probe.monitor_get(url, timeout=timeout)
+def monitor_get(url, timeout=None, *, keep_alive=True, head=False):
+    return http_probe.monitor_get(url,
+                                  timeout=timeout,
+                                  keep_alive=keep_alive,
+                                  head=head)
 
 
-def monitor_post(url, payload=None, *, headers=None, timeout=None):
+def monitor_post(url,
+                 payload=None,
+                 *,
+                 headers=None,
+                 timeout=None,
+                 keep_alive=True):
     return http_probe.monitor_post(
         url,
         payload,
         headers=headers,
         timeout=timeout,
+        keep_alive=keep_alive,
     )
 
 
-def monitor_server(address, timeout=None):
+def monitor_server(address, timeout=None, *, keep_alive=True, layers=None):
+    return probe_server(address, timeout, keep_alive=keep_alive,
+                        layers=layers).success
+
+
+def _stage_pool(needed):
+    """Return the pool shared by every SERVER check, with room for ``needed``.
+
+    It starts at ``[Request] worker_pool_size`` times the enabled layers and
+    grows with the stages in flight, since stages left running after a check
+    was decided keep their worker until their own timeout. A stage therefore
+    never waits for a worker behind other checks.
+    """
+
+    global _STAGE_POOL, _STAGES_IN_FLIGHT
+    with _STAGE_POOL_LOCK:
+        _STAGES_IN_FLIGHT += needed
+        if _STAGE_POOL is None:
+            workers = (configuration.get_worker_pool_size()
+                       or configuration.DEFAULT_WORKER_POOL_SIZE)
+            _STAGE_POOL = WorkerPool(max(
+                workers * len(configuration.get_server_layers()),
+                _STAGES_IN_FLIGHT),
+                                     name="MonitorStage")
+        elif _STAGE_POOL.size < _STAGES_IN_FLIGHT:
+            _STAGE_POOL.resize(_STAGES_IN_FLIGHT)
+        return _STAGE_POOL
+
+
+def _stage_finished():
+    global _STAGES_IN_FLIGHT
+    with _STAGE_POOL_LOCK:
+        _STAGES_IN_FLIGHT -= 1
+
+
+class _StageRun:
+    """Which stages of one check started, shared with the stage workers."""
+
+    def __init__(self, deadline, decided):
+        self.deadline = deadline
+        self.decided = decided
+        self.finished = queue.SimpleQueue()
+        self.started = set()
+        self._accepting = True
+        self._lock = threading.Lock()
+
+    def begin(self, name):
+        """Claim a worker's start for ``name``; ``False`` means skip it."""
+
+        with self._lock:
+            if (not self._accepting or self.decided.is_set()
+                    or time.monotonic() >= self.deadline):
+                return False
+            self.started.add(name)
+            return True
+
+    def close(self):
+        """Stop further stages from starting; return those that did."""
+
+        with self._lock:
+            self._accepting = False
+            return set(self.started)
+
+
+def _run_stage(name, stage, run):
+    try:
+        # Skip stages that only got a worker after the check was decided
+        # or its deadline passed.
+        if not run.begin(name):
+            return
+        try:
+            outcome = stage()
+        except Exception as exc:  # pragma: no cover - defensive safeguard
+            LOGGER.warning("monitor.server.stage_error stage=%s error=%s",
+                           name, exc)
+            outcome = False
+        run.finished.put((name, outcome))
+    finally:
+        _stage_finished()
+
+
+def _run_pipeline(stages, deadline, is_decided, decided=None):
+    """Start every stage at once and collect results until decided.
+
+    Returns ``(results, started)``: the results gathered by the time
+    ``is_decided(results)`` holds or every stage has finished, and the names
+    of the stages that got to run. ``deadline`` (``time.monotonic()``) only
+    bounds how long a stage may wait to start; a stage that started is waited
+    for up to its own timeout, so a slow but healthy exchange is never cut
+    short. ``decided`` is then set: stages that have not started are
+    skipped, stages watching it can stop early and the others are left to
+    finish on their own budget.
+    """
+
+    if decided is None:
+        decided = threading.Event()
+    run = _StageRun(deadline, decided)
+    pool = _stage_pool(len(stages))
+    for name, stage in stages.items():
+        pool.submit(_run_stage, name, stage, run)
+
+    results = {}
+    try:
+        while len(results) < len(stages) and not is_decided(results):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                name, outcome = run.finished.get(timeout=remaining)
+            except queue.Empty:
+                break
+            results[name] = outcome
+        started = run.close()
+        while not is_decided(results) and started - results.keys():
+            name, outcome = run.finished.get()
+            results[name] = outcome
+    finally:
+        decided.set()
+    return results, run.close()
+
+
+def probe_server(address, timeout=None, *, keep_alive=True, layers=None):
+    """Run the SERVER check layers concurrently.
+
+    ``layers`` (default ``[Request] server_layers``) picks among ``socket``,
+    ``ping``, ``icmp`` and ``http``. Every layer runs with the request
+    timeout as its own budget. With ``http`` enabled its result decides the
+    outcome and a success returns at once; without it any reachable layer
+    counts as up. The result carries the HTTP stage's status and phase
+    timings, with ``total`` covering the whole pipeline, and the address
+    family the socket or ICMP race settled on.
+    """
+
     protocol, host, port, suffix = address
     if protocol not in ('http', 'https'):
         protocol = 'http'
@@ -47,34 +199,94 @@ def monitor_server(address, timeout=None):
     except ValueError as exc:
         LOGGER.error("monitor.server.timeout_error host=%s error=%s", host,
                      exc)
-        return False
+        return ProbeResult(success=False)
+
+    if layers is None:
+        layers = configuration.get_server_layers()
 
     url = _compose_service_url(protocol, host, port, suffix, explicit_port)
 
-    LOGGER.info("monitor.server.start host=%s port=%s url=%s", host, port, url)
+    LOGGER.info("monitor.server.start host=%s port=%s url=%s layers=%s", host,
+                port, url, ",".join(layers))
+    started = time.perf_counter()
+    deadline = time.monotonic() + resolved_timeout
+
+    # Stages start together and each gets the full timeout as its own
+    # budget; the deadline only bounds how long a stage may wait to start.
+    # A ping to a host that filters ICMP would hold its stage worker for the
+    # whole timeout, so it stops as soon as the check is decided.
+    decided = threading.Event()
+    available = {
+        "socket":
+        lambda: network_probe.check_socket_connectivity(
+            host, port, resolved_timeout),
+        "ping":
+        lambda: network_probe.perform_ping_probe(
+            host, resolved_timeout, cancel=decided),
+        "icmp":
+        lambda: network_probe.perform_icmp_probe(host, resolved_timeout),
+        "http":
+        lambda: http_probe.probe_http_service(
+            url, resolved_timeout, keep_alive=keep_alive),
+    }
+    stages = {name: available[name] for name in layers if name in available}
+    with_http = "http" in stages
 
-    socket_success = network_probe.check_socket_connectivity(
-        host, port, resolved_timeout)
-    ping_success = network_probe.perform_ping_probe(host, resolved_timeout)
-    network_probe.perform_icmp_probe(host, resolved_timeout)
+    def is_decided(results):
+        if with_http:
+            # The HTTP result decides either way; the network layers that
+            # finished by then tell a network-only outage from an offline
+            # host in the log.
+            return "http" in results
+        return any(results.values())
 
-    http_success = http_probe.probe_http_service(url, resolved_timeout)
+    results, ran = _run_pipeline(stages, deadline, is_decided, decided)
+
+    def _state(name):
+        if name not in stages:
+            return "off"
+        if name in results:
+            return bool(results[name])
+        # Still running after the check was decided, or never started.
+        return "pending" if name in ran else "skipped"
 
     LOGGER.info(
-        "monitor.server.summary host=%s socket=%s ping=%s http=%s",
+        "monitor.server.summary host=%s socket=%s ping=%s icmp=%s http=%s",
         host,
-        socket_success,
-        ping_success,
-        http_success,
+        _state("socket"),
+        _state("ping"),
+        _state("icmp"),
+        _state("http"),
     )
 
-    if http_success:
-        return True
+    elapsed = time.perf_counter() - started
+    socket_result = ProbeResult.coerce(results.get("socket", False))
+    family = socket_result.family or ProbeResult.coerce(
+        results.get("icmp", False)).family
+    if with_http:
+        http_result = ProbeResult.coerce(results.get("http", False))
+        result = dataclasses.replace(http_result,
+                                     total=elapsed,
+                                     family=http_result.family or family)
+    else:
+        result = ProbeResult(success=any(results.values()),
+                             connect=socket_result.connect,
+                             total=elapsed,
+                             family=family)
+
+    if result.success:
+        return result
 
-    if socket_success or ping_success:
+    if any(results.get(name) for name in ("socket", "ping", "icmp")):
         LOGGER.warning("monitor.server.network_only host=%s", host)
 
+    elif "http" not in results if with_http else len(results) < len(stages):
+        # A deciding stage never got to run, which says nothing about the
+        # host itself.
+        LOGGER.warning("monitor.server.skipped host=%s stages=%s", host,
+                       ",".join(name for name in stages if name not in ran))
+
     else:
         LOGGER.error("monitor.server.offline host=%s", host)
 
-    return False
+    return result
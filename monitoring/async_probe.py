@@ -0,0 +1,751 @@
+# -*- codeing = utf-8 -*-
+# @Create: 2026-10-17 10:05 a.m.
+# @Update: 2026-10-17 11:55 p.m.
+# @Author: John Zhao
+"""asyncio-native HTTP and TCP probes used by :class:`AsyncMonitorScheduler`.
+
+The helpers speak just enough HTTP/1.1 over ``asyncio`` streams to read the
+status line and a capped amount of body, so thousands of checks can share one
+event loop without pulling in an extra HTTP client dependency. Like their
+threaded counterparts they return a :class:`ProbeResult` with the status
+code, bytes read and phase timings.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import dataclasses
+import functools
+import json
+import logging
+import ssl
+import threading
+import time
+import weakref
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+import configuration
+
+from . import dns_cache
+from . import http_probe
+from . import network_probe
+from .probe_result import ProbeResult
+from .tcp_engine import CONNECTION_ATTEMPT_DELAY
+
+LOGGER = logging.getLogger(__name__)
+
+USER_AGENT = "DataMonitor-async-probe"
+_MAX_HEADER_BYTES = 64 * 1024
+_READ_CHUNK_BYTES = 16 * 1024
+_SSL_CONTEXT: Optional[ssl.SSLContext] = None
+
+
+class HttpProbeError(Exception):
+    """Raised when the peer does not return a parseable HTTP response."""
+
+
+def _ssl_context() -> ssl.SSLContext:
+    global _SSL_CONTEXT
+    if _SSL_CONTEXT is None:
+        _SSL_CONTEXT = ssl.create_default_context()
+    return _SSL_CONTEXT
+
+
+async def _resolve(host: str, port: int) -> list:
+    """Resolve ``host`` via the DNS cache.
+
+    A cached answer is used without leaving the loop; otherwise the lookup
+    runs in the loop's default executor.
+    """
+
+    cache = dns_cache.shared_cache()
+    infos = cache.peek(host, port)
+    if infos is None:
+        loop = asyncio.get_running_loop()
+        infos = await loop.run_in_executor(None, cache.getaddrinfo, host,
+                                           port)
+    return infos
+
+
+async def _open_connection(host: str,
+                           port: int,
+                           *,
+                           infos: Optional[list] = None,
+                           **kwargs: Any):
+    """``asyncio.open_connection`` resolving ``host`` via :func:`_resolve`.
+
+    ``infos`` skips the lookup when the caller already resolved ``host``.
+    The addresses are raced Happy Eyeballs style, like
+    :class:`~monitoring.tcp_engine.TcpConnectEngine` does: each gets a head
+    start of ``CONNECTION_ATTEMPT_DELAY`` seconds, a failure starts the next
+    one at once and the first connection wins.
+    """
+
+    if infos is None:
+        infos = await _resolve(host, port)
+    addresses = list(
+        dict.fromkeys(info[4][0]
+                      for info in dns_cache.interleave_families(infos)))
+    attempts: set = set()
+    error: Optional[OSError] = None
+    try:
+        for index, address in enumerate(addresses):
+            attempts.add(
+                asyncio.ensure_future(
+                    asyncio.open_connection(address, port, **kwargs)))
+            last = index == len(addresses) - 1
+            while attempts:
+                done, attempts = await asyncio.wait(
+                    attempts,
+                    timeout=None if last else CONNECTION_ATTEMPT_DELAY,
+                    return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+                winner = None
+                for attempt in done:
+                    if attempt.exception() is not None:
+                        error = attempt.exception()
+                    elif winner is None:
+                        winner = attempt.result()
+                    else:
+                        attempt.result()[1].close()
+                if winner is not None:
+                    return winner
+    finally:
+        for attempt in attempts:
+            if attempt.done() and not attempt.cancelled() and (
+                    attempt.exception() is None):
+                attempt.result()[1].close()
+            attempt.cancel()
+    raise error
+
+
+def _encode_payload(payload: Any) -> Tuple[bytes, Optional[str]]:
+    """Encode a payload the same way ``requests`` treats its ``data`` argument."""
+
+    if payload is None:
+        return b"", None
+    if isinstance(payload, bytes):
+        return payload, None
+    if isinstance(payload, str):
+        return payload.encode("utf-8"), None
+    if isinstance(payload, Mapping):
+        return (urlencode(list(payload.items()), doseq=True).encode("utf-8"),
+                "application/x-www-form-urlencoded")
+    return json.dumps(payload).encode("utf-8"), "application/json"
+
+
+def _build_request(
+    method: str,
+    url: str,
+    *,
+    payload: Any = None,
+    headers: Optional[Dict[str, str]] = None,
+    keep_alive: bool = False,
+) -> Tuple[str, int, bool, bytes]:
+    parts = urlsplit(url)
+    scheme = (parts.scheme or "http").lower()
+    if scheme not in ("http", "https"):
+        raise ValueError(f"Unsupported URL scheme: {scheme}")
+    host = parts.hostname
+    if not host:
+        raise ValueError(f"URL is missing a host: {url}")
+    use_tls = scheme == "https"
+    port = parts.port or (443 if use_tls else 80)
+
+    target = parts.path or "/"
+    if parts.query:
+        target = f"{target}?{parts.query}"
+
+    host_header = f"[{host}]" if ":" in host else host
+    if parts.port:
+        host_header = f"{host_header}:{parts.port}"
+
+    body, content_type = _encode_payload(payload)
+    request_headers: Dict[str, str] = {
+        "Host": host_header,
+        "User-Agent": USER_AGENT,
+        "Accept": "*/*",
+        "Connection": "keep-alive" if keep_alive else "close",
+    }
+    if body or method not in ("GET", "HEAD"):
+        request_headers["Content-Length"] = str(len(body))
+    if content_type:
+        request_headers["Content-Type"] = content_type
+    for name, value in (headers or {}).items():
+        request_headers[str(name)] = str(value)
+
+    head = f"{method} {target} HTTP/1.1\r\n" + "".join(
+        f"{name}: {value}\r\n"
+        for name, value in request_headers.items()) + "\r\n"
+    return host, port, use_tls, head.encode("latin-1") + body
+
+
+async def _close_writer(writer: asyncio.StreamWriter) -> None:
+    writer.close()
+    with contextlib.suppress(Exception):
+        await writer.wait_closed()
+
+
+class _ConnectionPool:
+    """Idle keep-alive connections of one event loop, kept per host.
+
+    Follows the ``[Request]`` pool settings like
+    :class:`~monitoring.http_pool.HostSessionPool`: at most ``maxsize`` idle
+    connections per host and ``max_hosts`` hosts, the least recently used
+    host going first. A connection idle for ``idle_timeout`` seconds, or
+    closed by the server, is dropped instead of reused. Only touched from
+    its loop, so it needs no lock.
+    """
+
+    def __init__(self, maxsize: int, max_hosts: int,
+                 idle_timeout: float) -> None:
+        self._maxsize = max(1, maxsize)
+        self._max_hosts = max(1, max_hosts)
+        self._idle_timeout = idle_timeout
+        self._idle: "collections.OrderedDict[tuple, collections.deque]" = (
+            collections.OrderedDict())
+
+    def acquire(self, key: tuple) -> Optional[tuple]:
+        """Return an idle ``(reader, writer)`` for ``key``, or ``None``."""
+
+        entries = self._idle.get(key)
+        now = time.monotonic()
+        while entries:
+            reader, writer, released = entries.pop()
+            if (now - released < self._idle_timeout and not reader.at_eof()
+                    and not writer.is_closing()):
+                return reader, writer
+            writer.close()
+        return None
+
+    def release(self, key: tuple, reader: asyncio.StreamReader,
+                writer: asyncio.StreamWriter) -> None:
+        entries = self._idle.get(key)
+        if entries is None:
+            while len(self._idle) >= self._max_hosts:
+                _, evicted = self._idle.popitem(last=False)
+                for _, idle_writer, _ in evicted:
+                    idle_writer.close()
+            entries = self._idle[key] = collections.deque()
+        else:
+            self._idle.move_to_end(key)
+        if len(entries) >= self._maxsize:
+            writer.close()
+            return
+        entries.append((reader, writer, time.monotonic()))
+
+    def close(self) -> None:
+        while self._idle:
+            _, entries = self._idle.popitem()
+            for _, writer, _ in entries:
+                writer.close()
+
+
+_POOLS: "weakref.WeakKeyDictionary[Any, _ConnectionPool]" = (
+    weakref.WeakKeyDictionary())
+
+
+def _connection_pool() -> Optional[_ConnectionPool]:
+    """Return the running loop's pool, or ``None`` when pooling is disabled."""
+
+    if not configuration.get_keep_alive():
+        return None
+    loop = asyncio.get_running_loop()
+    pool = _POOLS.get(loop)
+    if pool is None:
+        pool = _POOLS[loop] = _ConnectionPool(
+            configuration.get_pool_maxsize(),
+            configuration.get_pool_max_hosts(),
+            configuration.get_pool_idle_timeout())
+    return pool
+
+
+def close_connection_pool() -> None:
+    """Close the running loop's idle keep-alive connections."""
+
+    pool = _POOLS.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        pool.close()
+
+
+def _parse_head(head: bytes) -> Tuple[str, int, Dict[str, str]]:
+    """Split a response head into its HTTP version, status and headers."""
+
+    lines = head.split(b"\r\n")
+    fields = lines[0].decode("latin-1").split(None, 2)
+    if len(fields) < 2 or not fields[0].startswith("HTTP/"):
+        raise HttpProbeError(f"Malformed status line: {lines[0][:80]!r}")
+    try:
+        status_code = int(fields[1])
+    except ValueError as exc:
+        raise HttpProbeError(
+            f"Malformed status code: {fields[1]!r}") from exc
+    headers: Dict[str, str] = {}
+    for line in lines[1:]:
+        name, separator, value = line.decode("latin-1").partition(":")
+        if separator:
+            headers[name.strip().lower()] = value.strip()
+    return fields[0], status_code, headers
+
+
+def _content_length(headers: Dict[str, str]) -> Optional[int]:
+    try:
+        return int(headers["content-length"])
+    except (KeyError, ValueError):
+        return None
+
+
+async def _read_body(reader: asyncio.StreamReader, length: Optional[int],
+                     limit: int) -> int:
+    """Read at most ``limit`` body bytes, stopping early at ``length`` or EOF.
+
+    Like the threaded probes, a longer body is abandoned rather than
+    downloaded; the caller then closes the connection.
+    """
+
+    wanted = limit if length is None else min(length, limit)
+    read = 0
+    while read < wanted:
+        chunk = await reader.read(min(wanted - read, _READ_CHUNK_BYTES))
+        if not chunk:
+            break
+        read += len(chunk)
+    return read
+
+
+async def _connect(host: str, port: int, use_tls: bool,
+                   phases: Dict[str, Any]) -> tuple:
+    """Open a connection, storing the ``dns``/``connect``/``tls`` phases."""
+
+    mark = time.perf_counter()
+    infos = await _resolve(host, port)
+    now = time.perf_counter()
+    phases["dns"], mark = now - mark, now
+    reader, writer = await _open_connection(host,
+                                            port,
+                                            infos=infos,
+                                            limit=_MAX_HEADER_BYTES)
+    try:
+        now = time.perf_counter()
+        phases["connect"], mark = now - mark, now
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            phases["family"] = dns_cache.family_label(sock.family)
+        if use_tls:
+            await writer.start_tls(_ssl_context(), server_hostname=host)
+            phases["tls"] = time.perf_counter() - mark
+    except BaseException:
+        writer.close()
+        raise
+    return reader, writer
+
+
+async def _send(method: str, request: bytes, reader: asyncio.StreamReader,
+                writer: asyncio.StreamWriter,
+                phases: Dict[str, Any]) -> Tuple[int, int, bool]:
+    """Send ``request`` and return ``(status_code, bytes_read, reusable)``.
+
+    ``reusable`` tells whether the whole response was read and the server
+    left the connection open for another request.
+    """
+
+    mark = time.perf_counter()
+    writer.write(request)
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    phases["ttfb"] = time.perf_counter() - mark
+    version, status_code, headers = _parse_head(head)
+    length = _content_length(headers)
+    if method == "HEAD" or status_code in (204, 304) or status_code < 200:
+        # These responses never carry a body.
+        length = 0
+    limit = 0 if method == "HEAD" else http_probe.body_limit()
+    bytes_read = await _read_body(reader, length, limit)
+    reusable = (version == "HTTP/1.1" and length == bytes_read
+                and headers.get("connection", "").lower() != "close"
+                and "transfer-encoding" not in headers)
+    return status_code, bytes_read, reusable
+
+
+async def _exchange(
+    method: str,
+    url: str,
+    phases: Dict[str, Any],
+    *,
+    payload: Any = None,
+    headers: Optional[Dict[str, str]] = None,
+    keep_alive: bool = False,
+) -> Tuple[int, int]:
+    """Send one request and return ``(status_code, bytes_read)``.
+
+    The ``dns``, ``connect``, ``tls`` and ``ttfb`` durations and the
+    connection's ``family`` are stored in ``phases`` as each one completes,
+    so a request that times out still reports the phases it got through.
+    With ``keep_alive`` an idle pooled connection is tried first, which
+    skips the handshake phases; one the server has meanwhile closed is
+    replaced by a new connection.
+    """
+
+    pool = _connection_pool() if keep_alive else None
+    host, port, use_tls, request = _build_request(method,
+                                                  url,
+                                                  payload=payload,
+                                                  headers=headers,
+                                                  keep_alive=pool is not None)
+    key = (host, port, use_tls)
+    connection = pool.acquire(key) if pool is not None else None
+    if connection is not None:
+        reusable = False
+        try:
+            status_code, bytes_read, reusable = await _send(
+                method, request, *connection, phases)
+            return status_code, bytes_read
+        except (OSError, asyncio.IncompleteReadError):
+            # The server closed the idle connection; use a new one.
+            pass
+        finally:
+            if reusable:
+                pool.release(key, *connection)
+            else:
+                connection[1].close()
+
+    reader, writer = await _connect(host, port, use_tls, phases)
+    reusable = False
+    try:
+        status_code, bytes_read, reusable = await _send(
+            method, request, reader, writer, phases)
+        return status_code, bytes_read
+    finally:
+        if reusable and pool is not None:
+            pool.release(key, reader, writer)
+        else:
+            await _close_writer(writer)
+
+
+async def _perform_http_request(
+    method_name: str,
+    url: str,
+    *,
+    timeout: float,
+    payload: Optional[Any] = None,
+    headers: Optional[Dict[str, str]] = None,
+    keep_alive: bool = False,
+    fallback: bool = False,
+) -> ProbeResult:
+    """Run one request bounded by ``timeout`` seconds, connect included.
+
+    With ``fallback`` a HEAD refused with 405/501 is retried once as a GET.
+    """
+
+    started = time.perf_counter()
+    phases: Dict[str, Any] = {}
+    try:
+        status_code, bytes_read = await asyncio.wait_for(
+            _exchange(method_name,
+                      url,
+                      phases,
+                      payload=payload,
+                      headers=headers,
+                      keep_alive=keep_alive), timeout)
+        if fallback and status_code in http_probe.HEAD_UNSUPPORTED:
+            LOGGER.info(
+                "monitor.async_http.head_unsupported url=%s status=%s; "
+                "retrying with GET", url, status_code)
+            method_name = "GET"
+            status_code, bytes_read = await asyncio.wait_for(
+                _exchange(method_name,
+                          url,
+                          phases,
+                          headers=headers,
+                          keep_alive=keep_alive), timeout)
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError, HttpProbeError, ValueError) as exc:
+        LOGGER.error("monitor.async_http.error method=%s url=%s error=%s",
+                     method_name, url, exc or type(exc).__name__)
+        return ProbeResult(success=False,
+                           total=time.perf_counter() - started,
+                           **phases)
+
+    result = ProbeResult(success=200 <= status_code < 400,
+                         status_code=status_code,
+                         bytes_read=bytes_read,
+                         total=time.perf_counter() - started,
+                         **phases)
+    if result.success:
+        LOGGER.info(
+            "monitor.async_http.success method=%s url=%s status=%s bytes=%s",
+            method_name, url, status_code, bytes_read)
+        return result
+
+    LOGGER.warning(
+        "monitor.async_http.failure method=%s url=%s status=%s bytes=%s",
+        method_name, url, status_code, bytes_read)
+    return result
+
+
+async def monitor_get(url: str,
+                      timeout: Optional[float] = None,
+                      *,
+                      keep_alive: bool = True,
+                      head: bool = False) -> ProbeResult:
+    """Probe ``url`` with GET, or HEAD when ``head`` is set.
+
+    The asyncio counterpart of ``probe_get``: servers that reject HEAD
+    (405/501) are retried once with a GET, and ``keep_alive`` reuses the
+    loop's pooled connections unless ``[Request] keep_alive`` is off.
+    """
+
+    try:
+        resolved_timeout = http_probe.resolve_timeout(timeout)
+    except ValueError as exc:
+        LOGGER.error(
+            "monitor.async_http.timeout_error method=GET url=%s error=%s", url,
+            exc)
+        return ProbeResult(success=False)
+    return await _perform_http_request("HEAD" if head else "GET",
+                                       url,
+                                       timeout=resolved_timeout,
+                                       keep_alive=keep_alive,
+                                       fallback=head)
+
+
+async def monitor_post(
+    url: str,
+    payload: Optional[Any] = None,
+    *,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+    keep_alive: bool = True,
+) -> ProbeResult:
+    """Probe ``url`` with POST; the asyncio counterpart of ``probe_post``."""
+
+    try:
+        resolved_timeout = http_probe.resolve_timeout(timeout)
+    except ValueError as exc:
+        LOGGER.error(
+            "monitor.async_http.timeout_error method=POST url=%s error=%s",
+            url, exc)
+        return ProbeResult(success=False)
+    return await _perform_http_request("POST",
+                                       url,
+                                       timeout=resolved_timeout,
+                                       payload=payload,
+                                       headers=headers,
+                                       keep_alive=keep_alive)
+
+
+async def probe_http_service(url: str,
+                             timeout: float,
+                             *,
+                             keep_alive: bool = True) -> ProbeResult:
+    """Perform a GET probe against the service endpoint."""
+
+    return await _perform_http_request("GET",
+                                       url,
+                                       timeout=timeout,
+                                       keep_alive=keep_alive)
+
+
+async def check_socket_connectivity(host: str, port: int,
+                                    timeout: float) -> bool:
+    try:
+        _, writer = await asyncio.wait_for(_open_connection(host, port),
+                                           timeout)
+    except (OSError, asyncio.TimeoutError) as exc:
+        LOGGER.warning("monitor.async_socket.offline host=%s port=%s error=%s",
+                       host, port, exc or type(exc).__name__)
+        return False
+    await _close_writer(writer)
+    LOGGER.info("monitor.async_socket.success host=%s port=%s", host, port)
+    return True
+
+
+async def connect_target(host: str, port: int, timeout: float) -> ProbeResult:
+    """Open and close a TCP connection to ``host:port``.
+
+    The result's ``connect`` and ``total`` cover the whole address race and
+    ``family`` names the address family that won it.
+    """
+
+    started = time.perf_counter()
+    try:
+        _, writer = await asyncio.wait_for(_open_connection(host, port),
+                                           timeout)
+    except (OSError, asyncio.TimeoutError) as exc:
+        LOGGER.warning("monitor.async_tcp.offline host=%s port=%s error=%s",
+                       host, port, exc or type(exc).__name__)
+        return ProbeResult(success=False)
+    elapsed = time.perf_counter() - started
+    sock = writer.get_extra_info("socket")
+    await _close_writer(writer)
+    return ProbeResult(
+        success=True,
+        connect=elapsed,
+        total=elapsed,
+        family=None if sock is None else dns_cache.family_label(sock.family))
+
+
+async def monitor_tcp(
+    targets: Iterable[Tuple[str, int]],
+    timeout: Optional[float] = None,
+) -> Dict[Tuple[str, int], ProbeResult]:
+    """Connect to every ``(host, port)`` at once and return a result each."""
+
+    targets = list(targets)
+    try:
+        resolved_timeout = http_probe.resolve_timeout(timeout)
+    except ValueError as exc:
+        LOGGER.error("monitor.async_tcp.timeout_error error=%s", exc)
+        return {target: ProbeResult(success=False) for target in targets}
+    results = await asyncio.gather(*(connect_target(host, port,
+                                                    resolved_timeout)
+                                     for host, port in targets))
+    return dict(zip(targets, results))
+
+
+async def monitor_server(
+    address,
+    timeout: Optional[float] = None,
+    *,
+    keep_alive: bool = True,
+    layers: Optional[Iterable[str]] = None,
+) -> ProbeResult:
+    """Run the layers of a SERVER check concurrently on the loop.
+
+    ``layers`` (default ``[Request] server_layers``) behaves as in
+    :func:`monitoring.api_monitor.probe_server`: with ``http`` enabled its
+    result decides the outcome, without it any reachable layer counts as up,
+    and every layer runs with the request timeout as its own budget.
+    ``socket`` and ``http`` run on the loop; the blocking ``ping`` and
+    ``icmp`` probes run in the loop's default executor. The result carries
+    the HTTP stage's status and phase timings, with ``total`` covering the
+    whole check.
+    """
+
+    protocol, host, port, suffix = address
+    if protocol not in ("http", "https"):
+        protocol = "http"
+
+    default_port = 80 if protocol == "http" else 443
+    explicit_port = port is not None
+    port = port if explicit_port else default_port
+
+    try:
+        resolved_timeout = http_probe.resolve_timeout(timeout)
+    except ValueError as exc:
+        LOGGER.error("monitor.async_server.timeout_error host=%s error=%s",
+                     host, exc)
+        return ProbeResult(success=False)
+
+    if layers is None:
+        layers = configuration.get_server_layers()
+
+    host_text = f"[{host}]" if ":" in host else host
+    url = f"{protocol}://{host_text}"
+    if explicit_port:
+        url = f"{url}:{port}"
+    if suffix:
+        url = f"{url}/{suffix}"
+
+    loop = asyncio.get_running_loop()
+    # Lets a ping to a host that filters ICMP stop once the check is decided.
+    decided = threading.Event()
+    available = {
+        "socket":
+        lambda: connect_target(host, port, resolved_timeout),
+        "ping":
+        lambda: loop.run_in_executor(
+            None,
+            functools.partial(network_probe.perform_ping_probe,
+                              host,
+                              resolved_timeout,
+                              cancel=decided)),
+        "icmp":
+        lambda: loop.run_in_executor(None, network_probe.perform_icmp_probe,
+                                     host, resolved_timeout),
+        "http":
+        lambda: probe_http_service(
+            url, resolved_timeout, keep_alive=keep_alive),
+    }
+    started = time.perf_counter()
+    tasks = {
+        asyncio.ensure_future(available[name]()): name
+        for name in layers if name in available
+    }
+    stages = set(tasks.values())
+    with_http = "http" in stages
+
+    def is_decided() -> bool:
+        if with_http:
+            return "http" in results
+        return any(results.values())
+
+    results: Dict[str, Any] = {}
+    pending = set(tasks)
+    try:
+        while pending and not is_decided():
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                try:
+                    results[tasks[task]] = task.result()
+                except Exception as exc:  # pragma: no cover - defensive
+                    LOGGER.warning(
+                        "monitor.async_server.stage_error stage=%s error=%s",
+                        tasks[task], exc)
+                    results[tasks[task]] = False
+    finally:
+        decided.set()
+        for task in pending:
+            task.cancel()
+
+    def _state(name: str) -> object:
+        if name not in stages:
+            return "off"
+        if name not in results:
+            return "pending"
+        return bool(results[name])
+
+    LOGGER.info(
+        "monitor.async_server.summary host=%s socket=%s ping=%s icmp=%s "
+        "http=%s", host, _state("socket"), _state("ping"), _state("icmp"),
+        _state("http"))
+
+    elapsed = time.perf_counter() - started
+    socket_result = ProbeResult.coerce(results.get("socket", False))
+    family = socket_result.family or ProbeResult.coerce(
+        results.get("icmp", False)).family
+    if with_http:
+        http_result = ProbeResult.coerce(results.get("http", False))
+        result = dataclasses.replace(http_result,
+                                     total=elapsed,
+                                     family=http_result.family or family)
+    else:
+        result = ProbeResult(success=any(results.values()),
+                             connect=socket_result.connect,
+                             total=elapsed,
+                             family=family)
+    if result.success:
+        return result
+    if any(results.get(name) for name in ("socket", "ping", "icmp")):
+        LOGGER.warning("monitor.async_server.network_only host=%s", host)
+    else:
+        LOGGER.error("monitor.async_server.offline host=%s", host)
+    return result
+
+
+__all__ = [
+    "HttpProbeError",
+    "check_socket_connectivity",
+    "close_connection_pool",
+    "connect_target",
+    "monitor_get",
+    "monitor_post",
+    "monitor_server",
+    "monitor_tcp",
+    "probe_http_service",
+]
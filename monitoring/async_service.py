@@ -0,0 +1,605 @@
+# -*- codeing = utf-8 -*-
+# @Create: 2026-10-17 10:40 a.m.
+# @Update: 2026-10-17 11:55 p.m.
+# @Author: John Zhao
+"""Event-loop based scheduler that drives asyncio-native probes."""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import datetime as _dt
+import logging
+import threading
+import time
+from typing import (Callable, Dict, Hashable, Iterable, Mapping, Optional,
+                    Tuple, Union)
+
+import configuration
+
+from . import async_probe
+from . import icmp_sweep
+from .history_store import HistoryStore
+from .probe_result import ProbeResult
+from .service import (
+    MonitorSchedulerBase,
+    OverrunPolicy,
+    ReconcileResult,
+    TickStats,
+    _ScheduledMonitor,
+    parse_network_address,
+    tcp_target_label,
+)
+from .state_machine import (
+    MonitorEvent,
+    NotificationMessage,
+    NotificationTemplates,
+)
+from .timeseries import TimeSeriesStore
+from .worker_pool import WorkerPool
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_IN_FLIGHT = 10000
+DEFAULT_SINK_WORKERS = 4
+
+
+class AsyncMonitorStrategy:
+    """Strategy interface for coroutine-based monitoring checks.
+
+    Like :class:`MonitorStrategy`, ``run`` may return a :class:`ProbeResult`,
+    a plain ``bool``, or a mapping of host to result for several hosts.
+    """
+
+    async def run(
+        self, monitor: configuration.MonitorItem
+    ) -> Union[bool, ProbeResult, Mapping[str, Union[bool, ProbeResult]]
+               ]:  # pragma: no cover - interface contract
+        raise NotImplementedError
+
+
+class AsyncGetMonitorStrategy(AsyncMonitorStrategy):
+
+    async def run(self, monitor: configuration.MonitorItem) -> ProbeResult:
+        return await async_probe.monitor_get(monitor.url,
+                                             keep_alive=monitor.keep_alive,
+                                             head=monitor.head_request)
+
+
+class AsyncPostMonitorStrategy(AsyncMonitorStrategy):
+
+    async def run(self, monitor: configuration.MonitorItem) -> ProbeResult:
+        return await async_probe.monitor_post(
+            monitor.url,
+            monitor.payload,
+            headers=monitor.headers,
+            keep_alive=monitor.keep_alive,
+        )
+
+
+class AsyncServerMonitorStrategy(AsyncMonitorStrategy):
+
+    def __init__(self) -> None:
+        self._cache: Dict[str, tuple] = {}
+
+    async def run(self, monitor: configuration.MonitorItem) -> ProbeResult:
+        parsed = self._cache.get(monitor.url)
+        if parsed is None:
+            parsed = parse_network_address(monitor.url)
+            self._cache[monitor.url] = parsed
+        return await async_probe.monitor_server(
+            parsed,
+            keep_alive=monitor.keep_alive,
+            layers=monitor.server_layers)
+
+
+class AsyncTcpMonitorStrategy(AsyncMonitorStrategy):
+    """Connect to every ``host:port`` of a TCP monitor on the loop.
+
+    Results are shaped like :class:`~monitoring.service.TcpMonitorStrategy`'s.
+    """
+
+    def __init__(self) -> None:
+        self._cache: Dict[str, Tuple[Tuple[str, int], ...]] = {}
+
+    async def run(
+        self, monitor: configuration.MonitorItem
+    ) -> Union[ProbeResult, Dict[str, ProbeResult]]:
+        targets = self._cache.get(monitor.url)
+        if targets is None:
+            targets = configuration.parse_tcp_targets(monitor.url)
+            self._cache[monitor.url] = targets
+        outcomes = await async_probe.monitor_tcp(targets)
+        results = {
+            tcp_target_label(host, port): result
+            for (host, port), result in outcomes.items()
+        }
+        if len(results) == 1:
+            return next(iter(results.values()))
+        return results
+
+
+class AsyncHostListMonitorStrategy(AsyncMonitorStrategy):
+    """Ping every host of a HOSTS monitor in one sweep.
+
+    The sweep multiplexes all hosts on a single ICMP socket, so it runs as
+    one blocking call in the loop's default executor.
+    """
+
+    def __init__(self) -> None:
+        self._cache: Dict[str, Tuple[str, ...]] = {}
+
+    async def run(
+            self,
+            monitor: configuration.MonitorItem) -> Dict[str, ProbeResult]:
+        hosts = self._cache.get(monitor.url)
+        if hosts is None:
+            hosts = configuration.parse_host_list(monitor.url)
+            self._cache[monitor.url] = hosts
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, icmp_sweep.sweep, hosts)
+
+
+class AsyncMonitorScheduler(MonitorSchedulerBase):
+    """Run every monitor as a task on one asyncio event loop.
+
+    The loop lives on a dedicated thread so callers keep the synchronous
+    ``start``/``stop`` API of :class:`MonitorScheduler`. ``max_in_flight``
+    bounds how many probes may be awaiting the network at once. Log writes,
+    notifications, and the event handler are blocking, so they run on a small
+    :class:`WorkerPool` of daemon threads instead of the loop.
+
+    Runs follow the same fixed-rate grid as :class:`MonitorScheduler`:
+    ``overrun_policy`` handles ticks missed by a slow probe, ``phase_spread``
+    and ``start_jitter`` stagger first runs, and :meth:`reconcile` changes
+    the monitor set without a restart.
+    ``probe_share_window`` shares identical probes, ``history`` and
+    ``csv_log`` choose where events are stored, and ``timeseries`` keeps
+    recent results, as in :class:`MonitorScheduler`.
+    """
+
+    def __init__(
+        self,
+        *,
+        event_handler: Optional[Callable[[MonitorEvent], None]] = None,
+        timezone_getter: Optional[Callable[[], int]] = None,
+        clock: Optional[Callable[[], _dt.datetime]] = None,
+        templates: Optional[NotificationTemplates] = None,
+        dispatcher: Optional[Callable[[NotificationMessage], None]] = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        sink_workers: int = DEFAULT_SINK_WORKERS,
+        overrun_policy: Union[str, OverrunPolicy] = OverrunPolicy.COALESCE,
+        phase_spread: bool = False,
+        start_jitter: float = 0.0,
+        jitter_source: Optional[Callable[[], float]] = None,
+        dns_prewarm: bool = False,
+        probe_share_window: Optional[float] = None,
+        history: Optional[HistoryStore] = None,
+        csv_log: bool = True,
+        timeseries: Optional[TimeSeriesStore] = None,
+    ) -> None:
+        super().__init__(
+            event_handler=event_handler,
+            timezone_getter=timezone_getter,
+            clock=clock,
+            templates=templates,
+            dispatcher=dispatcher,
+            dns_prewarm=dns_prewarm,
+            probe_share_window=probe_share_window,
+            history=history,
+            csv_log=csv_log,
+            timeseries=timeseries,
+            overrun_policy=overrun_policy,
+            phase_spread=phase_spread,
+            start_jitter=start_jitter,
+            jitter_source=jitter_source,
+        )
+        if max_in_flight <= 0:
+            raise ValueError("max_in_flight must be a positive integer")
+        self._max_in_flight = max_in_flight
+        self._sink_workers = max(int(sink_workers), 1)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._stop_signal: Optional[asyncio.Event] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._ready = threading.Event()
+        # Written on the loop thread only; the lock guards readers elsewhere.
+        self._scheduled: Dict[Hashable, _ScheduledMonitor] = {}
+        self._scheduled_lock = threading.Lock()
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self._sink_pool: Optional[WorkerPool] = None
+        self._in_flight = 0
+        self._busy: collections.Counter[str] = collections.Counter()
+        self._busy_lock = threading.Lock()
+
+        self.register_strategy("GET", AsyncGetMonitorStrategy())
+        self.register_strategy("POST", AsyncPostMonitorStrategy())
+        self.register_strategy("SERVER", AsyncServerMonitorStrategy())
+        self.register_strategy("HOSTS", AsyncHostListMonitorStrategy())
+        self.register_strategy("TCP", AsyncTcpMonitorStrategy())
+
+    @property
+    def is_running(self) -> bool:
+        return self._loop_thread is not None
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of probes currently awaiting a result."""
+
+        return self._in_flight
+
+    def start(self, monitors: Iterable[configuration.MonitorItem]) -> None:
+        if self._loop_thread is not None:
+            raise RuntimeError("Scheduler is already running")
+
+        monitors = list(monitors)
+        entries = [
+            _ScheduledMonitor(
+                key=self._monitor_key(monitor),
+                monitor=monitor,
+                strategy=self._resolve_strategy(monitor),
+            ) for monitor in monitors
+        ]
+        self._prewarm_dns(monitors)
+        self._ready.clear()
+        self._sink_pool = WorkerPool(self._sink_workers, name="MonitorSink")
+        self._loop_thread = threading.Thread(
+            name="AsyncMonitorScheduler",
+            target=self._run_loop,
+            args=(entries, ),
+            daemon=True,
+        )
+        self._loop_thread.start()
+        self._ready.wait()
+
+    def stop(self, timeout: Optional[float] = None) -> tuple[str, ...]:
+        """Cancel every monitor task and wait for the loop to wind down.
+
+        ``timeout`` bounds the wait in seconds (``None`` waits indefinitely).
+        Probes are cancelled on the loop, but a blocking log write, e-mail, or
+        event handler cannot be interrupted; those are abandoned on their
+        daemon sink threads once the deadline passes. Return the names of the
+        monitors that were still busy.
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def remaining() -> Optional[float]:
+            if deadline is None:
+                return None
+            return max(deadline - time.monotonic(), 0.0)
+
+        loop = self._loop
+        if loop is not None and self._stop_signal is not None:
+            try:
+                loop.call_soon_threadsafe(self._stop_signal.set)
+            except RuntimeError:  # pragma: no cover - loop already closed
+                pass
+        clean = True
+        if self._loop_thread is not None:
+            self._loop_thread.join(remaining())
+            clean = not self._loop_thread.is_alive()
+            self._loop_thread = None
+        if self._sink_pool is not None:
+            clean = self._sink_pool.shutdown(remaining()) and clean
+            self._sink_pool = None
+
+        abandoned: tuple[str, ...] = ()
+        if not clean:
+            with self._busy_lock:
+                abandoned = tuple(sorted(+self._busy))
+            LOGGER.warning(
+                "monitor.async_scheduler.stop_timeout timeout=%s abandoned=%s",
+                timeout,
+                ",".join(abandoned),
+            )
+        with self._busy_lock:
+            self._busy.clear()
+        with self._scheduled_lock:
+            self._scheduled.clear()
+        self._clear_state_machines()
+        return abandoned
+
+    def reconcile(
+        self, monitors: Iterable[configuration.MonitorItem]
+    ) -> ReconcileResult:
+        """Bring the running monitor set in line with ``monitors``.
+
+        Behaves like :meth:`MonitorScheduler.reconcile`: new keys get a task,
+        vanished keys are dropped once any in-flight cycle finishes, and
+        changed entries are swapped in place. Starts the scheduler when it is
+        not running yet.
+        """
+
+        monitors = list(monitors)
+        loop = self._loop
+        if self._loop_thread is None or loop is None:
+            self.start(monitors)
+            return ReconcileResult(added=tuple(monitors))
+
+        desired: Dict[Hashable, configuration.MonitorItem] = {}
+        for monitor in monitors:
+            desired[self._monitor_key(monitor)] = monitor
+        strategies = {
+            key: self._resolve_strategy(monitor)
+            for key, monitor in desired.items()
+        }
+        result = asyncio.run_coroutine_threadsafe(
+            self._reconcile(desired, strategies), loop).result()
+        self._prewarm_dns(result.added)
+        LOGGER.info(
+            "monitor.async_scheduler.reconcile added=%s removed=%s updated=%s",
+            len(result.added),
+            len(result.removed),
+            len(result.updated),
+        )
+        return result
+
+    def tick_stats(self) -> Dict[Hashable, TickStats]:
+        """Return late/skipped tick counters for every scheduled monitor."""
+
+        with self._scheduled_lock:
+            return {
+                key: entry.stats()
+                for key, entry in self._scheduled.items()
+            }
+
+    async def run_single_cycle(
+        self,
+        monitor: configuration.MonitorItem,
+        *,
+        strategy: Optional[AsyncMonitorStrategy] = None,
+    ) -> Optional[MonitorEvent]:
+        """Await one monitoring cycle on the caller's event loop.
+
+        A multi-host monitor returns the event of its first failing host, or
+        of the last host when all are up.
+        """
+
+        if strategy is None:
+            strategy = self._resolve_strategy(monitor)
+        return await self._run_cycle(monitor, strategy, None)
+
+    def _run_loop(self, entries) -> None:
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        try:
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self._main(entries))
+        finally:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            asyncio.set_event_loop(None)
+            loop.close()
+            if self._loop is loop:
+                self._loop = None
+                self._stop_signal = None
+                self._semaphore = None
+            self._ready.set()
+
+    async def _main(self, entries) -> None:
+        self._stop_signal = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self._max_in_flight)
+        self._tasks = {}
+        now = time.monotonic()
+        with self._scheduled_lock:
+            self._scheduled = {entry.key: entry for entry in entries}
+        for entry in entries:
+            entry.tick = entry.next_due = now + self._start_delay(entry)
+            self._spawn(entry)
+        self._ready.set()
+        try:
+            await self._stop_signal.wait()
+        finally:
+            tasks = list(self._tasks.values())
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._tasks = {}
+            async_probe.close_connection_pool()
+
+    def _spawn(self, entry: _ScheduledMonitor) -> None:
+        previous = self._tasks.get(entry.key)
+        if previous is not None:
+            previous.cancel()
+        self._tasks[entry.key] = asyncio.create_task(
+            self._monitor_loop(entry), name=f"Monitor:{entry.monitor.name}")
+
+    async def _reconcile(
+        self,
+        desired: Dict[Hashable, configuration.MonitorItem],
+        strategies: Dict[Hashable, AsyncMonitorStrategy],
+    ) -> ReconcileResult:
+        added: list[configuration.MonitorItem] = []
+        removed: list[configuration.MonitorItem] = []
+        updated: list[configuration.MonitorItem] = []
+        now = time.monotonic()
+        for key in [key for key in self._scheduled if key not in desired]:
+            with self._scheduled_lock:
+                entry = self._scheduled.pop(key)
+            removed.append(entry.monitor)
+            task = self._tasks.pop(key)
+            if not entry.running:
+                # A running cycle finishes and then ends its own task.
+                task.cancel()
+
+        for key, monitor in desired.items():
+            entry = self._scheduled.get(key)
+            if entry is None:
+                entry = _ScheduledMonitor(key=key,
+                                          monitor=monitor,
+                                          strategy=strategies[key])
+                entry.tick = entry.next_due = now + self._start_delay(entry)
+                with self._scheduled_lock:
+                    self._scheduled[key] = entry
+                self._spawn(entry)
+                added.append(monitor)
+            elif entry.monitor != monitor:
+                self._swap_monitor(entry, monitor, now)
+                updated.append(monitor)
+
+        return ReconcileResult(
+            added=tuple(added),
+            removed=tuple(removed),
+            updated=tuple(updated),
+        )
+
+    def _swap_monitor(self, entry: _ScheduledMonitor,
+                      monitor: configuration.MonitorItem, now: float) -> None:
+        old_interval = max(float(entry.monitor.interval), 0.0)
+        new_interval = max(float(monitor.interval), 0.0)
+        entry.monitor = monitor
+        state_machine = self._state_machines.get(entry.key)
+        if state_machine is not None:
+            state_machine.update_monitor(monitor)
+        if entry.running or old_interval == new_interval:
+            # A running cycle picks the new interval up when it reschedules.
+            return
+        entry.tick = entry.next_due = max(
+            entry.tick - old_interval + new_interval, now)
+        # Restart the sleeping task so it wakes at the new slot.
+        self._spawn(entry)
+
+    async def _monitor_loop(self, entry: _ScheduledMonitor) -> None:
+        try:
+            while await self._sleep_until(entry.next_due):
+                entry.running = True
+                entry.runs += 1
+                entry.last_lateness = max(time.monotonic() - entry.tick, 0.0)
+                try:
+                    await self._run_cycle(entry.monitor, entry.strategy,
+                                          self._semaphore)
+                finally:
+                    entry.running = False
+                if self._scheduled.get(entry.key) is not entry:
+                    # Removed by reconcile() while the probe was in flight.
+                    break
+                entry.next_due = self._advance_tick(entry, time.monotonic())
+        finally:
+            if self._tasks.get(entry.key) is asyncio.current_task():
+                del self._tasks[entry.key]
+            if entry.key not in self._scheduled:
+                self._discard_state_machines(entry.key)
+
+    async def _sleep_until(self, due: float) -> bool:
+        """Wait until the monotonic time ``due``; ``False`` once stopped."""
+
+        delay = due - time.monotonic()
+        if delay <= 0:
+            await asyncio.sleep(0)
+            return not self._stop_signal.is_set()
+        try:
+            await asyncio.wait_for(self._stop_signal.wait(), delay)
+        except asyncio.TimeoutError:
+            return True
+        return False
+
+    async def _run_cycle(
+        self,
+        monitor: configuration.MonitorItem,
+        strategy: AsyncMonitorStrategy,
+        semaphore: Optional[asyncio.Semaphore],
+    ) -> Optional[MonitorEvent]:
+        self._mark_busy(monitor.name, 1)
+        handed_off = False
+        try:
+            try:
+                if self._shared_probes is None:
+                    outcome = await self._probe(monitor, strategy, semaphore)
+                else:
+                    outcome = await self._shared_probes.run_async(
+                        self._shared_probe_key(monitor, strategy),
+                        lambda: self._probe(monitor, strategy, semaphore))
+                result = (outcome if isinstance(outcome, Mapping) else
+                          ProbeResult.coerce(outcome))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # pragma: no cover - defensive safeguard
+                result = ProbeResult(success=False)
+                self._log_strategy_error(monitor, exc)
+
+            if isinstance(result, Mapping):
+                # Each host has its own state machine and events; feed them
+                # where the events are handled.
+                delivered = self._on_sink(
+                    monitor.name, lambda: self._fan_out(monitor, result))
+                handed_off = True
+                return await delivered
+
+            _, state_machine = self._ensure_state_machine(monitor)
+            utc_now, local_now = self._now()
+            event = state_machine.transition(result, utc_now, local_now)
+            delivered = self._deliver(event)
+            handed_off = True
+            await delivered
+            return event
+        finally:
+            if not handed_off:
+                self._mark_busy(monitor.name, -1)
+
+    def _deliver(self, event: MonitorEvent) -> "asyncio.Future[None]":
+        """Hand ``event`` to a sink thread; the future resolves when it is done."""
+
+        return self._on_sink(event.monitor.name,
+                             lambda: self._handle_event(event))
+
+    def _on_sink(self, name: str, work: Callable[[], object]) -> asyncio.Future:
+        """Run ``work`` on a sink thread and release ``name``'s busy mark.
+
+        The future resolves with ``work``'s return value, or ``None`` when it
+        raised.
+        """
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def _resolve(value: object) -> None:
+            if not future.done():
+                future.set_result(value)
+
+        def _sink() -> None:
+            value = None
+            try:
+                value = work()
+            finally:
+                self._mark_busy(name, -1)
+                try:
+                    loop.call_soon_threadsafe(_resolve, value)
+                except RuntimeError:  # loop closed after an abandoned stop()
+                    pass
+
+        pool = self._sink_pool
+        if pool is None:
+            loop.run_in_executor(None, _sink)
+        else:
+            pool.submit(_sink)
+        return future
+
+    def _mark_busy(self, name: str, delta: int) -> None:
+        with self._busy_lock:
+            self._busy[name] += delta
+
+    async def _probe(
+        self,
+        monitor: configuration.MonitorItem,
+        strategy: AsyncMonitorStrategy,
+        semaphore: Optional[asyncio.Semaphore],
+    ) -> Union[bool, ProbeResult, Mapping[str, Union[bool, ProbeResult]]]:
+        if semaphore is not None:
+            async with semaphore:
+                return await self._probe(monitor, strategy, None)
+        self._in_flight += 1
+        try:
+            return await strategy.run(monitor)
+        finally:
+            self._in_flight -= 1
+
+
+__all__ = [
+    "AsyncGetMonitorStrategy",
+    "AsyncHostListMonitorStrategy",
+    "AsyncMonitorScheduler",
+    "AsyncMonitorStrategy",
+    "AsyncPostMonitorStrategy",
+    "AsyncServerMonitorStrategy",
+    "AsyncTcpMonitorStrategy",
+]
@@ -0,0 +1,302 @@
+# -*- codeing = utf-8 -*-
+# @Create: 2026-10-17 8:30 p.m.
+# @Update: 2026-10-17 9:00 p.m.
+# @Author: John Zhao
+"""Process-wide TTL cache for host name lookups.
+
+Every probe path (ping, ICMP, TCP connect, pooled HTTP and the asyncio
+probes) resolves through :func:`getaddrinfo` or :func:`gethostbyname` here
+instead of asking the system resolver on each cycle. Successful lookups are
+kept for ``[Request] dns_ttl`` seconds and failures for ``dns_negative_ttl``
+seconds. Concurrent lookups of the same host share one resolver call.
+
+The cache stores each host's TCP addresses once, independent of port, and
+fills the port in per call. :func:`interleave_families` orders the answers
+for a Happy Eyeballs (RFC 8305) race between IPv6 and IPv4.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import configuration
+
+from .worker_pool import WorkerPool
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 4096
+PREWARM_WORKERS = 8
+
+AddrInfo = Tuple[int, int, int, str, tuple]
+
+FAMILY_LABELS = {socket.AF_INET: "IPv4", socket.AF_INET6: "IPv6"}
+
+_SHARED_CACHE: Optional["DnsCache"] = None
+_SHARED_CACHE_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class DnsCacheStats:
+    """Snapshot of the cache's counters."""
+
+    hits: int
+    misses: int
+    negative_hits: int
+    coalesced: int
+    entries: int
+
+
+class _Flight:
+    """A lookup in progress that other callers for the same host wait on."""
+
+    __slots__ = ("done", "outcome")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.outcome: Union[List[AddrInfo], socket.gaierror, None] = None
+
+
+def _system_resolver(host: str) -> List[AddrInfo]:
+    # Looked up on each call so tests can patch socket.getaddrinfo.
+    return socket.getaddrinfo(host, None, 0, socket.SOCK_STREAM)
+
+
+def _with_port(info: AddrInfo, port: int) -> AddrInfo:
+    family, sock_type, proto, canonname, sockaddr = info
+    return family, sock_type, proto, canonname, (sockaddr[0], port,
+                                                 *sockaddr[2:])
+
+
+class DnsCache:
+    """Cache ``getaddrinfo`` answers per host with positive/negative TTLs."""
+
+    def __init__(
+        self,
+        *,
+        ttl: float = configuration.DEFAULT_DNS_TTL,
+        negative_ttl: float = configuration.DEFAULT_DNS_NEGATIVE_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        resolver: Callable[[str], List[AddrInfo]] = _system_resolver,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._max_entries = max_entries
+        self._resolver = resolver
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[float, Union[List[AddrInfo],
+                                                    socket.gaierror]]] = {}
+        self._flights: Dict[str, _Flight] = {}
+        self._hits = 0
+        self._misses = 0
+        self._negative_hits = 0
+        self._coalesced = 0
+
+    def getaddrinfo(self,
+                    host: str,
+                    port: Optional[int],
+                    family: int = 0) -> List[AddrInfo]:
+        """Return ``socket.getaddrinfo``-style TCP results for ``host``.
+
+        Raise ``socket.gaierror`` when the host does not resolve, or has no
+        address of the requested ``family``.
+        """
+
+        infos = self._lookup(host)
+        if family:
+            infos = [info for info in infos if info[0] == family]
+        if not infos:
+            raise socket.gaierror(socket.EAI_NONAME,
+                                  f"No usable address for {host}")
+        return [_with_port(info, port or 0) for info in infos]
+
+    def gethostbyname(self, host: str) -> str:
+        """Return the first IPv4 address of ``host``."""
+
+        return self.getaddrinfo(host, None, socket.AF_INET)[0][4][0]
+
+    def peek(self, host: str, port: Optional[int]) -> Optional[List[AddrInfo]]:
+        """Return fresh cached results without resolving, or ``None``."""
+
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is None or entry[0] <= self._clock() or isinstance(
+                    entry[1], socket.gaierror):
+                return None
+            self._hits += 1
+            infos = entry[1]
+        return [_with_port(info, port or 0) for info in infos]
+
+    def prewarm(self, hosts: Iterable[str], *, wait: bool = False) -> int:
+        """Resolve ``hosts`` in the background; return how many were queued.
+
+        With ``wait`` the call returns once every lookup finished.
+        """
+
+        hosts = list(dict.fromkeys(host for host in hosts if host))
+        if not hosts:
+            return 0
+        pool = WorkerPool(min(len(hosts), PREWARM_WORKERS), name="DnsPrewarm")
+        for host in hosts:
+            pool.submit(self._prewarm_one, host)
+        pool.shutdown(None if wait else 0)
+        LOGGER.info("monitor.dns.prewarm hosts=%s", len(hosts))
+        return len(hosts)
+
+    def stats(self) -> DnsCacheStats:
+        with self._lock:
+            return DnsCacheStats(hits=self._hits,
+                                 misses=self._misses,
+                                 negative_hits=self._negative_hits,
+                                 coalesced=self._coalesced,
+                                 entries=len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _prewarm_one(self, host: str) -> None:
+        try:
+            self._lookup(host)
+        except (OSError, UnicodeError) as exc:
+            LOGGER.debug("monitor.dns.prewarm_failed host=%s error=%s", host,
+                         exc)
+
+    def _lookup(self, host: str) -> List[AddrInfo]:
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is not None and entry[0] > self._clock():
+                outcome = entry[1]
+                if isinstance(outcome, socket.gaierror):
+                    self._negative_hits += 1
+                    raise socket.gaierror(*outcome.args)
+                self._hits += 1
+                return outcome
+            flight = self._flights.get(host)
+            leader = flight is None
+            if leader:
+                flight = self._flights[host] = _Flight()
+                self._misses += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.outcome is None:
+                # The leader failed with something we do not cache.
+                return self._lookup(host)
+            if isinstance(flight.outcome, socket.gaierror):
+                raise socket.gaierror(*flight.outcome.args)
+            return flight.outcome
+
+        outcome: Union[List[AddrInfo], socket.gaierror, None] = None
+        try:
+            try:
+                outcome = list(self._resolver(host))
+                ttl = self._ttl
+            except socket.gaierror as exc:
+                outcome = exc
+                ttl = self._negative_ttl
+            with self._lock:
+                if ttl > 0:
+                    self._store_locked(host, self._clock() + ttl, outcome)
+                else:
+                    self._entries.pop(host, None)
+        finally:
+            with self._lock:
+                self._flights.pop(host, None)
+            flight.outcome = outcome
+            flight.done.set()
+
+        if isinstance(outcome, socket.gaierror):
+            raise outcome
+        return outcome
+
+    def _store_locked(self, host: str, expires: float,
+                      outcome: Union[List[AddrInfo], socket.gaierror]) -> None:
+        self._entries.pop(host, None)
+        while len(self._entries) >= self._max_entries:
+            del self._entries[next(iter(self._entries))]
+        self._entries[host] = (expires, outcome)
+
+
+def interleave_families(infos: Iterable[AddrInfo]) -> List[AddrInfo]:
+    """Alternate address families, starting with the resolver's first choice.
+
+    This is the RFC 8305 section 4 ordering: the system's preferred family
+    keeps its lead, but a broken path in that family costs only one attempt
+    delay before the other family is tried.
+    """
+
+    infos = list(infos)
+    if not infos:
+        return []
+    first = infos[0][0]
+    preferred = [info for info in infos if info[0] == first]
+    others = [info for info in infos if info[0] != first]
+    return [
+        info for pair in itertools.zip_longest(preferred, others)
+        for info in pair if info is not None
+    ]
+
+
+def family_label(family: int) -> str:
+    """Return ``"IPv4"``/``"IPv6"`` for an address family."""
+
+    return FAMILY_LABELS.get(family, str(family))
+
+
+def shared_cache() -> DnsCache:
+    """Return the process-wide cache, built from ``[Request]`` on first use."""
+
+    global _SHARED_CACHE
+    with _SHARED_CACHE_LOCK:
+        if _SHARED_CACHE is None:
+            _SHARED_CACHE = DnsCache(
+                ttl=configuration.get_dns_ttl(),
+                negative_ttl=configuration.get_dns_negative_ttl(),
+            )
+        return _SHARED_CACHE
+
+
+def reset_shared_cache() -> None:
+    """Drop the shared cache so the next lookup re-reads the settings."""
+
+    global _SHARED_CACHE
+    with _SHARED_CACHE_LOCK:
+        _SHARED_CACHE = None
+
+
+def getaddrinfo(host: str,
+                port: Optional[int],
+                family: int = 0) -> List[AddrInfo]:
+    return shared_cache().getaddrinfo(host, port, family)
+
+
+def gethostbyname(host: str) -> str:
+    return shared_cache().gethostbyname(host)
+
+
+def prewarm(hosts: Iterable[str], *, wait: bool = False) -> int:
+    return shared_cache().prewarm(hosts, wait=wait)
+
+
+__all__ = [
+    "DnsCache",
+    "DnsCacheStats",
+    "family_label",
+    "getaddrinfo",
+    "gethostbyname",
+    "interleave_families",
+    "prewarm",
+    "reset_shared_cache",
+    "shared_cache",
+]
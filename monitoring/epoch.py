@@ -0,0 +1,33 @@
+# -*- codeing = utf-8 -*-
+# @Create: 2026-10-17 11:55 p.m.
+# @Update: 2026-10-17 11:55 p.m.
+# @Author: John Zhao
+"""Conversions between naive UTC datetimes and epoch seconds.
+
+Monitor events carry naive UTC datetimes; the history store and the live
+time series keep epoch seconds.
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+
+
+def to_epoch(moment: _dt.datetime) -> float:
+    """Return a naive UTC datetime, or an aware one, in epoch seconds."""
+
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=_dt.UTC)
+    return moment.timestamp()
+
+
+def from_epoch(seconds: float) -> _dt.datetime:
+    """Inverse of :func:`to_epoch`: a naive UTC datetime."""
+
+    return _dt.datetime.fromtimestamp(seconds, _dt.UTC).replace(tzinfo=None)
+
+
+__all__ = [
+    "from_epoch",
+    "to_epoch",
+]
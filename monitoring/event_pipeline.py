@@ -0,0 +1,221 @@
+# -*- codeing = utf-8 -*-
+# @Create: 2026-10-17 10:30 p.m.
+# @Update: 2026-10-17 10:30 p.m.
+# @Author: John Zhao
+"""Deliver monitor events to their sinks off the probe threads.
+
+:class:`EventPipeline` gives every sink (text log, CSV, notification, UI
+handler) a bounded queue and a consumer thread of its own, so a slow disk or
+SMTP server delays only that sink instead of the next probe. When a sink's
+queue is full the :class:`BackpressurePolicy` decides whether the publishing
+probe thread waits, the oldest queued event is dropped, or the new one is.
+:meth:`EventPipeline.close` delivers everything already queued before it
+returns.
+"""
+
+from __future__ import annotations
+
+import collections
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Deque, Dict, Mapping, Optional, Tuple, Union
+
+from .state_machine import MonitorEvent
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CAPACITY = 1024
+
+
+class BackpressurePolicy(Enum):
+    """What :meth:`EventPipeline.publish` does when a sink's queue is full."""
+
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+
+    @classmethod
+    def parse(
+            cls, value: Union[str,
+                              "BackpressurePolicy"]) -> "BackpressurePolicy":
+        if isinstance(value, cls):
+            return value
+        try:
+            return cls(str(value).strip().lower())
+        except ValueError:
+            raise ValueError(
+                f"Unknown backpressure policy {value!r}; expected one of "
+                f"{', '.join(policy.value for policy in cls)}") from None
+
+
+@dataclass(frozen=True)
+class SinkStats:
+    """Counters of one sink.
+
+    ``lag`` is how long the oldest queued event has been waiting, and
+    ``max_lag`` the longest any event waited before the sink picked it up,
+    both in seconds.
+    """
+
+    delivered: int
+    failed: int
+    dropped: int
+    backlog: int
+    lag: float
+    max_lag: float
+
+
+class _Sink:
+    """One sink's queue, consumer thread and counters."""
+
+    def __init__(self, name: str, handler: Callable[[MonitorEvent],
+                                                    None]) -> None:
+        self.name = name
+        self.handler = handler
+        self.queue: Deque[Tuple[float, MonitorEvent]] = collections.deque()
+        self.condition = threading.Condition()
+        self.thread: Optional[threading.Thread] = None
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.max_lag = 0.0
+
+
+class EventPipeline:
+    """Fan monitor events out to independently drained sinks."""
+
+    def __init__(
+        self,
+        sinks: Mapping[str, Callable[[MonitorEvent], None]],
+        *,
+        capacity: int = DEFAULT_CAPACITY,
+        policy: Union[str, BackpressurePolicy] = BackpressurePolicy.BLOCK,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be a positive integer")
+        self._sinks = [_Sink(name, handler) for name, handler in sinks.items()]
+        self._capacity = capacity
+        self._policy = BackpressurePolicy.parse(policy)
+        self._clock = clock
+        self._closing = False
+
+    def start(self) -> None:
+        for sink in self._sinks:
+            sink.thread = threading.Thread(target=self._consume,
+                                           args=(sink, ),
+                                           name=f"MonitorSink:{sink.name}",
+                                           daemon=True)
+            sink.thread.start()
+
+    def publish(self, event: MonitorEvent) -> None:
+        """Queue ``event`` for every sink.
+
+        Sinks that are already closed receive it on the calling thread, so
+        an event published during shutdown is not lost.
+        """
+
+        late = []
+        for sink in self._sinks:
+            with sink.condition:
+                if self._policy is BackpressurePolicy.BLOCK:
+                    while (len(sink.queue) >= self._capacity
+                           and not self._closing):
+                        sink.condition.wait()
+                if self._closing:
+                    late.append(sink)
+                    continue
+                if len(sink.queue) >= self._capacity:
+                    sink.dropped += 1
+                    if self._policy is BackpressurePolicy.DROP_NEWEST:
+                        self._log_drop(sink, event)
+                        continue
+                    _, dropped = sink.queue.popleft()
+                    self._log_drop(sink, dropped)
+                sink.queue.append((self._clock(), event))
+                sink.condition.notify_all()
+        for sink in late:
+            self._deliver(sink, event)
+
+    def stats(self) -> Dict[str, SinkStats]:
+        now = self._clock()
+        stats = {}
+        for sink in self._sinks:
+            with sink.condition:
+                stats[sink.name] = SinkStats(
+                    delivered=sink.delivered,
+                    failed=sink.failed,
+                    dropped=sink.dropped,
+                    backlog=len(sink.queue),
+                    lag=now - sink.queue[0][0] if sink.queue else 0.0,
+                    max_lag=sink.max_lag,
+                )
+        return stats
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Stop accepting events and wait until every queue is drained.
+
+        ``timeout`` bounds the wait in seconds (``None`` waits indefinitely).
+        Return ``False`` when a sink was still busy at the deadline; its
+        daemon thread keeps draining on its own.
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for sink in self._sinks:
+            with sink.condition:
+                self._closing = True
+                sink.condition.notify_all()
+
+        drained = True
+        for sink in self._sinks:
+            if sink.thread is None:
+                continue
+            sink.thread.join(None if deadline is None else
+                             max(deadline - time.monotonic(), 0.0))
+            if sink.thread.is_alive():
+                drained = False
+                with sink.condition:
+                    backlog = len(sink.queue)
+                LOGGER.warning(
+                    "monitor.events.drain_timeout sink=%s backlog=%s",
+                    sink.name, backlog)
+        return drained
+
+    def _consume(self, sink: _Sink) -> None:
+        while True:
+            with sink.condition:
+                while not sink.queue and not self._closing:
+                    sink.condition.wait()
+                if not sink.queue:
+                    return
+                queued_at, event = sink.queue.popleft()
+                sink.max_lag = max(sink.max_lag, self._clock() - queued_at)
+                # Wake a publisher blocked on the full queue.
+                sink.condition.notify_all()
+            self._deliver(sink, event)
+
+    def _deliver(self, sink: _Sink, event: MonitorEvent) -> None:
+        try:
+            sink.handler(event)
+        except Exception as exc:  # pragma: no cover - defensive safeguard
+            LOGGER.exception(
+                "monitor.events.sink_error sink=%s monitor=%s status=%s error=%s",
+                sink.name, event.monitor.name, event.status.name, exc)
+            failed = True
+        else:
+            failed = False
+        with sink.condition:
+            if failed:
+                sink.failed += 1
+            else:
+                sink.delivered += 1
+
+    def _log_drop(self, sink: _Sink, event: MonitorEvent) -> None:
+        LOGGER.warning("monitor.events.dropped sink=%s monitor=%s status=%s",
+                       sink.name, event.monitor.name, event.status.name)
+
+
+__all__ = ["BackpressurePolicy", "EventPipeline", "SinkStats"]
@@ -0,0 +1,418 @@
+# -*- codeing = utf-8 -*-
+# @Create: 2026-10-17 11:30 p.m.
+# @Update: 2026-10-17 11:55 p.m.
+# @Author: John Zhao
+"""SQLite history of every probe result.
+
+:class:`HistoryStore` appends one row per monitor event to a SQLite database
+in WAL mode, so readers (the CLI, a report) never block the probes writing.
+Rows are buffered and inserted in one transaction once ``batch_size`` of them
+are pending, or at the latest ``flush_interval`` seconds later. Rows older
+than ``retention_days`` are deleted by :meth:`HistoryStore.prune`, which the
+background flusher runs once an hour.
+
+Times are stored as UTC epoch seconds; the query methods take and return
+naive UTC datetimes like :class:`~monitoring.state_machine.MonitorEvent`.
+"""
+
+from __future__ import annotations
+
+import atexit
+import datetime as _dt
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import configuration
+
+from .epoch import from_epoch, to_epoch
+from .state_machine import MonitorEvent, MonitorState
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL = 1.0
+PRUNE_INTERVAL_SECONDS = 3600.0
+HISTORY_FILENAME = "history.sqlite3"
+SCHEMA_VERSION = 1
+
+_COLUMNS = ("monitor", "url", "monitor_type", "utc_time", "local_time",
+            "status", "success", "status_change", "status_code", "bytes_read",
+            "dns", "connect", "tls", "ttfb", "total", "family")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS probe_results (
+    id INTEGER PRIMARY KEY,
+    monitor TEXT NOT NULL,
+    url TEXT NOT NULL,
+    monitor_type TEXT NOT NULL,
+    utc_time REAL NOT NULL,
+    local_time TEXT NOT NULL,
+    status TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    status_change INTEGER NOT NULL,
+    status_code INTEGER,
+    bytes_read INTEGER NOT NULL,
+    dns REAL,
+    connect REAL,
+    tls REAL,
+    ttfb REAL,
+    total REAL,
+    family TEXT
+);
+CREATE INDEX IF NOT EXISTS probe_results_monitor_time
+    ON probe_results (monitor, utc_time);
+CREATE INDEX IF NOT EXISTS probe_results_time
+    ON probe_results (utc_time);
+CREATE INDEX IF NOT EXISTS probe_results_changes
+    ON probe_results (monitor, utc_time) WHERE status_change = 1;
+"""
+
+_INSERT = (f"INSERT INTO probe_results ({', '.join(_COLUMNS)}) "
+           f"VALUES ({', '.join('?' for _ in _COLUMNS)})")
+_SELECT = f"SELECT {', '.join(_COLUMNS)} FROM probe_results"
+
+
+@dataclass(frozen=True)
+class HistoryRecord:
+    """One stored probe result."""
+
+    monitor: str
+    url: str
+    monitor_type: str
+    utc_time: _dt.datetime
+    local_time: str
+    status: MonitorState
+    success: bool
+    status_change: bool
+    status_code: Optional[int]
+    bytes_read: int
+    dns: Optional[float]
+    connect: Optional[float]
+    tls: Optional[float]
+    ttfb: Optional[float]
+    total: Optional[float]
+    family: Optional[str]
+
+    @classmethod
+    def _from_row(cls, row: tuple) -> "HistoryRecord":
+        (monitor, url, monitor_type, utc_time, local_time, status, success,
+         status_change, status_code, bytes_read, dns, connect, tls, ttfb,
+         total, family) = row
+        return cls(monitor=monitor,
+                   url=url,
+                   monitor_type=monitor_type,
+                   utc_time=from_epoch(utc_time),
+                   local_time=local_time,
+                   status=MonitorState(status),
+                   success=bool(success),
+                   status_change=bool(status_change),
+                   status_code=status_code,
+                   bytes_read=bytes_read,
+                   dns=dns,
+                   connect=connect,
+                   tls=tls,
+                   ttfb=ttfb,
+                   total=total,
+                   family=family)
+
+
+def _event_row(event: MonitorEvent) -> tuple:
+    probe = event.probe
+    monitor = event.monitor
+    return (monitor.name, monitor.url, monitor.monitor_type,
+            to_epoch(event.utc_time),
+            event.local_time.strftime("%Y-%m-%d %H:%M:%S"), event.status.value,
+            int(event.success), int(event.is_status_change), probe.status_code,
+            probe.bytes_read, probe.dns, probe.connect, probe.tls, probe.ttfb,
+            probe.total, probe.family)
+
+
+class HistoryStore:
+    """Append monitor events to, and query them from, a SQLite database.
+
+    Safe to share between threads. Queries see rows still in the batch
+    because they flush it first. Call :meth:`close` to flush and release the
+    database; the store can be used again afterwards.
+    """
+
+    def __init__(self,
+                 path: Path,
+                 *,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 retention_days: Optional[float] = None,
+                 background: bool = True,
+                 clock: Callable[[], float] = time.time) -> None:
+        if retention_days is not None and retention_days < 0:
+            raise ValueError("retention_days must not be negative")
+        self._path = Path(path)
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval
+        self._retention_days = retention_days or None
+        self._background = background and flush_interval > 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pending: List[tuple] = []
+        self._last_prune: Optional[float] = None
+        self._flusher: Optional[threading.Thread] = None
+        self._stop_flusher = threading.Event()
+        self._closed = False
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def record(self, event: MonitorEvent) -> None:
+        """Queue ``event`` for the next batch insert."""
+
+        row = _event_row(event)
+        with self._lock:
+            self._closed = False
+            self._pending.append(row)
+            if len(self._pending) >= self._batch_size:
+                self._flush_locked()
+            elif self._background and self._flusher is None:
+                self._stop_flusher = threading.Event()
+                self._flusher = threading.Thread(
+                    target=self._flush_periodically,
+                    args=(self._stop_flusher, ),
+                    name="HistoryStoreFlush",
+                    daemon=True)
+                self._flusher.start()
+
+    def flush(self) -> None:
+        """Insert every pending row."""
+
+        with self._lock:
+            self._flush_locked()
+
+    def prune(self, before: Optional[_dt.datetime] = None) -> int:
+        """Delete rows older than ``before`` and return how many were removed.
+
+        Without ``before`` the configured retention applies; with neither,
+        nothing is deleted. A closed store is not reopened to prune it.
+        """
+
+        if before is not None:
+            cutoff = to_epoch(before)
+        elif self._retention_days is not None:
+            cutoff = self._clock() - self._retention_days * 86400
+        else:
+            return 0
+        with self._lock:
+            return self._prune_locked(cutoff)
+
+    def close(self) -> None:
+        """Flush, close the database and stop the background flusher."""
+
+        with self._lock:
+            self._flush_locked()
+            self._closed = True
+            connection, self._connection = self._connection, None
+            flusher, self._flusher = self._flusher, None
+            self._stop_flusher.set()
+        if connection is not None:
+            connection.close()
+        if flusher is not None and flusher is not threading.current_thread():
+            flusher.join()
+
+    # --- Queries ------------------------------------------------------
+    def monitors(self) -> List[str]:
+        """Return the names of every monitor with stored results."""
+
+        return [
+            name for name, in self._query(
+                "SELECT DISTINCT monitor FROM probe_results ORDER BY monitor",
+                ())
+        ]
+
+    def records_between(self, monitor: str, start: _dt.datetime,
+                        end: _dt.datetime) -> List[HistoryRecord]:
+        """Return ``monitor``'s results from ``start`` up to ``end``, oldest first."""
+
+        rows = self._query(
+            f"{_SELECT} WHERE monitor = ? AND utc_time >= ? AND utc_time < ? "
+            "ORDER BY utc_time, id", (monitor, to_epoch(start), to_epoch(end)))
+        return [HistoryRecord._from_row(row) for row in rows]
+
+    def latest(self,
+               monitor: Optional[str] = None,
+               count: int = 20) -> List[HistoryRecord]:
+        """Return the ``count`` newest results, newest first."""
+
+        if monitor is None:
+            rows = self._query(
+                f"{_SELECT} ORDER BY utc_time DESC, id DESC LIMIT ?",
+                (count, ))
+        else:
+            rows = self._query(
+                f"{_SELECT} WHERE monitor = ? "
+                "ORDER BY utc_time DESC, id DESC LIMIT ?", (monitor, count))
+        return [HistoryRecord._from_row(row) for row in rows]
+
+    def state_changes(
+            self,
+            monitor: Optional[str] = None,
+            start: Optional[_dt.datetime] = None,
+            end: Optional[_dt.datetime] = None) -> List[HistoryRecord]:
+        """Return the outages and recoveries in the range, oldest first."""
+
+        clauses, params = ["status_change = 1"], []
+        if monitor is not None:
+            clauses.append("monitor = ?")
+            params.append(monitor)
+        if start is not None:
+            clauses.append("utc_time >= ?")
+            params.append(to_epoch(start))
+        if end is not None:
+            clauses.append("utc_time < ?")
+            params.append(to_epoch(end))
+        rows = self._query(
+            f"{_SELECT} WHERE {' AND '.join(clauses)} ORDER BY utc_time, id",
+            tuple(params))
+        return [HistoryRecord._from_row(row) for row in rows]
+
+    # --- Internals ----------------------------------------------------
+    def _query(self, sql: str, params: tuple) -> List[tuple]:
+        self.flush()
+        if not self._path.exists():
+            return []
+        # A connection per query: in WAL mode it reads a consistent snapshot
+        # without waiting for the writer.
+        connection = sqlite3.connect(self._path, timeout=5.0)
+        try:
+            return connection.execute(sql, params).fetchall()
+        finally:
+            connection.close()
+
+    def _connect_locked(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self._path,
+                                         timeout=5.0,
+                                         check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            if connection.execute(
+                    "PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                with connection:
+                    connection.executescript(_SCHEMA)
+                    connection.execute(
+                        f"PRAGMA user_version={SCHEMA_VERSION}")
+            self._connection = connection
+        return self._connection
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        try:
+            with self._connect_locked() as connection:
+                connection.executemany(_INSERT, rows)
+        except (sqlite3.Error, OSError) as exc:
+            LOGGER.warning(
+                "monitor.history.insert_failed path=%s rows=%s error=%s",
+                self._path, len(rows), exc)
+
+    def _prune_locked(self, cutoff: float) -> int:
+        if self._closed:
+            return 0
+        self._flush_locked()
+        self._last_prune = self._clock()
+        try:
+            with self._connect_locked() as connection:
+                cursor = connection.execute(
+                    "DELETE FROM probe_results WHERE utc_time < ?", (cutoff, ))
+        except (sqlite3.Error, OSError) as exc:
+            LOGGER.warning("monitor.history.prune_failed path=%s error=%s",
+                           self._path, exc)
+            return 0
+        if cursor.rowcount:
+            LOGGER.info("monitor.history.pruned path=%s rows=%s", self._path,
+                        cursor.rowcount)
+        return cursor.rowcount
+
+    def _flush_periodically(self, stop: threading.Event) -> None:
+        while not stop.wait(self._flush_interval):
+            with self._lock:
+                # close() sets ``stop`` under the lock; a flusher that woke
+                # up just before must not reopen the connection it closed.
+                if stop.is_set():
+                    return
+                self._flush_locked()
+                now = self._clock()
+                if self._retention_days is not None and (
+                        self._last_prune is None or
+                        now - self._last_prune >= PRUNE_INTERVAL_SECONDS):
+                    self._prune_locked(now - self._retention_days * 86400)
+
+
+_SHARED: Optional[HistoryStore] = None
+_SHARED_LOCK = threading.Lock()
+_EXIT_HOOK_INSTALLED = False
+
+
+def history_path() -> Path:
+    """Return where the shared store keeps its database."""
+
+    return Path(configuration.get_logdir()) / "Log" / HISTORY_FILENAME
+
+
+def shared_store() -> HistoryStore:
+    """Return the process-wide store, created from the current settings."""
+
+    global _SHARED, _EXIT_HOOK_INSTALLED
+    with _SHARED_LOCK:
+        if _SHARED is None:
+            _SHARED = HistoryStore(
+                history_path(),
+                retention_days=configuration.get_history_retention_days())
+            if not _EXIT_HOOK_INSTALLED:
+                atexit.register(close_shared_store)
+                _EXIT_HOOK_INSTALLED = True
+        return _SHARED
+
+
+def flush() -> None:
+    """Insert the shared store's pending rows."""
+
+    with _SHARED_LOCK:
+        shared = _SHARED
+    if shared is not None:
+        shared.flush()
+
+
+def close_shared_store() -> None:
+    """Flush and close the shared store; the next use re-reads the settings."""
+
+    global _SHARED
+    with _SHARED_LOCK:
+        shared, _SHARED = _SHARED, None
+    if shared is not None:
+        shared.close()
+
+
+def summarize(record: HistoryRecord) -> Tuple[str, ...]:
+    """Return the columns the command line prints for ``record``."""
+
+    total = "" if record.total is None else f"{record.total * 1000:.1f}ms"
+    code = "" if record.status_code is None else str(record.status_code)
+    return (record.local_time, record.monitor, record.status.value, code,
+            total)
+
+
+__all__ = [
+    "HistoryRecord",
+    "HistoryStore",
+    "close_shared_store",
+    "flush",
+    "history_path",
+    "shared_store",
+    "summarize",
+]
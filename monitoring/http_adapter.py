@@ -0,0 +1,99 @@
+# -*- codeing = utf-8 -*-
+# @Create: 2026-10-17 4:10 p.m.
+# @Update: 2026-10-17 9:00 p.m.
+# @Author: John Zhao
+"""``requests`` adapter whose connections report DNS/connect/TLS timings.
+
+Host names are resolved through :mod:`monitoring.dns_cache`. Timings go to the
+recorder installed by :func:`monitoring.http_timing.record_phases` on the
+calling thread; without a recorder nothing is measured.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+from . import dns_cache
+from .http_timing import active_timings
+
+
+class _TimedConnectionMixin:
+
+    def _new_conn(self):
+        timings = active_timings()
+        started = time.perf_counter()
+        try:
+            addresses = dns_cache.getaddrinfo(self._dns_host, self.port,
+                                              allowed_gai_family())
+        except (OSError, UnicodeError):
+            # Let urllib3 repeat the lookup and raise its usual error.
+            return super()._new_conn()
+        resolved = time.perf_counter()
+        if timings is not None:
+            timings.dns = resolved - started
+
+        # Connect to the resolved addresses directly so the lookup is not
+        # repeated inside urllib3; the host name is restored for TLS/SNI.
+        dns_host = self._dns_host
+        error: Optional[Exception] = None
+        try:
+            for address in dict.fromkeys(
+                    info[4][0]
+                    for info in dns_cache.interleave_families(addresses)):
+                self._dns_host = address
+                try:
+                    sock = super()._new_conn()
+                except (ConnectTimeoutError, NewConnectionError) as exc:
+                    error = exc
+                    continue
+                if timings is not None:
+                    timings.socket_ready = time.perf_counter()
+                    timings.connect = timings.socket_ready - resolved
+                return sock
+        finally:
+            self._dns_host = dns_host
+        if error is None:
+            return super()._new_conn()
+        raise error
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+
+    def connect(self) -> None:
+        super().connect()
+        timings = active_timings()
+        if timings is not None and timings.socket_ready is not None:
+            timings.tls = time.perf_counter() - timings.socket_ready
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """``HTTPAdapter`` whose direct connections report phase timings."""
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+__all__ = ["TimedHTTPAdapter"]
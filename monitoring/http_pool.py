@@ -0,0 +1,183 @@
+# -*- codeing = utf-8 -*-
+# @Create: 2026-10-17 3:05 p.m.
+# @Update: 2026-10-17 11:55 p.m.
+# @Author: John Zhao
+"""Per-host keep-alive ``requests`` sessions shared by the HTTP probes."""
+
+from __future__ import annotations
+
+import collections
+import http.cookiejar
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_POOL_MAXSIZE = 4
+DEFAULT_POOL_MAX_HOSTS = 256
+DEFAULT_POOL_IDLE_TIMEOUT = 60.0
+
+
+@dataclass
+class _HostSession:
+    session: Any
+    last_used: float
+    in_use: int = 0
+
+
+def create_session(maxsize: int = 1):
+    """Return a ``requests`` session whose connections are timed.
+
+    Names resolve through :mod:`monitoring.dns_cache` and no cookies are kept.
+    """
+
+    # Imported here so the module loads with the slim ``requests`` stand-ins
+    # the tests install; the adapter needs urllib3 internals.
+    from .http_adapter import TimedHTTPAdapter
+
+    session = requests.Session()
+    adapter = TimedHTTPAdapter(pool_connections=1, pool_maxsize=maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # Probes must not influence each other through cookies, and a shared jar
+    # is the one part of a Session that is not safe to mutate concurrently.
+    session.cookies.set_policy(
+        http.cookiejar.DefaultCookiePolicy(allowed_domains=()))
+    return session
+
+
+class HostSessionPool:
+    """Hand out one keep-alive session per ``(scheme, host, port)``.
+
+    Each session keeps up to ``maxsize`` idle connections to its host, so
+    concurrent workers probing the same endpoint reuse TCP/TLS connections
+    instead of handshaking every cycle. Sessions unused for ``idle_timeout``
+    seconds are closed, and at most ``max_hosts`` sessions are kept (least
+    recently used first out). A session is never closed while a request on it
+    is in flight.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = DEFAULT_POOL_MAXSIZE,
+        max_hosts: int = DEFAULT_POOL_MAX_HOSTS,
+        idle_timeout: float = DEFAULT_POOL_IDLE_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+        session_factory: Optional[Callable[[int], Any]] = None,
+    ) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive integer")
+        if max_hosts <= 0:
+            raise ValueError("max_hosts must be a positive integer")
+        if idle_timeout <= 0:
+            raise ValueError("idle_timeout must be positive")
+        self._maxsize = int(maxsize)
+        self._max_hosts = int(max_hosts)
+        self._idle_timeout = float(idle_timeout)
+        self._clock = clock
+        self._session_factory = session_factory or create_session
+        self._lock = threading.Lock()
+        self._sessions: "collections.OrderedDict[Hashable, _HostSession]" = (
+            collections.OrderedDict())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def request(self, method: str, url: str, **kwargs: Any):
+        """Send ``method url`` on the session pooled for the URL's host."""
+
+        key = self._host_key(url)
+        entry = self._acquire(key)
+        try:
+            return entry.session.request(method, url, **kwargs)
+        finally:
+            with self._lock:
+                entry.in_use -= 1
+                entry.last_used = self._clock()
+                if self._sessions.get(key) is entry:
+                    self._sessions.move_to_end(key)
+
+    def evict_idle(self) -> int:
+        """Close sessions idle for longer than ``idle_timeout``; return the count."""
+
+        with self._lock:
+            evicted = self._evict_locked(self._clock())
+        return self._close_sessions(evicted)
+
+    def close(self) -> None:
+        """Close every session and forget all hosts."""
+
+        with self._lock:
+            entries = list(self._sessions.values())
+            self._sessions.clear()
+        # In-flight requests finish on their session; urllib3 discards the
+        # connection afterwards because its pool has been closed.
+        self._close_sessions(entries)
+
+    @staticmethod
+    def _host_key(url: str) -> Hashable:
+        parts = urlsplit(url)
+        scheme = (parts.scheme or "http").lower()
+        try:
+            port = parts.port
+        except ValueError:
+            port = None
+        return scheme, (parts.hostname or "").lower(), port
+
+    def _acquire(self, key: Hashable) -> _HostSession:
+        now = self._clock()
+        with self._lock:
+            evicted = self._evict_locked(now)
+            entry = self._sessions.get(key)
+            if entry is None:
+                entry = _HostSession(self._session_factory(self._maxsize),
+                                     now)
+                self._sessions[key] = entry
+                evicted.extend(self._trim_locked())
+            else:
+                self._sessions.move_to_end(key)
+            entry.in_use += 1
+            entry.last_used = now
+        self._close_sessions(evicted)
+        return entry
+
+    def _evict_locked(self, now: float) -> list[_HostSession]:
+        # Entries are kept in last-used order, so idle ones sit at the front
+        # and the scan stops at the first recently used session.
+        stale = []
+        for key, entry in self._sessions.items():
+            if now - entry.last_used < self._idle_timeout:
+                break
+            if not entry.in_use:
+                stale.append(key)
+        return [self._sessions.pop(key) for key in stale]
+
+    def _trim_locked(self) -> list[_HostSession]:
+        excess = len(self._sessions) - self._max_hosts
+        victims = []
+        for key, entry in self._sessions.items():
+            if len(victims) >= excess:
+                break
+            if not entry.in_use:
+                victims.append(key)
+        return [self._sessions.pop(key) for key in victims]
+
+    @staticmethod
+    def _close_sessions(entries) -> int:
+        for entry in entries:
+            try:
+                entry.session.close()
+            except Exception as exc:  # pragma: no cover - best effort cleanup
+                LOGGER.warning("monitor.http_pool.close_error error=%s", exc)
+        return len(entries)
+
+
+__all__ = ["HostSessionPool", "create_session"]
@@ -4,15 +4,29 @@
 # @Author: John Zhao
 """HTTP probing helper functions."""
 
+import functools
 import logging
-from typing import Any, Callable, Dict, Optional
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import requests
 
 import configuration
 
+from . import http_timing
+from .http_pool import HostSessionPool, create_session
+from .probe_result import ProbeResult
+
 LOGGER = logging.getLogger(__name__)
 
+_SESSION_POOL: Optional[HostSessionPool] = None
+_SESSION_POOL_LOCK = threading.Lock()
+_BODY_LIMIT: Optional[int] = None
+_READ_CHUNK_BYTES = 16 * 1024
+# Status codes with which servers refuse HEAD but may still accept GET.
+HEAD_UNSUPPORTED = frozenset({405, 501})
+
 
 def resolve_timeout(explicit_timeout: Optional[float] = None) -> float:
     """Resolve the request timeout from configuration or explicit overrides."""
@@ -22,6 +36,121 @@ def resolve_timeout(explicit_timeout: Optional[float] = None) -> float:
     return configuration.get_request_timeout()
 
 
+def session_pool() -> Optional[HostSessionPool]:
+    """Return the shared keep-alive pool, or ``None`` when pooling is disabled.
+
+    The pool is built from the ``[Request]`` settings on first use; call
+    :func:`reset_session_pool` after the configuration changes.
+    """
+
+    global _SESSION_POOL
+    pool = _SESSION_POOL
+    if pool is not None:
+        return pool
+    if not configuration.get_keep_alive():
+        return None
+    with _SESSION_POOL_LOCK:
+        if _SESSION_POOL is None:
+            _SESSION_POOL = HostSessionPool(
+                maxsize=configuration.get_pool_maxsize(),
+                max_hosts=configuration.get_pool_max_hosts(),
+                idle_timeout=configuration.get_pool_idle_timeout(),
+            )
+        return _SESSION_POOL
+
+
+def reset_session_pool() -> None:
+    """Close pooled connections so the next probe re-reads the settings."""
+
+    global _SESSION_POOL, _BODY_LIMIT
+    with _SESSION_POOL_LOCK:
+        pool, _SESSION_POOL = _SESSION_POOL, None
+        _BODY_LIMIT = None
+    if pool is not None:
+        pool.close()
+
+
+def _one_shot_request(method_name: str, url: str, **kwargs: Any) -> Any:
+    """Send one request on a throwaway session, so it always connects cold.
+
+    The session's adapter times the DNS/connect/TLS phases and resolves
+    through :mod:`monitoring.dns_cache` like the pooled sessions do.
+    """
+
+    session = create_session()
+    try:
+        return session.request(method_name, url, **kwargs)
+    finally:
+        # A streamed body stays readable: the response holds its
+        # connection, which is closed once released to the closed pool.
+        session.close()
+
+
+def _request_callable(method_name: str,
+                      keep_alive: bool) -> Callable[..., Any]:
+    """Pick the pooled session or a cold one-shot session."""
+
+    pool = session_pool() if keep_alive else None
+    if pool is None:
+        return functools.partial(_one_shot_request, method_name)
+    return functools.partial(pool.request, method_name)
+
+
+def body_limit() -> int:
+    """Return how many response-body bytes a probe may read (cached)."""
+
+    global _BODY_LIMIT
+    if _BODY_LIMIT is None:
+        _BODY_LIMIT = configuration.get_max_body_bytes()
+    return _BODY_LIMIT
+
+
+def _consume_body(response: Any, limit: int) -> int:
+    """Read at most ``limit`` body bytes, then release the response.
+
+    A body that fits under the cap is drained so a keep-alive connection can
+    go back to the pool; a longer body is abandoned by closing the response,
+    which drops that connection instead of downloading the rest.
+    """
+
+    read = 0
+    try:
+        if limit > 0:
+            for chunk in response.iter_content(
+                    chunk_size=min(limit, _READ_CHUNK_BYTES)):
+                read += len(chunk)
+                if read >= limit:
+                    break
+    finally:
+        response.close()
+    return read
+
+
+def _send(
+    method_name: str,
+    request_callable: Callable[..., Any],
+    url: str,
+    request_kwargs: Dict[str, Any],
+) -> Tuple[int, int, Optional[float]]:
+    """Send one streamed request; return ``(status_code, bytes_read, ttfb)``."""
+
+    response = request_callable(url, stream=True, **request_kwargs)
+    # With stream=True requests stops the clock once the headers are parsed.
+    elapsed = getattr(response, "elapsed", None)
+    ttfb = elapsed.total_seconds() if elapsed is not None else None
+    limit = 0 if method_name == "HEAD" else body_limit()
+    return response.status_code, _consume_body(response, limit), ttfb
+
+
+def _probe_result(phases: http_timing.PhaseTimings, started: float,
+                  **fields: Any) -> ProbeResult:
+    return ProbeResult(dns=phases.dns,
+                       connect=phases.connect,
+                       tls=phases.tls,
+                       total=time.perf_counter() - started,
+                       **fields)
+
+
 def _perform_http_request(
     method_name: str,
     request_callable: Callable[..., Any],
@@ -30,71 +159,109 @@ def _perform_http_request(
     timeout: float,
     payload: Optional[Any] = None,
     headers: Optional[Dict[str, str]] = None,
-) -> bool:
+    fallback: Optional[Callable[..., Any]] = None,
+) -> ProbeResult:
     request_kwargs: Dict[str, Any] = {"timeout": timeout}
     if payload is not None:
         request_kwargs["data"] = payload
     if headers is not None:
         request_kwargs["headers"] = headers
 
-    try:
-        response = request_callable(url, **request_kwargs)
-    except requests.RequestException as exc:
-        LOGGER.error("monitor.http.error method=%s url=%s error=%s",
-                     method_name, url, exc)
-        return False
+    started = time.perf_counter()
+    with http_timing.record_phases() as phases:
+        try:
+            status_code, bytes_read, ttfb = _send(method_name,
+                                                  request_callable, url,
+                                                  request_kwargs)
+            if fallback is not None and status_code in HEAD_UNSUPPORTED:
+                LOGGER.info(
+                    "monitor.http.head_unsupported url=%s status=%s; retrying with GET",
+                    url, status_code)
+                method_name = "GET"
+                status_code, bytes_read, ttfb = _send(method_name, fallback,
+                                                      url, request_kwargs)
+        except requests.RequestException as exc:
+            LOGGER.error("monitor.http.error method=%s url=%s error=%s",
+                         method_name, url, exc)
+            return _probe_result(phases, started, success=False)
 
-    if 200 <= response.status_code < 400:
+    result = _probe_result(phases,
+                           started,
+                           success=200 <= status_code < 400,
+                           status_code=status_code,
+                           bytes_read=bytes_read,
+                           ttfb=ttfb)
+    if result.success:
         LOGGER.info(
-            "monitor.http.success method=%s url=%s status=%s",
+            "monitor.http.success method=%s url=%s status=%s bytes=%s",
             method_name,
             url,
-            response.status_code,
+            status_code,
+            bytes_read,
         )
-        return True
+        return result
 
     LOGGER.warning(
-        "monitor.http.failure method=%s url=%s status=%s",
+        "monitor.http.failure method=%s url=%s status=%s bytes=%s",
         method_name,
         url,
-        response.status_code,
+        status_code,
+        bytes_read,
     )
-    return False
+    return result
+
 
+def probe_get(url: str,
+              timeout: Optional[float] = None,
+              *,
+              keep_alive: bool = True,
+              head: bool = False) -> ProbeResult:
+    """Probe ``url`` with GET, or with HEAD when ``head`` is set.
+
+    Servers that reject HEAD (405/501) are retried once with a GET.
+    """
 
-def monitor_get(url: str, timeout: Optional[float] = None) -> bool:
     try:
         resolved_timeout = resolve_timeout(timeout)
     except ValueError as exc:
         LOGGER.error("monitor.http.timeout_error method=GET url=%s error=%s",
                      url, exc)
-        return False
+        return ProbeResult(success=False)
 
+    if head:
+        return _perform_http_request(
+            "HEAD",
+            _request_callable("HEAD", keep_alive),
+            url,
+            timeout=resolved_timeout,
+            fallback=_request_callable("GET", keep_alive),
+        )
     return _perform_http_request(
         "GET",
-        requests.get,
+        _request_callable("GET", keep_alive),
         url,
         timeout=resolved_timeout,
     )
 
 
-def monitor_post(
+def probe_post(
     url: str,
     payload: Optional[Any] = None,
     *,
     headers: Optional[Dict[str, str]] = None,
     timeout: Optional[float] = None,
-) -> bool:
+    keep_alive: bool = True,
+) -> ProbeResult:
     try:
         resolved_timeout = resolve_timeout(timeout)
     except ValueError as exc:
         LOGGER.error("monitor.http.timeout_error method=POST url=%s error=%s",
                      url, exc)
-        return False
+        return ProbeResult(success=False)
 
     return _perform_http_request(
         "POST",
-        requests.post,
+        _request_callable("POST", keep_alive),
         url,
         timeout=resolved_timeout,
         payload=payload,
@@ -102,21 +269,60 @@ def monitor_post(
     )
 
 
-def probe_http_service(url: str, timeout: float) -> bool:
+def monitor_get(url: str,
+                timeout: Optional[float] = None,
+                *,
+                keep_alive: bool = True,
+                head: bool = False) -> bool:
+    """Boolean form of :func:`probe_get`."""
+
+    return probe_get(url, timeout, keep_alive=keep_alive, head=head).success
+
+
+def monitor_post(
+    url: str,
+    payload: Optional[Any] = None,
+    *,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+    keep_alive: bool = True,
+) -> bool:
+    """Boolean form of :func:`probe_post`."""
+
+    return probe_post(url,
+                      payload,
+                      headers=headers,
+                      timeout=timeout,
+                      keep_alive=keep_alive).success
+
+
+def probe_http_service(url: str,
+                       timeout: float,
+                       *,
+                       keep_alive: bool = True) -> ProbeResult:
     """Perform a GET probe against the service endpoint."""
 
-    try:
-        response = requests.get(url, timeout=timeout)
-    except requests.RequestException as exc:
-        LOGGER.error("monitor.http_probe.error url=%s error=%s", url, exc)
-        return False
-
-    status_code = response.status_code
-    if 200 <= status_code < 400:
-        LOGGER.info("monitor.http_probe.success url=%s status=%s", url,
-                    status_code)
-        return True
-
-    LOGGER.warning("monitor.http_probe.failure url=%s status=%s", url,
-                   status_code)
-    return False
+    started = time.perf_counter()
+    with http_timing.record_phases() as phases:
+        try:
+            status_code, bytes_read, ttfb = _send(
+                "GET", _request_callable("GET", keep_alive), url,
+                {"timeout": timeout})
+        except requests.RequestException as exc:
+            LOGGER.error("monitor.http_probe.error url=%s error=%s", url, exc)
+            return _probe_result(phases, started, success=False)
+
+    result = _probe_result(phases,
+                           started,
+                           success=200 <= status_code < 400,
+                           status_code=status_code,
+                           bytes_read=bytes_read,
+                           ttfb=ttfb)
+    if result.success:
+        LOGGER.info("monitor.http_probe.success url=%s status=%s bytes=%s",
+                    url, status_code, bytes_read)
+        return result
+
+    LOGGER.warning("monitor.http_probe.failure url=%s status=%s bytes=%s", url,
+                   status_code, bytes_read)
+    return result
@@ -0,0 +1,50 @@
+# -*- codeing = utf-8 -*-
+# @Create: 2026-10-17 4:10 p.m.
+# @Update: 2026-10-17 4:10 p.m.
+# @Author: John Zhao
+"""Per-thread recorder for HTTP connection-phase timings.
+
+:func:`record_phases` installs a :class:`PhaseTimings` on the calling thread;
+the connections built by :mod:`monitoring.http_adapter` fill it in.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+from typing import Iterator, Optional
+
+_ACTIVE = threading.local()
+
+
+class PhaseTimings:
+    """Mutable per-request record filled in by the timed connections."""
+
+    __slots__ = ("dns", "connect", "tls", "socket_ready")
+
+    def __init__(self) -> None:
+        self.dns: Optional[float] = None
+        self.connect: Optional[float] = None
+        self.tls: Optional[float] = None
+        # perf_counter() value when the TCP socket came up; TLS starts here.
+        self.socket_ready: Optional[float] = None
+
+
+@contextlib.contextmanager
+def record_phases() -> Iterator[PhaseTimings]:
+    """Collect phase timings for connections opened on this thread."""
+
+    timings = PhaseTimings()
+    previous = getattr(_ACTIVE, "timings", None)
+    _ACTIVE.timings = timings
+    try:
+        yield timings
+    finally:
+        _ACTIVE.timings = previous
+
+
+def active_timings() -> Optional[PhaseTimings]:
+    return getattr(_ACTIVE, "timings", None)
+
+
+__all__ = ["PhaseTimings", "active_timings", "record_phases"]
@@ -0,0 +1,63 @@
+# -*- codeing = utf-8 -*-
+# @Create: 2026-10-17 2:10 p.m.
+# @Update: 2026-10-17 2:10 p.m.
+# @Author: John Zhao
+"""Qt-free message translation for the monitoring core.
+
+Inside the desktop client a ``QCoreApplication`` is running with the JSON
+translator installed, so lookups are delegated to Qt and stay in sync with the
+language switcher. Headless processes never import Qt; they read the same
+``i18n/<language>.qm.json`` catalogs directly.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+from typing import Dict
+
+import configuration
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _qt_translate(context: str, source_text: str):
+    """Return Qt's translation when a Qt application is already running."""
+
+    qt_core = sys.modules.get("PySide6.QtCore")
+    if qt_core is None:
+        return None
+    application = qt_core.QCoreApplication
+    if application.instance() is None:
+        return None
+    return application.translate(context, source_text)
+
+
+def _catalog(language: str) -> Dict[str, Dict[str, str]]:
+    try:
+        return configuration._load_language_messages(language)
+    except (ValueError, RuntimeError, OSError) as exc:
+        LOGGER.warning("monitor.i18n.catalog_unavailable language=%s error=%s",
+                       language, exc)
+        return {}
+
+
+def translate(context: str, source_text: str) -> str:
+    """Translate ``source_text`` like ``QCoreApplication.translate`` would.
+
+    Unknown contexts or messages fall back to ``source_text`` unchanged.
+    """
+
+    if not source_text:
+        return ""
+    translated = _qt_translate(context, source_text)
+    if translated is not None:
+        return translated
+    messages = _catalog(configuration.get_language())
+    translation = (messages.get(context) or {}).get(source_text)
+    if translation is None:
+        translation = (messages.get("*") or {}).get(source_text)
+    return translation if translation is not None else source_text
+
+
+__all__ = ["translate"]
@@ -0,0 +1,421 @@
+# -*- codeing = utf-8 -*-
+# @Create: 2026-10-17 5:20 p.m.
+# @Update: 2026-10-17 9:00 p.m.
+# @Author: John Zhao
+"""Process-wide ICMP echo multiplexer shared by every ping probe.
+
+A single :class:`IcmpEngine` owns one raw socket per address family and one
+reader thread. Callers register the echo they are about to send; the reader
+pulls replies into a preallocated buffer with ``recvfrom_into`` and wakes the
+waiter registered under the reply's ``(identifier, sequence)``. Because every
+probe gets its own identifier, concurrent pings from different monitor
+threads can no longer consume each other's replies.
+
+Raw sockets need root or ``CAP_NET_RAW``. Where they are refused, Linux
+offers unprivileged ``SOCK_DGRAM`` ping sockets (subject to
+``net.ipv4.ping_group_range``). :func:`socket_mode` works out once per address
+family which of the two is available and caches the answer; only when neither
+is does the engine raise ``PermissionError`` and leave callers to fall back to
+the ``ping`` binary.
+
+On a datagram socket the kernel replaces the echo identifier with the socket's
+own and delivers replies without the IP header, so the engine tells those
+replies apart by a sequence number it assigns itself.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import selectors
+import socket
+import struct
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+ICMP_ECHO_REPLY = 0
+ICMPV6_ECHO_REPLY = 129
+RECEIVE_BUFFER_BYTES = 64 * 1024
+
+SOCKET_MODE_RAW = "raw"
+SOCKET_MODE_DGRAM = "dgram"
+# Key slot used in place of the identifier for datagram-socket echoes.
+_DGRAM_IDENTIFIER = -1
+
+_ECHO_HEADER = struct.Struct(">BBHHH")
+
+_SHARED_ENGINE: Optional["IcmpEngine"] = None
+_SHARED_ENGINE_LOCK = threading.Lock()
+
+_SOCKET_MODES: Dict[int, Optional[str]] = {}
+_SOCKET_MODES_LOCK = threading.Lock()
+
+
+def _icmp_protocol(family: int) -> int:
+    return (socket.IPPROTO_ICMPV6
+            if family == socket.AF_INET6 else socket.IPPROTO_ICMP)
+
+
+def _detect_socket_mode(family: int) -> Optional[str]:
+    for mode, sock_type in ((SOCKET_MODE_RAW, socket.SOCK_RAW),
+                            (SOCKET_MODE_DGRAM, socket.SOCK_DGRAM)):
+        try:
+            socket.socket(family, sock_type, _icmp_protocol(family)).close()
+        except OSError as exc:
+            LOGGER.debug("monitor.icmp_engine.mode_unavailable family=%s "
+                         "mode=%s error=%s", family.name, mode, exc)
+            continue
+        return mode
+    return None
+
+
+def socket_mode(family: int = socket.AF_INET) -> Optional[str]:
+    """Return ``"raw"``, ``"dgram"`` or ``None`` for ``family``.
+
+    The check opens and closes a throwaway socket the first time a family is
+    asked about; later calls return the cached answer.
+    """
+
+    with _SOCKET_MODES_LOCK:
+        if family not in _SOCKET_MODES:
+            mode = _detect_socket_mode(family)
+            _SOCKET_MODES[family] = mode
+            LOGGER.info("monitor.icmp_engine.mode family=%s mode=%s",
+                        family.name, mode or "unavailable")
+        return _SOCKET_MODES[family]
+
+
+def detect_socket_modes() -> Dict[int, Optional[str]]:
+    """Run the capability check for IPv4 and IPv6 up front."""
+
+    return {
+        family: socket_mode(family)
+        for family in (socket.AF_INET, socket.AF_INET6)
+    }
+
+
+def reset_socket_modes() -> None:
+    """Forget the cached capability check, e.g. after a privilege change."""
+
+    with _SOCKET_MODES_LOCK:
+        _SOCKET_MODES.clear()
+
+
+def _open_icmp_socket(family: int) -> socket.socket:
+    mode = socket_mode(family)
+    if mode is None:
+        raise PermissionError(
+            f"Neither raw nor datagram ICMP sockets are available for "
+            f"{family.name}")
+    sock_type = socket.SOCK_RAW if mode == SOCKET_MODE_RAW else socket.SOCK_DGRAM
+    return socket.socket(family, sock_type, _icmp_protocol(family))
+
+
+def _socket_is_datagram(sock: socket.socket) -> bool:
+    return getattr(sock, "type", socket.SOCK_RAW) == socket.SOCK_DGRAM
+
+
+def address_family(address: str) -> int:
+    return socket.AF_INET6 if ":" in address else socket.AF_INET
+
+
+class EchoRequest:
+    """One outstanding echo; resolved by the engine's reader thread."""
+
+    __slots__ = ("_engine", "key", "address", "sent_at", "rtt", "_event",
+                 "_notify")
+
+    def __init__(self,
+                 engine: "IcmpEngine",
+                 key: Tuple[int, int, int],
+                 address: str,
+                 notify: Optional[threading.Event] = None) -> None:
+        self._engine = engine
+        self.key = key
+        self.address = address
+        self.sent_at = time.perf_counter()
+        self.rtt: Optional[float] = None
+        self._event = threading.Event()
+        self._notify = notify
+
+    @property
+    def family(self) -> int:
+        return self.key[0]
+
+    def wait(self, timeout: Optional[float]) -> Optional[float]:
+        """Return the round-trip time in seconds, or ``None`` on timeout."""
+
+        if timeout is not None and timeout <= 0:
+            return self.rtt
+        self._event.wait(timeout)
+        return self.rtt
+
+    def close(self) -> None:
+        """Stop listening for this echo's reply."""
+
+        self._engine._forget(self)
+
+    def _resolve(self, received_at: float) -> None:
+        self.rtt = max(received_at - self.sent_at, 0.0)
+        self._event.set()
+        if self._notify is not None:
+            self._notify.set()
+
+
+class IcmpEngine:
+    """Send echo requests and dispatch their replies by identifier/sequence.
+
+    ``socket_factory(family)`` opens the socket for an address family; it is
+    called lazily on the first echo to that family, so a ``PermissionError``
+    surfaces from :meth:`send` and callers can fall back to other probes.
+    Sockets whose ``type`` is ``SOCK_DGRAM`` are handled as unprivileged ping
+    sockets.
+    """
+
+    def __init__(
+        self,
+        *,
+        socket_factory: Callable[[int], socket.socket] = _open_icmp_socket,
+        buffer_size: int = RECEIVE_BUFFER_BYTES,
+    ) -> None:
+        self._socket_factory = socket_factory
+        self._sockets: Dict[int, socket.socket] = {}
+        self._datagram_families: set[int] = set()
+        self._pending: Dict[Tuple[int, int, int], EchoRequest] = {}
+        self._identifiers: set[int] = set()
+        self._next_identifier = random.randrange(0x10000)
+        self._next_sequence = random.randrange(0x10000)
+        self._lock = threading.Lock()
+        self._buffer = bytearray(buffer_size)
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._wake_reader: Optional[socket.socket] = None
+        self._wake_writer: Optional[socket.socket] = None
+        self._reader: Optional[threading.Thread] = None
+        self._closed = False
+
+    def allocate_identifier(self) -> int:
+        """Reserve an echo identifier no other live probe is using."""
+
+        with self._lock:
+            if len(self._identifiers) >= 0x10000:
+                raise RuntimeError("All ICMP identifiers are in use")
+            identifier = self._next_identifier
+            while identifier in self._identifiers:
+                identifier = (identifier + 1) & 0xFFFF
+            self._identifiers.add(identifier)
+            self._next_identifier = (identifier + 1) & 0xFFFF
+            return identifier
+
+    def release_identifier(self, identifier: int) -> None:
+        with self._lock:
+            self._identifiers.discard(identifier)
+
+    def send(self,
+             address: str,
+             packet: bytes,
+             *,
+             notify: Optional[threading.Event] = None) -> EchoRequest:
+        """Send an echo request packet and return its pending reply.
+
+        The identifier and sequence are read from the packet header, so the
+        packet must carry an identifier obtained from
+        :meth:`allocate_identifier`. On a datagram socket the sequence on the
+        wire is replaced with one unique among outstanding echoes; the kernel
+        fills in the identifier and checksum itself. ``notify`` is set when
+        the reply arrives, so one event can wait on several echoes.
+        """
+
+        family = address_family(address)
+        _, _, _, identifier, sequence = _ECHO_HEADER.unpack_from(packet)
+        sock = self._socket_for(family)
+        with self._lock:
+            if family in self._datagram_families:
+                sequence = self._allocate_sequence_locked(family)
+                packet = (bytes(packet[:6]) + sequence.to_bytes(2, "big")
+                          + bytes(packet[8:]))
+                identifier = _DGRAM_IDENTIFIER
+            request = EchoRequest(self, (family, identifier, sequence),
+                                  address, notify)
+            # Register first so a fast reply cannot beat the bookkeeping.
+            self._pending[request.key] = request
+        request.sent_at = time.perf_counter()
+        try:
+            sock.sendto(packet, (address, 0))
+        except OSError:
+            self._forget(request)
+            raise
+        return request
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def close(self) -> None:
+        """Stop the reader thread and close the sockets."""
+
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            reader = self._reader
+        self._wake()
+        if reader is not None and reader is not threading.current_thread():
+            reader.join(2.0)
+        with self._lock:
+            sockets = list(self._sockets.values())
+            self._sockets.clear()
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for sock in sockets:
+            sock.close()
+        for request in pending:
+            request._event.set()
+        if self._selector is not None:
+            self._selector.close()
+        for wake_socket in (self._wake_reader, self._wake_writer):
+            if wake_socket is not None:
+                wake_socket.close()
+
+    def _allocate_sequence_locked(self, family: int) -> int:
+        sequence = self._next_sequence
+        while (family, _DGRAM_IDENTIFIER, sequence) in self._pending:
+            sequence = (sequence + 1) & 0xFFFF
+        self._next_sequence = (sequence + 1) & 0xFFFF
+        return sequence
+
+    def _forget(self, request: EchoRequest) -> None:
+        with self._lock:
+            if self._pending.get(request.key) is request:
+                del self._pending[request.key]
+
+    def _socket_for(self, family: int) -> socket.socket:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ICMP engine has been closed")
+            sock = self._sockets.get(family)
+            if sock is not None:
+                return sock
+            sock = self._socket_factory(family)
+            sock.setblocking(False)
+            if _socket_is_datagram(sock):
+                self._datagram_families.add(family)
+            self._ensure_reader_locked()
+            self._selector.register(sock, selectors.EVENT_READ, family)
+            self._sockets[family] = sock
+            self._wake()
+            return sock
+
+    def _ensure_reader_locked(self) -> None:
+        if self._reader is not None:
+            return
+        self._selector = selectors.DefaultSelector()
+        self._wake_reader, self._wake_writer = socket.socketpair()
+        self._wake_reader.setblocking(False)
+        self._selector.register(self._wake_reader, selectors.EVENT_READ, None)
+        self._reader = threading.Thread(target=self._read_loop,
+                                        name="IcmpEngine",
+                                        daemon=True)
+        self._reader.start()
+
+    def _wake(self) -> None:
+        if self._wake_writer is None:
+            return
+        try:
+            self._wake_writer.send(b"\0")
+        except OSError:
+            pass
+
+    def _read_loop(self) -> None:
+        view = memoryview(self._buffer)
+        while not self._closed:
+            try:
+                events = self._selector.select()
+            except (OSError, ValueError):
+                return
+            for key, _ in events:
+                family = key.data
+                if family is None:
+                    try:
+                        self._wake_reader.recv(512)
+                    except OSError:
+                        pass
+                    continue
+                self._drain(key.fileobj, family, view)
+
+    def _drain(self, sock: socket.socket, family: int,
+               view: memoryview) -> None:
+        while True:
+            try:
+                size, source = sock.recvfrom_into(self._buffer)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as exc:
+                if not self._closed:
+                    LOGGER.warning("monitor.icmp_engine.receive_error error=%s",
+                                   exc)
+                return
+            self._dispatch(family, view[:size], source[0], time.perf_counter())
+
+    def _dispatch(self, family: int, packet: memoryview, source: str,
+                  received_at: float) -> None:
+        datagram = family in self._datagram_families
+        offset = 0
+        if family == socket.AF_INET and not datagram:
+            # Raw IPv4 sockets hand us the IP header as well.
+            if len(packet) < 1:
+                return
+            offset = (packet[0] & 0x0F) * 4
+        reply_type = (ICMP_ECHO_REPLY
+                      if family == socket.AF_INET else ICMPV6_ECHO_REPLY)
+        if len(packet) < offset + _ECHO_HEADER.size:
+            return
+        icmp_type, _, _, identifier, sequence = _ECHO_HEADER.unpack_from(
+            packet, offset)
+        if icmp_type != reply_type:
+            return
+        if datagram:
+            # The kernel owns the identifier and already filtered on it.
+            identifier = _DGRAM_IDENTIFIER
+        with self._lock:
+            request = self._pending.get((family, identifier, sequence))
+            if request is None or request.address != source:
+                return
+            del self._pending[request.key]
+        request._resolve(received_at)
+
+
+def shared_engine() -> IcmpEngine:
+    """Return the process-wide engine, creating it on first use."""
+
+    global _SHARED_ENGINE
+    with _SHARED_ENGINE_LOCK:
+        if _SHARED_ENGINE is None:
+            _SHARED_ENGINE = IcmpEngine()
+        return _SHARED_ENGINE
+
+
+def reset_shared_engine() -> None:
+    """Close the shared engine; the next ping opens a fresh one."""
+
+    global _SHARED_ENGINE
+    with _SHARED_ENGINE_LOCK:
+        engine, _SHARED_ENGINE = _SHARED_ENGINE, None
+    if engine is not None:
+        engine.close()
+
+
+__all__ = [
+    "EchoRequest",
+    "IcmpEngine",
+    "SOCKET_MODE_DGRAM",
+    "SOCKET_MODE_RAW",
+    "address_family",
+    "detect_socket_modes",
+    "reset_shared_engine",
+    "reset_socket_modes",
+    "shared_engine",
+    "socket_mode",
+]
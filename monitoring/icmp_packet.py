@@ -0,0 +1,78 @@
+# -*- codeing = utf-8 -*-
+# @Create: 2026-10-17 7:15 p.m.
+# @Update: 2026-10-17 9:00 p.m.
+# @Author: John Zhao
+"""ICMP echo packet construction.
+
+:func:`internet_checksum` sums the packet as an ``array`` of 16-bit words
+instead of walking it byte pair by byte pair. :class:`EchoPacketBuilder` keeps
+the header fields and payload of one identifier fixed and precomputes their
+one's-complement sum, so building the packet for another sequence number only
+adds that number in and packs the header.
+"""
+
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+
+ICMP_ECHO_REQUEST = 8
+# The kernel fills in the ICMPv6 checksum, which covers an IPv6 pseudo-header.
+ICMPV6_ECHO_REQUEST = 128
+
+_HEADER = struct.Struct(">BBHHH")
+
+
+def _word_sum(data: bytes) -> int:
+    if len(data) % 2:
+        data = bytes(data) + b"\0"
+    words = array("H", data)
+    if sys.byteorder == "little":
+        words.byteswap()
+    return sum(words)
+
+
+def _fold(total: int) -> int:
+    while total >> 16:
+        total = (total & 0xFFFF) + (total >> 16)
+    return total
+
+
+def internet_checksum(data: bytes) -> int:
+    """Return the RFC 1071 checksum of ``data``, to be packed big-endian."""
+
+    return ~_fold(_word_sum(data)) & 0xFFFF
+
+
+class EchoPacketBuilder:
+    """Build echo requests that differ only in their sequence number."""
+
+    __slots__ = ("icmp_type", "code", "identifier", "payload", "_base_sum")
+
+    def __init__(self,
+                 identifier: int,
+                 payload: bytes,
+                 *,
+                 icmp_type: int = ICMP_ECHO_REQUEST,
+                 code: int = 0) -> None:
+        self.icmp_type = icmp_type
+        self.code = code
+        self.identifier = identifier
+        self.payload = bytes(payload)
+        # Sum of every word except the checksum and sequence fields.
+        self._base_sum = _word_sum(
+            _HEADER.pack(icmp_type, code, 0, identifier, 0) + self.payload)
+
+    def build(self, sequence: int) -> bytes:
+        checksum = ~_fold(self._base_sum + sequence) & 0xFFFF
+        return _HEADER.pack(self.icmp_type, self.code, checksum,
+                            self.identifier, sequence) + self.payload
+
+
+__all__ = [
+    "ICMPV6_ECHO_REQUEST",
+    "ICMP_ECHO_REQUEST",
+    "EchoPacketBuilder",
+    "internet_checksum",
+]
@@ -1,93 +1,97 @@
 # -*- codeing = utf-8 -*-
 # @Create: 2023-03-29 3:23 p.m.
-# @Update: 2025-10-24 11:53 p.m.
+# @Update: 2026-10-17 8:30 p.m.
 # @Author: John Zhao
 
-import time, struct
-import socket, select
+import time
 from contextlib import closing
 
+from . import dns_cache
+from .icmp_engine import shared_engine
+from .icmp_packet import EchoPacketBuilder, internet_checksum
+
 
 class IcmpProbe:
-    # Send the raw ICMP packet through a socket.
+    """Build echo requests and exchange them through the shared ICMP engine.
+
+    Each probe reserves its own echo identifier on first use; call
+    :meth:`close` to hand it back.
+    """
+
+    def __init__(self, engine=None):
+        self._engine = engine
+        self._identifier = None
+        self._builders = {}
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            self._engine = shared_engine()
+        return self._engine
+
+    # Echo identifier reserved for this probe.
+    @property
+    def identifier(self):
+        if self._identifier is None:
+            self._identifier = self.engine.allocate_identifier()
+        return self._identifier
+
+    def close(self):
+        self._builders.clear()
+        if self._identifier is not None:
+            self.engine.release_identifier(self._identifier)
+            self._identifier = None
+
+    # Send the ICMP packet through the shared engine socket. The returned
+    # handle stands in for the old per-attempt socket: closing it stops
+    # listening for the reply.
     def raw_socket(self, dst_addr, imcp_packet):
-        rawsocket = socket.socket(socket.AF_INET, socket.SOCK_RAW,
-                                  socket.getprotobyname("icmp"))
+        request = self.engine.send(dst_addr, imcp_packet)
         send_request_ping_time = time.time()
-        rawsocket.sendto(imcp_packet, (dst_addr, 80))
-        return send_request_ping_time, closing(rawsocket)
+        return send_request_ping_time, closing(request)
 
     # Calculate the checksum for an ICMP payload.
     def chesksum(self, data):
-        n = len(data)
-        m = n % 2
-        sum = 0
-        for i in range(0, n - m, 2):
-            sum += (data[i]) + ((data[i + 1]) << 8)
-            sum = (sum >> 16) + (sum & 0xffff)
-        if m:
-            sum += (data[-1])
-            sum = (sum >> 16) + (sum & 0xffff)
-        answer = ~sum & 0xffff
-        answer = answer >> 8 | (answer << 8 & 0xff00)
-        return answer
+        return internet_checksum(data)
 
     # Resolve the destination host address from a hostname.
     def get_host_address(self, host):
-        dst_addr = socket.gethostbyname(host)
+        dst_addr = dns_cache.gethostbyname(host)
         return dst_addr
 
-    # Construct an ICMP echo request packet.
+    # Construct an ICMP echo request packet. The header and payload are
+    # cached per identifier; only the sequence and checksum change between
+    # attempts. The checksum field is always computed, so data_checksum is
+    # only kept for the call signature.
     def request_ping(self, data_type, data_code, data_checksum, data_ID,
                      data_Sequence, payload_body):
-        # Pack the supplied fields into a binary structure.
-        imcp_packet = struct.pack('>BBHHH32s', data_type, data_code,
-                                  data_checksum, data_ID, data_Sequence,
-                                  payload_body)
-        # Calculate the checksum based on the initial packet.
-        icmp_chesksum = self.chesksum(imcp_packet)
-        # Insert the checksum and rebuild the packet bytes.
-        imcp_packet = struct.pack('>BBHHH32s', data_type, data_code,
-                                  icmp_chesksum, data_ID, data_Sequence,
-                                  payload_body)
-        return imcp_packet
-
-    # Process reply packets by unpacking and validating them.
+        key = (data_type, data_code, data_ID, payload_body)
+        builder = self._builders.get(key)
+        if builder is None:
+            # Match the fixed 32-byte payload the packet has always carried.
+            payload = bytes(payload_body[:32]).ljust(32, b"\0")
+            builder = EchoPacketBuilder(data_ID, payload,
+                                        icmp_type=data_type, code=data_code)
+            self._builders[key] = builder
+        return builder.build(data_Sequence)
+
+    # Wait for the reply matched to the request by identifier and sequence.
     def reply_ping(self,
                    send_request_ping_time,
                    rawsocket,
                    data_Sequence,
                    timeout=3):
-        while True:
-            # Wait for the raw socket to become readable within the timeout window.
-            what_ready = select.select([rawsocket], [], [], timeout)
-            # Track how much time was spent waiting in this iteration.
-            wait_for_time = (time.time() - send_request_ping_time)
-            # Treat a lack of readable sockets as a timeout event.
-            if what_ready[0] == []:
-                return -1
-            # Record when the response was received.
-            time_received = time.time()
-            # Read up to 1024 bytes from the raw socket.
-            received_packet, addr = rawsocket.recvfrom(1024)
-            # Extract the ICMP header from the response payload.
-            icmpHeader = received_packet[20:28]
-            # Decode the header fields into their native values.
-            type, code, r_checksum, packet_id, sequence = struct.unpack(
-                ">BBHHH", icmpHeader)
-            if type == 0 and sequence == data_Sequence:
-                return time_received - send_request_ping_time
-            # Update the remaining timeout budget and abort if it is exhausted.
-            timeout = timeout - wait_for_time
-            if timeout <= 0:
-                return -1
+        rtt = rawsocket.wait(timeout)
+        if rtt is None:
+            return -1
+        return rtt
 
     # Send a ping command to the specified address.
     def send_ping(self, address, timeout=None):
         data_type = 8
         data_code = 0
         data_checksum = 0
-        data_ID = 0
+        data_ID = self.identifier
         data_Sequence = 1
         payload_body = b'abcdefghijklmnopqrstuvwabcdefghi'
 
@@ -0,0 +1,119 @@
+# -*- codeing = utf-8 -*-
+# @Create: 2026-10-17 6:40 p.m.
+# @Update: 2026-10-17 8:30 p.m.
+# @Author: John Zhao
+"""fping-style reachability sweep over many hosts at once.
+
+:func:`sweep` sends one echo request per host through the shared
+:class:`~monitoring.icmp_engine.IcmpEngine`, paced to ``[Request] sweep_rate``
+requests per second, and lets the engine's single reader thread collect every
+reply. Each host waits at most ``timeout`` after its own request went out, so
+a sweep takes roughly one timeout plus the pacing time rather than one
+timeout per host.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import configuration
+
+from . import dns_cache
+from .icmp_engine import EchoRequest, IcmpEngine
+from .icmp_probe import IcmpProbe
+from .probe_result import ProbeResult
+
+LOGGER = logging.getLogger(__name__)
+
+PAYLOAD = b"abcdefghijklmnopqrstuvwabcdefghi"
+# Sequence numbers available to one probe identifier.
+HOSTS_PER_IDENTIFIER = 0xFFFF
+
+
+def _resolve(host: str) -> Optional[str]:
+    try:
+        return dns_cache.gethostbyname(host)
+    except OSError as exc:
+        LOGGER.warning("monitor.sweep.resolve_failed host=%s error=%s", host,
+                       exc)
+        return None
+
+
+def sweep(
+    hosts: Iterable[str],
+    timeout: Optional[float] = None,
+    *,
+    rate: Optional[int] = None,
+    engine: Optional[IcmpEngine] = None,
+) -> Dict[str, ProbeResult]:
+    """Ping every host once and return a :class:`ProbeResult` per host.
+
+    ``timeout`` defaults to the request timeout and ``rate`` to
+    ``[Request] sweep_rate``. A reply's round-trip time is reported as the
+    result's ``total``. Hosts that cannot be resolved or reached, or that do
+    not answer in time, come back unsuccessful; when no ICMP socket can be
+    opened at all, every host does.
+    """
+
+    hosts = list(dict.fromkeys(hosts))
+    if timeout is None:
+        timeout = configuration.get_request_timeout()
+    timeout = max(float(timeout), 0.0)
+    if rate is None:
+        rate = configuration.get_sweep_rate()
+    spacing = 1.0 / rate if rate > 0 else 0.0
+
+    results: Dict[str, ProbeResult] = {
+        host: ProbeResult(success=False)
+        for host in hosts
+    }
+    probes: List[IcmpProbe] = []
+    outstanding: List[Tuple[str, EchoRequest]] = []
+    started = time.monotonic()
+    slot = 0
+    try:
+        for host in hosts:
+            address = _resolve(host)
+            if address is None:
+                continue
+            if slot % HOSTS_PER_IDENTIFIER == 0:
+                probes.append(IcmpProbe(engine))
+            probe = probes[-1]
+            packet = probe.request_ping(8, 0, 0, probe.identifier,
+                                        slot % HOSTS_PER_IDENTIFIER + 1,
+                                        PAYLOAD)
+            delay = started + slot * spacing - time.monotonic()
+            slot += 1
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                outstanding.append((host, probe.engine.send(address,
+                                                            packet)))
+            except PermissionError as exc:
+                LOGGER.warning("monitor.sweep.unavailable hosts=%s error=%s",
+                               len(hosts), exc)
+                break
+            except OSError as exc:
+                LOGGER.warning("monitor.sweep.send_failed host=%s error=%s",
+                               host, exc)
+
+        for host, request in outstanding:
+            remaining = request.sent_at + timeout - time.perf_counter()
+            rtt = request.wait(max(remaining, 0.0))
+            if rtt is not None:
+                results[host] = ProbeResult(success=True, total=rtt)
+    finally:
+        for _, request in outstanding:
+            request.close()
+        for probe in probes:
+            probe.close()
+
+    up = sum(1 for result in results.values() if result.success)
+    LOGGER.info("monitor.sweep.summary hosts=%s up=%s elapsed_ms=%s",
+                len(hosts), up, int((time.monotonic() - started) * 1000))
+    return results
+
+
+__all__ = ["sweep"]
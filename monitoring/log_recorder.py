@@ -2,13 +2,16 @@
 # @Create: 2023-02-16 3:37 p.m.
 # @Update: 2025-10-24 11:53 p.m.
 # @Author: John Zhao
+import atexit
 import datetime
-import csv
 import re
+import threading
 from pathlib import Path
 
 import configuration
 
+from .log_writer import LogWriter
+
 _FALLBACK_MONITOR_FILENAME = "monitor"
 
 
@@ -33,9 +36,11 @@ def _sanitize_monitor_name(name) -> str:
     return candidate
 
 
-def _now_with_timezone():
+def _now_with_timezone(timezone=None):
+    if timezone is None:
+        timezone = configuration.get_timezone()
     try:
-        timezone = int(configuration.get_timezone())
+        timezone = int(timezone)
     except (TypeError, ValueError):
         timezone = 0
     utc_now = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
@@ -57,11 +62,57 @@ def _csv_header() -> list:
     ]
 
 
+class _SharedWriter:
+    """The process-wide writer and the settings it was built from."""
+
+    def __init__(self) -> None:
+        self.writer = LogWriter(_ensure_log_folder())
+        self.timezone = configuration.get_timezone()
+
+
+_SHARED = None
+_SHARED_LOCK = threading.Lock()
+_EXIT_HOOK_INSTALLED = False
+
+
+def _shared_writer() -> _SharedWriter:
+    global _SHARED, _EXIT_HOOK_INSTALLED
+    with _SHARED_LOCK:
+        if _SHARED is None:
+            _SHARED = _SharedWriter()
+            if not _EXIT_HOOK_INSTALLED:
+                atexit.register(reset_writer)
+                _EXIT_HOOK_INSTALLED = True
+        return _SHARED
+
+
+def flush():
+    """Write buffered log lines to disk."""
+
+    with _SHARED_LOCK:
+        shared = _SHARED
+    if shared is not None:
+        shared.writer.flush()
+
+
+def reset_writer():
+    """Flush and close the log files; the next write re-reads the settings.
+
+    Call this after the log folder or the timezone changed.
+    """
+
+    global _SHARED
+    with _SHARED_LOCK:
+        shared, _SHARED = _SHARED, None
+    if shared is not None:
+        shared.writer.close()
+
+
 def record(action: str, log):
-    chinaDateTime = _now_with_timezone()
-    folder = _ensure_log_folder()
+    shared = _shared_writer()
+    chinaDateTime = _now_with_timezone(shared.timezone)
+    nowDate = chinaDateTime.strftime('%Y%m%d')
 
-    log_path = folder / f"log-{chinaDateTime.strftime('%Y%m%d')}.txt"
     log_timestamp = chinaDateTime.strftime('%Y-%m-%d %H:%M:%S')
     entry = configuration.render_template(
         "log",
@@ -73,30 +124,18 @@ def record(action: str, log):
         },
     )
 
-    with log_path.open("a", encoding="utf-8") as file:
-        file.write(entry.rstrip("\n") + "\n")
+    shared.writer.write_line(nowDate, f"log-{nowDate}.txt", entry.rstrip("\n"))
 
 
 def saveToFile(dataString, API):
-    folder = _ensure_log_folder()
-
-    nowDateTime = _now_with_timezone()
+    shared = _shared_writer()
+    nowDateTime = _now_with_timezone(shared.timezone)
     nowDate = nowDateTime.strftime("%Y%m%d")
 
     sanitized_name = _sanitize_monitor_name(API)
-    filename = folder / f"{sanitized_name}_{nowDate}.csv"
-    header = _csv_header()
     row = [str(item) for item in dataString]
-
-    if not filename.exists():
-        with filename.open(mode='w', newline='', encoding='utf8') as cf:
-            wf = csv.writer(cf)
-            wf.writerow(header)
-            wf.writerow(row)
-    else:
-        with filename.open(mode='a', newline='', encoding='utf8') as cfa:
-            wf = csv.writer(cfa)
-            wf.writerow(row)
+    shared.writer.write_row(nowDate, f"{sanitized_name}_{nowDate}.csv", row,
+                            _csv_header)
 
 
 # Example usage for manual testing:
@@ -0,0 +1,259 @@
+# -*- codeing = utf-8 -*-
+# @Create: 2026-10-17 10:00 p.m.
+# @Update: 2026-10-17 11:55 p.m.
+# @Author: John Zhao
+"""Buffered append-only writer for the daily text log and per-monitor CSVs.
+
+:class:`LogWriter` keeps the most recently used log files open instead of
+opening and closing one per event. Lines are buffered and flushed once
+``flush_rows`` of them are pending, or at the latest ``flush_interval``
+seconds after they were written. Files belong to one day: the first write for
+a new day closes every handle of the previous one. A CSV that already starts
+with a different header, such as one written before the columns changed, is
+left alone and the rows go to a ``<stem>-1.csv`` sibling instead.
+"""
+
+from __future__ import annotations
+
+import csv
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Callable, List, Optional, Sequence
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_OPEN_FILES = 32
+DEFAULT_FLUSH_ROWS = 64
+DEFAULT_FLUSH_INTERVAL = 1.0
+FILE_BUFFER_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class LogWriterStats:
+    """Snapshot of the writer's counters."""
+
+    lines: int
+    flushes: int
+    opens: int
+    evictions: int
+    open_files: int
+
+
+class _OpenLog:
+    """An open log file and its lines not yet flushed."""
+
+    __slots__ = ("file", "csv", "pending")
+
+    def __init__(self, file: IO[str]) -> None:
+        self.file = file
+        self.csv = csv.writer(file)
+        self.pending = 0
+
+
+class LogWriter:
+    """Append lines and CSV rows to files under ``folder``.
+
+    Safe to share between threads. Call :meth:`close` to flush and release
+    every handle; the writer can be used again afterwards.
+    """
+
+    def __init__(self,
+                 folder: Path,
+                 *,
+                 max_open_files: int = DEFAULT_MAX_OPEN_FILES,
+                 flush_rows: int = DEFAULT_FLUSH_ROWS,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 background: bool = True) -> None:
+        if max_open_files < 1:
+            raise ValueError("max_open_files must be at least 1")
+        self._folder = Path(folder)
+        self._max_open_files = max_open_files
+        self._flush_rows = max(1, flush_rows)
+        self._flush_interval = flush_interval
+        self._background = background and flush_interval > 0
+        self._lock = threading.Lock()
+        self._files: "OrderedDict[str, _OpenLog]" = OrderedDict()
+        self._day: Optional[str] = None
+        self._pending = 0
+        self._lines = 0
+        self._flushes = 0
+        self._opens = 0
+        self._evictions = 0
+        self._flusher: Optional[threading.Thread] = None
+        self._stop_flusher = threading.Event()
+
+    @property
+    def folder(self) -> Path:
+        return self._folder
+
+    def write_line(self, day: str, name: str, line: str) -> None:
+        """Append ``line`` and a newline to ``name``, a file of ``day``."""
+
+        with self._lock:
+            log = self._open_locked(day, name, None)
+            log.file.write(line + "\n")
+            self._written_locked(log)
+
+    def write_row(self, day: str, name: str, row: Sequence[str],
+                  header: Callable[[], Sequence[str]]) -> None:
+        """Append ``row`` to the CSV ``name``, a file of ``day``.
+
+        ``header()`` is called when the file is opened. It is written to a
+        new file; an existing file whose first row differs is not appended
+        to and ``name`` is written to a suffixed sibling instead.
+        """
+
+        with self._lock:
+            log = self._open_locked(day, name, header)
+            log.csv.writerow(row)
+            self._written_locked(log)
+
+    def flush(self) -> None:
+        """Write every pending line to disk."""
+
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        """Flush and close every open file and stop the background flusher."""
+
+        with self._lock:
+            self._close_all_locked()
+            flusher, self._flusher = self._flusher, None
+            self._stop_flusher.set()
+        if flusher is not None and flusher is not threading.current_thread():
+            flusher.join()
+
+    def stats(self) -> LogWriterStats:
+        with self._lock:
+            return LogWriterStats(lines=self._lines,
+                                  flushes=self._flushes,
+                                  opens=self._opens,
+                                  evictions=self._evictions,
+                                  open_files=len(self._files))
+
+    def _open_locked(self, day: str, name: str,
+                     header: Optional[Callable[[], Sequence[str]]]) -> _OpenLog:
+        if day != self._day:
+            # Day rollover: yesterday's files will not be written again.
+            self._close_all_locked()
+            self._day = day
+        log = self._files.get(name)
+        if log is not None:
+            self._files.move_to_end(name)
+            return log
+
+        while len(self._files) >= self._max_open_files:
+            _, evicted = self._files.popitem(last=False)
+            self._close_log_locked(evicted)
+            self._evictions += 1
+
+        path = self._folder / name
+        columns = None
+        if header is not None:
+            columns = [str(column) for column in header()]
+            path = _csv_path_for(path, columns)
+        # The csv module writes its own line endings; text lines use the
+        # platform's, as the log did before it was buffered.
+        options = {"newline": ""} if header is not None else {}
+        try:
+            file = path.open("a",
+                             encoding="utf-8",
+                             buffering=FILE_BUFFER_SIZE,
+                             **options)
+        except FileNotFoundError:
+            # The folder was removed while we were running.
+            self._folder.mkdir(parents=True, exist_ok=True)
+            file = path.open("a",
+                             encoding="utf-8",
+                             buffering=FILE_BUFFER_SIZE,
+                             **options)
+        self._opens += 1
+        log = self._files[name] = _OpenLog(file)
+        if columns is not None and file.tell() == 0:
+            log.csv.writerow(columns)
+        return log
+
+    def _written_locked(self, log: _OpenLog) -> None:
+        log.pending += 1
+        self._pending += 1
+        self._lines += 1
+        if self._pending >= self._flush_rows:
+            self._flush_locked()
+        elif self._background and self._flusher is None:
+            # Each flusher has its own stop event so close() can never stop
+            # a flusher started by a write that came after it.
+            self._stop_flusher = threading.Event()
+            self._flusher = threading.Thread(target=self._flush_periodically,
+                                             args=(self._stop_flusher, ),
+                                             name="LogWriterFlush",
+                                             daemon=True)
+            self._flusher.start()
+
+    def _flush_periodically(self, stop: threading.Event) -> None:
+        while not stop.wait(self._flush_interval):
+            with self._lock:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        for log in self._files.values():
+            if log.pending:
+                self._flush_log_locked(log)
+        self._flushes += 1
+
+    def _flush_log_locked(self, log: _OpenLog) -> None:
+        try:
+            log.file.flush()
+        except OSError as exc:
+            LOGGER.warning("monitor.log_writer.flush_failed file=%s error=%s",
+                           log.file.name, exc)
+        self._pending -= log.pending
+        log.pending = 0
+
+    def _close_log_locked(self, log: _OpenLog) -> None:
+        self._flush_log_locked(log)
+        try:
+            log.file.close()
+        except OSError as exc:
+            LOGGER.warning("monitor.log_writer.close_failed file=%s error=%s",
+                           log.file.name, exc)
+
+    def _close_all_locked(self) -> None:
+        while self._files:
+            _, log = self._files.popitem(last=False)
+            self._close_log_locked(log)
+
+
+def _header_matches(path: Path, columns: List[str]) -> bool:
+    """Whether rows under ``columns`` may be appended to ``path``."""
+
+    try:
+        with path.open("r", newline="", encoding="utf-8") as file:
+            existing = next(csv.reader(file), None)
+    except FileNotFoundError:
+        return True
+    except (OSError, UnicodeDecodeError, csv.Error):
+        return False
+    return existing is None or existing == columns
+
+
+def _csv_path_for(path: Path, columns: List[str]) -> Path:
+    """Return ``path`` or the first ``<stem>-N`` sibling taking ``columns``."""
+
+    candidate = path
+    suffix = 0
+    while not _header_matches(candidate, columns):
+        suffix += 1
+        candidate = path.with_name(f"{path.stem}-{suffix}{path.suffix}")
+    if suffix:
+        LOGGER.info("monitor.log_writer.header_changed file=%s using=%s",
+                    path.name, candidate.name)
+    return candidate
+
+
+__all__ = ["LogWriter", "LogWriterStats"]
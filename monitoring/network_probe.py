@@ -1,6 +1,6 @@
 # -*- codeing = utf-8 -*-
 # @Create: 2023-02-16 3:37 p.m.
-# @Update: 2025-10-24 11:53 p.m.
+# @Update: 2026-10-17 11:55 p.m.
 # @Author: John Zhao
 """Network connectivity probing helpers."""
 
@@ -10,16 +10,29 @@ import os
 import shutil
 import socket
 import subprocess
+import threading
 import time
 from contextlib import closing
+from typing import List, Optional, Tuple
 
+from . import dns_cache
+from . import tcp_engine
+from .icmp_packet import ICMP_ECHO_REQUEST, ICMPV6_ECHO_REQUEST
 from .icmp_probe import IcmpProbe
+from .probe_result import ProbeResult
 
 LOGGER = logging.getLogger(__name__)
 
+# How often a cancellable ping checks whether it is still wanted.
+CANCEL_POLL_SECONDS = 0.05
+
 
 def _subprocess_ping(host: str, timeout: float) -> bool:
-    """Use the system ping command as a fallback probe; return True on success."""
+    """Use the system ping command as a fallback probe; return True on success.
+
+    Only reached when neither raw nor unprivileged datagram ICMP sockets can
+    be opened, since every call forks a process.
+    """
 
     timeout = max(float(timeout), 0.0)
     if os.name == "nt":
@@ -44,22 +57,56 @@ def _subprocess_ping(host: str, timeout: float) -> bool:
         return False
 
 
-def check_socket_connectivity(host: str, port: int, timeout: float) -> bool:
+def check_socket_connectivity(host: str, port: int,
+                              timeout: float) -> ProbeResult:
+    """Connect to ``host:port`` through the shared non-blocking TCP engine.
+
+    The host's IPv6 and IPv4 addresses are raced; the result reports the
+    family that connected first, its connect time and the race's duration.
+    """
+
     try:
-        with socket.create_connection((host, port), timeout=timeout):
-            pass
-        LOGGER.info("monitor.socket.success host=%s port=%s", host, port)
-        return True
+        attempt = tcp_engine.shared_engine().start(host, port, timeout)
+        attempt.wait()
     except OSError as exc:
         LOGGER.warning("monitor.socket.offline host=%s port=%s error=%s", host,
                        port, exc)
-        return False
+        return ProbeResult(success=False)
+    family = dns_cache.family_label(attempt.family)
+    LOGGER.info("monitor.socket.success host=%s port=%s family=%s", host, port,
+                family)
+    return ProbeResult(success=True,
+                       connect=attempt.connect_time,
+                       total=attempt.elapsed,
+                       family=family)
+
+
+def _wait_for_reply(ping, sent_at, rawsocket, sequence, timeout: float,
+                    cancel: Optional[threading.Event]) -> float:
+    if cancel is None:
+        return ping.reply_ping(sent_at, rawsocket, sequence, timeout=timeout)
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        times = ping.reply_ping(sent_at,
+                                rawsocket,
+                                sequence,
+                                timeout=min(remaining, CANCEL_POLL_SECONDS))
+        if times > 0 or cancel.is_set() or remaining <= CANCEL_POLL_SECONDS:
+            return times
 
 
 def perform_ping_probe(host: str,
                        timeout: float,
                        *,
-                       attempts: int = 3) -> bool:
+                       attempts: int = 3,
+                       cancel: Optional[threading.Event] = None) -> bool:
+    """Send up to ``attempts`` echo requests within ``timeout`` seconds.
+
+    Once ``cancel`` is set the probe stops waiting for replies and sends no
+    further requests.
+    """
+
     try:
         resolved_timeout = max(float(timeout), 0.0)
     except (TypeError, ValueError):
@@ -73,16 +120,16 @@ def perform_ping_probe(host: str,
                          0.7) if per_attempt_timeout > 0 else 0.0
     remaining_budget = resolved_timeout
 
+    ping = IcmpProbe()
     try:
-        ping = IcmpProbe()
         status = []
         data_type = 8
         data_code = 0
         data_checksum = 0
-        data_id = 0
+        data_id = ping.identifier
         data_sequence = 1
         payload_body = b"abcdefghijklmnopqrstuvwabcdefghi"
-        dst_addr = socket.gethostbyname(host)
+        dst_addr = dns_cache.gethostbyname(host)
         LOGGER.info(
             "monitor.ping.raw.start host=%s destination=%s payload_size=%s",
             host,
@@ -90,6 +137,9 @@ def perform_ping_probe(host: str,
             len(payload_body),
         )
         for attempt in range(attempts):
+            if cancel is not None and cancel.is_set():
+                LOGGER.info("monitor.ping.raw.cancelled host=%s", host)
+                break
             sequence = data_sequence + attempt
             icmp_packet = ping.request_ping(
                 data_type,
@@ -112,12 +162,9 @@ def perform_ping_probe(host: str,
                 attempt_timeout = 0.0
 
             with rawsocket_resource as rawsocket:
-                times = ping.reply_ping(
-                    send_request_ping_time,
-                    rawsocket,
-                    sequence,
-                    timeout=attempt_timeout,
-                )
+                times = _wait_for_reply(ping, send_request_ping_time,
+                                        rawsocket, sequence, attempt_timeout,
+                                        cancel)
             remaining_budget = max(0.0, remaining_budget - attempt_timeout)
             if times > 0:
                 LOGGER.info(
@@ -128,9 +175,14 @@ def perform_ping_probe(host: str,
                     int(times * 1000),
                 )
                 status.append(True)
-                if sleep_interval > 0 and remaining_budget > 0:
+                last_attempt = attempt == attempts - 1
+                if (sleep_interval > 0 and remaining_budget > 0
+                        and not last_attempt):
                     sleep_duration = min(sleep_interval, remaining_budget)
-                    time.sleep(sleep_duration)
+                    if cancel is None:
+                        time.sleep(sleep_duration)
+                    else:
+                        cancel.wait(sleep_duration)
                     remaining_budget = max(0.0,
                                            remaining_budget - sleep_duration)
             else:
@@ -155,24 +207,89 @@ def perform_ping_probe(host: str,
     except Exception as exc:  # pragma: no cover - defensive safeguard
         LOGGER.warning("monitor.ping.raw.error host=%s error=%s", host, exc)
         return _subprocess_ping(host, timeout)
+    finally:
+        ping.close()
+
+
+def _race_echo(ping: IcmpProbe, addresses: List[Tuple[int, str]],
+               timeout: float) -> Optional[Tuple[int, float]]:
+    """Echo ``addresses`` Happy Eyeballs style; return the first reply.
+
+    Each address gets a head start of the TCP engine's connection attempt
+    delay before the next one is pinged; an address that cannot be sent to
+    hands over at once. Return ``(family, rtt)`` or ``None`` on timeout.
+    """
 
+    payload_body = b"abcdefghijklmnopqrstuvwabcdefghi"
+    replied = threading.Event()
+    deadline = time.monotonic() + max(float(timeout), 0.0)
+    pending = list(addresses)
+    requests = []
+    error: Optional[OSError] = None
+    next_send = time.monotonic()
+    try:
+        while True:
+            now = time.monotonic()
+            if pending and now >= next_send:
+                family, address = pending.pop(0)
+                icmp_type = (ICMPV6_ECHO_REQUEST if family == socket.AF_INET6
+                             else ICMP_ECHO_REQUEST)
+                # Distinct sequences keep same-family echoes apart.
+                packet = ping.request_ping(icmp_type, 0, 0, ping.identifier,
+                                           len(requests) + 1, payload_body)
+                try:
+                    requests.append(
+                        ping.engine.send(address, packet, notify=replied))
+                    next_send = now + tcp_engine.CONNECTION_ATTEMPT_DELAY
+                except OSError as exc:
+                    error = exc
+                continue
+            for request in requests:
+                if request.rtt is not None:
+                    return request.family, request.rtt
+            if not requests and not pending:
+                raise error or OSError("no address to ping")
+            if now >= deadline:
+                return None
+            wake_at = min(next_send, deadline) if pending else deadline
+            replied.wait(max(wake_at - now, 0.0))
+            replied.clear()
+    finally:
+        for request in requests:
+            request.close()
+
+
+def perform_icmp_probe(host: str, timeout: float) -> ProbeResult:
+    """Race echo requests to the host's IPv6 and IPv4 addresses.
 
-def perform_icmp_probe(host: str, timeout: float) -> bool:
+    The result reports the family that answered first, with its round-trip
+    time as ``total``.
+    """
+
+    ping = IcmpProbe()
     try:
-        with socket.socket(socket.AF_INET, socket.SOCK_RAW,
-                           socket.IPPROTO_ICMP) as sock:
-            dummy_packet = b"\x08\x00}\x4b\x00\x00\x00\x00PingData"
-            sock.sendto(dummy_packet, (host, 0))
-            sock.settimeout(timeout)
-            sock.recv(1024)
-            LOGGER.info("monitor.icmp.success host=%s", host)
-            return True
+        infos = dns_cache.interleave_families(dns_cache.getaddrinfo(host, None))
+        addresses = list(dict.fromkeys(
+            (info[0], info[4][0]) for info in infos))
+        reply = _race_echo(ping, addresses, timeout)
     except PermissionError as exc:
         LOGGER.warning("monitor.icmp.permission_denied host=%s error=%s", host,
                        exc)
-    except (socket.timeout, socket.error) as exc:
+        return ProbeResult(success=False)
+    except OSError as exc:
         LOGGER.warning("monitor.icmp.failure host=%s error=%s", host, exc)
-    return False
+        return ProbeResult(success=False)
+    finally:
+        ping.close()
+    if reply is None:
+        LOGGER.warning("monitor.icmp.failure host=%s error=timeout", host)
+        return ProbeResult(success=False)
+    family, rtt = reply
+    LOGGER.info("monitor.icmp.success host=%s family=%s rtt_ms=%s", host,
+                dns_cache.family_label(family), int(rtt * 1000))
+    return ProbeResult(success=True,
+                       total=rtt,
+                       family=dns_cache.family_label(family))
 
 
 __all__ = [
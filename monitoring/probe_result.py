@@ -0,0 +1,71 @@
+# -*- codeing = utf-8 -*-
+# @Create: 2026-10-17 4:10 p.m.
+# @Update: 2026-10-17 9:00 p.m.
+# @Author: John Zhao
+"""Structured outcome of a single probe."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+
+def _milliseconds(seconds: Optional[float]) -> object:
+    if seconds is None:
+        return ""
+    return round(seconds * 1000.0, 1)
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    """Verdict of one probe plus what was observed on the wire.
+
+    Durations are in seconds. ``dns``, ``connect`` and ``tls`` cover only their
+    own phase and are ``None`` when the phase did not happen (a reused
+    keep-alive connection skips all three) or could not be measured.
+    ``ttfb`` runs from sending the request to receiving the response headers
+    and ``total`` covers the whole probe, so both include the earlier phases.
+    ``family`` is ``"IPv4"`` or ``"IPv6"`` when the probe raced a host's
+    addresses and records which family answered first.
+
+    Instances are truthy when the probe succeeded, so code written against the
+    old ``bool`` results keeps working.
+    """
+
+    success: bool
+    status_code: Optional[int] = None
+    bytes_read: int = 0
+    dns: Optional[float] = None
+    connect: Optional[float] = None
+    tls: Optional[float] = None
+    ttfb: Optional[float] = None
+    total: Optional[float] = None
+    family: Optional[str] = None
+
+    def __bool__(self) -> bool:
+        return self.success
+
+    @classmethod
+    def coerce(cls, outcome: Any) -> "ProbeResult":
+        """Wrap a strategy's return value, which may still be a plain bool."""
+
+        if isinstance(outcome, ProbeResult):
+            return outcome
+        return cls(success=bool(outcome))
+
+    def csv_fields(self) -> Tuple[object, ...]:
+        """Return the columns appended to the CSV row (timings in ms)."""
+
+        return (
+            "" if self.status_code is None else self.status_code,
+            self.bytes_read,
+            _milliseconds(self.dns),
+            _milliseconds(self.connect),
+            _milliseconds(self.tls),
+            _milliseconds(self.ttfb),
+            _milliseconds(self.total),
+            self.family or "",
+        )
+
+
+__all__ = ["ProbeResult"]
@@ -0,0 +1,187 @@
+# -*- codeing = utf-8 -*-
+# @Create: 2026-10-17 9:30 p.m.
+# @Update: 2026-10-17 9:30 p.m.
+# @Author: John Zhao
+"""Share one probe between monitors that check the same thing.
+
+Monitors often differ only in their alert recipients or interval while
+probing the same URL the same way. :class:`SharedProbes` lets such monitors
+run a single probe: a check that starts while an identical probe is in flight
+waits for that probe's result, and one that starts within ``window`` seconds
+after it finished reuses the result. Each monitor still feeds the result
+through its own :class:`~monitoring.state_machine.MonitorStateMachine`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+import configuration
+
+
+def probe_key(monitor: configuration.MonitorItem) -> Hashable:
+    """Return what makes two monitors' probes interchangeable.
+
+    Everything that changes the request on the wire counts; the name,
+    interval, recipients and language do not.
+    """
+
+    return (
+        monitor.monitor_type.upper(),
+        monitor.url.strip(),
+        json.dumps(monitor.payload or {}, sort_keys=True, default=str),
+        json.dumps(monitor.headers or {}, sort_keys=True, default=str),
+        monitor.keep_alive,
+        monitor.head_request,
+        monitor.server_layers,
+    )
+
+
+class _Flight:
+    """A probe in progress that identical checks wait on."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SharedProbes:
+    """Coalesce identical probes and reuse results for ``window`` seconds.
+
+    ``window`` 0 only shares probes that are still in flight.
+    """
+
+    def __init__(self,
+                 window: float,
+                 *,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        if window < 0:
+            raise ValueError("window must not be negative")
+        self._window = float(window)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._results: Dict[Hashable, Tuple[float, Any]] = {}
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._futures: Dict[Hashable, asyncio.Future] = {}
+        self._probes = 0
+        self._shared = 0
+
+    @property
+    def probes(self) -> int:
+        """Number of probes actually run."""
+
+        return self._probes
+
+    @property
+    def shared(self) -> int:
+        """Number of checks answered by another monitor's probe."""
+
+        return self._shared
+
+    def run(self, key: Hashable, probe: Callable[[], Any]) -> Any:
+        """Return ``probe()``'s result, shared among identical ``key``s.
+
+        An exception raised by the probe reaches every check waiting on it
+        but is not reused afterwards.
+        """
+
+        with self._lock:
+            found, result = self._fresh_locked(key)
+            if found:
+                return result
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._probes += 1
+            else:
+                self._shared += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = probe()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+                if flight.error is None:
+                    self._store_locked(key, flight.result)
+            flight.done.set()
+        return flight.result
+
+    async def run_async(self, key: Hashable,
+                        probe: Callable[[], Awaitable[Any]]) -> Any:
+        """Like :meth:`run` for coroutine probes on one event loop."""
+
+        leader = False
+        with self._lock:
+            found, result = self._fresh_locked(key)
+            if found:
+                return result
+            future = self._futures.get(key)
+            if future is None:
+                leader = True
+                self._probes += 1
+                future = asyncio.get_running_loop().create_future()
+                self._futures[key] = future
+            else:
+                self._shared += 1
+
+        if not leader:
+            # A cancelled waiter must not cancel the probe others wait on.
+            return await asyncio.shield(future)
+
+        try:
+            result = await probe()
+        except asyncio.CancelledError:
+            with self._lock:
+                self._futures.pop(key, None)
+            future.cancel()
+            raise
+        except Exception as exc:
+            with self._lock:
+                self._futures.pop(key, None)
+            future.set_exception(exc)
+            # Mark it retrieved; without waiters asyncio would log it.
+            future.exception()
+            raise
+        with self._lock:
+            self._futures.pop(key, None)
+            self._store_locked(key, result)
+        future.set_result(result)
+        return result
+
+    def _fresh_locked(self, key: Hashable) -> Tuple[bool, Any]:
+        entry = self._results.get(key)
+        if entry is None or self._clock() - entry[0] > self._window:
+            return False, None
+        self._shared += 1
+        return True, entry[1]
+
+    def _store_locked(self, key: Hashable, result: Any) -> None:
+        if self._window <= 0:
+            return
+        now = self._clock()
+        for stale in [
+                stale for stale, (finished, _) in self._results.items()
+                if now - finished > self._window
+        ]:
+            del self._results[stale]
+        self._results[key] = (now, result)
+
+
+__all__ = ["SharedProbes", "probe_key"]
@@ -12,15 +12,15 @@ from email.mime.text import MIMEText
 from email.utils import formataddr, parseaddr
 from typing import Iterable, Mapping, Optional, Tuple
 
-from PySide6 import QtCore
-
 import configuration
 
+from .i18n import translate
+
 LOGGER = logging.getLogger(__name__)
 
 
 def _translate(text: str) -> str:
-    return QtCore.QCoreApplication.translate("Email", text)
+    return translate("Email", text)
 
 
 MAIL_EVENT_MAP = {
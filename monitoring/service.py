@@ -1,23 +1,40 @@
 # -*- codeing = utf-8 -*-
 # @Create: 2023-02-16 3:37 p.m.
-# @Update: 2025-10-24 11:53 p.m.
+# @Update: 2026-10-17 11:55 p.m.
 # @Author: John Zhao
 """Implementation of the monitoring orchestration layer."""
 
 from __future__ import annotations
 
 import datetime as _dt
+import heapq
+import itertools
 import logging
+import random
 import threading
-from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple
+import time
+import zlib
+from dataclasses import dataclass, replace
+from enum import Enum
+from typing import (Callable, Dict, Hashable, Iterable, Mapping, Optional,
+                    Tuple, Union)
 from urllib.parse import urlsplit
 
 import configuration
 
 from . import api_monitor
+from . import dns_cache
 from . import http_probe
+from . import icmp_sweep
 from . import log_recorder
 from . import send_email
+from . import tcp_engine
+from .event_pipeline import BackpressurePolicy, EventPipeline, SinkStats
+from .history_store import HistoryStore
+from .probe_result import ProbeResult
+from .probe_sharing import SharedProbes, probe_key
+from .timeseries import TimeSeriesStore
+from .worker_pool import WorkerPool
 
 from .state_machine import (
     MonitorEvent,
@@ -30,27 +47,37 @@ LOGGER = logging.getLogger(__name__)
 
 
 class MonitorStrategy:
-    """Strategy interface that executes a single monitoring check."""
+    """Strategy interface that executes a single monitoring check.
+
+    ``run`` returns a :class:`ProbeResult`; a plain ``bool`` is still accepted
+    and treated as a result without timings. A strategy covering several
+    hosts returns a mapping of host to result instead, and each host is
+    tracked by its own state machine.
+    """
 
     def run(
         self, monitor: configuration.MonitorItem
-    ) -> bool:  # pragma: no cover - interface contract
+    ) -> Union[bool, ProbeResult, Mapping[str, Union[bool, ProbeResult]]
+               ]:  # pragma: no cover - interface contract
         raise NotImplementedError
 
 
 class GetMonitorStrategy(MonitorStrategy):
 
-    def run(self, monitor: configuration.MonitorItem) -> bool:
-        return http_probe.monitor_get(monitor.url)
+    def run(self, monitor: configuration.MonitorItem) -> ProbeResult:
+        return http_probe.probe_get(monitor.url,
+                                    keep_alive=monitor.keep_alive,
+                                    head=monitor.head_request)
 
 
 class PostMonitorStrategy(MonitorStrategy):
 
-    def run(self, monitor: configuration.MonitorItem) -> bool:
-        return http_probe.monitor_post(
+    def run(self, monitor: configuration.MonitorItem) -> ProbeResult:
+        return http_probe.probe_post(
             monitor.url,
             monitor.payload,
             headers=monitor.headers,
+            keep_alive=monitor.keep_alive,
         )
 
 
@@ -82,16 +109,116 @@ class ServerMonitorStrategy(MonitorStrategy):
     def __init__(self) -> None:
         self._cache: Dict[str, Iterable[str]] = {}
 
-    def run(self, monitor: configuration.MonitorItem) -> bool:
+    def run(self, monitor: configuration.MonitorItem) -> ProbeResult:
         parsed = self._cache.get(monitor.url)
         if parsed is None:
             parsed = parse_network_address(monitor.url)
             self._cache[monitor.url] = parsed
-        return api_monitor.monitor_server(parsed)
+        return api_monitor.probe_server(parsed,
+                                        keep_alive=monitor.keep_alive,
+                                        layers=monitor.server_layers)
+
+
+class HostListMonitorStrategy(MonitorStrategy):
+    """Ping every host of a HOSTS monitor in one sweep."""
+
+    def __init__(self) -> None:
+        self._cache: Dict[str, Tuple[str, ...]] = {}
 
+    def run(self,
+            monitor: configuration.MonitorItem) -> Dict[str, ProbeResult]:
+        hosts = self._cache.get(monitor.url)
+        if hosts is None:
+            hosts = configuration.parse_host_list(monitor.url)
+            self._cache[monitor.url] = hosts
+        return icmp_sweep.sweep(hosts)
+
+
+class TcpMonitorStrategy(MonitorStrategy):
+    """Connect to every ``host:port`` of a TCP monitor at once.
+
+    A monitor with one target yields a single result; with several, one
+    result per ``host:port`` so each target gets its own state machine.
+    Each result names the address family that won the target's race.
+    """
+
+    def __init__(self) -> None:
+        self._cache: Dict[str, Tuple[Tuple[str, int], ...]] = {}
 
-class MonitorScheduler:
-    """Coordinate worker threads, execution strategies, and monitor state machines."""
+    def run(
+        self, monitor: configuration.MonitorItem
+    ) -> Union[ProbeResult, Dict[str, ProbeResult]]:
+        targets = self._cache.get(monitor.url)
+        if targets is None:
+            targets = configuration.parse_tcp_targets(monitor.url)
+            self._cache[monitor.url] = targets
+        outcomes = tcp_engine.shared_engine().connect_many(
+            targets, http_probe.resolve_timeout())
+
+        results: Dict[str, ProbeResult] = {}
+        for (host, port), outcome in outcomes.items():
+            label = tcp_target_label(host, port)
+            if isinstance(outcome, OSError):
+                LOGGER.warning("monitor.tcp.offline target=%s error=%s", label,
+                               outcome)
+                results[label] = ProbeResult(success=False)
+            else:
+                results[label] = ProbeResult(
+                    success=True,
+                    connect=outcome.connect_time,
+                    total=outcome.elapsed,
+                    family=dns_cache.family_label(outcome.family))
+        if len(results) == 1:
+            return next(iter(results.values()))
+        return results
+
+
+def tcp_target_label(host: str, port: int) -> str:
+    """Return how a TCP monitor names the target ``host:port``."""
+
+    return f"[{host}]:{port}" if ":" in host else f"{host}:{port}"
+
+
+def monitor_hosts(
+        monitors: Iterable[configuration.MonitorItem]) -> Tuple[str, ...]:
+    """Return the distinct host names ``monitors`` probe, in order.
+
+    Monitors whose address does not parse are skipped; they fail on their
+    first cycle instead.
+    """
+
+    hosts: list[str] = []
+    for monitor in monitors:
+        monitor_type = monitor.monitor_type.upper()
+        try:
+            if monitor_type == "HOSTS":
+                hosts.extend(configuration.parse_host_list(monitor.url))
+            elif monitor_type == "TCP":
+                hosts.extend(
+                    host
+                    for host, _ in configuration.parse_tcp_targets(monitor.url))
+            elif monitor_type == "SERVER":
+                hosts.append(parse_network_address(monitor.url)[1])
+            else:
+                hosts.append(urlsplit(monitor.url.strip()).hostname or "")
+        except ValueError:
+            continue
+    return tuple(host for host in dict.fromkeys(hosts) if host)
+
+
+class MonitorSchedulerBase:
+    """Shared state-machine, logging, and notification plumbing for schedulers.
+
+    Every event is written to the text log and, unless ``csv_log`` is off, to
+    the monitor's daily CSV; with a ``history`` store it is also recorded
+    there. The recent results of every monitor are kept in :attr:`timeseries`
+    (a fresh :class:`~monitoring.timeseries.TimeSeriesStore` unless one is
+    passed in) for live views.
+
+    ``overrun_policy``, ``phase_spread``, and ``start_jitter`` shape the
+    fixed-rate grid the subclasses' timing loops run monitors on, see
+    :class:`MonitorScheduler`.
+    """
 
     def __init__(
         self,
@@ -101,8 +228,31 @@ class MonitorScheduler:
         clock: Optional[Callable[[], _dt.datetime]] = None,
         templates: Optional[NotificationTemplates] = None,
         dispatcher: Optional[Callable[[NotificationMessage], None]] = None,
+        dns_prewarm: bool = False,
+        probe_share_window: Optional[float] = None,
+        history: Optional[HistoryStore] = None,
+        csv_log: bool = True,
+        timeseries: Optional[TimeSeriesStore] = None,
+        overrun_policy: Union[str, "OverrunPolicy"] = "coalesce",
+        phase_spread: bool = False,
+        start_jitter: float = 0.0,
+        jitter_source: Optional[Callable[[], float]] = None,
     ) -> None:
-        self._strategies: Dict[str, MonitorStrategy] = {}
+        if start_jitter < 0:
+            raise ValueError("start_jitter must not be negative")
+        self._overrun_policy = OverrunPolicy.parse(overrun_policy)
+        self._phase_spread = phase_spread
+        self._start_jitter = float(start_jitter)
+        self._jitter_source = jitter_source or random.random
+        self._strategies: Dict[str, object] = {}
+        self._dns_prewarm = dns_prewarm
+        self._history = history
+        self._csv_log = csv_log
+        self._timeseries = (TimeSeriesStore()
+                            if timeseries is None else timeseries)
+        # Monitors probing the same thing share probes unless this is None.
+        self._shared_probes = (None if probe_share_window is None else
+                               SharedProbes(probe_share_window))
         self._event_handler = event_handler or (lambda event: None)
         self._timezone_getter = timezone_getter or (lambda: 0)
 
@@ -112,104 +262,68 @@ class MonitorScheduler:
         self._clock = clock or _default_clock
         self._templates = templates or default_notification_templates()
         self._dispatcher = dispatcher or default_notification_dispatcher
-        self._threads: list[threading.Thread] = []
-        self._stop_event = threading.Event()
         self._state_machines: Dict[Hashable, MonitorStateMachine] = {}
-
-        self.register_strategy("GET", GetMonitorStrategy())
-        self.register_strategy("POST", PostMonitorStrategy())
-        self.register_strategy("SERVER", ServerMonitorStrategy())
-
-    def register_strategy(self, monitor_type: str,
-                          strategy: MonitorStrategy) -> None:
-        self._strategies[monitor_type.upper()] = strategy
-
-    def start(self, monitors: Iterable[configuration.MonitorItem]) -> None:
-        if self._threads:
-            raise RuntimeError("Scheduler is already running")
-
-        self._stop_event.clear()
-        for monitor in monitors:
-            strategy = self._strategies.get(monitor.monitor_type.upper())
-            if strategy is None:
-                raise ValueError(
-                    f"Unregistered monitor type {monitor.monitor_type}")
-
-            thread = threading.Thread(
-                name=monitor.name,
-                target=self._run_monitor,
-                args=(monitor, strategy),
-                daemon=True,
+        # Per-host machines of multi-host monitors, keyed like the above.
+        self._host_state_machines: Dict[Hashable,
+                                        Dict[str, MonitorStateMachine]] = {}
+
+    @property
+    def timeseries(self) -> TimeSeriesStore:
+        return self._timeseries
+
+    def _start_delay(self, entry: "_ScheduledMonitor") -> float:
+        interval_seconds = max(float(entry.monitor.interval), 0.0)
+        delay = 0.0
+        if self._phase_spread:
+            delay = phase_offset(entry.key, interval_seconds)
+        if self._start_jitter > 0:
+            delay += self._start_jitter * self._jitter_source()
+        if interval_seconds > 0:
+            delay %= interval_seconds
+        return delay
+
+    def _advance_tick(self, entry: "_ScheduledMonitor", now: float) -> float:
+        """Move ``entry`` to its next grid slot; return when to dispatch it."""
+
+        interval_seconds = max(float(entry.monitor.interval), 0.0)
+        if interval_seconds == 0:
+            entry.tick = now
+            return now
+
+        tick, dispatch_at, late, skipped = plan_next_tick(
+            entry.tick, now, interval_seconds, self._overrun_policy)
+        entry.tick = tick
+        entry.late += late
+        entry.skipped += skipped
+        if late or skipped:
+            LOGGER.debug(
+                "monitor.scheduler.overrun monitor=%s policy=%s late=%s skipped=%s",
+                entry.monitor.name,
+                self._overrun_policy.value,
+                late,
+                skipped,
             )
-            thread.start()
-            self._threads.append(thread)
+        return dispatch_at
 
-    def stop(self) -> None:
-        self._stop_event.set()
-        for thread in self._threads:
-            thread.join()
-        self._threads.clear()
-        self._state_machines.clear()
+    def _prewarm_dns(self,
+                     monitors: Iterable[configuration.MonitorItem]) -> None:
+        # Resolve every host in the background so first probes hit the cache.
+        if self._dns_prewarm:
+            dns_cache.prewarm(monitor_hosts(monitors))
 
-    def run_single_cycle(
-        self,
-        monitor: configuration.MonitorItem,
-        *,
-        strategy: Optional[MonitorStrategy] = None,
-    ) -> MonitorEvent:
-        """Run a single monitoring cycle for the provided item.
+    def _shared_probe_key(self, monitor: configuration.MonitorItem,
+                          strategy) -> Hashable:
+        return strategy, probe_key(monitor)
 
-        The scheduler's state machine, logging, and notification workflows are reused so
-        callers such as GUI timers can trigger an ad-hoc check without reimplementing the
-        bookkeeping that normally occurs in the background threads.
-        """
+    def register_strategy(self, monitor_type: str, strategy) -> None:
+        self._strategies[monitor_type.upper()] = strategy
 
+    def _resolve_strategy(self, monitor: configuration.MonitorItem):
+        strategy = self._strategies.get(monitor.monitor_type.upper())
         if strategy is None:
-            strategy = self._strategies.get(monitor.monitor_type.upper())
-            if strategy is None:
-                raise ValueError(
-                    f"Unregistered monitor type {monitor.monitor_type}")
-
-        key, state_machine = self._ensure_state_machine(monitor)
-
-        try:
-            success = bool(strategy.run(monitor))
-        except Exception as exc:  # pragma: no cover - defensive safeguard
-            success = False
-            self._log_strategy_error(monitor, exc)
-
-        utc_now, local_now = self._now()
-        event = state_machine.transition(success, utc_now, local_now)
-        self._handle_event(event)
-        return event
-
-    def _run_monitor(
-        self,
-        monitor: configuration.MonitorItem,
-        strategy: MonitorStrategy,
-    ) -> None:
-        key, state_machine = self._ensure_state_machine(monitor)
-
-        try:
-            while not self._stop_event.is_set():
-                try:
-                    success = bool(strategy.run(monitor))
-                except Exception as exc:  # pragma: no cover - defensive safeguard
-                    success = False
-                    self._log_strategy_error(monitor, exc)
-
-                utc_now, local_now = self._now()
-                event = state_machine.transition(success, utc_now, local_now)
-                self._handle_event(event)
-
-                interval_seconds = max(float(monitor.interval), 0.0)
-                if interval_seconds == 0:
-                    continue
-                if self._stop_event.wait(interval_seconds):
-                    break
-        finally:
-            # Remove finished monitoring state machines to avoid leaking references.
-            self._state_machines.pop(key, None)
+            raise ValueError(
+                f"Unregistered monitor type {monitor.monitor_type}")
+        return strategy
 
     def _monitor_key(self, monitor: configuration.MonitorItem) -> Hashable:
         """Generate a hashable key for caching the state machine instance."""
@@ -232,20 +346,70 @@ class MonitorScheduler:
             state_machine.update_monitor(monitor)
         return key, state_machine
 
+    def _fan_out(
+        self,
+        monitor: configuration.MonitorItem,
+        results: Mapping[str, Union[bool, ProbeResult]],
+    ) -> Optional[MonitorEvent]:
+        """Feed each host's result to its own state machine.
+
+        Every host is logged and notified as a monitor named
+        ``"<name> [<host>]"``. Return the first failing host's event, or the
+        last event when all hosts are up.
+        """
+
+        key = self._monitor_key(monitor)
+        machines = self._host_state_machines.setdefault(key, {})
+        for host in [host for host in machines if host not in results]:
+            del machines[host]
+
+        utc_now, local_now = self._now()
+        summary: Optional[MonitorEvent] = None
+        for host, outcome in results.items():
+            host_monitor = replace(monitor,
+                                   name=f"{monitor.name} [{host}]",
+                                   url=host)
+            state_machine = machines.get(host)
+            if state_machine is None:
+                state_machine = MonitorStateMachine(host_monitor,
+                                                    self._templates)
+                machines[host] = state_machine
+            else:
+                state_machine.update_monitor(host_monitor)
+            event = state_machine.transition(ProbeResult.coerce(outcome),
+                                             utc_now, local_now)
+            self._handle_event(event)
+            if summary is None or (summary.success and not event.success):
+                summary = event
+        return summary
+
+    def _discard_state_machines(self, key: Hashable) -> None:
+        machines = list(self._host_state_machines.pop(key, {}).values())
+        single = self._state_machines.pop(key, None)
+        if single is not None:
+            machines.append(single)
+        self._timeseries.discard(machine.monitor.name for machine in machines)
+
+    def _clear_state_machines(self) -> None:
+        self._state_machines.clear()
+        self._host_state_machines.clear()
+        self._timeseries.clear()
+
     def prune_state_machines(
             self, monitors: Iterable[configuration.MonitorItem]) -> None:
         """Drop state machines that no longer belong to the active monitor set."""
 
         active_keys = {self._monitor_key(monitor) for monitor in monitors}
         if not active_keys:
-            self._state_machines.clear()
+            self._clear_state_machines()
             return
 
         stale_keys = [
-            key for key in list(self._state_machines) if key not in active_keys
+            key for key in {*self._state_machines, *self._host_state_machines}
+            if key not in active_keys
         ]
         for key in stale_keys:
-            self._state_machines.pop(key, None)
+            self._discard_state_machines(key)
 
     def _now(self) -> tuple[_dt.datetime, _dt.datetime]:
         utc_now = self._clock()
@@ -258,8 +422,26 @@ class MonitorScheduler:
         return utc_now, local_now
 
     def _handle_event(self, event: MonitorEvent) -> None:
+        self._timeseries.record(event)
         self._write_logs(event)
         self._dispatch_notification(event)
+        self._notify_event_handler(event)
+
+    def _event_sinks(self) -> Dict[str, Callable[[MonitorEvent], None]]:
+        """Return the steps of :meth:`_handle_event` as named sinks."""
+
+        sinks: Dict[str, Callable[[MonitorEvent], None]] = {
+            "log": self._write_text_log
+        }
+        if self._csv_log:
+            sinks["csv"] = self._write_csv
+        if self._history is not None:
+            sinks["history"] = self._write_history
+        sinks["notification"] = self._dispatch_notification
+        sinks["ui"] = self._notify_event_handler
+        return sinks
+
+    def _notify_event_handler(self, event: MonitorEvent) -> None:
         try:
             self._event_handler(event)
         except Exception as exc:  # pragma: no cover - defensive safeguard
@@ -271,9 +453,21 @@ class MonitorScheduler:
             )
 
     def _write_logs(self, event: MonitorEvent) -> None:
+        self._write_text_log(event)
+        if self._csv_log:
+            self._write_csv(event)
+        if self._history is not None:
+            self._write_history(event)
+
+    def _write_text_log(self, event: MonitorEvent) -> None:
         log_recorder.record(event.log_action, event.log_detail)
+
+    def _write_csv(self, event: MonitorEvent) -> None:
         log_recorder.saveToFile(list(event.csv_row), event.monitor.name)
 
+    def _write_history(self, event: MonitorEvent) -> None:
+        self._history.record(event)
+
     def _dispatch_notification(self, event: MonitorEvent) -> None:
         if not event.notification:
             return
@@ -298,6 +492,514 @@ class MonitorScheduler:
         )
 
 
+class OverrunPolicy(Enum):
+    """Describe how the scheduler handles ticks missed by a long-running probe."""
+
+    SKIP = "skip"
+    COALESCE = "coalesce"
+    IMMEDIATE = "immediate"
+
+    @classmethod
+    def parse(cls, value: Union[str, "OverrunPolicy"]) -> "OverrunPolicy":
+        if isinstance(value, cls):
+            return value
+        text = str(value).strip().lower()
+        for member in cls:
+            if member.value == text:
+                return member
+        raise ValueError(f"Unknown overrun policy: {value}")
+
+
+@dataclass(frozen=True)
+class TickStats:
+    """Snapshot of a monitor's fixed-rate scheduling counters."""
+
+    runs: int
+    late: int
+    skipped: int
+    last_lateness: float
+
+
+def plan_next_tick(
+    tick: float,
+    now: float,
+    interval: float,
+    policy: OverrunPolicy,
+) -> Tuple[float, float, int, int]:
+    """Plan the run that follows the slot ``tick`` once a probe finishes at ``now``.
+
+    Return ``(next_tick, dispatch_at, late, skipped)``: the schedule slot the
+    next run belongs to, the monotonic time it should be dispatched, and how
+    many late and skipped ticks the decision adds to the monitor's counters.
+    """
+
+    next_tick = tick + interval
+    if next_tick >= now:
+        return next_tick, next_tick, 0, 0
+
+    missed = int((now - next_tick) // interval) + 1
+    if policy is OverrunPolicy.SKIP:
+        next_tick += missed * interval
+        return next_tick, next_tick, 0, missed
+    if policy is OverrunPolicy.COALESCE:
+        return next_tick + (missed - 1) * interval, now, 1, missed - 1
+    return next_tick, now, 1, 0
+
+
+def phase_offset(key: Hashable, interval: float) -> float:
+    """Map a monitor key to a stable offset within ``[0, interval)``.
+
+    CRC32 of the key's ``repr`` is used instead of ``hash()`` so the phase is
+    identical across restarts regardless of ``PYTHONHASHSEED``.
+    """
+
+    if interval <= 0:
+        return 0.0
+    digest = zlib.crc32(repr(key).encode("utf-8"))
+    return interval * (digest / 2**32)
+
+
+@dataclass(frozen=True)
+class ReconcileResult:
+    """Summarise how :meth:`MonitorScheduler.reconcile` changed the monitor set."""
+
+    added: Tuple[configuration.MonitorItem, ...] = ()
+    removed: Tuple[configuration.MonitorItem, ...] = ()
+    updated: Tuple[configuration.MonitorItem, ...] = ()
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed or self.updated)
+
+
+@dataclass
+class _ScheduledMonitor:
+    """Book-keeping for a monitor driven by the scheduler's timing loop."""
+
+    key: Hashable
+    monitor: configuration.MonitorItem
+    strategy: MonitorStrategy
+    tick: float = 0.0
+    next_due: float = 0.0
+    running: bool = False
+    runs: int = 0
+    late: int = 0
+    skipped: int = 0
+    last_lateness: float = 0.0
+
+    def stats(self) -> TickStats:
+        return TickStats(
+            runs=self.runs,
+            late=self.late,
+            skipped=self.skipped,
+            last_lateness=self.last_lateness,
+        )
+
+
+class MonitorScheduler(MonitorSchedulerBase):
+    """Coordinate the timing loop, worker pool, strategies, and state machines.
+
+    A single timing thread keeps a heap of next-due times and hands due
+    monitors to a fixed-size :class:`WorkerPool`. Runs are anchored to a
+    fixed-rate grid on the monotonic clock (``start + n * interval``), so probe
+    duration does not shift later runs. Each monitor has at most one cycle in
+    flight; when a probe overruns its slot, ``overrun_policy`` decides whether
+    the missed ticks are skipped, coalesced into one immediate run, or all run
+    back-to-back.
+
+    With ``phase_spread`` enabled each monitor's first run is delayed by a
+    deterministic offset within its interval (derived from the monitor key),
+    plus up to ``start_jitter`` seconds of random delay, so monitors sharing
+    an interval do not fire in lock-step. With ``dns_prewarm`` the host names
+    of started and added monitors are resolved into the shared DNS cache in
+    the background.
+
+    With ``probe_share_window`` set, monitors whose probes are identical (see
+    :func:`~monitoring.probe_sharing.probe_key`) share one in-flight probe
+    and reuse its result for that many seconds; each keeps its own state
+    machine, logs and alerts.
+
+    ``history`` and ``csv_log`` choose where events are stored, see
+    :class:`MonitorSchedulerBase`.
+
+    With ``event_queue_size`` set, events of a started scheduler are handed
+    to an :class:`~monitoring.event_pipeline.EventPipeline` instead of being
+    logged, notified and reported on the probe thread: each sink drains a
+    queue of that many events on its own thread, ``event_backpressure``
+    decides what happens when one is full, and :meth:`stop` drains the
+    queues. :meth:`run_single_cycle` outside a run still handles its event
+    inline.
+    """
+
+    def __init__(
+        self,
+        *,
+        event_handler: Optional[Callable[[MonitorEvent], None]] = None,
+        timezone_getter: Optional[Callable[[], int]] = None,
+        clock: Optional[Callable[[], _dt.datetime]] = None,
+        templates: Optional[NotificationTemplates] = None,
+        dispatcher: Optional[Callable[[NotificationMessage], None]] = None,
+        worker_count: Optional[int] = None,
+        overrun_policy: Union[str, OverrunPolicy] = OverrunPolicy.COALESCE,
+        phase_spread: bool = False,
+        start_jitter: float = 0.0,
+        jitter_source: Optional[Callable[[], float]] = None,
+        dns_prewarm: bool = False,
+        probe_share_window: Optional[float] = None,
+        history: Optional[HistoryStore] = None,
+        csv_log: bool = True,
+        timeseries: Optional[TimeSeriesStore] = None,
+        event_queue_size: Optional[int] = None,
+        event_backpressure: Union[str,
+                                  BackpressurePolicy] = BackpressurePolicy.BLOCK,
+    ) -> None:
+        super().__init__(
+            event_handler=event_handler,
+            timezone_getter=timezone_getter,
+            clock=clock,
+            templates=templates,
+            dispatcher=dispatcher,
+            dns_prewarm=dns_prewarm,
+            probe_share_window=probe_share_window,
+            history=history,
+            csv_log=csv_log,
+            timeseries=timeseries,
+            overrun_policy=overrun_policy,
+            phase_spread=phase_spread,
+            start_jitter=start_jitter,
+            jitter_source=jitter_source,
+        )
+        if worker_count is not None and worker_count < 0:
+            raise ValueError("worker_count must not be negative")
+        if event_queue_size is not None and event_queue_size < 1:
+            raise ValueError("event_queue_size must be a positive integer")
+        self._event_queue_size = event_queue_size
+        self._event_backpressure = BackpressurePolicy.parse(event_backpressure)
+        self._pipeline: Optional[EventPipeline] = None
+        self._last_event_stats: Dict[str, SinkStats] = {}
+        # ``None`` and ``0`` both size the pool to the monitor count.
+        self._worker_count = worker_count or 0
+        self._stop_event = threading.Event()
+        self._condition = threading.Condition()
+        self._due_heap: list[tuple[float, int, Hashable]] = []
+        self._sequence = itertools.count()
+        self._scheduled: Dict[Hashable, _ScheduledMonitor] = {}
+        self._timer_thread: Optional[threading.Thread] = None
+        self._pool: Optional[WorkerPool] = None
+
+        self.register_strategy("GET", GetMonitorStrategy())
+        self.register_strategy("POST", PostMonitorStrategy())
+        self.register_strategy("SERVER", ServerMonitorStrategy())
+        self.register_strategy("HOSTS", HostListMonitorStrategy())
+        self.register_strategy("TCP", TcpMonitorStrategy())
+
+    @property
+    def is_running(self) -> bool:
+        return self._timer_thread is not None
+
+    def start(self, monitors: Iterable[configuration.MonitorItem]) -> None:
+        if self._timer_thread is not None:
+            raise RuntimeError("Scheduler is already running")
+
+        monitors = list(monitors)
+        entries = [
+            _ScheduledMonitor(
+                key=self._monitor_key(monitor),
+                monitor=monitor,
+                strategy=self._resolve_strategy(monitor),
+            ) for monitor in monitors
+        ]
+        self._prewarm_dns(monitors)
+
+        pool_size = self._worker_count or len(entries)
+        # A fresh event per run: workers abandoned by a timed-out stop() keep
+        # seeing their own run as stopped after the scheduler is restarted.
+        self._stop_event = threading.Event()
+        if self._event_queue_size is not None:
+            self._pipeline = EventPipeline(self._event_sinks(),
+                                           capacity=self._event_queue_size,
+                                           policy=self._event_backpressure)
+            self._pipeline.start()
+        self._pool = WorkerPool(max(pool_size, 1))
+        now = time.monotonic()
+        with self._condition:
+            self._due_heap.clear()
+            self._scheduled.clear()
+            for entry in entries:
+                self._scheduled[entry.key] = entry
+                first_run = now + self._start_delay(entry)
+                entry.tick = first_run
+                self._push_locked(entry, first_run)
+
+        self._timer_thread = threading.Thread(
+            name="MonitorScheduler",
+            target=self._timing_loop,
+            args=(self._stop_event, ),
+            daemon=True,
+        )
+        self._timer_thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> tuple[str, ...]:
+        """Stop scheduling and wait for in-flight probes to finish.
+
+        ``timeout`` bounds the whole shutdown in seconds (``None`` waits
+        indefinitely). Probes still running at the deadline are abandoned: their
+        daemon worker threads are left to finish on their own and their results
+        are discarded without logging or notifying. Queued events are then
+        delivered within what is left of ``timeout``. Return the names of the
+        abandoned monitors.
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def remaining() -> Optional[float]:
+            if deadline is None:
+                return None
+            return max(deadline - time.monotonic(), 0.0)
+
+        self._stop_event.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._timer_thread is not None:
+            self._timer_thread.join(remaining())
+            self._timer_thread = None
+
+        abandoned: tuple[str, ...] = ()
+        if self._pool is not None:
+            if not self._pool.shutdown(remaining()):
+                with self._condition:
+                    abandoned = tuple(entry.monitor.name
+                                      for entry in self._scheduled.values()
+                                      if entry.running)
+                LOGGER.warning(
+                    "monitor.scheduler.stop_timeout timeout=%s abandoned=%s",
+                    timeout,
+                    ",".join(abandoned),
+                )
+            self._pool = None
+        pipeline, self._pipeline = self._pipeline, None
+        if pipeline is not None:
+            pipeline.close(remaining())
+            self._last_event_stats = pipeline.stats()
+        with self._condition:
+            self._due_heap.clear()
+            self._scheduled.clear()
+        self._clear_state_machines()
+        return abandoned
+
+    def reconcile(
+        self, monitors: Iterable[configuration.MonitorItem]
+    ) -> ReconcileResult:
+        """Bring the running monitor set in line with ``monitors``.
+
+        Monitors are matched by :meth:`_monitor_key`. New keys are scheduled,
+        vanished keys are dropped (an in-flight cycle finishes but is not
+        rescheduled), and entries whose :class:`MonitorItem` changed are
+        swapped in place so their state machine and tick counters survive.
+        Starts the scheduler when it is not running yet.
+        """
+
+        monitors = list(monitors)
+        if self._timer_thread is None:
+            self.start(monitors)
+            return ReconcileResult(added=tuple(monitors))
+
+        desired: Dict[Hashable, configuration.MonitorItem] = {}
+        for monitor in monitors:
+            desired[self._monitor_key(monitor)] = monitor
+        strategies = {
+            key: self._resolve_strategy(monitor)
+            for key, monitor in desired.items()
+        }
+
+        added: list[configuration.MonitorItem] = []
+        removed: list[configuration.MonitorItem] = []
+        updated: list[configuration.MonitorItem] = []
+        now = time.monotonic()
+        with self._condition:
+            for key in [key for key in self._scheduled if key not in desired]:
+                entry = self._scheduled.pop(key)
+                removed.append(entry.monitor)
+                if not entry.running:
+                    self._discard_state_machines(key)
+
+            for key, monitor in desired.items():
+                entry = self._scheduled.get(key)
+                if entry is None:
+                    entry = _ScheduledMonitor(key=key,
+                                              monitor=monitor,
+                                              strategy=strategies[key])
+                    self._scheduled[key] = entry
+                    first_run = now + self._start_delay(entry)
+                    entry.tick = first_run
+                    self._push_locked(entry, first_run)
+                    added.append(monitor)
+                elif entry.monitor != monitor:
+                    self._swap_monitor_locked(entry, monitor, now)
+                    updated.append(monitor)
+
+            if not self._worker_count:
+                self._pool.resize(max(len(self._scheduled), 1))
+        self._prewarm_dns(added)
+
+        result = ReconcileResult(
+            added=tuple(added),
+            removed=tuple(removed),
+            updated=tuple(updated),
+        )
+        LOGGER.info(
+            "monitor.scheduler.reconcile added=%s removed=%s updated=%s",
+            len(result.added),
+            len(result.removed),
+            len(result.updated),
+        )
+        return result
+
+    def _swap_monitor_locked(self, entry: _ScheduledMonitor,
+                             monitor: configuration.MonitorItem,
+                             now: float) -> None:
+        old_interval = max(float(entry.monitor.interval), 0.0)
+        new_interval = max(float(monitor.interval), 0.0)
+        entry.monitor = monitor
+        state_machine = self._state_machines.get(entry.key)
+        if state_machine is not None:
+            state_machine.update_monitor(monitor)
+        if entry.running or old_interval == new_interval:
+            # A running cycle picks the new interval up when it reschedules.
+            return
+        tick = max(entry.tick - old_interval + new_interval, now)
+        entry.tick = tick
+        self._push_locked(entry, tick)
+
+    def tick_stats(self) -> Dict[Hashable, TickStats]:
+        """Return late/skipped tick counters for every scheduled monitor."""
+
+        with self._condition:
+            return {
+                key: entry.stats()
+                for key, entry in self._scheduled.items()
+            }
+
+    def event_stats(self) -> Dict[str, SinkStats]:
+        """Return per-sink counters and lag of the event pipeline.
+
+        After :meth:`stop` this is the final state of the last run; it is
+        empty when events are handled inline.
+        """
+
+        pipeline = self._pipeline
+        if pipeline is None:
+            return dict(self._last_event_stats)
+        return pipeline.stats()
+
+    def run_single_cycle(
+        self,
+        monitor: configuration.MonitorItem,
+        *,
+        strategy: Optional[MonitorStrategy] = None,
+    ) -> MonitorEvent:
+        """Run a single monitoring cycle for the provided item.
+
+        The scheduler's state machine, logging, and notification workflows are reused so
+        callers such as GUI timers can trigger an ad-hoc check without reimplementing the
+        bookkeeping that normally occurs in the worker pool.
+        """
+
+        if strategy is None:
+            strategy = self._resolve_strategy(monitor)
+        return self._run_cycle(monitor, strategy)
+
+    def _run_cycle(
+        self,
+        monitor: configuration.MonitorItem,
+        strategy: MonitorStrategy,
+        stop_event: Optional[threading.Event] = None,
+    ) -> Optional[MonitorEvent]:
+        try:
+            if self._shared_probes is None:
+                result = strategy.run(monitor)
+            else:
+                result = self._shared_probes.run(
+                    self._shared_probe_key(monitor, strategy),
+                    lambda: strategy.run(monitor))
+            if not isinstance(result, Mapping):
+                result = ProbeResult.coerce(result)
+        except Exception as exc:  # pragma: no cover - defensive safeguard
+            result = ProbeResult(success=False)
+            self._log_strategy_error(monitor, exc)
+
+        if stop_event is not None and stop_event.is_set():
+            LOGGER.info("monitor.scheduler.result_discarded monitor=%s",
+                        monitor.name)
+            return None
+
+        if isinstance(result, Mapping):
+            return self._fan_out(monitor, result)
+        _, state_machine = self._ensure_state_machine(monitor)
+        utc_now, local_now = self._now()
+        event = state_machine.transition(result, utc_now, local_now)
+        self._handle_event(event)
+        return event
+
+    def _handle_event(self, event: MonitorEvent) -> None:
+        pipeline = self._pipeline
+        if pipeline is None:
+            super()._handle_event(event)
+        else:
+            # Appending is O(1), so the live series stays on the probe thread.
+            self._timeseries.record(event)
+            pipeline.publish(event)
+
+    def _push_locked(self, entry: _ScheduledMonitor, due: float) -> None:
+        entry.next_due = due
+        heapq.heappush(self._due_heap, (due, next(self._sequence), entry.key))
+        self._condition.notify()
+
+    def _timing_loop(self, stop_event: threading.Event) -> None:
+        with self._condition:
+            while not stop_event.is_set():
+                if not self._due_heap:
+                    self._condition.wait()
+                    continue
+
+                due, _, key = self._due_heap[0]
+                delay = due - time.monotonic()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+
+                heapq.heappop(self._due_heap)
+                entry = self._scheduled.get(key)
+                if entry is None or entry.running or entry.next_due != due:
+                    continue
+                entry.running = True
+                entry.runs += 1
+                entry.last_lateness = max(time.monotonic() - entry.tick, 0.0)
+                self._pool.submit(self._run_monitor, entry, stop_event)
+
+    def _run_monitor(self, entry: _ScheduledMonitor,
+                     stop_event: threading.Event) -> None:
+        try:
+            if not stop_event.is_set():
+                self._run_cycle(entry.monitor, entry.strategy, stop_event)
+        finally:
+            with self._condition:
+                entry.running = False
+                if stop_event.is_set():
+                    # Stopped, or abandoned by a timed-out stop(); the
+                    # scheduler state may already belong to a newer run.
+                    pass
+                elif self._scheduled.get(entry.key) is not entry:
+                    # Removed by reconcile() while the probe was in flight.
+                    if entry.key not in self._scheduled:
+                        self._discard_state_machines(entry.key)
+                else:
+                    self._reschedule_locked(entry)
+
+    def _reschedule_locked(self, entry: _ScheduledMonitor) -> None:
+        self._push_locked(entry, self._advance_tick(entry, time.monotonic()))
+
+
 def default_notification_templates() -> NotificationTemplates:
     return NotificationTemplates(
         channel="email",
@@ -9,13 +9,14 @@ from __future__ import annotations
 import datetime as _dt
 from dataclasses import dataclass
 from enum import Enum
-from typing import Callable, Dict, Optional, Tuple
-
-from PySide6 import QtCore
+from typing import Callable, Dict, Optional, Tuple, Union
 
 import configuration
 from configuration import MonitorItem
 
+from .i18n import translate
+from .probe_result import ProbeResult
+
 
 class MonitorState(Enum):
     """Describe the business state produced by a monitor run."""
@@ -36,7 +37,6 @@ class MonitorState(Enum):
 
     @property
     def display_text(self) -> str:
-        translate = QtCore.QCoreApplication.translate
         return {
             MonitorState.HEALTHY:
             translate("MonitorState", "Service healthy"),
@@ -50,7 +50,6 @@ class MonitorState(Enum):
 
     @property
     def csv_label(self) -> str:
-        translate = QtCore.QCoreApplication.translate
         return {
             MonitorState.HEALTHY:
             translate("MonitorState", "Healthy"),
@@ -64,7 +63,6 @@ class MonitorState(Enum):
 
     @property
     def status_bar_text(self) -> str:
-        translate = QtCore.QCoreApplication.translate
         if self in (MonitorState.HEALTHY, MonitorState.RECOVERED):
             return translate("MonitorState", ">>>Running...")
         return translate("MonitorState", "Service outage detected")
@@ -104,6 +102,7 @@ class MonitorEvent:
     csv_row: Tuple[object, ...]
     notification: Optional[NotificationMessage]
     is_status_change: bool
+    probe: ProbeResult
 
 
 class MonitorStateMachine:
@@ -127,10 +126,14 @@ class MonitorStateMachine:
 
     def transition(
         self,
-        success: bool,
+        outcome: Union[bool, ProbeResult],
         utc_time: _dt.datetime,
         local_time: _dt.datetime,
     ) -> MonitorEvent:
+        """Advance the state from ``outcome``, a :class:`ProbeResult` or bool."""
+
+        probe = ProbeResult.coerce(outcome)
+        success = probe.success
         previous_success = self._last_success
         self._last_success = success
 
@@ -159,7 +162,7 @@ class MonitorStateMachine:
             context["interval"],
             context["status_code"],
             context["status_text"],
-        )
+        ) + probe.csv_fields()
         status_bar_message = self._build_status_bar_message(state)
 
         return MonitorEvent(
@@ -175,6 +178,7 @@ class MonitorStateMachine:
             csv_row=csv_row,
             notification=notification,
             is_status_change=success != previous_success,
+            probe=probe,
         )
 
     def _build_context(self, state: MonitorState,
@@ -0,0 +1,378 @@
+# -*- codeing = utf-8 -*-
+# @Create: 2026-10-17 7:50 p.m.
+# @Update: 2026-10-17 9:00 p.m.
+# @Author: John Zhao
+"""Non-blocking TCP connect prober shared by every socket check.
+
+A single :class:`TcpConnectEngine` thread waits on a ``selectors`` selector
+(epoll on Linux) for any number of in-flight non-blocking connects and fails
+those still pending when their deadline passes. Callers start a connect with
+:meth:`TcpConnectEngine.start` and block only on their own
+:class:`ConnectAttempt`, so thousands of targets need one engine thread rather
+than one thread each; :meth:`TcpConnectEngine.connect_many` starts a whole
+batch and collects it under one deadline.
+
+A host with several addresses is raced Happy Eyeballs style (RFC 8305): the
+addresses are tried in :func:`~monitoring.dns_cache.interleave_families`
+order, a new attempt starts every ``attempt_delay`` seconds or as soon as the
+previous one fails, and the first socket to connect wins.
+"""
+
+from __future__ import annotations
+
+import collections
+import errno
+import heapq
+import itertools
+import logging
+import os
+import selectors
+import socket
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from . import dns_cache
+
+LOGGER = logging.getLogger(__name__)
+
+# Extra time a caller waits past the deadline for the engine to report it.
+WAIT_GRACE_SECONDS = 1.0
+# RFC 8305 "Connection Attempt Delay": head start of each racing address.
+CONNECTION_ATTEMPT_DELAY = 0.25
+
+# Heap entry kinds.
+_DEADLINE = 0
+_NEXT_ADDRESS = 1
+
+_IN_PROGRESS = frozenset({errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY})
+
+_SHARED_ENGINE: Optional["TcpConnectEngine"] = None
+_SHARED_ENGINE_LOCK = threading.Lock()
+
+
+class ConnectAttempt:
+    """One raced connect to a host; finished by the engine thread.
+
+    Once it succeeded, ``family`` and ``address`` name the winning address,
+    ``connect_time`` is that socket's own connect time and ``elapsed`` covers
+    the whole race.
+    """
+
+    __slots__ = ("target", "timeout", "started", "deadline", "elapsed",
+                 "error", "family", "address", "connect_time", "_candidates",
+                 "_sockets", "_last_error", "_event")
+
+    def __init__(self, target: Tuple[str, int], timeout: float,
+                 candidates: Iterable[tuple]) -> None:
+        self.target = target
+        self.timeout = timeout
+        self.started = time.perf_counter()
+        self.deadline = time.monotonic() + timeout
+        self.elapsed: Optional[float] = None
+        self.error: Optional[OSError] = None
+        self.family: Optional[int] = None
+        self.address: Optional[tuple] = None
+        self.connect_time: Optional[float] = None
+        self._candidates = collections.deque(candidates)
+        # In-flight sockets -> (family, sockaddr, launch time).
+        self._sockets: Dict[socket.socket, Tuple[int, tuple, float]] = {}
+        self._last_error: Optional[OSError] = None
+        self._event = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> float:
+        """Return the connect time in seconds or raise the connect error.
+
+        ``timeout`` defaults to the attempt's own timeout plus a grace
+        period; a connect that is still open after it raises ``TimeoutError``.
+        """
+
+        if timeout is None:
+            timeout = self.timeout + WAIT_GRACE_SECONDS
+        if not self._event.wait(max(timeout, 0.0)):
+            raise TimeoutError(f"connect to {self.target[0]}:{self.target[1]} "
+                               "timed out")
+        if self.error is not None:
+            raise self.error
+        return self.elapsed
+
+    def _launch(self) -> Optional[socket.socket]:
+        """Start connecting to the next address; return it while pending.
+
+        Addresses that fail straight away (no route, refused locally) are
+        skipped. An immediate connect wins the race on the spot.
+        """
+
+        while self._candidates and self.family is None:
+            family, sock_type, proto, _, sockaddr = self._candidates.popleft()
+            try:
+                sock = socket.socket(family, sock_type, proto)
+            except OSError as exc:
+                self._last_error = exc
+                continue
+            launched = time.perf_counter()
+            try:
+                sock.setblocking(False)
+                code = sock.connect_ex(sockaddr)
+            except OSError as exc:
+                sock.close()
+                self._last_error = exc
+                continue
+            if code == 0:
+                sock.close()
+                self._won(family, sockaddr, launched)
+                return None
+            if code in _IN_PROGRESS:
+                self._sockets[sock] = (family, sockaddr, launched)
+                return sock
+            sock.close()
+            self._last_error = OSError(code, os.strerror(code))
+        return None
+
+    def _won(self, family: int, sockaddr: tuple, launched: float) -> None:
+        self.family = family
+        self.address = sockaddr
+        self.connect_time = time.perf_counter() - launched
+
+    def _finish(self, error: Optional[OSError]) -> None:
+        if self._event.is_set():
+            return
+        sockets = list(self._sockets)
+        self._sockets.clear()
+        for sock in sockets:
+            sock.close()
+        self.elapsed = time.perf_counter() - self.started
+        self.error = error
+        self._event.set()
+
+
+class TcpConnectEngine:
+    """Drive many non-blocking TCP connects from one selector thread."""
+
+    def __init__(self,
+                 *,
+                 attempt_delay: float = CONNECTION_ATTEMPT_DELAY) -> None:
+        self._attempt_delay = attempt_delay
+        self._lock = threading.Lock()
+        self._incoming: List[ConnectAttempt] = []
+        self._deadlines: List[Tuple[float, int, ConnectAttempt, int]] = []
+        self._order = itertools.count()
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._wake_reader: Optional[socket.socket] = None
+        self._wake_writer: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def start(self, host: str, port: int, timeout: float) -> ConnectAttempt:
+        """Resolve ``host`` and begin connecting without blocking on it.
+
+        Name resolution goes through :mod:`monitoring.dns_cache` on the
+        calling thread and its ``socket.gaierror`` propagates; connect
+        failures are reported by :meth:`ConnectAttempt.wait`.
+        """
+
+        timeout = max(float(timeout), 0.0)
+        candidates = dns_cache.interleave_families(
+            dns_cache.getaddrinfo(host, port))
+        attempt = ConnectAttempt((host, port), timeout, candidates)
+        attempt._launch()
+        if attempt.family is not None:
+            attempt._finish(None)
+        elif not attempt._sockets:
+            attempt._finish(attempt._last_error)
+        else:
+            with self._lock:
+                if self._closed:
+                    attempt._finish(OSError("TCP connect engine is closed"))
+                    return attempt
+                self._ensure_thread_locked()
+                self._incoming.append(attempt)
+            self._wake()
+        return attempt
+
+    def connect_many(
+        self,
+        targets: Iterable[Tuple[str, int]],
+        timeout: float,
+    ) -> Dict[Tuple[str, int], Union[ConnectAttempt, OSError]]:
+        """Connect to every target at once.
+
+        Map each target to its finished :class:`ConnectAttempt`, or to the
+        error it failed with.
+        """
+
+        attempts: Dict[Tuple[str, int], Union[ConnectAttempt, OSError]] = {}
+        for target in dict.fromkeys(targets):
+            try:
+                attempts[target] = self.start(target[0], target[1], timeout)
+            except OSError as exc:
+                attempts[target] = exc
+
+        results: Dict[Tuple[str, int], Union[ConnectAttempt, OSError]] = {}
+        for target, attempt in attempts.items():
+            if isinstance(attempt, OSError):
+                results[target] = attempt
+                continue
+            try:
+                attempt.wait()
+                results[target] = attempt
+            except OSError as exc:
+                results[target] = exc
+        return results
+
+    def close(self) -> None:
+        """Stop the engine thread and fail every connect still in flight."""
+
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        self._wake()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(2.0)
+        with self._lock:
+            pending = [entry[2] for entry in self._deadlines] + self._incoming
+            self._deadlines.clear()
+            self._incoming.clear()
+        for attempt in pending:
+            attempt._finish(OSError("TCP connect engine is closed"))
+        if self._selector is not None:
+            self._selector.close()
+        for wake_socket in (self._wake_reader, self._wake_writer):
+            if wake_socket is not None:
+                wake_socket.close()
+
+    def _ensure_thread_locked(self) -> None:
+        if self._thread is not None:
+            return
+        self._selector = selectors.DefaultSelector()
+        self._wake_reader, self._wake_writer = socket.socketpair()
+        self._wake_reader.setblocking(False)
+        self._selector.register(self._wake_reader, selectors.EVENT_READ, None)
+        self._thread = threading.Thread(target=self._run,
+                                        name="TcpConnectEngine",
+                                        daemon=True)
+        self._thread.start()
+
+    def _wake(self) -> None:
+        if self._wake_writer is None:
+            return
+        try:
+            self._wake_writer.send(b"\0")
+        except OSError:
+            pass
+
+    def _run(self) -> None:
+        while not self._closed:
+            timeout = None
+            if self._deadlines:
+                timeout = max(self._deadlines[0][0] - time.monotonic(), 0.0)
+            try:
+                events = self._selector.select(timeout)
+            except (OSError, ValueError):
+                return
+            for key, _ in events:
+                attempt = key.data
+                if attempt is None:
+                    self._accept_incoming()
+                elif not attempt.done:
+                    self._connected(attempt, key.fileobj)
+            self._fire_timers(time.monotonic())
+
+    def _accept_incoming(self) -> None:
+        try:
+            while self._wake_reader.recv(512):
+                pass
+        except OSError:
+            pass
+        with self._lock:
+            incoming, self._incoming = self._incoming, []
+        for attempt in incoming:
+            if attempt.done:
+                continue
+            for sock in attempt._sockets:
+                self._selector.register(sock, selectors.EVENT_WRITE, attempt)
+            self._push(attempt.deadline, attempt, _DEADLINE)
+            if attempt._candidates:
+                self._push(time.monotonic() + self._attempt_delay, attempt,
+                           _NEXT_ADDRESS)
+
+    def _push(self, when: float, attempt: ConnectAttempt, kind: int) -> None:
+        heapq.heappush(self._deadlines, (when, next(self._order), attempt, kind))
+
+    def _connected(self, attempt: ConnectAttempt, sock: socket.socket) -> None:
+        self._selector.unregister(sock)
+        family, sockaddr, launched = attempt._sockets.pop(sock)
+        code = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        sock.close()
+        if code == 0:
+            attempt._won(family, sockaddr, launched)
+            self._settle(attempt, None)
+            return
+        attempt._last_error = OSError(code, os.strerror(code))
+        # A failed address hands over to the next one without waiting.
+        self._launch_next(attempt)
+
+    def _launch_next(self, attempt: ConnectAttempt) -> None:
+        sock = attempt._launch()
+        if attempt.family is not None:
+            self._settle(attempt, None)
+        elif sock is not None:
+            self._selector.register(sock, selectors.EVENT_WRITE, attempt)
+            if attempt._candidates:
+                self._push(time.monotonic() + self._attempt_delay, attempt,
+                           _NEXT_ADDRESS)
+        elif not attempt._sockets:
+            self._settle(attempt, attempt._last_error)
+
+    def _settle(self, attempt: ConnectAttempt,
+                error: Optional[OSError]) -> None:
+        for sock in attempt._sockets:
+            self._selector.unregister(sock)
+        attempt._finish(error)
+
+    def _fire_timers(self, now: float) -> None:
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, _, attempt, kind = heapq.heappop(self._deadlines)
+            if attempt.done:
+                continue
+            if kind == _NEXT_ADDRESS:
+                self._launch_next(attempt)
+                continue
+            self._settle(
+                attempt,
+                TimeoutError(f"connect to {attempt.target[0]}:"
+                             f"{attempt.target[1]} timed out"))
+
+
+def shared_engine() -> TcpConnectEngine:
+    """Return the process-wide engine, creating it on first use."""
+
+    global _SHARED_ENGINE
+    with _SHARED_ENGINE_LOCK:
+        if _SHARED_ENGINE is None:
+            _SHARED_ENGINE = TcpConnectEngine()
+        return _SHARED_ENGINE
+
+
+def reset_shared_engine() -> None:
+    """Close the shared engine; the next connect starts a fresh one."""
+
+    global _SHARED_ENGINE
+    with _SHARED_ENGINE_LOCK:
+        engine, _SHARED_ENGINE = _SHARED_ENGINE, None
+    if engine is not None:
+        engine.close()
+
+
+__all__ = [
+    "ConnectAttempt",
+    "TcpConnectEngine",
+    "reset_shared_engine",
+    "shared_engine",
+]
@@ -0,0 +1,214 @@
+# -*- codeing = utf-8 -*-
+# @Create: 2026-10-17 11:50 p.m.
+# @Update: 2026-10-17 11:55 p.m.
+# @Author: John Zhao
+"""Recent results of every monitor, kept in fixed-size arrays.
+
+A :class:`MonitorSeries` is a ring buffer of ``capacity`` samples stored in
+four preallocated :mod:`array` columns: the UTC timestamp and total latency
+as doubles, the HTTP status code as an unsigned short and the success flag as
+a byte. That is :data:`SAMPLE_BYTES` (19) bytes per sample, so the default
+1024 samples take about 19 KiB per monitor and never grow. Appending
+overwrites the oldest sample in O(1); :meth:`MonitorSeries.summary`
+aggregates the newest samples of a time window.
+"""
+
+from __future__ import annotations
+
+import datetime as _dt
+import math
+import sys
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from .epoch import from_epoch, to_epoch
+from .state_machine import MonitorEvent
+
+DEFAULT_CAPACITY = 1024
+SAMPLE_BYTES = 8 + 8 + 2 + 1
+
+_NO_LATENCY = math.nan
+_NO_STATUS_CODE = 0
+
+
+@dataclass(frozen=True)
+class SeriesSummary:
+    """Aggregates of the samples in one window.
+
+    ``availability`` is the percentage of successful samples and is ``None``
+    for an empty window, as are the latencies when no sample measured one.
+    Latencies are in seconds. ``last_change`` is the UTC time of the most
+    recent outage or recovery, even when it is older than the window.
+    """
+
+    samples: int
+    availability: Optional[float]
+    mean_latency: Optional[float]
+    max_latency: Optional[float]
+    last_change: Optional[_dt.datetime]
+
+
+class MonitorSeries:
+    """Ring buffer of one monitor's recent results. Not thread-safe."""
+
+    __slots__ = ("_capacity", "_times", "_latencies", "_codes", "_successes",
+                 "_next", "_size", "_last_change")
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be a positive integer")
+        self._capacity = capacity
+        # Repeating a one-item array allocates exactly ``capacity`` items.
+        self._times = array("d", [0.0]) * capacity
+        self._latencies = array("d", [0.0]) * capacity
+        self._codes = array("H", [0]) * capacity
+        self._successes = array("b", [0]) * capacity
+        self._next = 0
+        self._size = 0
+        self._last_change: Optional[float] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def append(self,
+               timestamp: float,
+               latency: Optional[float],
+               status_code: Optional[int],
+               success: bool,
+               changed: bool = False) -> None:
+        """Store a sample, overwriting the oldest once the buffer is full.
+
+        ``timestamp`` is in UTC epoch seconds and should not decrease.
+        """
+
+        index = self._next
+        self._times[index] = timestamp
+        self._latencies[index] = _NO_LATENCY if latency is None else latency
+        self._codes[index] = (_NO_STATUS_CODE if status_code is None else
+                              min(max(int(status_code), 0), 0xFFFF))
+        self._successes[index] = 1 if success else 0
+        self._next = (index + 1) % self._capacity
+        if self._size < self._capacity:
+            self._size += 1
+        if changed:
+            self._last_change = timestamp
+
+    def append_event(self, event: MonitorEvent) -> None:
+        self.append(to_epoch(event.utc_time), event.probe.total,
+                    event.probe.status_code, event.success,
+                    event.is_status_change)
+
+    def summary(self,
+                window: Optional[float] = None,
+                now: Optional[float] = None) -> SeriesSummary:
+        """Aggregate the samples of the last ``window`` seconds before ``now``.
+
+        Without ``window`` every stored sample counts. ``now`` defaults to
+        the current time. The cost grows with the samples in the window, not
+        with the capacity.
+        """
+
+        cutoff = -math.inf
+        if window is not None:
+            cutoff = (time.time() if now is None else now) - window
+        samples = successes = measured = 0
+        total = 0.0
+        peak = -math.inf
+        index = self._next
+        for _ in range(self._size):
+            index = (index - 1) % self._capacity
+            if self._times[index] < cutoff:
+                break
+            samples += 1
+            successes += self._successes[index]
+            latency = self._latencies[index]
+            if latency == latency:  # NaN marks a missing latency.
+                measured += 1
+                total += latency
+                if latency > peak:
+                    peak = latency
+        return SeriesSummary(
+            samples=samples,
+            availability=100.0 * successes / samples if samples else None,
+            mean_latency=total / measured if measured else None,
+            max_latency=peak if measured else None,
+            last_change=(None if self._last_change is None else
+                         from_epoch(self._last_change)),
+        )
+
+    def status_codes(self) -> List[int]:
+        """Return the stored status codes, oldest first (``0`` for none)."""
+
+        start = (self._next - self._size) % self._capacity
+        return [
+            self._codes[(start + offset) % self._capacity]
+            for offset in range(self._size)
+        ]
+
+    def nbytes(self) -> int:
+        """Return the memory held by the sample arrays, headers included."""
+
+        return sum(
+            sys.getsizeof(column) for column in (self._times,
+                                                 self._latencies, self._codes,
+                                                 self._successes))
+
+
+class TimeSeriesStore:
+    """A :class:`MonitorSeries` per monitor name, safe to share between threads."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be a positive integer")
+        self._capacity = capacity
+        self._lock = threading.Lock()
+        self._series: Dict[str, MonitorSeries] = {}
+
+    def record(self, event: MonitorEvent) -> None:
+        name = event.monitor.name
+        with self._lock:
+            series = self._series.get(name)
+            if series is None:
+                series = self._series[name] = MonitorSeries(self._capacity)
+            series.append_event(event)
+
+    def summary(self,
+                name: str,
+                window: Optional[float] = None,
+                now: Optional[float] = None) -> Optional[SeriesSummary]:
+        """Return ``name``'s aggregates, or ``None`` when it has no samples."""
+
+        with self._lock:
+            series = self._series.get(name)
+            if series is None:
+                return None
+            return series.summary(window, now)
+
+    def monitors(self) -> List[str]:
+        with self._lock:
+            return sorted(self._series)
+
+    def discard(self, names: Iterable[str]) -> None:
+        with self._lock:
+            for name in names:
+                self._series.pop(name, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+__all__ = [
+    "DEFAULT_CAPACITY",
+    "MonitorSeries",
+    "SAMPLE_BYTES",
+    "SeriesSummary",
+    "TimeSeriesStore",
+]
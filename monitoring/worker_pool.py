@@ -0,0 +1,121 @@
+# -*- codeing = utf-8 -*-
+# @Create: 2026-10-17 9:12 a.m.
+# @Update: 2026-10-17 9:12 a.m.
+# @Author: John Zhao
+"""Fixed-size pool of daemon worker threads used by the monitoring scheduler."""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+_SHUTDOWN = object()
+
+
+class WorkerPool:
+    """Run submitted callables on a bounded set of daemon threads.
+
+    Workers are spawned lazily, one per submission that finds no idle worker,
+    until ``size`` threads exist. Daemon threads are used on purpose so that a
+    probe stuck inside a blocking call can never keep the interpreter alive.
+    """
+
+    def __init__(self, size: int, *, name: str = "MonitorWorker") -> None:
+        if size <= 0:
+            raise ValueError("Worker pool size must be a positive integer")
+        self._size = int(size)
+        self._name = name
+        self._queue: "queue.SimpleQueue[object]" = queue.SimpleQueue()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._idle = 0
+        self._closed = False
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def thread_count(self) -> int:
+        with self._lock:
+            return len(self._threads)
+
+    def resize(self, size: int) -> None:
+        """Change the maximum number of workers.
+
+        Growing takes effect on the next submissions; shrinking only stops new
+        workers from being spawned, existing ones keep running.
+        """
+
+        if size <= 0:
+            raise ValueError("Worker pool size must be a positive integer")
+        with self._lock:
+            self._size = int(size)
+
+    def submit(self, func: Callable[..., object], *args: object) -> None:
+        """Queue ``func(*args)`` for execution on the next free worker."""
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Worker pool has been shut down")
+            self._queue.put((func, args))
+            if self._idle > 0:
+                self._idle -= 1
+            elif len(self._threads) < self._size:
+                self._spawn_locked()
+
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """Stop accepting work and wait for the workers to exit.
+
+        Return ``True`` when every worker finished within ``timeout`` seconds;
+        ``False`` means at least one worker is still busy and was abandoned.
+        """
+
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                for _ in self._threads:
+                    self._queue.put(_SHUTDOWN)
+            threads = list(self._threads)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in threads:
+            if thread is threading.current_thread():
+                continue
+            remaining = None
+            if deadline is not None:
+                remaining = max(deadline - time.monotonic(), 0.0)
+            thread.join(remaining)
+        return not any(thread.is_alive() for thread in threads
+                       if thread is not threading.current_thread())
+
+    def _spawn_locked(self) -> None:
+        thread = threading.Thread(
+            name=f"{self._name}-{len(self._threads) + 1}",
+            target=self._worker,
+            daemon=True,
+        )
+        self._threads.append(thread)
+        thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _SHUTDOWN:
+                return
+            func, args = item
+            try:
+                func(*args)
+            except Exception as exc:  # pragma: no cover - defensive safeguard
+                LOGGER.exception("monitor.worker_pool.task_error error=%s",
+                                 exc)
+            with self._lock:
+                self._idle += 1
+
+
+__all__ = ["WorkerPool"]
@@ -0,0 +1,64 @@
+"""Helpers shared by the monitoring tests."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import configuration  # noqa: E402
+from monitoring import log_recorder  # noqa: E402
+from monitoring.probe_result import ProbeResult  # noqa: E402
+from monitoring.service import MonitorScheduler  # noqa: E402
+
+
+class FakeClock:
+    """A clock that only moves when the test sets ``now``."""
+
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class StubStrategy:
+    """A strategy whose every probe returns ``result`` (a 200 by default)."""
+
+    def __init__(self, result=None):
+        if result is None:
+            result = ProbeResult(success=True, status_code=200)
+        self.result = result
+
+    def run(self, monitor):
+        return self.result
+
+
+def make_monitor(name="api", interval=60):
+    return configuration.MonitorItem(name=name,
+                                     url=f"https://{name}.example/health",
+                                     monitor_type="GET",
+                                     interval=interval)
+
+
+def stub_scheduler(strategy=None, **options):
+    """A scheduler probing GET monitors with ``strategy`` and no notifier."""
+
+    options.setdefault("dispatcher", lambda message: None)
+    scheduler = MonitorScheduler(**options)
+    scheduler.register_strategy("GET", strategy or StubStrategy())
+    return scheduler
+
+
+@pytest.fixture
+def csv_rows(monkeypatch):
+    """Keep the scheduler's log sink off disk; collect its CSV rows."""
+
+    rows = []
+    monkeypatch.setattr(log_recorder, "record", lambda action, detail: None)
+    monkeypatch.setattr(log_recorder, "saveToFile",
+                        lambda row, name: rows.append(row))
+    return rows
@@ -1,6 +1,9 @@
+import io
 import logging
 import socket
 import textwrap
+import threading
+import time
 import types
 import sys
 from contextlib import closing
@@ -37,6 +40,7 @@ if str(PROJECT_ROOT) not in sys.path:
 import requests  # noqa: E402  pylint: disable=wrong-import-position
 
 from monitoring import api_monitor  # noqa: E402  pylint: disable=wrong-import-position
+from monitoring import dns_cache  # noqa: E402  pylint: disable=wrong-import-position
 from monitoring import http_probe  # noqa: E402  pylint: disable=wrong-import-position
 from monitoring import network_probe  # noqa: E402  pylint: disable=wrong-import-position
 import configuration  # noqa: E402  pylint: disable=wrong-import-position
@@ -46,8 +50,17 @@ ORIGINAL_GET_REQUEST_TIMEOUT = configuration.get_request_timeout
 
 class DummyResponse:
 
-    def __init__(self, status_code):
+    def __init__(self, status_code, body=b""):
         self.status_code = status_code
+        self.body = body
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+    def close(self):
+        self.closed = True
 
 
 @pytest.fixture(autouse=True)
@@ -55,11 +68,29 @@ def stub_request_timeout(monkeypatch):
     monkeypatch.setattr(configuration, "get_request_timeout", lambda: 5.0)
 
 
+@pytest.fixture(autouse=True)
+def fresh_dns_cache():
+    # Lookups failed on purpose must not stay cached for later tests.
+    dns_cache.reset_shared_cache()
+    yield
+    dns_cache.reset_shared_cache()
+
+
+@pytest.fixture(autouse=True)
+def disable_session_pool(monkeypatch):
+    # These tests stub the module-level requests helpers; send the cold
+    # path's one-shot requests through them instead of a real session.
+    monkeypatch.setattr(http_probe, "session_pool", lambda: None)
+    monkeypatch.setattr(
+        http_probe, "_one_shot_request", lambda method_name, url, **kwargs:
+        getattr(http_probe.requests, method_name.lower())(url, **kwargs))
+
+
 @pytest.mark.parametrize("status_code", [200, 204, 301, 302])
 def test_monitor_get_success_for_valid_status(monkeypatch, caplog,
                                               status_code):
 
-    def fake_get(url, timeout):
+    def fake_get(url, timeout, stream=False):
         assert timeout == 5.0
         return DummyResponse(status_code)
 
@@ -73,7 +104,7 @@ def test_monitor_get_success_for_valid_status(monkeypatch, caplog,
 
 def test_monitor_get_failure_status(monkeypatch, caplog):
 
-    def fake_get(url, timeout):
+    def fake_get(url, timeout, stream=False):
         assert timeout == 5.0
         return DummyResponse(404)
 
@@ -88,7 +119,7 @@ def test_monitor_get_failure_status(monkeypatch, caplog):
 
 def test_monitor_get_exception(monkeypatch, caplog):
 
-    def fake_get(url, timeout):
+    def fake_get(url, timeout, stream=False):
         raise requests.Timeout("request timed out")
 
     monkeypatch.setattr(http_probe.requests, "get", fake_get)
@@ -107,7 +138,7 @@ def test_monitor_get_reads_configuration_timeout(monkeypatch):
         calls["count"] += 1
         return 3.5
 
-    def fake_get(url, timeout):
+    def fake_get(url, timeout, stream=False):
         assert timeout == 3.5
         raise requests.RequestException("boom")
 
@@ -133,7 +164,7 @@ def test_monitor_get_uses_explicit_timeout(monkeypatch):
     def fail_if_called():
         raise AssertionError("configuration timeout should not be used")
 
-    def fake_get(url, timeout):
+    def fake_get(url, timeout, stream=False):
         assert timeout == 1.5
         return DummyResponse(200)
 
@@ -161,7 +192,7 @@ def test_monitor_get_handles_timeout_configuration_error(monkeypatch, caplog):
 def test_monitor_post_success_for_valid_status(monkeypatch, caplog,
                                                status_code):
 
-    def fake_post(url, data=None, headers=None, timeout=None):
+    def fake_post(url, data=None, headers=None, timeout=None, stream=False):
         assert data == {}
         assert headers is None
         assert timeout == 5.0
@@ -178,7 +209,7 @@ def test_monitor_post_success_for_valid_status(monkeypatch, caplog,
 
 def test_monitor_post_failure_status(monkeypatch, caplog):
 
-    def fake_post(url, data=None, headers=None, timeout=None):
+    def fake_post(url, data=None, headers=None, timeout=None, stream=False):
         assert data == {}
         assert headers is None
         assert timeout == 5.0
@@ -196,7 +227,7 @@ def test_monitor_post_failure_status(monkeypatch, caplog):
 
 def test_monitor_post_exception(monkeypatch, caplog):
 
-    def fake_post(url, data=None, headers=None, timeout=None):
+    def fake_post(url, data=None, headers=None, timeout=None, stream=False):
         raise requests.ConnectionError("connection aborted")
 
     monkeypatch.setattr(http_probe.requests, "post", fake_post)
@@ -231,7 +262,7 @@ def test_monitor_post_handles_timeout_configuration_error(monkeypatch, caplog):
 def test_monitor_post_forwards_payload_and_headers(monkeypatch):
     observed = {}
 
-    def fake_post(url, data=None, headers=None, timeout=None):
+    def fake_post(url, data=None, headers=None, timeout=None, stream=False):
         observed["url"] = url
         observed["data"] = data
         observed["headers"] = headers
@@ -257,6 +288,56 @@ def test_monitor_post_forwards_payload_and_headers(monkeypatch):
     }
 
 
+@pytest.fixture
+def body_cap(monkeypatch):
+    monkeypatch.setattr(configuration, "get_max_body_bytes", lambda: 1024)
+    http_probe.reset_session_pool()
+    yield 1024
+    http_probe.reset_session_pool()
+
+
+def test_monitor_get_streams_and_caps_body(monkeypatch, caplog, body_cap):
+    responses = []
+
+    def fake_get(url, timeout, stream=False):
+        assert stream is True
+        response = DummyResponse(200, body=b"x" * (50 * body_cap))
+        responses.append(response)
+        return response
+
+    monkeypatch.setattr(http_probe.requests, "get", fake_get)
+
+    caplog.clear()
+    with caplog.at_level(logging.INFO):
+        assert api_monitor.monitor_get("http://example.com/big") is True
+
+    assert responses[0].closed
+    assert f"bytes={body_cap}" in caplog.text
+
+
+def test_monitor_get_head_falls_back_to_get(monkeypatch, caplog, body_cap):
+    calls = []
+
+    def fake_head(url, timeout, stream=False):
+        calls.append("HEAD")
+        return DummyResponse(405, body=b"not allowed")
+
+    def fake_get(url, timeout, stream=False):
+        calls.append("GET")
+        return DummyResponse(200, body=b"ok")
+
+    monkeypatch.setattr(http_probe.requests, "head", fake_head, raising=False)
+    monkeypatch.setattr(http_probe.requests, "get", fake_get)
+
+    caplog.clear()
+    with caplog.at_level(logging.INFO):
+        assert api_monitor.monitor_get("http://example.com", head=True)
+
+    assert calls == ["HEAD", "GET"]
+    assert "monitor.http.head_unsupported" in caplog.text
+    assert "method=GET url=http://example.com status=200 bytes=2" in caplog.text
+
+
 def test_monitor_requests_refresh_timeout_after_configuration_reload(
         monkeypatch, tmp_path):
     monkeypatch.delenv(configuration.REQUEST_TIMEOUT_ENV, raising=False)
@@ -278,11 +359,11 @@ def test_monitor_requests_refresh_timeout_after_configuration_reload(
     observed_get = []
     observed_post = []
 
-    def fake_get(url, timeout):
+    def fake_get(url, timeout, stream=False):
         observed_get.append(timeout)
         return DummyResponse(200)
 
-    def fake_post(url, data=None, headers=None, timeout=None):
+    def fake_post(url, data=None, headers=None, timeout=None, stream=False):
         observed_post.append(timeout)
         return DummyResponse(200)
 
@@ -305,15 +386,36 @@ def test_monitor_requests_refresh_timeout_after_configuration_reload(
     ORIGINAL_GET_REQUEST_TIMEOUT.cache_clear()
 
 
+def _report_network_layers(monkeypatch, names):
+    """Return a callable waiting until the ``names`` stages have reported."""
+
+    reported = {name: threading.Event() for name in names}
+    run_stage = api_monitor._run_stage
+
+    def tracking_run_stage(name, *args):
+        run_stage(name, *args)
+        if name in reported:
+            reported[name].set()
+
+    monkeypatch.setattr(api_monitor, "_run_stage", tracking_run_stage)
+
+    def wait():
+        for event in reported.values():
+            assert event.wait(5)
+
+    return wait
+
+
 def test_monitor_server_handles_socket_gaierror(monkeypatch, caplog):
 
-    def fake_create_connection(*args, **kwargs):
+    def fake_getaddrinfo(*args, **kwargs):
         raise socket.gaierror("name or service not known")
 
-    monkeypatch.setattr(network_probe.socket, "create_connection",
-                        fake_create_connection)
+    monkeypatch.setattr(network_probe.socket, "getaddrinfo",
+                        fake_getaddrinfo)
 
     ping_calls = {"subprocess": 0}
+    layers_reported = _report_network_layers(monkeypatch, ("socket", "ping"))
 
     def fake_subprocess_ping(host, timeout):
         ping_calls["subprocess"] += 1
@@ -324,6 +426,10 @@ def test_monitor_server_handles_socket_gaierror(monkeypatch, caplog):
                         fake_subprocess_ping)
 
     class DummyPing:
+        identifier = 0
+
+        def close(self):
+            pass
 
         def request_ping(self, *args, **kwargs):
             return b"icmp"
@@ -360,9 +466,12 @@ def test_monitor_server_handles_socket_gaierror(monkeypatch, caplog):
 
     monkeypatch.setattr(network_probe.socket, "socket", fake_socket_factory)
 
-    def fake_get(url, timeout):
+    def fake_get(url, timeout, stream=False):
         assert url == "http://invalid.host"
         assert timeout == 5.0
+        # A failed HTTP check decides at once; let the network layers report
+        # first so their outcome is logged.
+        layers_reported()
         return DummyResponse(503)
 
     monkeypatch.setattr(http_probe.requests, "get", fake_get)
@@ -381,6 +490,7 @@ def test_monitor_server_handles_socket_gaierror(monkeypatch, caplog):
 
 
 def test_monitor_server_requires_http_success(monkeypatch, caplog):
+    layers_reported = _report_network_layers(monkeypatch, ("socket", "ping"))
     monkeypatch.setattr(
         network_probe,
         "check_socket_connectivity",
@@ -389,7 +499,7 @@ def test_monitor_server_requires_http_success(monkeypatch, caplog):
     monkeypatch.setattr(
         network_probe,
         "perform_ping_probe",
-        lambda host, timeout: True,
+        lambda host, timeout, cancel=None: True,
     )
     monkeypatch.setattr(
         network_probe,
@@ -397,8 +507,9 @@ def test_monitor_server_requires_http_success(monkeypatch, caplog):
         lambda host, timeout: None,
     )
 
-    def fake_get(url, timeout):
+    def fake_get(url, timeout, stream=False):
         assert timeout == 5.0
+        layers_reported()
         return DummyResponse(502)
 
     monkeypatch.setattr(http_probe.requests, "get", fake_get)
@@ -431,6 +542,10 @@ def test_perform_ping_probe_distributes_timeout(monkeypatch):
     reply_results = [0.05, -1, -1]
 
     class DummyPing:
+        identifier = 0
+
+        def close(self):
+            pass
 
         def __init__(self):
             self.reply_timeouts = []
@@ -454,7 +569,7 @@ def test_perform_ping_probe_distributes_timeout(monkeypatch):
     dummy_ping = DummyPing()
 
     monkeypatch.setattr(network_probe, "IcmpProbe", lambda: dummy_ping)
-    monkeypatch.setattr(network_probe.socket, "gethostbyname",
+    monkeypatch.setattr(network_probe.dns_cache, "gethostbyname",
                         lambda host: "127.0.0.1")
 
     def fake_sleep(duration):
@@ -478,21 +593,17 @@ def test_perform_ping_probe_distributes_timeout(monkeypatch):
 @pytest.fixture
 def stub_monitor_server_dependencies(monkeypatch):
 
-    class DummyConnection:
-
-        def __enter__(self):
-            return self
-
-        def __exit__(self, exc_type, exc, tb):
-            return False
-
     monkeypatch.setattr(
-        network_probe.socket,
-        "create_connection",
-        lambda *args, **kwargs: DummyConnection(),
+        network_probe,
+        "check_socket_connectivity",
+        lambda host, port, timeout: True,
     )
 
     class DummyPing:
+        identifier = 0
+
+        def close(self):
+            pass
 
         def request_ping(self, *args, **kwargs):
             return b"icmp"
@@ -540,7 +651,7 @@ def test_monitor_server_uses_timeout_from_environment(
 
     observed = {}
 
-    def fake_get(url, timeout):
+    def fake_get(url, timeout, stream=False):
         observed["url"] = url
         observed["timeout"] = timeout
         return DummyResponse(200)
@@ -574,7 +685,7 @@ def test_monitor_server_uses_timeout_from_config_file(
 
     observed = {}
 
-    def fake_get(url, timeout):
+    def fake_get(url, timeout, stream=False):
         observed["url"] = url
         observed["timeout"] = timeout
         return DummyResponse(200)
@@ -594,18 +705,10 @@ def test_monitor_server_uses_timeout_from_config_file(
 def test_monitor_server_closes_raw_ping_socket(monkeypatch):
     close_counts = {"count": 0}
 
-    class DummyConnection:
-
-        def __enter__(self):
-            return self
-
-        def __exit__(self, exc_type, exc, tb):
-            return False
-
     monkeypatch.setattr(
-        network_probe.socket,
-        "create_connection",
-        lambda *args, **kwargs: DummyConnection(),
+        network_probe,
+        "check_socket_connectivity",
+        lambda host, port, timeout: True,
     )
 
     class CountingSocket:
@@ -619,6 +722,10 @@ def test_monitor_server_closes_raw_ping_socket(monkeypatch):
                 close_counts["count"] += 1
 
     class CountingPing:
+        identifier = 0
+
+        def close(self):
+            pass
 
         def request_ping(self, *args, **kwargs):
             return b"icmp"
@@ -632,7 +739,7 @@ def test_monitor_server_closes_raw_ping_socket(monkeypatch):
     monkeypatch.setattr(network_probe, "IcmpProbe", CountingPing)
     monkeypatch.setattr(network_probe, "_subprocess_ping",
                         lambda host, timeout: False)
-    monkeypatch.setattr(network_probe.socket, "gethostbyname",
+    monkeypatch.setattr(network_probe.dns_cache, "gethostbyname",
                         lambda host: "127.0.0.1")
 
     class DummyIcmpSocket:
@@ -657,13 +764,162 @@ def test_monitor_server_closes_raw_ping_socket(monkeypatch):
     monkeypatch.setattr(network_probe.time, "sleep",
                         lambda *_args, **_kwargs: None)
 
-    def fake_get(url, timeout):
-        assert timeout == 5.0
-        return DummyResponse(200)
-
-    monkeypatch.setattr(http_probe.requests, "get", fake_get)
-
-    result = api_monitor.monitor_server(("http", "example.org", None, None))
+    # Only the ping layer, so the check waits for every attempt to finish.
+    result = api_monitor.monitor_server(("http", "example.org", None, None),
+                                        layers=("ping",))
 
     assert result is True
     assert close_counts["count"] == 3
+
+
+@pytest.fixture
+def blocking_network_layers(monkeypatch):
+    release = threading.Event()
+
+    def blocked(*args, **kwargs):
+        release.wait(5)
+        return False
+
+    monkeypatch.setattr(network_probe, "check_socket_connectivity", blocked)
+    monkeypatch.setattr(network_probe, "perform_ping_probe", blocked)
+    monkeypatch.setattr(network_probe, "perform_icmp_probe", blocked)
+    yield release
+    release.set()
+
+
+def test_monitor_server_returns_on_http_success_without_waiting(
+        monkeypatch, caplog, blocking_network_layers):
+    monkeypatch.setattr(http_probe.requests, "get",
+                        lambda url, timeout, stream=False: DummyResponse(200))
+
+    started = time.monotonic()
+    with caplog.at_level(logging.INFO):
+        result = api_monitor.probe_server(("http", "example.org", None, None),
+                                          layers=("socket", "ping", "icmp",
+                                                  "http"))
+
+    assert result.success and result.status_code == 200
+    assert time.monotonic() - started < 2
+    assert "socket=pending" in caplog.text and "http=True" in caplog.text
+
+
+def test_monitor_server_returns_on_http_failure_without_waiting(
+        monkeypatch, caplog, blocking_network_layers):
+    monkeypatch.setattr(http_probe.requests, "get",
+                        lambda url, timeout, stream=False: DummyResponse(503))
+
+    started = time.monotonic()
+    with caplog.at_level(logging.INFO):
+        result = api_monitor.probe_server(("http", "example.org", None, None),
+                                          layers=("socket", "ping", "http"))
+
+    assert not result.success and result.status_code == 503
+    assert time.monotonic() - started < 2
+    assert "ping=pending" in caplog.text
+    assert "monitor.server.offline" in caplog.text
+
+
+def test_ping_probe_stops_once_cancelled(monkeypatch):
+    waits = []
+
+    class SilentPing:
+        identifier = 0
+
+        def close(self):
+            pass
+
+        def request_ping(self, *args, **kwargs):
+            return b"icmp"
+
+        def raw_socket(self, dst_addr, icmp_packet):
+            return 0.0, closing(io.BytesIO())
+
+        def reply_ping(self, sent_at, rawsocket, sequence, timeout=None):
+            waits.append(timeout)
+            time.sleep(timeout)
+            return -1
+
+    monkeypatch.setattr(network_probe, "IcmpProbe", SilentPing)
+    monkeypatch.setattr(network_probe.dns_cache, "gethostbyname",
+                        lambda host: "127.0.0.1")
+    cancel = threading.Event()
+    threading.Timer(0.2, cancel.set).start()
+
+    started = time.monotonic()
+    assert network_probe.perform_ping_probe("filtered.example",
+                                            30,
+                                            cancel=cancel) is False
+    assert time.monotonic() - started < 2
+    assert max(waits) <= network_probe.CANCEL_POLL_SECONDS
+
+
+def test_monitor_server_waits_for_a_started_http_exchange(monkeypatch, caplog):
+    monkeypatch.setattr(network_probe, "check_socket_connectivity",
+                        lambda host, port, timeout: True)
+
+    def slow_get(url, timeout, stream=False):
+        # Each read stays within the timeout, the whole exchange does not.
+        time.sleep(timeout * 2)
+        return DummyResponse(200, b"ok")
+
+    monkeypatch.setattr(http_probe.requests, "get", slow_get)
+
+    with caplog.at_level(logging.INFO):
+        result = api_monitor.probe_server(("http", "example.org", None, None),
+                                          timeout=0.2,
+                                          keep_alive=False,
+                                          layers=("socket", "http"))
+
+    assert result.success and result.status_code == 200
+    assert "monitor.server.network_only" not in caplog.text
+
+
+def test_monitor_server_reports_stages_that_never_started_as_skipped(
+        monkeypatch, caplog):
+
+    def fail_stage(*args, **kwargs):
+        raise AssertionError("stage started after the deadline")
+
+    monkeypatch.setattr(network_probe, "check_socket_connectivity",
+                        fail_stage)
+    monkeypatch.setattr(http_probe.requests, "get", fail_stage)
+
+    with caplog.at_level(logging.INFO):
+        result = api_monitor.probe_server(("http", "example.org", None, None),
+                                          timeout=0,
+                                          keep_alive=False,
+                                          layers=("socket", "http"))
+
+    assert not result.success
+    assert "socket=skipped" in caplog.text and "http=skipped" in caplog.text
+    assert "monitor.server.skipped" in caplog.text
+    assert "monitor.server.offline" not in caplog.text
+
+
+def test_stage_pool_grows_with_the_stages_in_flight(monkeypatch):
+    monkeypatch.setattr(api_monitor, "_STAGE_POOL", None)
+    monkeypatch.setattr(api_monitor, "_STAGES_IN_FLIGHT", 0)
+    monkeypatch.setattr(configuration, "get_worker_pool_size", lambda: 2)
+    monkeypatch.setattr(configuration, "get_server_layers",
+                        lambda: ("socket", "http"))
+
+    pool = api_monitor._stage_pool(3)
+    assert pool.size == 4
+    assert api_monitor._stage_pool(3) is pool and pool.size == 6
+    for _ in range(6):
+        api_monitor._stage_finished()
+    assert api_monitor._STAGES_IN_FLIGHT == 0
+
+
+def test_monitor_server_without_http_layer_accepts_any_reachable_layer(
+        monkeypatch, blocking_network_layers):
+    monkeypatch.setattr(network_probe, "check_socket_connectivity",
+                        lambda host, port, timeout: True)
+
+    def fail_get(*args, **kwargs):
+        raise AssertionError("http layer is disabled")
+
+    monkeypatch.setattr(http_probe.requests, "get", fail_get)
+
+    assert api_monitor.monitor_server(("http", "example.org", 22, None),
+                                      layers=("socket", "ping")) is True
@@ -0,0 +1,514 @@
+import asyncio
+import datetime
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import configuration  # noqa: E402  pylint: disable=wrong-import-position
+from monitoring import (  # noqa: E402
+    async_probe, icmp_sweep, log_recorder, network_probe,
+)
+from monitoring.async_service import AsyncMonitorScheduler  # noqa: E402
+from monitoring.probe_result import ProbeResult  # noqa: E402
+from monitoring.service import phase_offset  # noqa: E402
+from monitoring.state_machine import MonitorState, NotificationTemplates  # noqa: E402
+
+
+class AsyncHttpStandIn:
+    """Tiny asyncio HTTP/1.1 server used as a probe target."""
+
+    def __init__(self, routes, keep_alive=False):
+        self.routes = routes
+        self.keep_alive = keep_alive
+        self.requests = []
+        self.connections = 0
+        self.port = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        daemon=True)
+        self._server = None
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except asyncio.IncompleteReadError:
+                break
+            lines = head.decode("latin-1").split("\r\n")
+            method, target, _ = lines[0].split(" ", 2)
+            headers = {}
+            for line in lines[1:]:
+                if ":" in line:
+                    name, value = line.split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+            length = int(headers.get("content-length", "0"))
+            body = await reader.readexactly(length) if length else b""
+            self.requests.append((method, target, headers, body))
+            status = self.routes.get((method, target), 404)
+            connection = "keep-alive" if self.keep_alive else "close"
+            writer.write(f"HTTP/1.1 {status} Status\r\nContent-Length: 2\r\n"
+                         f"Connection: {connection}\r\n\r\n".encode("latin-1"))
+            if method != "HEAD":
+                writer.write(b"ok")
+            await writer.drain()
+            if not self.keep_alive:
+                break
+        writer.close()
+
+    def __enter__(self):
+        self._thread.start()
+        future = asyncio.run_coroutine_threadsafe(
+            asyncio.start_server(self._handle, "127.0.0.1", 0), self._loop)
+        self._server = future.result(5)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.close()
+        asyncio.run_coroutine_threadsafe(self._server.wait_closed(),
+                                         self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+        self._loop.close()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.port}{path}"
+
+
+@pytest.fixture(autouse=True)
+def stub_request_timeout(monkeypatch):
+    monkeypatch.setattr(configuration, "get_request_timeout", lambda: 2.0)
+
+
+def _templates():
+    return NotificationTemplates(
+        channel="email",
+        build_outage=lambda name, ts, language=None: (f"{name}-outage", ""),
+        build_recovery=lambda name, ts, language=None: (f"{name}-recovery", ""),
+    )
+
+
+def test_async_probe_reads_status_and_sends_payload():
+    routes = {("GET", "/ok"): 200, ("POST", "/submit"): 201}
+    with AsyncHttpStandIn(routes) as server:
+
+        async def scenario():
+            return await asyncio.gather(
+                async_probe.monitor_get(server.url("/ok")),
+                async_probe.monitor_get(server.url("/missing")),
+                async_probe.monitor_post(server.url("/submit"),
+                                         {"query": "value"},
+                                         headers={"X-Token": "abc"}),
+            )
+
+        results = asyncio.run(scenario())
+
+    assert [result.success for result in results] == [True, False, True]
+    assert [result.status_code for result in results] == [200, 404, 201]
+    assert all(result.bytes_read == 2 for result in results)
+    ok = results[0]
+    assert ok.connect is not None and ok.tls is None
+    assert ok.family == "IPv4"
+    assert 0 < ok.ttfb <= ok.total
+    post = [item for item in server.requests if item[0] == "POST"][0]
+    assert post[2]["x-token"] == "abc"
+    assert post[2]["content-type"] == "application/x-www-form-urlencoded"
+    assert post[3] == b"query=value"
+
+
+def test_async_probe_sends_head_and_falls_back_to_get():
+    routes = {("HEAD", "/head"): 200, ("HEAD", "/legacy"): 405,
+              ("GET", "/legacy"): 200}
+    with AsyncHttpStandIn(routes) as server:
+
+        async def scenario():
+            return await asyncio.gather(
+                async_probe.monitor_get(server.url("/head"), head=True),
+                async_probe.monitor_get(server.url("/legacy"), head=True),
+            )
+
+        head, legacy = asyncio.run(scenario())
+
+    assert (head.success, head.bytes_read) == (True, 0)
+    assert (legacy.success, legacy.bytes_read) == (True, 2)
+    assert sorted((method, target)
+                  for method, target, _, _ in server.requests) == [
+                      ("GET", "/legacy"), ("HEAD", "/head"),
+                      ("HEAD", "/legacy")
+                  ]
+
+
+def test_async_probe_reuses_connections_unless_opted_out(monkeypatch):
+    monkeypatch.setattr(configuration, "get_keep_alive", lambda: True)
+    with AsyncHttpStandIn({("GET", "/ok"): 200}, keep_alive=True) as server:
+
+        async def scenario(keep_alive):
+            results = [
+                await async_probe.monitor_get(server.url("/ok"),
+                                              keep_alive=keep_alive)
+                for _ in range(3)
+            ]
+            async_probe.close_connection_pool()
+            return results
+
+        pooled = asyncio.run(scenario(True))
+        pooled_connections = server.connections
+        cold = asyncio.run(scenario(False))
+
+    assert all(result.success for result in pooled + cold)
+    assert pooled_connections == 1
+    assert server.connections == 4
+    assert pooled[0].connect is not None and pooled[1].connect is None
+    assert all(result.connect is not None for result in cold)
+    assert server.requests[0][2]["connection"] == "keep-alive"
+    assert server.requests[-1][2]["connection"] == "close"
+
+
+def test_async_probe_reports_connection_failure():
+    async def scenario():
+        return await async_probe.monitor_server(("http", "127.0.0.1", 1, ""),
+                                                timeout=1.0,
+                                                layers=("socket", "http"))
+
+    result = asyncio.run(scenario())
+    assert not result.success and result.status_code is None
+    assert result.total is not None
+
+
+def test_async_server_check_honours_its_layers(monkeypatch, caplog):
+    pings = []
+
+    def fake_ping(host, timeout, cancel=None):
+        pings.append(host)
+        return True
+
+    monkeypatch.setattr(network_probe, "perform_ping_probe", fake_ping)
+
+    async def scenario():
+        # Port 1 refuses connections, so only the ping layer can answer.
+        return await asyncio.gather(
+            async_probe.monitor_server(("http", "127.0.0.1", 1, ""),
+                                       layers=("socket", "ping")),
+            async_probe.monitor_server(("http", "127.0.0.1", 1, ""),
+                                       layers=("socket", )),
+        )
+
+    with caplog.at_level(logging.INFO):
+        reachable, refused = asyncio.run(scenario())
+
+    assert reachable.success and not refused.success
+    assert pings == ["127.0.0.1"]
+    assert "ping=True icmp=off http=off" in caplog.text
+
+
+def test_async_scheduler_drives_monitors_on_one_loop(monkeypatch):
+    monkeypatch.setattr(configuration, "get_server_layers",
+                        lambda: ("socket", "http"))
+    monkeypatch.setattr(log_recorder, "record", lambda action, detail: None)
+    monkeypatch.setattr(log_recorder, "saveToFile", lambda row, name: None)
+
+    routes = {
+        ("GET", "/health"): 200,
+        ("GET", "/down"): 503,
+        ("POST", "/api"): 200,
+        ("GET", "/"): 200,
+    }
+    lock = threading.Lock()
+    events = {}
+    status_codes = {}
+    finished = threading.Event()
+
+    with AsyncHttpStandIn(routes) as server:
+        monitors = [
+            configuration.MonitorItem(name="Get",
+                                      url=server.url("/health"),
+                                      monitor_type="GET",
+                                      interval=0.05),
+            configuration.MonitorItem(name="Down",
+                                      url=server.url("/down"),
+                                      monitor_type="GET",
+                                      interval=0.05),
+            configuration.MonitorItem(name="Post",
+                                      url=server.url("/api"),
+                                      monitor_type="POST",
+                                      interval=0.05,
+                                      payload={"a": "b"}),
+            configuration.MonitorItem(name="Server",
+                                      url=f"127.0.0.1:{server.port}",
+                                      monitor_type="SERVER",
+                                      interval=0.05),
+        ]
+
+        def capture(event):
+            with lock:
+                events.setdefault(event.monitor.name, []).append(event.status)
+                status_codes[event.monitor.name] = event.probe.status_code
+                if len(events) == len(monitors) and all(
+                        len(items) >= 2 for items in events.values()):
+                    finished.set()
+
+        scheduler = AsyncMonitorScheduler(
+            event_handler=capture,
+            timezone_getter=lambda: 0,
+            clock=lambda: datetime.datetime(2023, 1, 1),
+            templates=_templates(),
+            dispatcher=lambda notification: None,
+        )
+        scheduler.start(monitors)
+        try:
+            assert finished.wait(10), "Async scheduler did not emit events"
+            with pytest.raises(RuntimeError):
+                scheduler.start(monitors)
+        finally:
+            scheduler.stop()
+
+    assert not scheduler.is_running
+    assert events["Get"][:2] == [MonitorState.HEALTHY, MonitorState.HEALTHY]
+    assert events["Down"][:2] == [
+        MonitorState.OUTAGE, MonitorState.OUTAGE_ONGOING
+    ]
+    assert events["Post"][0] is MonitorState.HEALTHY
+    assert events["Server"][0] is MonitorState.HEALTHY
+    assert status_codes == {
+        "Get": 200,
+        "Down": 503,
+        "Post": 200,
+        "Server": 200
+    }
+
+
+def test_async_scheduler_stop_is_bounded_by_blocking_sinks(monkeypatch):
+    monkeypatch.setattr(log_recorder, "record", lambda action, detail: None)
+    monkeypatch.setattr(log_recorder, "saveToFile", lambda row, name: None)
+
+    release = threading.Event()
+    entered = threading.Event()
+
+    def blocking_handler(event):
+        entered.set()
+        release.wait(5)
+
+    class InstantStrategy:
+
+        async def run(self, monitor):
+            return True
+
+    scheduler = AsyncMonitorScheduler(event_handler=blocking_handler,
+                                      timezone_getter=lambda: 0,
+                                      dispatcher=lambda notification: None)
+    scheduler.register_strategy("GET", InstantStrategy())
+    monitor = configuration.MonitorItem(name="Slow sink",
+                                        url="http://example.com",
+                                        monitor_type="GET",
+                                        interval=0.05)
+
+    scheduler.start([monitor])
+    try:
+        assert entered.wait(5)
+        abandoned = scheduler.stop(timeout=0.2)
+    finally:
+        release.set()
+
+    assert abandoned == ("Slow sink", )
+    assert not scheduler.is_running
+
+
+def test_async_scheduler_runs_tcp_and_host_list_monitors(monkeypatch):
+    monkeypatch.setattr(log_recorder, "record", lambda action, detail: None)
+    monkeypatch.setattr(log_recorder, "saveToFile", lambda row, name: None)
+    monkeypatch.setattr(
+        icmp_sweep, "sweep", lambda hosts: {
+            host: ProbeResult(success=host != "db2", total=0.001)
+            for host in hosts
+        })
+
+    lock = threading.Lock()
+    events = {}
+    finished = threading.Event()
+
+    with AsyncHttpStandIn({}) as server:
+        monitors = [
+            configuration.MonitorItem(
+                name="Ports",
+                url=f"127.0.0.1:{server.port}, 127.0.0.1:1",
+                monitor_type="TCP",
+                interval=60),
+            configuration.MonitorItem(name="Pings",
+                                      url="db1, db2",
+                                      monitor_type="HOSTS",
+                                      interval=60),
+        ]
+
+        def capture(event):
+            with lock:
+                events[event.monitor.name] = event
+                if len(events) == 4:
+                    finished.set()
+
+        scheduler = AsyncMonitorScheduler(event_handler=capture,
+                                          timezone_getter=lambda: 0,
+                                          templates=_templates(),
+                                          dispatcher=lambda notification: None)
+        scheduler.start(monitors)
+        try:
+            assert finished.wait(10), "TCP/HOSTS monitors emitted no events"
+        finally:
+            scheduler.stop()
+
+    up = events[f"Ports [127.0.0.1:{server.port}]"]
+    assert up.success and up.probe.family == "IPv4"
+    assert up.probe.connect is not None
+    assert not events["Ports [127.0.0.1:1]"].success
+    assert events["Pings [db1]"].success
+    assert not events["Pings [db2]"].success
+
+
+def _quiet_async_scheduler(monkeypatch, strategy, **options):
+    monkeypatch.setattr(log_recorder, "record", lambda action, detail: None)
+    monkeypatch.setattr(log_recorder, "saveToFile", lambda row, name: None)
+    options.setdefault("timezone_getter", lambda: 0)
+    options.setdefault("dispatcher", lambda notification: None)
+    scheduler = AsyncMonitorScheduler(**options)
+    scheduler.register_strategy("GET", strategy)
+    return scheduler
+
+
+def test_async_scheduler_runs_at_fixed_rate_despite_probe_duration(
+        monkeypatch):
+    started = []
+    finished = threading.Event()
+
+    class SlowStrategy:
+
+        async def run(self, monitor):
+            started.append(time.monotonic())
+            if len(started) >= 5:
+                finished.set()
+            await asyncio.sleep(0.06)
+            return True
+
+    scheduler = _quiet_async_scheduler(monkeypatch, SlowStrategy())
+    monitor = configuration.MonitorItem(name="FixedRate",
+                                        url="http://example.com",
+                                        monitor_type="GET",
+                                        interval=0.1)
+    scheduler.start([monitor])
+    try:
+        assert finished.wait(5), "Async scheduler did not complete the runs"
+        stats = scheduler.tick_stats()[scheduler._monitor_key(monitor)]
+    finally:
+        scheduler.stop()
+
+    # Sleeping the interval after each run would start run 4 at ~0.64s.
+    assert started[4] - started[0] == pytest.approx(0.4, abs=0.08)
+    assert stats.late == 0 and stats.skipped == 0
+
+
+def test_async_scheduler_spreads_first_runs(monkeypatch):
+
+    class InstantStrategy:
+
+        async def run(self, monitor):
+            return True
+
+    monitors = [
+        configuration.MonitorItem(name=f"Spread{index}",
+                                  url=f"http://example.com/{index}",
+                                  monitor_type="GET",
+                                  interval=30) for index in range(8)
+    ]
+    scheduler = _quiet_async_scheduler(monkeypatch,
+                                       InstantStrategy(),
+                                       phase_spread=True,
+                                       start_jitter=10,
+                                       jitter_source=lambda: 0.5)
+
+    before = time.monotonic()
+    scheduler.start(monitors)
+    try:
+        delays = {
+            entry.monitor.name: entry.tick - before
+            for entry in scheduler._scheduled.values()
+        }
+        assert scheduler.tick_stats()[scheduler._monitor_key(
+            monitors[0])].runs == 0
+    finally:
+        scheduler.stop()
+
+    for monitor in monitors:
+        key = scheduler._monitor_key(monitor)
+        expected = (phase_offset(key, 30) + 5) % 30
+        assert delays[monitor.name] == pytest.approx(expected, abs=0.5)
+
+
+def test_async_scheduler_reconcile_diffs_monitor_set(monkeypatch):
+    lock = threading.Lock()
+    seen = {}
+
+    def capture(event):
+        with lock:
+            seen.setdefault(event.monitor.name, []).append(event)
+
+    class FailingStrategy:
+
+        async def run(self, monitor):
+            return False
+
+    def build(name, **overrides):
+        values = dict(name=name,
+                      url=f"http://example.com/{name}",
+                      monitor_type="GET",
+                      interval=0.05)
+        values.update(overrides)
+        return configuration.MonitorItem(**values)
+
+    def wait_for(predicate):
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            with lock:
+                if predicate():
+                    return True
+            time.sleep(0.01)
+        return False
+
+    kept, dropped = build("Kept"), build("Dropped")
+    scheduler = _quiet_async_scheduler(monkeypatch,
+                                       FailingStrategy(),
+                                       event_handler=capture)
+    scheduler.start([kept, dropped])
+    try:
+        assert wait_for(lambda: len(seen.get("Kept", [])) >= 2)
+        kept_key = scheduler._monitor_key(kept)
+        machine = scheduler._state_machines[kept_key]
+
+        edited = build("Kept", email="ops@example.com")
+        added = build("Added")
+        result = scheduler.reconcile([edited, added])
+
+        assert result.added == (added, )
+        assert result.removed == (dropped, )
+        assert result.updated == (edited, )
+        assert wait_for(lambda: len(seen.get("Added", [])) >= 1 and any(
+            event.monitor is edited for event in seen["Kept"]))
+        assert scheduler._state_machines[kept_key] is machine
+        time.sleep(0.1)
+        assert scheduler._monitor_key(dropped) not in scheduler._state_machines
+        with lock:
+            dropped_runs = len(seen["Dropped"])
+        time.sleep(0.1)
+        assert len(seen["Dropped"]) == dropped_runs
+        assert set(scheduler.tick_stats()) == {
+            kept_key, scheduler._monitor_key(added)
+        }
+        assert not scheduler.reconcile([edited, added]).changed
+    finally:
+        scheduler.stop()
@@ -617,3 +617,331 @@ def test_set_logging_preferences_updates_config(tmp_path, monkeypatch):
     assert matching_handlers == []
 
     configuration.reset_logging_configuration()
+
+
+@pytest.mark.parametrize(
+    ("config_content", "expected"),
+    [
+        ("[Request]\nworker_pool_size = 4\n", 4),
+        ("[Request]\nworker_pool_size = 0\n", 0),
+        ("[Request]\nworker_pool_size = -2\n",
+         configuration.DEFAULT_WORKER_POOL_SIZE),
+        ("[Request]\ntimeout = 5\n", configuration.DEFAULT_WORKER_POOL_SIZE),
+    ],
+)
+def test_get_worker_pool_size(tmp_path, monkeypatch, config_content,
+                              expected):
+    monkeypatch.setenv(configuration.LOG_DIR_ENV, str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    _write_config(tmp_path, config_content)
+
+    assert configuration.get_worker_pool_size() == expected
+
+
+@pytest.mark.parametrize(
+    ("config_content", "expected"),
+    [
+        ("[Request]\noverrun_policy = Skip\n", "skip"),
+        ("[Request]\noverrun_policy = immediate\n", "immediate"),
+        ("[Request]\noverrun_policy = later\n",
+         configuration.DEFAULT_OVERRUN_POLICY),
+        ("[Request]\ntimeout = 5\n", configuration.DEFAULT_OVERRUN_POLICY),
+    ],
+)
+def test_get_overrun_policy(tmp_path, monkeypatch, config_content, expected):
+    monkeypatch.setenv(configuration.LOG_DIR_ENV, str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    _write_config(tmp_path, config_content)
+
+    assert configuration.get_overrun_policy() == expected
+
+
+def test_phase_spread_and_jitter_settings(tmp_path, monkeypatch):
+    monkeypatch.setenv(configuration.LOG_DIR_ENV, str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    _write_config(tmp_path,
+                  "[Request]\nphase_spread = off\nstart_jitter = 2.5\n")
+
+    assert configuration.get_phase_spread() is False
+    assert configuration.get_start_jitter() == 2.5
+
+    _write_config(tmp_path,
+                  "[Request]\nphase_spread = maybe\nstart_jitter = -1\n")
+
+    assert configuration.get_phase_spread() is configuration.DEFAULT_PHASE_SPREAD
+    assert configuration.get_start_jitter() == configuration.DEFAULT_START_JITTER
+
+
+def test_connection_pool_settings(tmp_path, monkeypatch):
+    monkeypatch.setenv(configuration.LOG_DIR_ENV, str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    _write_config(
+        tmp_path, "[Request]\nkeep_alive = no\npool_maxsize = 8\n"
+        "pool_max_hosts = 32\npool_idle_timeout = 15\n")
+
+    assert configuration.get_keep_alive() is False
+    assert configuration.get_pool_maxsize() == 8
+    assert configuration.get_pool_max_hosts() == 32
+    assert configuration.get_pool_idle_timeout() == 15.0
+
+    _write_config(
+        tmp_path, "[Request]\nkeep_alive = sometimes\npool_maxsize = 0\n"
+        "pool_idle_timeout = -5\n")
+
+    assert configuration.get_keep_alive() is configuration.DEFAULT_KEEP_ALIVE
+    assert configuration.get_pool_maxsize() == configuration.DEFAULT_POOL_MAXSIZE
+    assert (configuration.get_pool_max_hosts() ==
+            configuration.DEFAULT_POOL_MAX_HOSTS)
+    assert (configuration.get_pool_idle_timeout() ==
+            configuration.DEFAULT_POOL_IDLE_TIMEOUT)
+
+    _write_config(tmp_path, "[Request]\npool_idle_timeout = 0\n")
+
+    assert (configuration.get_pool_idle_timeout() ==
+            configuration.DEFAULT_POOL_IDLE_TIMEOUT)
+
+
+def test_monitor_probe_flags_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setenv(configuration.LOG_DIR_ENV, str(tmp_path))
+    configuration.writeconfig(str(tmp_path / "Config"))
+    configuration.write_monitor_list([
+        {
+            "name": "Cold",
+            "url": "https://example.com",
+            "type": "GET",
+            "interval": 30,
+            "keep_alive": False,
+            "head_request": True,
+        },
+        {
+            "name": "Pooled",
+            "url": "https://example.com/ok",
+            "type": "SERVER",
+            "interval": 30,
+            "server_layers": ["HTTP", "socket"],
+        },
+    ])
+
+    monitors = configuration.read_monitor_list()
+
+    assert [monitor.keep_alive for monitor in monitors] == [False, True]
+    assert [monitor.head_request for monitor in monitors] == [True, False]
+    assert [monitor.server_layers
+            for monitor in monitors] == [None, ("http", "socket")]
+
+
+@pytest.mark.parametrize(
+    ("config_content", "expected"),
+    [
+        ("[Request]\nmax_body_bytes = 0\n", 0),
+        ("[Request]\nmax_body_bytes = 2KB\n", 2048),
+        ("[Request]\nmax_body_bytes = lots\n",
+         configuration.DEFAULT_MAX_BODY_BYTES),
+        ("[Request]\ntimeout = 5\n", configuration.DEFAULT_MAX_BODY_BYTES),
+    ],
+)
+def test_get_max_body_bytes(tmp_path, monkeypatch, config_content, expected):
+    monkeypatch.setenv(configuration.LOG_DIR_ENV, str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    _write_config(tmp_path, config_content)
+
+    assert configuration.get_max_body_bytes() == expected
+
+
+@pytest.mark.parametrize(
+    ("config_content", "expected"),
+    [
+        ("[Request]\nserver_layers = http\n", ("http",)),
+        ("[Request]\nserver_layers = Socket, icmp, socket\n",
+         ("socket", "icmp")),
+        ("[Request]\nserver_layers = socket, telnet\n",
+         configuration.DEFAULT_SERVER_LAYERS),
+        ("[Request]\nserver_layers =\n", configuration.DEFAULT_SERVER_LAYERS),
+    ],
+)
+def test_get_server_layers(tmp_path, monkeypatch, config_content, expected):
+    monkeypatch.setenv(configuration.LOG_DIR_ENV, str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    _write_config(tmp_path, config_content)
+
+    assert configuration.get_server_layers() == expected
+
+
+@pytest.mark.parametrize(
+    ("config_content", "expected"),
+    [
+        ("[Request]\ndns_ttl = 300\ndns_negative_ttl = 0\n", (300.0, 0.0)),
+        ("[Request]\ndns_ttl = -1\ndns_negative_ttl = soon\n",
+         (configuration.DEFAULT_DNS_TTL,
+          configuration.DEFAULT_DNS_NEGATIVE_TTL)),
+        ("[Request]\ntimeout = 5\n", (configuration.DEFAULT_DNS_TTL,
+                                        configuration.DEFAULT_DNS_NEGATIVE_TTL)),
+    ],
+)
+def test_get_dns_ttls(tmp_path, monkeypatch, config_content, expected):
+    monkeypatch.setenv(configuration.LOG_DIR_ENV, str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    _write_config(tmp_path, config_content)
+
+    assert (configuration.get_dns_ttl(),
+            configuration.get_dns_negative_ttl()) == expected
+
+
+@pytest.mark.parametrize(
+    ("config_content", "expected"),
+    [
+        ("[Request]\nprobe_share_window = 0\n", 0.0),
+        ("[Request]\nprobe_share_window = 5.5\n", 5.5),
+        ("[Request]\nprobe_share_window = -2\n",
+         configuration.DEFAULT_PROBE_SHARE_WINDOW),
+        ("[Request]\ntimeout = 5\n", configuration.DEFAULT_PROBE_SHARE_WINDOW),
+    ],
+)
+def test_get_probe_share_window(tmp_path, monkeypatch, config_content,
+                                expected):
+    monkeypatch.setenv(configuration.LOG_DIR_ENV, str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    _write_config(tmp_path, config_content)
+
+    assert configuration.get_probe_share_window() == expected
+
+
+@pytest.mark.parametrize(
+    ("config_content", "expected"),
+    [
+        ("[Request]\nevent_queue_size = 64\nevent_backpressure = Drop_Oldest\n",
+         (64, "drop_oldest")),
+        ("[Request]\nevent_queue_size = 0\nevent_backpressure = spill\n",
+         (configuration.DEFAULT_EVENT_QUEUE_SIZE,
+          configuration.DEFAULT_EVENT_BACKPRESSURE)),
+        ("[Request]\ntimeout = 5\n", (configuration.DEFAULT_EVENT_QUEUE_SIZE,
+                                        configuration.DEFAULT_EVENT_BACKPRESSURE)),
+    ],
+)
+def test_get_event_pipeline_settings(tmp_path, monkeypatch, config_content,
+                                     expected):
+    monkeypatch.setenv(configuration.LOG_DIR_ENV, str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    _write_config(tmp_path, config_content)
+
+    assert (configuration.get_event_queue_size(),
+            configuration.get_event_backpressure()) == expected
+
+
+@pytest.mark.parametrize(
+    ("config_content", "expected"),
+    [
+        ("[History]\nenabled = yes\ncsv = off\nretention_days = 7.5\n",
+         (True, False, 7.5)),
+        ("[History]\nenabled = maybe\nretention_days = -1\n",
+         (configuration.DEFAULT_HISTORY_ENABLED,
+          configuration.DEFAULT_HISTORY_CSV,
+          configuration.DEFAULT_HISTORY_RETENTION_DAYS)),
+        ("[Request]\ntimeout = 5\n", (configuration.DEFAULT_HISTORY_ENABLED,
+                                        configuration.DEFAULT_HISTORY_CSV,
+                                        configuration.DEFAULT_HISTORY_RETENTION_DAYS)),
+    ],
+)
+def test_get_history_settings(tmp_path, monkeypatch, config_content,
+                              expected):
+    monkeypatch.setenv(configuration.LOG_DIR_ENV, str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    _write_config(tmp_path, config_content)
+
+    assert (configuration.get_history_enabled(),
+            configuration.get_csv_log_enabled(),
+            configuration.get_history_retention_days()) == expected
+
+
+def test_parse_host_list():
+    assert configuration.parse_host_list(" 10.0.0.1,db1\n10.0.0.1  web ") == (
+        "10.0.0.1", "db1", "web")
+    with pytest.raises(ValueError):
+        configuration.parse_host_list(" , ")
+
+
+def test_read_monitor_list_accepts_host_list_monitors(tmp_path, monkeypatch):
+    base_dir = tmp_path / "apimonitor"
+    monkeypatch.setenv(configuration.LOG_DIR_ENV, str(base_dir))
+    _write_config(
+        base_dir, """
+[MonitorNum]
+total = 2
+
+[Monitor1]
+name = Fleet
+url = 10.0.0.1, 10.0.0.2
+type = hosts
+interval = 30
+
+[Monitor2]
+name = Empty
+url = ,
+type = HOSTS
+interval = 30
+""")
+
+    items = configuration.read_monitor_list()
+
+    assert [(item.name, item.monitor_type) for item in items] == [("Fleet",
+                                                                   "HOSTS")]
+
+
+def test_parse_tcp_targets():
+    assert configuration.parse_tcp_targets("db1:5432, [2001:db8::1]:22") == (
+        ("db1", 5432), ("2001:db8::1", 22))
+    for invalid in ("db1", "db1:0", "db1:ssh"):
+        with pytest.raises(ValueError):
+            configuration.parse_tcp_targets(invalid)
+
+
+def test_config_snapshot_is_parsed_once_until_the_file_changes(
+        tmp_path, monkeypatch):
+    monkeypatch.setenv(configuration.LOG_DIR_ENV, str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    config_path = _write_config(tmp_path, "[TimeZone]\ntimezone = 8\n")
+    reads = []
+    original_read = configparser.RawConfigParser.read
+
+    def counting_read(self, filenames, encoding=None):
+        reads.append(filenames)
+        return original_read(self, filenames, encoding)
+
+    monkeypatch.setattr(configparser.RawConfigParser, "read", counting_read)
+    changed = []
+    configuration.add_config_listener(changed.append)
+    try:
+        assert configuration.get_timezone() == "8"
+        assert configuration.get_timezone() == "8"
+        assert len(reads) == 1
+
+        config_path.write_text("[TimeZone]\ntimezone = -5\n", encoding="utf-8")
+        assert configuration.get_timezone() == "-5"
+        assert len(reads) == 2
+        assert changed == [configuration.get_config_snapshot().path]
+
+        # Writes made through the module are not reported as changes.
+        configuration.set_timezone(3)
+        assert configuration.get_timezone() == "3"
+        assert len(changed) == 1
+    finally:
+        configuration.remove_config_listener(changed.append)
+
+
+def test_config_snapshot_is_immutable(tmp_path, monkeypatch):
+    monkeypatch.setenv(configuration.LOG_DIR_ENV, str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    _write_config(tmp_path, "[Request]\nTimeout = 4\n")
+
+    snapshot = configuration.get_config_snapshot()
+
+    assert snapshot.exists
+    assert snapshot.get("Request", "timeout") == "4"
+    with pytest.raises(TypeError):
+        snapshot.sections["Request"]["timeout"] = "5"
+    parser = snapshot.parser()
+    parser.set("Request", "timeout", "5")
+    assert configuration.get_config_snapshot().get("Request",
+                                                   "timeout") == "4"
+    missing = configuration.get_config_snapshot(tmp_path / "absent.ini")
+    assert not missing.exists and missing.sections == {}
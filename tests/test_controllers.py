@@ -22,9 +22,11 @@ from ui.main_window import MainWindowUI
 
 class DummyScheduler:
 
-    def __init__(self, *, event_handler=None, timezone_getter=None):
+    def __init__(self, *, event_handler=None, timezone_getter=None,
+                 **options):
         self.event_handler = event_handler
         self.timezone_getter = timezone_getter
+        self.options = options
         self.started = False
         self.monitors = []
         self.prune_calls = []
@@ -33,8 +35,22 @@ class DummyScheduler:
         self.started = True
         self.monitors = list(monitors)
 
-    def stop(self):
+    def stop(self, timeout=None):
         self.started = False
+        return ()
+
+    def reconcile(self, monitors):
+        previous = {monitor.name: monitor for monitor in self.monitors}
+        self.monitors = list(monitors)
+        current = {monitor.name: monitor for monitor in self.monitors}
+        return types.SimpleNamespace(
+            added=tuple(current[name] for name in current
+                        if name not in previous),
+            removed=tuple(previous[name] for name in previous
+                          if name not in current),
+            updated=(),
+            changed=set(previous) != set(current),
+        )
 
     def run_single_cycle(self, monitor):
         event = types.SimpleNamespace(
@@ -91,6 +107,45 @@ def test_dashboard_start_and_stop_emits_signals(qtbot, monkeypatch, request):
     assert any("Monitoring stopped" in msg for msg, _ in status_messages)
 
 
+@pytest.mark.qt
+def test_dashboard_reconcile_keeps_scheduler_running(qtbot, monkeypatch,
+                                                     request):
+    first = configuration.MonitorItem(name="Service A",
+                                      url="http://example.com/a",
+                                      monitor_type="GET",
+                                      interval=30)
+    second = configuration.MonitorItem(name="Service B",
+                                       url="http://example.com/b",
+                                       monitor_type="GET",
+                                       interval=30)
+    monitor_lists = [[first], [first, second]]
+    monkeypatch.setattr(configuration, "read_monitor_list",
+                        lambda: monitor_lists[0])
+    monkeypatch.setattr("controllers.dashboard.MonitorScheduler",
+                        DummyScheduler)
+
+    bus = ControllerEventBus()
+    log_messages = []
+    toggled = []
+    bus.logMessage.connect(log_messages.append)
+    bus.monitoringToggled.connect(toggled.append)
+
+    controller = DashboardController(event_bus=bus, timezone=0)
+    request.addfinalizer(controller.on_close)
+
+    assert controller.reconcile_monitoring() is False
+    assert controller.start_monitoring() is True
+    scheduler = controller._scheduler
+
+    monitor_lists.pop(0)
+    assert controller.reconcile_monitoring() is True
+    assert controller._scheduler is scheduler
+    assert scheduler.started
+    assert scheduler.monitors == [first, second]
+    assert toggled == [True]
+    assert any("1 added" in message for message in log_messages)
+
+
 @pytest.mark.qt
 def test_dashboard_run_periodically_triggers_event(qtbot, monkeypatch,
                                                    request):
@@ -118,6 +173,41 @@ def test_dashboard_run_periodically_triggers_event(qtbot, monkeypatch,
     assert prune_calls and len(prune_calls[-1]) == 1
 
 
+@pytest.mark.qt
+def test_dashboard_periodic_jobs_share_timer_and_pool(qtbot, monkeypatch,
+                                                      request):
+    monkeypatch.setattr("controllers.dashboard.MonitorScheduler",
+                        DummyScheduler)
+    bus = ControllerEventBus()
+    captured = []
+    bus.logMessage.connect(captured.append)
+
+    controller = DashboardController(event_bus=bus, timezone=0)
+    request.addfinalizer(controller.on_close)
+
+    for name in ("Periodic A", "Periodic B"):
+        controller.run_periodically({
+            "name": name,
+            "url": f"http://example.com/{name[-1]}",
+            "type": "GET",
+            "interval": 1,
+        })
+
+    pool = controller._periodic_pool
+    assert pool is not None
+    assert controller._periodic_timer.isActive()
+    qtbot.waitUntil(lambda: all(
+        captured.count(f"cycle:{name}") >= 2
+        for name in ("Periodic A", "Periodic B")),
+                    timeout=4000)
+    assert controller._periodic_pool is pool
+    assert pool.thread_count <= 2
+
+    controller.on_close()
+    assert not controller._periodic_timer.isActive()
+    assert controller._periodic_pool is None
+
+
 @pytest.mark.qt
 def test_dashboard_logs_unsupported_type(monkeypatch, qtbot, request):
     monkeypatch.setattr("controllers.dashboard.MonitorScheduler",
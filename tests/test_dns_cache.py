@@ -0,0 +1,183 @@
+import socket
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import configuration  # noqa: E402
+from monitoring import dns_cache  # noqa: E402
+from monitoring.service import monitor_hosts  # noqa: E402
+
+from conftest import FakeClock, make_monitor, stub_scheduler  # noqa: E402
+
+
+class CountingResolver:
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.calls = []
+
+    def __call__(self, host):
+        self.calls.append(host)
+        answer = self.answers[host]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+V4 = (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("192.0.2.10", 0))
+V6 = (socket.AF_INET6, socket.SOCK_STREAM, 6, "", ("2001:db8::1", 0, 0, 0))
+
+
+def _cache(resolver, clock, **options):
+    return dns_cache.DnsCache(ttl=30.0,
+                              negative_ttl=5.0,
+                              resolver=resolver,
+                              clock=clock,
+                              **options)
+
+
+def test_answers_are_cached_until_the_ttl_expires():
+    clock = FakeClock()
+    resolver = CountingResolver({"example.com": [V6, V4]})
+    cache = _cache(resolver, clock)
+
+    assert cache.getaddrinfo("example.com", 443)[0][4] == ("2001:db8::1", 443,
+                                                           0, 0)
+    assert cache.getaddrinfo("example.com", 80,
+                             socket.AF_INET)[0][4] == ("192.0.2.10", 80)
+    assert cache.gethostbyname("example.com") == "192.0.2.10"
+    assert resolver.calls == ["example.com"]
+
+    clock.now += 30.0
+    cache.getaddrinfo("example.com", 443)
+    assert resolver.calls == ["example.com", "example.com"]
+    assert cache.stats() == dns_cache.DnsCacheStats(hits=2,
+                                                    misses=2,
+                                                    negative_hits=0,
+                                                    coalesced=0,
+                                                    entries=1)
+
+
+def test_failures_are_cached_for_the_negative_ttl():
+    clock = FakeClock()
+    resolver = CountingResolver(
+        {"missing.invalid": socket.gaierror(socket.EAI_NONAME, "unknown")})
+    cache = _cache(resolver, clock)
+
+    for _ in range(3):
+        with pytest.raises(socket.gaierror):
+            cache.getaddrinfo("missing.invalid", 80)
+    assert len(resolver.calls) == 1
+    assert cache.stats().negative_hits == 2
+
+    clock.now += 5.0
+    with pytest.raises(socket.gaierror):
+        cache.gethostbyname("missing.invalid")
+    assert len(resolver.calls) == 2
+
+
+def test_missing_family_raises_gaierror():
+    cache = _cache(CountingResolver({"v6only": [V6]}), FakeClock())
+
+    with pytest.raises(socket.gaierror):
+        cache.gethostbyname("v6only")
+
+
+def test_concurrent_lookups_share_one_resolver_call():
+    release = threading.Event()
+    calls = []
+
+    def slow_resolver(host):
+        calls.append(host)
+        release.wait(5)
+        return [V4]
+
+    cache = _cache(slow_resolver, FakeClock())
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(cache.gethostbyname("slow")))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    while cache.stats().coalesced < 4:
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == ["slow"]
+    assert results == ["192.0.2.10"] * 5
+
+
+def test_prewarm_resolves_hosts_in_the_background():
+    resolver = CountingResolver({
+        "a.example": [V4],
+        "b.example": socket.gaierror(socket.EAI_NONAME, "unknown"),
+    })
+    cache = _cache(resolver, FakeClock())
+
+    assert cache.prewarm(["a.example", "b.example", "a.example"],
+                         wait=True) == 2
+    assert sorted(resolver.calls) == ["a.example", "b.example"]
+    assert cache.peek("a.example", 8080)[0][4] == ("192.0.2.10", 8080)
+    assert cache.peek("b.example", 80) is None
+
+
+def test_monitor_hosts_covers_every_monitor_type():
+    monitors = [
+        configuration.MonitorItem(name="get",
+                                  url="https://api.example/health",
+                                  monitor_type="GET",
+                                  interval=60),
+        configuration.MonitorItem(name="server",
+                                  url="db.example:5432",
+                                  monitor_type="SERVER",
+                                  interval=60),
+        configuration.MonitorItem(name="hosts",
+                                  url="a.example, b.example",
+                                  monitor_type="HOSTS",
+                                  interval=60),
+        configuration.MonitorItem(name="tcp",
+                                  url="a.example:22, [2001:db8::1]:443",
+                                  monitor_type="TCP",
+                                  interval=60),
+    ]
+
+    assert monitor_hosts(monitors) == ("api.example", "db.example",
+                                       "a.example", "b.example",
+                                       "2001:db8::1")
+
+
+def test_scheduler_start_prewarms_monitor_hosts(monkeypatch):
+    warmed = []
+    monkeypatch.setattr(dns_cache, "prewarm",
+                        lambda hosts, **_: warmed.append(tuple(hosts)))
+
+    scheduler = stub_scheduler(dns_prewarm=True)
+    scheduler.start([make_monitor(interval=3600)])
+    scheduler.stop(timeout=1)
+
+    assert warmed == [("api.example", )]
+
+
+def test_interleave_families_alternates_from_the_first_family():
+    v4 = [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (f"192.0.2.{n}", 0))
+          for n in range(3)]
+    v6 = [(socket.AF_INET6, socket.SOCK_STREAM, 6, "", (f"2001:db8::{n}", 0,
+                                                         0, 0))
+          for n in range(2)]
+
+    ordered = dns_cache.interleave_families(v6 + v4)
+
+    assert [info[4][0] for info in ordered] == [
+        "2001:db8::0", "192.0.2.0", "2001:db8::1", "192.0.2.1", "192.0.2.2"
+    ]
+    assert dns_cache.interleave_families([]) == []
@@ -0,0 +1,179 @@
+import datetime
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from monitoring import log_recorder  # noqa: E402
+from monitoring.event_pipeline import (  # noqa: E402
+    BackpressurePolicy, EventPipeline,
+)
+from monitoring.probe_result import ProbeResult  # noqa: E402
+from monitoring.service import default_notification_templates  # noqa: E402
+from monitoring.state_machine import MonitorStateMachine  # noqa: E402
+
+from conftest import FakeClock, make_monitor, stub_scheduler  # noqa: E402
+
+NOW = datetime.datetime(2026, 10, 17, 22, 30)
+
+
+def _events(count):
+    machine = MonitorStateMachine(make_monitor(),
+                                  default_notification_templates())
+    return [
+        machine.transition(ProbeResult(success=True), NOW, NOW)
+        for _ in range(count)
+    ]
+
+
+def _blocked_sink(received):
+    release = threading.Event()
+
+    def sink(event):
+        release.wait(5)
+        received.append(event)
+
+    return sink, release
+
+
+def test_a_slow_sink_does_not_hold_up_the_others():
+    slow, fast = [], []
+    slow_sink, release = _blocked_sink(slow)
+    pipeline = EventPipeline({"slow": slow_sink, "fast": fast.append})
+    pipeline.start()
+
+    events = _events(3)
+    for event in events:
+        pipeline.publish(event)
+    while len(fast) < 3:
+        threading.Event().wait(0.01)
+    assert slow == []
+
+    release.set()
+    assert pipeline.close(timeout=5) is True
+    assert slow == events
+    assert pipeline.stats()["slow"].delivered == 3
+
+
+def test_block_policy_makes_the_publisher_wait_for_room():
+    received = []
+    sink, release = _blocked_sink(received)
+    pipeline = EventPipeline({"log": sink}, capacity=1)
+    pipeline.start()
+    first, second, third = _events(3)
+
+    pipeline.publish(first)
+    while pipeline.stats()["log"].backlog:
+        threading.Event().wait(0.01)
+    pipeline.publish(second)
+    publisher = threading.Thread(target=pipeline.publish, args=(third, ))
+    publisher.start()
+    publisher.join(0.1)
+    assert publisher.is_alive()
+
+    release.set()
+    publisher.join(5)
+    pipeline.close(timeout=5)
+    assert received == [first, second, third]
+
+
+@pytest.mark.parametrize(("policy", "kept"), [("drop_oldest", [0, 2]),
+                                              ("drop_newest", [0, 1])])
+def test_drop_policies_keep_the_queue_bounded(policy, kept):
+    received = []
+    sink, release = _blocked_sink(received)
+    pipeline = EventPipeline({"ui": sink}, capacity=1, policy=policy)
+    pipeline.start()
+    events = _events(3)
+
+    pipeline.publish(events[0])
+    while pipeline.stats()["ui"].backlog:
+        threading.Event().wait(0.01)
+    pipeline.publish(events[1])
+    pipeline.publish(events[2])
+
+    release.set()
+    pipeline.close(timeout=5)
+    assert received == [events[index] for index in kept]
+    assert pipeline.stats()["ui"].dropped == 1
+
+
+def test_stats_report_backlog_and_lag():
+    clock = FakeClock()
+    pipeline = EventPipeline({"csv": lambda event: None}, clock=clock)
+    event, = _events(1)
+
+    pipeline.publish(event)
+    clock.now += 2.5
+    stats = pipeline.stats()["csv"]
+    assert (stats.backlog, stats.lag) == (1, 2.5)
+
+    pipeline.start()
+    pipeline.close(timeout=5)
+    stats = pipeline.stats()["csv"]
+    assert (stats.backlog, stats.delivered, stats.max_lag) == (0, 1, 2.5)
+
+
+def test_a_failing_sink_keeps_draining():
+    received = []
+
+    def flaky(event):
+        if not received:
+            received.append(None)
+            raise OSError("disk full")
+        received.append(event)
+
+    pipeline = EventPipeline({"log": flaky})
+    pipeline.start()
+    first, second = _events(2)
+    pipeline.publish(first)
+    pipeline.publish(second)
+    pipeline.close(timeout=5)
+
+    assert received == [None, second]
+    stats = pipeline.stats()["log"]
+    assert (stats.failed, stats.delivered) == (1, 1)
+
+
+def test_events_published_after_close_are_delivered_inline():
+    received = []
+    pipeline = EventPipeline({"ui": received.append})
+    pipeline.start()
+    pipeline.close(timeout=5)
+    event, = _events(1)
+
+    pipeline.publish(event)
+    assert received == [event]
+
+
+def test_parse_rejects_unknown_policies():
+    assert BackpressurePolicy.parse(" Drop_Oldest ") is (
+        BackpressurePolicy.DROP_OLDEST)
+    with pytest.raises(ValueError):
+        BackpressurePolicy.parse("spill")
+
+
+def test_scheduler_probes_while_the_log_sink_is_stalled(monkeypatch):
+    logged, ui_events = [], []
+    log_sink, release = _blocked_sink(logged)
+    monkeypatch.setattr(log_recorder, "record",
+                        lambda action, detail: log_sink(action))
+    monkeypatch.setattr(log_recorder, "saveToFile", lambda row, name: None)
+    scheduler = stub_scheduler(event_handler=ui_events.append,
+                               event_queue_size=16)
+
+    scheduler.start([make_monitor(interval=0.05)])
+    while len(ui_events) < 3:
+        threading.Event().wait(0.01)
+    assert scheduler.event_stats()["log"].backlog >= 1
+
+    release.set()
+    assert scheduler.stop(timeout=5) == ()
+    stats = scheduler.event_stats()
+    assert stats["log"].backlog == 0
+    assert stats["log"].delivered == stats["ui"].delivered == len(logged)
@@ -0,0 +1,118 @@
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import configuration  # noqa: E402  pylint: disable=wrong-import-position
+from monitoring import __main__ as daemon  # noqa: E402
+from monitoring import http_probe, log_recorder  # noqa: E402
+
+
+def _run_python(code, home):
+    env = dict(os.environ, APIMONITOR_HOME=str(home))
+    return subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=False,
+    )
+
+
+def test_monitoring_core_imports_without_qt(tmp_path):
+    result = _run_python(
+        """
+        import sys
+        import monitoring
+        import monitoring.__main__
+        loaded = sorted(name for name in sys.modules
+                        if name.startswith("PySide6"))
+        print(loaded)
+        """, tmp_path)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
+
+
+def test_headless_translate_reads_json_catalog(tmp_path):
+    config_dir = tmp_path / "Config"
+    config_dir.mkdir()
+    (config_dir / "Config.ini").write_text("[Locale]\nlanguage = en_US\n",
+                                           encoding="utf-8")
+
+    result = _run_python(
+        """
+        from monitoring.i18n import translate
+        print(translate("MonitorState", "服务正常"))
+        print(translate("MonitorState", "Not in the catalog"))
+        """, tmp_path)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines() == [
+        "Service healthy", "Not in the catalog"
+    ]
+
+
+@pytest.fixture
+def headless_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("APIMONITOR_HOME", str(tmp_path))
+    configuration.writeconfig(str(tmp_path / "Config"))
+    monkeypatch.setattr(log_recorder, "record", lambda action, detail: None)
+    monkeypatch.setattr(log_recorder, "saveToFile", lambda row, name: None)
+    yield tmp_path
+    configuration.reset_logging_configuration()
+
+
+def test_daemon_once_reports_failing_monitors(headless_home, monkeypatch):
+    configuration.write_monitor_list([
+        {
+            "name": "Healthy",
+            "url": "http://example.com/ok",
+            "type": "GET",
+            "interval": 30,
+        },
+        {
+            "name": "Broken",
+            "url": "http://example.com/down",
+            "type": "GET",
+            "interval": 30,
+        },
+    ])
+    results = {"http://example.com/ok": True}
+
+    def fake_probe_get(url, timeout=None, keep_alive=True, head=False):
+        return results.get(url, False)
+
+    monkeypatch.setattr(http_probe, "probe_get", fake_probe_get)
+    monkeypatch.setattr(daemon, "_create_scheduler",
+                        _scheduler_without_mail(daemon._create_scheduler))
+
+    assert daemon.main(["--home", str(headless_home), "--once"]) == 2
+
+    results["http://example.com/down"] = True
+    assert daemon.main(["--once"]) == 0
+
+
+def test_daemon_exits_when_no_monitors_are_configured(headless_home):
+    configuration.write_monitor_list([])
+
+    assert daemon.main(["--once"]) == 1
+
+
+def _scheduler_without_mail(factory):
+
+    def build(timezone):
+        scheduler = factory(timezone)
+        scheduler._dispatcher = lambda notification: None
+        return scheduler
+
+    return build
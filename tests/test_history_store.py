@@ -0,0 +1,169 @@
+import dataclasses
+import datetime
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import configuration  # noqa: E402
+from monitoring import history_store  # noqa: E402
+from monitoring.history_store import HistoryStore  # noqa: E402
+from monitoring.probe_result import ProbeResult  # noqa: E402
+from monitoring.service import default_notification_templates  # noqa: E402
+from monitoring.state_machine import (  # noqa: E402
+    MonitorState, MonitorStateMachine,
+)
+
+from conftest import make_monitor, stub_scheduler  # noqa: E402
+
+START = datetime.datetime(2026, 10, 17, 22, 0)
+
+
+def _events(outcomes, name="api"):
+    machine = MonitorStateMachine(make_monitor(name),
+                                  default_notification_templates())
+    return [
+        machine.transition(
+            ProbeResult(success=success,
+                        status_code=200 if success else 503,
+                        total=0.25,
+                        family="IPv6"), START + datetime.timedelta(minutes=n),
+            START + datetime.timedelta(hours=8, minutes=n))
+        for n, success in enumerate(outcomes)
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(tmp_path / "history.sqlite3", background=False)
+    yield store
+    store.close()
+
+
+def test_rows_are_inserted_in_batches(tmp_path):
+    path = tmp_path / "history.sqlite3"
+    store = HistoryStore(path, batch_size=3, background=False)
+
+    for event in _events([True, True]):
+        store.record(event)
+    assert not path.exists()
+
+    store.record(_events([True])[0])
+    count, = sqlite3.connect(path).execute(
+        "SELECT COUNT(*) FROM probe_results").fetchone()
+    assert count == 3
+    assert sqlite3.connect(path).execute(
+        "PRAGMA journal_mode").fetchone() == ("wal", )
+    store.close()
+
+
+def test_queries_return_stored_results(store):
+    for event in _events([True, False, False, True]):
+        store.record(event)
+
+    latest = store.latest("api", count=2)
+    assert [record.status for record in latest] == [
+        MonitorState.RECOVERED, MonitorState.OUTAGE_ONGOING
+    ]
+    first = store.records_between("api", START,
+                                  START + datetime.timedelta(minutes=2))
+    assert [record.utc_time for record in first] == [
+        START, START + datetime.timedelta(minutes=1)
+    ]
+    assert (first[1].status_code, first[1].total, first[1].family,
+            first[1].local_time) == (503, 0.25, "IPv6", "2026-10-18 06:01:00")
+    assert store.monitors() == ["api"]
+
+
+def test_state_changes_are_outages_and_recoveries(store):
+    for event in _events([True, False, False, True]) + _events([False],
+                                                                name="db"):
+        store.record(event)
+
+    changes = store.state_changes("api")
+    assert [(record.status, record.utc_time) for record in changes] == [
+        (MonitorState.OUTAGE, START + datetime.timedelta(minutes=1)),
+        (MonitorState.RECOVERED, START + datetime.timedelta(minutes=3)),
+    ]
+    assert len(store.state_changes(start=START + datetime.timedelta(
+        minutes=2))) == 1
+
+
+def test_prune_applies_the_retention(tmp_path):
+    now = (START + datetime.timedelta(days=10)).replace(
+        tzinfo=datetime.UTC).timestamp()
+    store = HistoryStore(tmp_path / "history.sqlite3",
+                         retention_days=7,
+                         background=False,
+                         clock=lambda: now)
+    old = _events([True])
+    recent = [
+        dataclasses.replace(event,
+                            utc_time=START + datetime.timedelta(days=5))
+        for event in _events([True], name="db")
+    ]
+    for event in old + recent:
+        store.record(event)
+
+    assert store.prune() == 1
+    assert store.monitors() == ["db"]
+    store.close()
+
+
+def test_closed_store_is_not_reopened_to_prune(tmp_path):
+    path = tmp_path / "history.sqlite3"
+    store = HistoryStore(path, retention_days=7, background=False)
+    store.record(_events([True])[0])
+    store.close()
+    path.unlink()
+
+    assert store.prune() == 0
+    assert not path.exists()
+
+
+def test_concurrent_writers_lose_no_rows(tmp_path):
+    store = HistoryStore(tmp_path / "history.sqlite3",
+                         batch_size=7,
+                         flush_interval=0.01)
+    events = _events([True] * 50)
+
+    threads = [
+        threading.Thread(target=lambda: [store.record(e) for e in events])
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(store.latest(count=1000)) == 200
+    store.close()
+
+
+def test_scheduler_records_into_history_without_csv(tmp_path, csv_rows):
+    store = HistoryStore(tmp_path / "history.sqlite3", background=False)
+    scheduler = stub_scheduler(history=store, csv_log=False)
+
+    scheduler.run_single_cycle(make_monitor())
+    assert csv_rows == []
+    record, = store.latest()
+    assert (record.monitor, record.status_code) == ("api", 200)
+    store.close()
+
+
+def test_shared_store_lives_in_the_log_folder(tmp_path, monkeypatch):
+    monkeypatch.setenv(configuration.LOG_DIR_ENV, str(tmp_path))
+    history_store.close_shared_store()
+    try:
+        store = history_store.shared_store()
+        assert store is history_store.shared_store()
+        assert store.path == Path(
+            configuration.get_logdir()) / "Log" / "history.sqlite3"
+    finally:
+        history_store.close_shared_store()
@@ -0,0 +1,257 @@
+import http.server
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import configuration  # noqa: E402  pylint: disable=wrong-import-position
+from monitoring import dns_cache, http_probe  # noqa: E402
+from monitoring.http_pool import HostSessionPool  # noqa: E402
+
+from conftest import FakeClock  # noqa: E402
+
+
+class FakeSession:
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.requests = []
+        self.closed = False
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs))
+        return url
+
+    def close(self):
+        self.closed = True
+
+
+def _pool(clock, sessions, **options):
+
+    def factory(maxsize):
+        session = FakeSession(maxsize)
+        sessions.append(session)
+        return session
+
+    return HostSessionPool(clock=clock, session_factory=factory, **options)
+
+
+def test_pool_reuses_one_session_per_host():
+    sessions = []
+    pool = _pool(FakeClock(0.0), sessions, maxsize=8)
+
+    pool.request("GET", "https://example.com/a", timeout=1)
+    pool.request("POST", "https://EXAMPLE.com/b", timeout=1)
+    pool.request("GET", "http://example.com/a", timeout=1)
+    pool.request("GET", "https://example.com:8443/a", timeout=1)
+
+    assert len(pool) == 3
+    assert len(sessions) == 3
+    assert [method for method, _, _ in sessions[0].requests] == ["GET", "POST"]
+    assert sessions[0].maxsize == 8
+
+
+def test_pool_evicts_idle_and_least_recently_used_hosts():
+    clock = FakeClock(0.0)
+    sessions = []
+    pool = _pool(clock, sessions, max_hosts=2, idle_timeout=30)
+
+    pool.request("GET", "http://a.example")
+    clock.now = 10
+    pool.request("GET", "http://b.example")
+    clock.now = 20
+    pool.request("GET", "http://a.example")
+    pool.request("GET", "http://c.example")
+
+    # b was the least recently used host when c pushed the pool past 2.
+    assert [session.closed for session in sessions] == [False, True, False]
+    assert len(pool) == 2
+
+    clock.now = 45
+    assert pool.evict_idle() == 0
+    clock.now = 55
+    assert pool.evict_idle() == 2
+    assert len(pool) == 0
+
+    pool.request("GET", "http://a.example")
+    pool.close()
+    assert all(session.closed for session in sessions)
+
+
+def test_pool_never_closes_a_session_with_a_request_in_flight():
+    clock = FakeClock(0.0)
+    entered = threading.Event()
+    release = threading.Event()
+
+    class SlowSession(FakeSession):
+
+        def request(self, method, url, **kwargs):
+            entered.set()
+            release.wait(5)
+            return super().request(method, url, **kwargs)
+
+    slow = SlowSession(1)
+    pool = HostSessionPool(clock=clock,
+                           idle_timeout=5,
+                           session_factory=lambda maxsize: slow)
+
+    worker = threading.Thread(target=pool.request,
+                              args=("GET", "http://slow.example"))
+    worker.start()
+    assert entered.wait(5)
+    clock.now = 100
+    assert pool.evict_idle() == 0
+    release.set()
+    worker.join(5)
+
+    assert not slow.closed
+    clock.now = 200
+    assert pool.evict_idle() == 1
+    assert slow.closed
+
+
+def test_pool_is_safe_across_worker_threads():
+    sessions = []
+    lock = threading.Lock()
+
+    def factory(maxsize):
+        session = FakeSession(maxsize)
+        with lock:
+            sessions.append(session)
+        return session
+
+    pool = HostSessionPool(session_factory=factory)
+    hosts = [f"http://host{index}.example/" for index in range(4)]
+
+    def hammer():
+        for _ in range(200):
+            for host in hosts:
+                pool.request("GET", host)
+
+    threads = [threading.Thread(target=hammer) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert len(sessions) == len(hosts)
+    assert sum(len(session.requests) for session in sessions) == 8 * 200 * 4
+
+
+class _KeepAliveHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802 - http.server naming
+        self.server.peers.append(self.client_address)
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def keep_alive_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0),
+                                             _KeepAliveHandler)
+    server.peers = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join(5)
+
+
+@pytest.fixture
+def fresh_session_pool(monkeypatch):
+    monkeypatch.setattr(configuration, "get_request_timeout", lambda: 5.0)
+    monkeypatch.setattr(configuration, "get_keep_alive", lambda: True)
+    http_probe.reset_session_pool()
+    yield
+    http_probe.reset_session_pool()
+
+
+def test_monitor_get_reuses_connection_unless_opted_out(
+        keep_alive_server, fresh_session_pool):
+    url = f"http://127.0.0.1:{keep_alive_server.server_port}/health"
+
+    for _ in range(3):
+        assert http_probe.monitor_get(url) is True
+    pooled_ports = {port for _, port in keep_alive_server.peers}
+    assert len(pooled_ports) == 1
+
+    del keep_alive_server.peers[:]
+    for _ in range(3):
+        assert http_probe.monitor_get(url, keep_alive=False) is True
+    cold_ports = {port for _, port in keep_alive_server.peers}
+    assert len(cold_ports) == 3
+
+
+def test_probe_get_reports_phase_timings(keep_alive_server,
+                                         fresh_session_pool):
+    url = f"http://127.0.0.1:{keep_alive_server.server_port}/health"
+
+    cold = http_probe.probe_get(url)
+    assert cold.success and cold.status_code == 200 and cold.bytes_read == 2
+    assert cold.dns is not None and cold.connect is not None
+    assert cold.tls is None
+    assert 0 <= cold.connect <= cold.ttfb <= cold.total
+
+    # The second probe reuses the pooled connection, so no handshake phases.
+    warm = http_probe.probe_get(url)
+    assert warm.success
+    assert (warm.dns, warm.connect, warm.tls) == (None, None, None)
+    assert 0 <= warm.ttfb <= warm.total
+
+    # Opting out of keep-alive still measures the handshake phases.
+    opted_out = http_probe.probe_get(url, keep_alive=False)
+    assert opted_out.success and opted_out.bytes_read == 2
+    assert opted_out.dns is not None and opted_out.connect is not None
+
+
+def test_cold_probe_resolves_through_the_dns_cache(keep_alive_server,
+                                                  fresh_session_pool,
+                                                  monkeypatch):
+    lookups = []
+    getaddrinfo = dns_cache.getaddrinfo
+
+    def tracking_getaddrinfo(host, port, *args, **kwargs):
+        lookups.append((host, port))
+        return getaddrinfo(host, port, *args, **kwargs)
+
+    monkeypatch.setattr(dns_cache, "getaddrinfo", tracking_getaddrinfo)
+    port = keep_alive_server.server_port
+
+    assert http_probe.monitor_get(f"http://127.0.0.1:{port}/health",
+                                  keep_alive=False) is True
+    assert lookups == [("127.0.0.1", port)]
+
+
+def test_session_pool_follows_keep_alive_setting(monkeypatch):
+    monkeypatch.setattr(configuration, "get_keep_alive", lambda: False)
+    http_probe.reset_session_pool()
+    try:
+        assert http_probe.session_pool() is None
+    finally:
+        http_probe.reset_session_pool()
+
+
+def test_pooled_probe_drops_connection_for_oversized_body(
+        keep_alive_server, fresh_session_pool, monkeypatch):
+    monkeypatch.setattr(configuration, "get_max_body_bytes", lambda: 1)
+    http_probe.reset_session_pool()
+    url = f"http://127.0.0.1:{keep_alive_server.server_port}/health"
+
+    for _ in range(2):
+        assert http_probe.monitor_get(url) is True
+
+    # The 2-byte body exceeds the 1-byte cap, so no connection is reused.
+    assert len({port for _, port in keep_alive_server.peers}) == 2
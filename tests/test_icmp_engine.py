@@ -0,0 +1,253 @@
+import socket
+import struct
+import time
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from monitoring.icmp_engine import IcmpEngine  # noqa: E402
+from monitoring.icmp_probe import IcmpProbe  # noqa: E402
+
+
+class FakeRawSocket:
+    """Raw-socket stand-in; the test plays the network on the other end."""
+
+    def __init__(self):
+        self._inbound, self.network = socket.socketpair(
+            socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sent = []
+
+    def fileno(self):
+        return self._inbound.fileno()
+
+    def setblocking(self, flag):
+        self._inbound.setblocking(flag)
+
+    def sendto(self, packet, address):
+        self.sent.append((bytes(packet), address[0]))
+
+    def recvfrom_into(self, buffer):
+        size = self._inbound.recv_into(buffer)
+        # Like a real raw socket, the source comes from the IPv4 header.
+        return size, (socket.inet_ntoa(bytes(buffer[12:16])), 0)
+
+    def close(self):
+        self._inbound.close()
+        self.network.close()
+
+    def reply(self, source, identifier, sequence, icmp_type=0):
+        icmp = struct.pack(">BBHHH", icmp_type, 0, 0, identifier,
+                           sequence) + b"payload"
+        header = struct.pack(">BBHHHBBH4s4s", 0x45, 0, 20 + len(icmp), 0, 0,
+                             64, socket.IPPROTO_ICMP, 0,
+                             socket.inet_aton(source),
+                             socket.inet_aton("127.0.0.1"))
+        self.network.send(header + icmp)
+
+
+@pytest.fixture
+def engine_and_socket():
+    sockets = []
+
+    def factory(family):
+        assert family == socket.AF_INET
+        sockets.append(FakeRawSocket())
+        return sockets[-1]
+
+    engine = IcmpEngine(socket_factory=factory)
+    yield engine, sockets
+    engine.close()
+
+
+def _send(probe, address, sequence):
+    packet = probe.request_ping(8, 0, 0, probe.identifier, sequence,
+                                b"abcdefghijklmnopqrstuvwabcdefghi")
+    _, handle = probe.raw_socket(address, packet)
+    return handle
+
+
+def test_concurrent_probes_only_see_their_own_replies(engine_and_socket):
+    engine, sockets = engine_and_socket
+    first, second = IcmpProbe(engine), IcmpProbe(engine)
+    assert first.identifier != second.identifier
+
+    with _send(first, "10.0.0.1", 1) as first_echo, \
+            _send(second, "10.0.0.2", 1) as second_echo:
+        raw = sockets[0]
+        assert len(sockets) == 1
+        assert [address for _, address in raw.sent] == ["10.0.0.1", "10.0.0.2"]
+
+        raw.reply("10.0.0.9", 0, 1)  # someone else's echo
+        raw.reply("10.0.0.2", first.identifier, 1)  # right id, wrong host
+        raw.reply("10.0.0.1", first.identifier, 1, icmp_type=8)  # a request
+        raw.reply("10.0.0.2", second.identifier, 1)
+        raw.reply("10.0.0.1", first.identifier, 1)
+
+        assert second.reply_ping(0, second_echo, 1, timeout=2) > 0
+        assert first.reply_ping(0, first_echo, 1, timeout=2) > 0
+        assert engine.pending_count() == 0
+
+
+def test_unanswered_echo_times_out_and_releases_its_slot(engine_and_socket):
+    engine, _ = engine_and_socket
+    probe = IcmpProbe(engine)
+
+    with _send(probe, "10.0.0.3", 7) as echo:
+        assert engine.pending_count() == 1
+        assert probe.reply_ping(0, echo, 7, timeout=0.05) == -1
+    assert engine.pending_count() == 0
+
+    identifier = probe.identifier
+    probe.close()
+    assert identifier not in engine._identifiers
+
+
+class FakeDatagramSocket(FakeRawSocket):
+    """Unprivileged ping socket: no IP header, identifier owned by the kernel."""
+
+    type = socket.SOCK_DGRAM
+
+    def __init__(self, source):
+        super().__init__()
+        self.source = source
+
+    def recvfrom_into(self, buffer):
+        return self._inbound.recv_into(buffer), (self.source, 0)
+
+    def reply_to(self, packet, icmp_type=0):
+        _, _, _, _, sequence = struct.unpack_from(">BBHHH", packet)
+        self.network.send(
+            struct.pack(">BBHHH", icmp_type, 0, 0, 0xBEEF, sequence) + b"x")
+
+
+def test_datagram_socket_demultiplexes_by_engine_sequence():
+    sockets = []
+
+    def factory(family):
+        sockets.append(FakeDatagramSocket("10.0.0.5"))
+        return sockets[-1]
+
+    engine = IcmpEngine(socket_factory=factory)
+    try:
+        first, second = IcmpProbe(engine), IcmpProbe(engine)
+        with _send(first, "10.0.0.5", 1) as first_echo, \
+                _send(second, "10.0.0.5", 1) as second_echo:
+            raw = sockets[0]
+            first_packet, second_packet = (packet for packet, _ in raw.sent)
+            # Both probes asked for sequence 1; the wire must tell them apart.
+            assert first_packet[6:8] != second_packet[6:8]
+            assert first_packet[8:] == second_packet[8:]
+
+            raw.reply_to(second_packet, icmp_type=8)
+            raw.reply_to(second_packet)
+            assert second.reply_ping(0, second_echo, 1, timeout=2) > 0
+            assert engine.pending_count() == 1
+            assert first.reply_ping(0, first_echo, 1, timeout=0.05) == -1
+    finally:
+        engine.close()
+
+
+def test_socket_mode_prefers_raw_then_datagram_and_caches(monkeypatch):
+    from monitoring import icmp_engine
+
+    attempts = []
+
+    class Refusing:
+
+        def __init__(self, family, sock_type, protocol):
+            attempts.append(sock_type)
+            if sock_type == socket.SOCK_RAW:
+                raise PermissionError("raw sockets need CAP_NET_RAW")
+
+        def close(self):
+            pass
+
+    icmp_engine.reset_socket_modes()
+    monkeypatch.setattr(icmp_engine.socket, "socket", Refusing)
+    try:
+        assert icmp_engine.socket_mode(socket.AF_INET) == "dgram"
+        assert icmp_engine.socket_mode(socket.AF_INET) == "dgram"
+        assert attempts == [socket.SOCK_RAW, socket.SOCK_DGRAM]
+    finally:
+        icmp_engine.reset_socket_modes()
+
+
+class AnsweringRawSocket(FakeRawSocket):
+    """Raw socket whose network answers echoes to ``live`` hosts at once."""
+
+    def __init__(self, live):
+        super().__init__()
+        self.live = live
+
+    def sendto(self, packet, address):
+        super().sendto(packet, address)
+        if address[0] in self.live:
+            _, _, _, identifier, sequence = struct.unpack_from(">BBHHH",
+                                                               packet)
+            self.reply(address[0], identifier, sequence)
+
+
+def test_sweep_waits_about_one_timeout_for_all_hosts():
+    from monitoring.icmp_sweep import sweep
+
+    live = {"10.0.1.1", "10.0.1.3"}
+    engine = IcmpEngine(socket_factory=lambda family: AnsweringRawSocket(live))
+    try:
+        started = time.monotonic()
+        results = sweep(["10.0.1.1", "10.0.1.2", "10.0.1.3", "10.0.1.4"],
+                        timeout=0.3,
+                        rate=1000,
+                        engine=engine)
+        elapsed = time.monotonic() - started
+        assert engine.pending_count() == 0
+        assert not engine._identifiers
+    finally:
+        engine.close()
+
+    assert {host: result.success for host, result in results.items()} == {
+        "10.0.1.1": True,
+        "10.0.1.2": False,
+        "10.0.1.3": True,
+        "10.0.1.4": False,
+    }
+    assert results["10.0.1.1"].total is not None
+    assert elapsed < 0.6
+
+
+def test_icmp_probe_races_ipv6_and_ipv4(monkeypatch):
+    from monitoring import dns_cache, network_probe
+
+    sockets = {}
+
+    def factory(family):
+        # IPv6 is silent, as on a host with a broken IPv6 path.
+        sockets[family] = (AnsweringRawSocket({"10.0.2.1"})
+                           if family == socket.AF_INET else FakeRawSocket())
+        return sockets[family]
+
+    engine = IcmpEngine(socket_factory=factory)
+    monkeypatch.setattr(network_probe, "IcmpProbe", lambda: IcmpProbe(engine))
+    monkeypatch.setattr(
+        dns_cache, "getaddrinfo", lambda host, port: [
+            (socket.AF_INET6, socket.SOCK_STREAM, 6, "",
+             ("2001:db8::1", 0, 0, 0)),
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.2.1", 0)),
+        ])
+    try:
+        started = time.monotonic()
+        result = network_probe.perform_icmp_probe("dual.example", 2.0)
+        elapsed = time.monotonic() - started
+        assert engine.pending_count() == 0
+    finally:
+        engine.close()
+
+    assert result.success
+    assert result.family == "IPv4"
+    assert sockets[socket.AF_INET6].sent[0][0][0] == 128
+    assert sockets[socket.AF_INET].sent[0][0][0] == 8
+    assert 0.2 < elapsed < 1.0
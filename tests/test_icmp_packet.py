@@ -0,0 +1,65 @@
+import struct
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from monitoring.icmp_packet import EchoPacketBuilder, internet_checksum  # noqa: E402
+from monitoring.icmp_probe import IcmpProbe  # noqa: E402
+
+PAYLOAD = b"abcdefghijklmnopqrstuvwabcdefghi"
+
+
+def legacy_checksum(data):
+    """The byte-pair loop IcmpProbe.chesksum used before."""
+
+    n = len(data)
+    m = n % 2
+    total = 0
+    for i in range(0, n - m, 2):
+        total += data[i] + (data[i + 1] << 8)
+        total = (total >> 16) + (total & 0xffff)
+    if m:
+        total += data[-1]
+        total = (total >> 16) + (total & 0xffff)
+    answer = ~total & 0xffff
+    return answer >> 8 | (answer << 8 & 0xff00)
+
+
+def legacy_packet(identifier, sequence, payload=PAYLOAD):
+    packet = struct.pack(">BBHHH32s", 8, 0, 0, identifier, sequence, payload)
+    return struct.pack(">BBHHH32s", 8, 0, legacy_checksum(packet), identifier,
+                       sequence, payload)
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"\x01",
+    b"\xff\xff\xff",
+    bytes(range(256)),
+    legacy_packet(0xFFFF, 0xFFFF),
+])
+def test_internet_checksum_matches_byte_loop(data):
+    assert internet_checksum(data) == legacy_checksum(data)
+
+
+@pytest.mark.parametrize("identifier", [0, 1, 0x1234, 0xFFFF])
+def test_builder_patches_sequence_into_cached_template(identifier):
+    builder = EchoPacketBuilder(identifier, PAYLOAD)
+
+    for sequence in (0, 1, 2, 0x7FFF, 0xFFFE, 0xFFFF):
+        packet = builder.build(sequence)
+        assert packet == legacy_packet(identifier, sequence)
+        assert internet_checksum(packet) == 0
+
+
+def test_request_ping_keeps_the_fixed_payload_size():
+    probe = IcmpProbe(engine=object())
+
+    assert probe.request_ping(8, 0, 0, 7, 3, b"short") == legacy_packet(
+        7, 3, b"short")
+    assert probe.request_ping(8, 0, 0, 7, 4, PAYLOAD) == legacy_packet(7, 4)
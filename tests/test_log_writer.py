@@ -0,0 +1,164 @@
+import csv
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import configuration  # noqa: E402
+from monitoring import log_recorder  # noqa: E402
+from monitoring.log_writer import LogWriter  # noqa: E402
+
+HEADER = ["Time", "Status"]
+
+
+@pytest.fixture(autouse=True)
+def fresh_writer():
+    log_recorder.reset_writer()
+    yield
+    log_recorder.reset_writer()
+
+
+def _rows(path):
+    with path.open(newline="", encoding="utf-8") as handle:
+        return list(csv.reader(handle))
+
+
+def test_rows_are_buffered_until_the_flush_threshold(tmp_path):
+    writer = LogWriter(tmp_path, flush_rows=3, background=False)
+    target = tmp_path / "api_20261017.csv"
+
+    writer.write_row("20261017", target.name, ["t1", "up"], lambda: HEADER)
+    writer.write_row("20261017", target.name, ["t2", "up"], lambda: HEADER)
+    assert target.read_text(encoding="utf-8") == ""
+
+    writer.write_row("20261017", target.name, ["t3", "down"], lambda: HEADER)
+    assert _rows(target) == [HEADER, ["t1", "up"], ["t2", "up"],
+                             ["t3", "down"]]
+    assert writer.stats().opens == 1
+    writer.close()
+
+
+def test_header_is_only_written_to_new_files(tmp_path):
+    target = tmp_path / "api_20261017.csv"
+    target.write_text("Time,Status\r\nt0,up\r\n", encoding="utf-8")
+    writer = LogWriter(tmp_path, background=False)
+
+    writer.write_row("20261017", target.name, ["t1", "up"], lambda: HEADER)
+    writer.close()
+
+    assert _rows(target) == [HEADER, ["t0", "up"], ["t1", "up"]]
+
+
+def test_changed_header_starts_a_suffixed_file(tmp_path):
+    target = tmp_path / "api_20261017.csv"
+    target.write_text("Time\r\nt0\r\n", encoding="utf-8")
+    (tmp_path / "api_20261017-1.csv").write_text("Old,Columns\r\n",
+                                                 encoding="utf-8")
+    writer = LogWriter(tmp_path, background=False)
+
+    writer.write_row("20261017", target.name, ["t1", "up"], lambda: HEADER)
+    writer.write_row("20261017", target.name, ["t2", "up"], lambda: HEADER)
+    writer.close()
+
+    assert _rows(target) == [["Time"], ["t0"]]
+    assert _rows(tmp_path / "api_20261017-2.csv") == [
+        HEADER, ["t1", "up"], ["t2", "up"]
+    ]
+
+
+def test_least_recently_used_file_is_closed(tmp_path):
+    writer = LogWriter(tmp_path, max_open_files=2, background=False)
+
+    for name in ("a.txt", "b.txt", "a.txt", "c.txt"):
+        writer.write_line("20261017", name, name)
+    stats = writer.stats()
+    assert (stats.opens, stats.evictions, stats.open_files) == (3, 1, 2)
+    # "b" was evicted, so its line is already on disk.
+    assert (tmp_path / "b.txt").read_text(encoding="utf-8") == "b.txt\n"
+
+    writer.write_line("20261017", "b.txt", "again")
+    writer.close()
+    assert (tmp_path / "b.txt").read_text(encoding="utf-8") == "b.txt\nagain\n"
+    assert (tmp_path / "a.txt").read_text(encoding="utf-8") == "a.txt\na.txt\n"
+
+
+def test_new_day_closes_the_previous_days_files(tmp_path):
+    writer = LogWriter(tmp_path, background=False)
+
+    writer.write_line("20261017", "log-20261017.txt", "late")
+    writer.write_line("20261018", "log-20261018.txt", "early")
+
+    assert (tmp_path / "log-20261017.txt").read_text(
+        encoding="utf-8") == "late\n"
+    assert writer.stats().open_files == 1
+    writer.close()
+
+
+def test_text_lines_use_platform_newlines_and_rows_use_crlf(tmp_path):
+    writer = LogWriter(tmp_path, background=False)
+
+    writer.write_line("20261017", "log-20261017.txt", "entry")
+    writer.write_row("20261017", "api.csv", ["t1", "up"], lambda: HEADER)
+    writer.close()
+
+    assert (tmp_path / "log-20261017.txt").read_bytes() == (
+        "entry" + os.linesep).encode("utf-8")
+    assert (tmp_path / "api.csv").read_bytes() == b"Time,Status\r\nt1,up\r\n"
+
+
+def test_background_flusher_writes_pending_lines(tmp_path):
+    writer = LogWriter(tmp_path, flush_interval=0.02)
+    target = tmp_path / "log.txt"
+
+    writer.write_line("20261017", target.name, "entry")
+    for _ in range(200):
+        if target.read_text(encoding="utf-8"):
+            break
+        threading.Event().wait(0.01)
+    assert target.read_text(encoding="utf-8") == "entry\n"
+    writer.close()
+
+
+def test_concurrent_writers_do_not_interleave_rows(tmp_path):
+    writer = LogWriter(tmp_path, flush_rows=7, background=False)
+
+    def write(worker):
+        for index in range(200):
+            writer.write_row("20261017", "api.csv", [worker, str(index)],
+                             lambda: HEADER)
+
+    threads = [
+        threading.Thread(target=write, args=(str(n), )) for n in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.close()
+
+    rows = _rows(tmp_path / "api.csv")
+    assert rows[0] == HEADER
+    assert sorted(rows[1:]) == sorted([str(n), str(i)] for n in range(4)
+                                      for i in range(200))
+
+
+def test_recorder_writes_through_the_shared_writer(tmp_path, monkeypatch):
+    monkeypatch.setenv(configuration.LOG_DIR_ENV, str(tmp_path))
+    monkeypatch.setattr(configuration, "get_timezone", lambda: "0")
+
+    log_recorder.saveToFile(["2026-10-17 10:00", "OK"], "api/health")
+    log_recorder.record("Check", "api is up\n")
+    log_recorder.flush()
+
+    folder = Path(configuration.get_logdir()) / "Log"
+    csv_files = list(folder.glob("api_health_*.csv"))
+    assert len(csv_files) == 1
+    assert _rows(csv_files[0])[1:] == [["2026-10-17 10:00", "OK"]]
+    (text_log, ) = folder.glob("log-*.txt")
+    assert "api is up" in text_log.read_text(encoding="utf-8")
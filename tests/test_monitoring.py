@@ -2,6 +2,7 @@ import datetime
 import logging
 import sys
 import threading
+import time
 import types
 from pathlib import Path
 
@@ -32,9 +33,11 @@ import pytest
 
 import configuration  # noqa: E402  pylint: disable=wrong-import-position
 from monitoring import log_recorder  # noqa: E402  pylint: disable=wrong-import-position
+from monitoring.probe_result import ProbeResult  # noqa: E402
 from monitoring.service import (  # noqa: E402
-    MonitorScheduler, MonitorStrategy, ServerMonitorStrategy,
-    default_notification_templates, parse_network_address,
+    MonitorScheduler, MonitorStrategy, OverrunPolicy, ServerMonitorStrategy,
+    default_notification_templates, parse_network_address, phase_offset,
+    plan_next_tick,
 )
 from monitoring.state_machine import (  # noqa: E402
     MonitorState, MonitorStateMachine, NotificationTemplates,
@@ -135,6 +138,37 @@ def test_state_machine_transitions_and_notifications():
     assert event4.notification.subject.startswith("Recovery")
 
 
+def test_state_machine_threads_probe_result_into_event():
+    monitor = configuration.MonitorItem(
+        name="ServiceA",
+        url="http://example.com",
+        monitor_type="GET",
+        interval=30,
+    )
+    machine = MonitorStateMachine(monitor, default_notification_templates())
+    base_time = datetime.datetime(2023, 1, 1, 0, 0, 0)
+    probe = ProbeResult(success=True,
+                        status_code=204,
+                        bytes_read=0,
+                        dns=0.002,
+                        connect=0.0105,
+                        ttfb=0.05,
+                        total=0.0512,
+                        family="IPv6")
+
+    event = machine.transition(probe, base_time, base_time)
+    assert event.success is True
+    assert event.probe is probe
+    assert event.csv_row[5] == MonitorState.HEALTHY.response_code
+    assert event.csv_row[7:] == (204, 0, 2.0, 10.5, "", 50.0, 51.2, "IPv6")
+
+    # Strategies that still return a bare bool get a result without timings.
+    event = machine.transition(False, base_time, base_time)
+    assert event.status is MonitorState.OUTAGE
+    assert event.probe == ProbeResult(success=False)
+    assert event.csv_row[7:] == ("", 0, "", "", "", "", "", "")
+
+
 def test_state_machine_respects_template_overrides(tmp_path, monkeypatch):
     templates_content = """[ui]\nstatus_line = [{event_timestamp}] {service_name}::{status_label}\n[log]\naction_line = ACTION {service_name} {monitor_type}\ndetail_line = DETAIL {status_text} @ {event_timestamp}\n"""
     monkeypatch.setenv(configuration.LOG_DIR_ENV, str(tmp_path))
@@ -292,8 +326,9 @@ def test_server_strategy_uses_shared_parser(monkeypatch):
 
     monkeypatch.setattr("monitoring.service.parse_network_address", fake_parse)
     monkeypatch.setattr(
-        "monitoring.service.api_monitor.monitor_server",
-        lambda parsed: monitor_calls.append(parsed) or True,
+        "monitoring.service.api_monitor.probe_server",
+        lambda parsed, keep_alive=True, layers=None: monitor_calls.append(
+            parsed) or True,
     )
 
     assert strategy.run(monitor) is True
@@ -668,3 +703,402 @@ def test_scheduler_reuses_state_machine_for_repeated_cycles(monkeypatch):
 
     scheduler.prune_state_machines([])
     assert scheduler._state_machines == {}
+
+
+def test_scheduler_fans_host_list_results_out_to_per_host_machines(
+        monkeypatch):
+    monkeypatch.setattr(log_recorder, "record", lambda action, detail: None)
+    saved = []
+    monkeypatch.setattr(log_recorder, "saveToFile",
+                        lambda row, name: saved.append(name))
+    notified = []
+    scheduler = MonitorScheduler(
+        timezone_getter=lambda: 0,
+        clock=lambda: datetime.datetime(2023, 1, 1, 0, 0, 0),
+        dispatcher=notified.append,
+    )
+    sweeps = iter([
+        {"10.0.0.1": True, "10.0.0.2": True},
+        {"10.0.0.1": ProbeResult(success=True, total=0.004), "10.0.0.2": False},
+        {"10.0.0.2": True},
+    ])
+    strategy = types.SimpleNamespace(run=lambda monitor: next(sweeps))
+    monitor = configuration.MonitorItem(name="Fleet",
+                                        url="10.0.0.1, 10.0.0.2",
+                                        monitor_type="HOSTS",
+                                        interval=60)
+
+    first = scheduler.run_single_cycle(monitor, strategy=strategy)
+    assert first.success
+    assert saved == ["Fleet [10.0.0.1]", "Fleet [10.0.0.2]"]
+
+    second = scheduler.run_single_cycle(monitor, strategy=strategy)
+    assert second.monitor.name == "Fleet [10.0.0.2]"
+    assert second.monitor.url == "10.0.0.2"
+    assert second.status is MonitorState.OUTAGE
+    assert len(notified) == 1
+
+    third = scheduler.run_single_cycle(monitor, strategy=strategy)
+    assert third.status is MonitorState.RECOVERED
+    machines = scheduler._host_state_machines[scheduler._monitor_key(monitor)]
+    assert list(machines) == ["10.0.0.2"]
+    assert scheduler._state_machines == {}
+
+    scheduler.prune_state_machines([])
+    assert scheduler._host_state_machines == {}
+
+
+def test_scheduler_worker_pool_bounds_thread_count(monkeypatch):
+    monkeypatch.setattr(log_recorder, "record", lambda action, detail: None)
+    monkeypatch.setattr(log_recorder, "saveToFile", lambda row, name: None)
+
+    monitors = [
+        configuration.MonitorItem(
+            name=f"Pooled{index}",
+            url=f"http://example.com/{index}",
+            monitor_type="GET",
+            interval=0.05,
+        ) for index in range(20)
+    ]
+    strategy = PerMonitorSequenceStrategy(
+        {monitor: [True, False, True]
+         for monitor in monitors})
+
+    lock = threading.Lock()
+    statuses = {monitor.name: [] for monitor in monitors}
+    worker_threads = set()
+    finished = threading.Event()
+
+    def capture_event(event):
+        with lock:
+            worker_threads.add(threading.current_thread().name)
+            statuses[event.monitor.name].append(event.status)
+            if all(len(items) >= 3 for items in statuses.values()):
+                finished.set()
+
+    scheduler = MonitorScheduler(
+        event_handler=capture_event,
+        timezone_getter=lambda: 0,
+        clock=lambda: datetime.datetime(2023, 1, 1, 0, 0, 0),
+        dispatcher=lambda notification: None,
+        worker_count=3,
+    )
+    scheduler.register_strategy("GET", strategy)
+
+    scheduler.start(monitors)
+    try:
+        assert finished.wait(5), "Pooled scheduler did not cover all monitors"
+        assert scheduler._pool.thread_count <= 3
+    finally:
+        scheduler.stop()
+
+    assert len(worker_threads) <= 3
+    for items in statuses.values():
+        assert items[:3] == [
+            MonitorState.HEALTHY,
+            MonitorState.OUTAGE,
+            MonitorState.RECOVERED,
+        ]
+
+
+def test_scheduler_rejects_unknown_type_before_starting():
+    scheduler = MonitorScheduler(timezone_getter=lambda: 0)
+    monitor = configuration.MonitorItem(
+        name="Unknown",
+        url="http://example.com",
+        monitor_type="FTP",
+        interval=1,
+    )
+
+    with pytest.raises(ValueError):
+        scheduler.start([monitor])
+    assert not scheduler.is_running
+
+
+@pytest.mark.parametrize(
+    ("policy", "now", "expected"),
+    [
+        (OverrunPolicy.SKIP, 5.0, (10.0, 10.0, 0, 0)),
+        (OverrunPolicy.SKIP, 38.0, (40.0, 40.0, 0, 3)),
+        (OverrunPolicy.COALESCE, 38.0, (30.0, 38.0, 1, 2)),
+        (OverrunPolicy.IMMEDIATE, 38.0, (10.0, 38.0, 1, 0)),
+    ],
+)
+def test_plan_next_tick_applies_overrun_policy(policy, now, expected):
+    assert plan_next_tick(0.0, now, 10.0, policy) == expected
+
+
+def test_overrun_policy_parse():
+    assert OverrunPolicy.parse(" Skip ") is OverrunPolicy.SKIP
+    assert OverrunPolicy.parse(OverrunPolicy.IMMEDIATE) is (
+        OverrunPolicy.IMMEDIATE)
+    with pytest.raises(ValueError):
+        OverrunPolicy.parse("later")
+
+
+class TimedStrategy(MonitorStrategy):
+
+    def __init__(self, duration):
+        self.duration = duration
+        self.started = []
+
+    def run(self, monitor):
+        self.started.append(time.monotonic())
+        time.sleep(self.duration)
+        return True
+
+
+def _run_timed_scheduler(monkeypatch, strategy, *, interval, runs, policy):
+    monkeypatch.setattr(log_recorder, "record", lambda action, detail: None)
+    monkeypatch.setattr(log_recorder, "saveToFile", lambda row, name: None)
+    finished = threading.Event()
+
+    def capture_event(event):
+        if len(strategy.started) >= runs:
+            finished.set()
+
+    scheduler = MonitorScheduler(
+        event_handler=capture_event,
+        timezone_getter=lambda: 0,
+        dispatcher=lambda notification: None,
+        overrun_policy=policy,
+    )
+    scheduler.register_strategy("GET", strategy)
+    monitor = configuration.MonitorItem(
+        name="FixedRate",
+        url="http://example.com",
+        monitor_type="GET",
+        interval=interval,
+    )
+    scheduler.start([monitor])
+    try:
+        assert finished.wait(5), "Scheduler did not complete the runs"
+        stats = scheduler.tick_stats()
+    finally:
+        scheduler.stop()
+    return stats[scheduler._monitor_key(monitor)]
+
+
+def test_scheduler_runs_at_fixed_rate_despite_probe_duration(monkeypatch):
+    strategy = TimedStrategy(0.06)
+    stats = _run_timed_scheduler(monkeypatch,
+                                 strategy,
+                                 interval=0.1,
+                                 runs=5,
+                                 policy=OverrunPolicy.COALESCE)
+
+    offsets = [started - strategy.started[0] for started in strategy.started]
+    # Fixed-delay scheduling would start run 4 at ~0.64s; fixed-rate at ~0.4s.
+    assert offsets[4] == pytest.approx(0.4, abs=0.08)
+    assert stats.late == 0
+    assert stats.skipped == 0
+
+
+def test_scheduler_counts_skipped_ticks(monkeypatch):
+    strategy = TimedStrategy(0.12)
+    stats = _run_timed_scheduler(monkeypatch,
+                                 strategy,
+                                 interval=0.05,
+                                 runs=3,
+                                 policy="skip")
+
+    assert stats.runs >= 3
+    assert stats.skipped >= 2
+    assert stats.late == 0
+
+
+def test_scheduler_counts_late_ticks_when_coalescing(monkeypatch):
+    strategy = TimedStrategy(0.12)
+    stats = _run_timed_scheduler(monkeypatch,
+                                 strategy,
+                                 interval=0.05,
+                                 runs=3,
+                                 policy=OverrunPolicy.COALESCE)
+
+    assert stats.late >= 2
+    assert stats.skipped >= 2
+
+
+def test_phase_offset_is_stable_and_spread():
+    keys = [(f"Service{index}", f"http://example.com/{index}", "GET")
+            for index in range(200)]
+    offsets = [phase_offset(key, 60) for key in keys]
+
+    assert offsets == [phase_offset(key, 60) for key in keys]
+    assert all(0 <= offset < 60 for offset in offsets)
+    buckets = {int(offset // 6) for offset in offsets}
+    assert len(buckets) == 10
+    assert phase_offset(keys[0], 0) == 0.0
+
+
+def test_scheduler_spreads_first_runs(monkeypatch):
+    monkeypatch.setattr(log_recorder, "record", lambda action, detail: None)
+    monkeypatch.setattr(log_recorder, "saveToFile", lambda row, name: None)
+
+    monitors = [
+        configuration.MonitorItem(
+            name=f"Spread{index}",
+            url=f"http://example.com/{index}",
+            monitor_type="GET",
+            interval=30,
+        ) for index in range(8)
+    ]
+    scheduler = MonitorScheduler(
+        timezone_getter=lambda: 0,
+        phase_spread=True,
+        start_jitter=10,
+        jitter_source=lambda: 0.5,
+    )
+    scheduler.register_strategy("GET", SequenceStrategy([True]))
+
+    before = time.monotonic()
+    scheduler.start(monitors)
+    try:
+        delays = {
+            entry.monitor.name: entry.tick - before
+            for entry in scheduler._scheduled.values()
+        }
+    finally:
+        scheduler.stop()
+
+    for monitor in monitors:
+        key = scheduler._monitor_key(monitor)
+        expected = (phase_offset(key, 30) + 5) % 30
+        assert delays[monitor.name] == pytest.approx(expected, abs=0.5)
+    assert max(delays.values()) - min(delays.values()) > 5
+
+
+def test_scheduler_reconcile_diffs_monitor_set(monkeypatch):
+    monkeypatch.setattr(log_recorder, "record", lambda action, detail: None)
+    monkeypatch.setattr(log_recorder, "saveToFile", lambda row, name: None)
+
+    def build(name, **overrides):
+        values = dict(name=name,
+                      url=f"http://example.com/{name}",
+                      monitor_type="GET",
+                      interval=0.05)
+        values.update(overrides)
+        return configuration.MonitorItem(**values)
+
+    kept, dropped = build("Kept"), build("Dropped")
+    lock = threading.Lock()
+    seen = {}
+
+    def capture_event(event):
+        with lock:
+            seen.setdefault(event.monitor.name, []).append(event)
+
+    scheduler = MonitorScheduler(event_handler=capture_event,
+                                 timezone_getter=lambda: 0,
+                                 dispatcher=lambda notification: None)
+    scheduler.register_strategy("GET", SequenceStrategy([False]))
+
+    def wait_for(predicate):
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            with lock:
+                if predicate():
+                    return True
+            time.sleep(0.01)
+        return False
+
+    scheduler.start([kept, dropped])
+    try:
+        assert wait_for(lambda: len(seen.get("Kept", [])) >= 2)
+        kept_key = scheduler._monitor_key(kept)
+        machine = scheduler._state_machines[kept_key]
+
+        edited = build("Kept", email="ops@example.com")
+        added = build("Added")
+        result = scheduler.reconcile([edited, added])
+
+        assert result.added == (added, )
+        assert result.removed == (dropped, )
+        assert result.updated == (edited, )
+        assert scheduler.is_running
+
+        assert wait_for(lambda: len(seen.get("Added", [])) >= 1 and any(
+            event.monitor is edited for event in seen["Kept"]))
+        assert scheduler._state_machines[kept_key] is machine
+        with lock:
+            edited_events = [
+                event for event in seen["Kept"] if event.monitor is edited
+            ]
+        assert edited_events[0].status is MonitorState.OUTAGE_ONGOING
+        time.sleep(0.1)
+        assert scheduler._monitor_key(dropped) not in scheduler._state_machines
+        assert set(scheduler.tick_stats()) == {
+            kept_key, scheduler._monitor_key(added)
+        }
+
+        unchanged = scheduler.reconcile([edited, added])
+        assert not unchanged.changed
+    finally:
+        scheduler.stop()
+
+
+def test_scheduler_reconcile_grows_the_default_pool(monkeypatch):
+    monkeypatch.setattr(log_recorder, "record", lambda action, detail: None)
+    monkeypatch.setattr(log_recorder, "saveToFile", lambda row, name: None)
+
+    monitors = [
+        configuration.MonitorItem(name=name,
+                                  url=f"http://example.com/{name}",
+                                  monitor_type="GET",
+                                  interval=60) for name in ("A", "B", "C")
+    ]
+    scheduler = MonitorScheduler(timezone_getter=lambda: 0,
+                                 dispatcher=lambda notification: None)
+    scheduler.register_strategy("GET", SequenceStrategy([True]))
+
+    scheduler.start(monitors[:1])
+    try:
+        assert scheduler._pool.size == 1
+        scheduler.reconcile(monitors)
+        assert scheduler._pool.size == 3
+    finally:
+        scheduler.stop()
+
+
+def test_scheduler_stop_abandons_stuck_probes(monkeypatch):
+    monkeypatch.setattr(log_recorder, "record", lambda action, detail: None)
+    monkeypatch.setattr(log_recorder, "saveToFile", lambda row, name: None)
+
+    release = threading.Event()
+    entered = threading.Event()
+
+    class StuckStrategy:
+
+        def run(self, monitor):
+            if monitor.name == "Stuck":
+                entered.set()
+                release.wait(5)
+            return True
+
+    events = []
+    scheduler = MonitorScheduler(event_handler=events.append,
+                                 timezone_getter=lambda: 0,
+                                 dispatcher=lambda notification: None)
+    scheduler.register_strategy("GET", StuckStrategy())
+    monitors = [
+        configuration.MonitorItem(name=name,
+                                  url=f"http://example.com/{name}",
+                                  monitor_type="GET",
+                                  interval=0.05) for name in ("Stuck", "Fast")
+    ]
+
+    scheduler.start(monitors)
+    try:
+        assert entered.wait(5)
+        started = time.monotonic()
+        abandoned = scheduler.stop(timeout=0.2)
+        elapsed = time.monotonic() - started
+    finally:
+        release.set()
+
+    assert abandoned == ("Stuck", )
+    assert elapsed < 1.0
+    assert not scheduler.is_running
+
+    time.sleep(0.1)
+    assert all(event.monitor.name == "Fast" for event in events)
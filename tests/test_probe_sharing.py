@@ -0,0 +1,133 @@
+import asyncio
+import sys
+import threading
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import configuration  # noqa: E402
+from monitoring.probe_sharing import SharedProbes, probe_key  # noqa: E402
+
+from conftest import FakeClock, StubStrategy, stub_scheduler  # noqa: E402
+
+MONITOR = configuration.MonitorItem(name="ops",
+                                    url="https://api.example/health",
+                                    monitor_type="GET",
+                                    interval=60,
+                                    email="ops@example.com")
+
+
+class CountingStrategy(StubStrategy):
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def run(self, monitor):
+        self.calls += 1
+        return super().run(monitor)
+
+
+def test_probe_key_ignores_alerting_fields():
+    other_team = replace(MONITOR,
+                         name="dev",
+                         interval=30,
+                         email="dev@example.com",
+                         language="zh_CN")
+
+    assert probe_key(other_team) == probe_key(MONITOR)
+    assert probe_key(replace(MONITOR, headers={"X-Token": "a"})) != probe_key(
+        MONITOR)
+    assert probe_key(replace(MONITOR, monitor_type="POST")) != probe_key(
+        MONITOR)
+
+
+def test_concurrent_checks_share_one_probe():
+    release = threading.Event()
+    calls = []
+
+    def probe():
+        calls.append(1)
+        release.wait(5)
+        return "up"
+
+    shared = SharedProbes(0)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(shared.run("k", probe)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    while shared.shared < 3:
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert calls == [1]
+    assert results == ["up"] * 4
+    # With no window the next check probes again.
+    assert shared.run("k", lambda: "again") == "again"
+
+
+def test_results_are_reused_within_the_window():
+    clock = FakeClock()
+    shared = SharedProbes(2.0, clock=clock)
+
+    assert shared.run("k", lambda: 1) == 1
+    clock.now += 2.0
+    assert shared.run("k", lambda: 2) == 1
+    clock.now += 0.5
+    assert shared.run("k", lambda: 3) == 3
+    assert (shared.probes, shared.shared) == (2, 1)
+
+
+def test_failed_probes_are_not_reused():
+    shared = SharedProbes(60)
+
+    def broken():
+        raise OSError("boom")
+
+    with pytest.raises(OSError):
+        shared.run("k", broken)
+    assert shared.run("k", lambda: "ok") == "ok"
+
+
+def test_async_checks_share_one_probe():
+    shared = SharedProbes(0)
+    calls = []
+
+    async def probe():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "up"
+
+    async def main():
+        return await asyncio.gather(
+            *(shared.run_async("k", probe) for _ in range(3)))
+
+    assert asyncio.run(main()) == ["up"] * 3
+    assert calls == [1]
+
+
+def test_scheduler_shares_probes_but_keeps_state_machines(csv_rows):
+    events = []
+    strategy = CountingStrategy()
+    scheduler = stub_scheduler(strategy,
+                               event_handler=events.append,
+                               probe_share_window=60)
+    other_team = replace(MONITOR, name="dev", email="dev@example.com")
+
+    scheduler.run_single_cycle(MONITOR)
+    scheduler.run_single_cycle(other_team)
+
+    assert strategy.calls == 1
+    assert [event.monitor.name for event in events] == ["ops", "dev"]
+    assert len(scheduler._state_machines) == 2
+    assert len(csv_rows) == 2
@@ -0,0 +1,157 @@
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import configuration  # noqa: E402
+from monitoring import tcp_engine  # noqa: E402
+from monitoring.service import TcpMonitorStrategy  # noqa: E402
+
+
+@pytest.fixture
+def engine():
+    engine = tcp_engine.TcpConnectEngine()
+    yield engine
+    engine.close()
+
+
+@pytest.fixture
+def listener():
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(1024)
+    yield server
+    server.close()
+
+
+def _closed_port():
+    probe = socket.socket()
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    return port
+
+
+def test_connect_many_uses_one_thread_for_many_targets(engine, listener):
+    port = listener.getsockname()[1]
+    closed = _closed_port()
+    threads_before = threading.active_count()
+
+    results = engine.connect_many([("127.0.0.1", port), ("127.0.0.1", closed)]
+                                  + [("localhost", port)] * 3, timeout=2)
+
+    assert threading.active_count() <= threads_before + 1
+    assert results[("127.0.0.1", port)].family == socket.AF_INET
+    assert isinstance(results[("127.0.0.1", port)].elapsed, float)
+    assert isinstance(results[("localhost", port)], tcp_engine.ConnectAttempt)
+    assert isinstance(results[("127.0.0.1", closed)], ConnectionRefusedError)
+
+
+@pytest.fixture
+def stalled_port():
+    # A full accept queue makes the kernel drop further SYNs.
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(0)
+    port = server.getsockname()[1]
+    held = []
+    for _ in range(3):
+        client = socket.socket()
+        client.setblocking(False)
+        client.connect_ex(("127.0.0.1", port))
+        held.append(client)
+    time.sleep(0.05)
+    yield port
+    for client in held:
+        client.close()
+    server.close()
+
+
+def _addresses(*sockaddrs):
+    return [(socket.AF_INET6 if ":" in sockaddr[0] else socket.AF_INET,
+             socket.SOCK_STREAM, socket.IPPROTO_TCP, "", sockaddr)
+            for sockaddr in sockaddrs]
+
+
+def test_pending_connect_fails_at_its_deadline(engine, stalled_port):
+    started = time.monotonic()
+    attempt = engine.start("127.0.0.1", stalled_port, 0.2)
+    with pytest.raises(TimeoutError):
+        attempt.wait()
+    assert time.monotonic() - started < 1.0
+
+
+def test_stalled_address_loses_the_race_after_the_attempt_delay(
+        monkeypatch, stalled_port):
+    ipv6 = socket.socket(socket.AF_INET6)
+    try:
+        ipv6.bind(("::1", 0))
+    except OSError:
+        pytest.skip("IPv6 loopback unavailable")
+    ipv6.listen(8)
+    port = ipv6.getsockname()[1]
+    monkeypatch.setattr(
+        tcp_engine.dns_cache, "getaddrinfo", lambda host, port_:
+        _addresses(("127.0.0.1", stalled_port), ("::1", port, 0, 0)))
+    engine = tcp_engine.TcpConnectEngine(attempt_delay=0.1)
+    try:
+        attempt = engine.start("dual.example", port, 2)
+        attempt.wait()
+    finally:
+        engine.close()
+        ipv6.close()
+
+    assert attempt.family == socket.AF_INET6
+    assert attempt.address[0] == "::1"
+    assert 0.1 <= attempt.elapsed < 1.0
+    assert attempt.connect_time < attempt.elapsed
+
+
+def test_failed_address_hands_over_without_waiting(monkeypatch, listener):
+    port = listener.getsockname()[1]
+    closed = _closed_port()
+    monkeypatch.setattr(
+        tcp_engine.dns_cache, "getaddrinfo", lambda host, port_:
+        _addresses(("127.0.0.1", closed), ("127.0.0.1", port)))
+    engine = tcp_engine.TcpConnectEngine(attempt_delay=5)
+    try:
+        attempt = engine.start("flaky.example", port, 2)
+        assert attempt.wait() < 1.0
+    finally:
+        engine.close()
+
+    assert attempt.address == ("127.0.0.1", port)
+
+
+def test_tcp_strategy_fans_out_only_for_several_targets(monkeypatch,
+                                                        listener):
+    monkeypatch.setattr(configuration, "get_request_timeout", lambda: 2.0)
+    port = listener.getsockname()[1]
+    closed = _closed_port()
+    strategy = TcpMonitorStrategy()
+
+    single = strategy.run(
+        configuration.MonitorItem(name="db",
+                                  url=f"127.0.0.1:{port}",
+                                  monitor_type="TCP",
+                                  interval=60))
+    assert single.success
+    assert single.connect is not None
+    assert single.family == "IPv4"
+
+    results = strategy.run(
+        configuration.MonitorItem(name="fleet",
+                                  url=f"127.0.0.1:{port}, 127.0.0.1:{closed}",
+                                  monitor_type="TCP",
+                                  interval=60))
+    assert {label: result.success for label, result in results.items()} == {
+        f"127.0.0.1:{port}": True,
+        f"127.0.0.1:{closed}": False,
+    }
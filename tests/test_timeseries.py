@@ -0,0 +1,106 @@
+import datetime
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from monitoring.probe_result import ProbeResult  # noqa: E402
+from monitoring.timeseries import (  # noqa: E402
+    SAMPLE_BYTES, MonitorSeries, TimeSeriesStore,
+)
+
+from conftest import make_monitor, stub_scheduler  # noqa: E402
+
+START = datetime.datetime(2026, 10, 17, 23, 0)
+EPOCH = START.replace(tzinfo=datetime.UTC).timestamp()
+
+
+def test_oldest_samples_are_overwritten_once_full():
+    series = MonitorSeries(capacity=3)
+
+    for second, code in enumerate([200, 201, 202, 203, 204]):
+        series.append(EPOCH + second, 0.1, code, True)
+
+    assert len(series) == 3
+    assert series.status_codes() == [202, 203, 204]
+
+
+def test_summary_aggregates_the_window():
+    series = MonitorSeries(capacity=8)
+    samples = [(0, 0.1, 200, True, False), (10, 0.3, 200, True, False),
+               (20, None, None, False, True), (30, 0.2, 200, True, True)]
+    for offset, latency, code, success, changed in samples:
+        series.append(EPOCH + offset, latency, code, success, changed)
+
+    everything = series.summary()
+    assert everything.samples == 4
+    assert everything.availability == 75.0
+    assert everything.mean_latency == pytest.approx(0.2)
+    assert everything.max_latency == pytest.approx(0.3)
+    assert everything.last_change == START + datetime.timedelta(seconds=30)
+
+    recent = series.summary(window=15, now=EPOCH + 30)
+    assert (recent.samples, recent.availability) == (2, 50.0)
+    assert recent.max_latency == pytest.approx(0.2)
+
+
+def test_empty_window_has_no_aggregates():
+    series = MonitorSeries(capacity=4)
+    series.append(EPOCH, None, None, False, True)
+
+    summary = series.summary(window=60, now=EPOCH + 3600)
+    assert (summary.samples, summary.availability, summary.mean_latency,
+            summary.max_latency) == (0, None, None, None)
+    assert summary.last_change == START
+
+
+def test_footprint_is_fixed_by_the_capacity():
+    series = MonitorSeries(capacity=1024)
+    before = series.nbytes()
+
+    for second in range(5000):
+        series.append(EPOCH + second, 0.05, 200, True)
+
+    assert series.nbytes() == before
+    # 19 bytes per sample plus the four array headers.
+    assert 1024 * SAMPLE_BYTES <= before <= 1024 * SAMPLE_BYTES + 4 * 128
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        MonitorSeries(capacity=0)
+    with pytest.raises(ValueError):
+        TimeSeriesStore(capacity=0)
+
+
+class FlakyStrategy:
+
+    def __init__(self, outcomes):
+        self._outcomes = iter(outcomes)
+
+    def run(self, monitor):
+        success = next(self._outcomes)
+        return ProbeResult(success=success,
+                           status_code=200 if success else 503,
+                           total=0.1)
+
+
+def test_scheduler_feeds_and_prunes_the_series(csv_rows):
+    clock = iter(START + datetime.timedelta(minutes=n) for n in range(10))
+    scheduler = stub_scheduler(FlakyStrategy([True, False, True]),
+                               clock=lambda: next(clock))
+    monitor = make_monitor()
+
+    for _ in range(3):
+        scheduler.run_single_cycle(monitor)
+    summary = scheduler.timeseries.summary("api")
+    assert summary.samples == 3
+    assert summary.availability == pytest.approx(200 / 3)
+    assert summary.last_change == START + datetime.timedelta(minutes=2)
+
+    scheduler.prune_state_machines([])
+    assert scheduler.timeseries.monitors() == []
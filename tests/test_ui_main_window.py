@@ -105,8 +105,9 @@ def test_toggle_stop_only_halts_monitoring(qtbot, monkeypatch):
         def __init__(self) -> None:
             self.stopped = False
 
-        def stop(self) -> None:
+        def stop(self, timeout=None):
             self.stopped = True
+            return ()
 
     dummy_scheduler = DummyScheduler()
     window.dashboard._scheduler = dummy_scheduler
@@ -222,28 +223,32 @@ def test_run_periodically_single_iteration(qtbot, tmp_path, monkeypatch,
 
     call_sequence: list[str] = []
 
-    def fake_monitor_get(actual_url, timeout=None):
+    def fake_probe_get(actual_url, timeout=None, keep_alive=True, head=False):
         call_sequence.append("GET")
         assert actual_url == url
         return True
 
-    def fake_monitor_post(actual_url,
-                          payload=None,
-                          *,
-                          headers=None,
-                          timeout=None):
+    def fake_probe_post(actual_url,
+                        payload=None,
+                        *,
+                        headers=None,
+                        timeout=None,
+                        keep_alive=True):
         call_sequence.append("POST")
         assert actual_url == url
         return True
 
-    def fake_monitor_server(parsed_address, timeout=None):
+    def fake_probe_server(parsed_address,
+                          timeout=None,
+                          keep_alive=True,
+                          layers=None):
         call_sequence.append("SERVER")
         assert parsed_address == expected_parsed
         return True
 
-    monkeypatch.setattr(http_probe, "monitor_get", fake_monitor_get)
-    monkeypatch.setattr(http_probe, "monitor_post", fake_monitor_post)
-    monkeypatch.setattr(api_monitor, "monitor_server", fake_monitor_server)
+    monkeypatch.setattr(http_probe, "probe_get", fake_probe_get)
+    monkeypatch.setattr(http_probe, "probe_post", fake_probe_post)
+    monkeypatch.setattr(api_monitor, "probe_server", fake_probe_server)
 
     expected_parsed = None
     if monitor_type == "SERVER":
@@ -317,30 +322,16 @@ def test_run_periodically_with_duplicate_names(qtbot, tmp_path, monkeypatch):
         fake_run_single_cycle,
     )
 
-    created_threads = []
+    submitted = []
 
-    class ImmediateThread:
+    class ImmediatePool:
 
-        def __init__(
-                self,
-                group=None,
-                target=None,
-                name=None,
-                args=(),
-                kwargs=None,
-                daemon=None,
-        ):
-            self._target = target
-            self._args = args
-            self._kwargs = kwargs or {}
-            self.name = name or "Thread"
-            created_threads.append(self.name)
+        def submit(self, func, *args):
+            submitted.append(func)
+            func(*args)
 
-        def start(self):
-            if self._target:
-                self._target(*self._args, **self._kwargs)
-
-    monkeypatch.setattr(threading, "Thread", ImmediateThread)
+    monkeypatch.setattr(window.controller.dashboard, "_ensure_periodic_pool",
+                        lambda: ImmediatePool())
 
     monitors = [
         {
@@ -361,10 +352,9 @@ def test_run_periodically_with_duplicate_names(qtbot, tmp_path, monkeypatch):
         window.controller.run_periodically(info)
 
     assert len(window.controller.dashboard._periodic_monitors) == 2
-    assert len(window.controller.dashboard._periodic_timers) == 2
-    assert created_threads == [
-        "Monitor:Duplicate Service", "Monitor:Duplicate Service"
-    ]
+    assert len(window.controller.dashboard._periodic_due) == 2
+    assert len(submitted) == 2
+    assert window.controller.dashboard._periodic_timer.isActive()
     assert run_calls == [
         ("Duplicate Service", "http://example.com/a", "GET"),
         ("Duplicate Service", "http://example.com/b", "GET"),
@@ -377,7 +367,7 @@ def test_run_periodically_with_duplicate_names(qtbot, tmp_path, monkeypatch):
     assert set(
         window.controller.dashboard._periodic_monitors.keys()) == expected_keys
     assert set(
-        window.controller.dashboard._periodic_timers.keys()) == expected_keys
+        window.controller.dashboard._periodic_due.keys()) == expected_keys
     urls = {
         monitor.url
         for monitor in window.controller.dashboard._periodic_monitors.values()
@@ -0,0 +1,73 @@
+"""Micro-benchmark: ICMP echo packet building, old byte loop vs. builder.
+
+Run from the repository root:  python tools/bench_icmp_packet.py
+"""
+
+import os
+import struct
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monitoring.icmp_packet import EchoPacketBuilder, internet_checksum  # noqa: E402
+
+PAYLOAD = b'abcdefghijklmnopqrstuvwabcdefghi'
+IDENTIFIER = 0x1234
+ROUNDS = 100000
+
+
+# The implementation IcmpProbe used before the builder, kept for comparison.
+def legacy_checksum(data):
+    n = len(data)
+    m = n % 2
+    total = 0
+    for i in range(0, n - m, 2):
+        total += (data[i]) + ((data[i + 1]) << 8)
+        total = (total >> 16) + (total & 0xffff)
+    if m:
+        total += (data[-1])
+        total = (total >> 16) + (total & 0xffff)
+    answer = ~total & 0xffff
+    answer = answer >> 8 | (answer << 8 & 0xff00)
+    return answer
+
+
+def legacy_request_ping(sequence):
+    packet = struct.pack('>BBHHH32s', 8, 0, 0, IDENTIFIER, sequence, PAYLOAD)
+    checksum = legacy_checksum(packet)
+    return struct.pack('>BBHHH32s', 8, 0, checksum, IDENTIFIER, sequence,
+                       PAYLOAD)
+
+
+def report(label, seconds, baseline=None):
+    per_call = seconds / ROUNDS * 1e6
+    line = f'{label:<28} {per_call:8.3f} us/call'
+    if baseline:
+        line += f'   x{baseline / seconds:5.1f}'
+    print(line)
+
+
+def main():
+    builder = EchoPacketBuilder(IDENTIFIER, PAYLOAD)
+    for sequence in range(1, 1000):
+        assert builder.build(sequence) == legacy_request_ping(sequence)
+
+    packet = legacy_request_ping(1)
+    old = min(timeit.repeat(lambda: legacy_checksum(packet), number=ROUNDS,
+                            repeat=5))
+    new = min(timeit.repeat(lambda: internet_checksum(packet), number=ROUNDS,
+                            repeat=5))
+    report('checksum, byte loop', old)
+    report('checksum, array', new, old)
+
+    old = min(timeit.repeat(lambda: legacy_request_ping(7), number=ROUNDS,
+                            repeat=5))
+    new = min(timeit.repeat(lambda: builder.build(7), number=ROUNDS,
+                            repeat=5))
+    report('packet, pack twice + loop', old)
+    report('packet, cached template', new, old)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""Benchmark: CSV log rows per second, open/close per row vs. LogWriter.
+
+Run from the repository root:  python tools/bench_log_writer.py
+"""
+
+import csv
+import datetime
+import os
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import configuration  # noqa: E402
+from monitoring import log_recorder  # noqa: E402
+
+MONITORS = 20
+ROWS = 20000
+ROW = ['2026-10-17 22:00:00', 'https://api.example/health', 'GET', 'OK',
+       '200', '12.5', '3.1', 'IPv4']
+
+
+# saveToFile and the helpers it called before LogWriter, copied verbatim
+# from the pre-writer log_recorder so later helper changes cannot speed up
+# the baseline.
+_FALLBACK_MONITOR_FILENAME = "monitor"
+
+
+def _sanitize_monitor_name(name) -> str:
+    """Sanitize a monitor name so it can safely appear in a file name."""
+
+    if name is None:
+        candidate = ""
+    else:
+        candidate = str(name)
+
+    # Replace path separators so the resulting name cannot escape the log folder.
+    candidate = re.sub(r"[\\/]+", "_", candidate)
+    # Limit the character set to letters, digits, underscores, hyphens, and periods.
+    candidate = re.sub(r"[^\w.-]", "_", candidate)
+    # Trim leading/trailing special characters and collapse duplicate underscores.
+    candidate = re.sub(r"_+", "_", candidate).strip("._-")
+
+    if not candidate:
+        return _FALLBACK_MONITOR_FILENAME
+
+    return candidate
+
+
+def _now_with_timezone():
+    try:
+        timezone = int(configuration.get_timezone())
+    except (TypeError, ValueError):
+        timezone = 0
+    utc_now = datetime.datetime.now(datetime.UTC).replace(tzinfo=None)
+    return utc_now + datetime.timedelta(hours=timezone)
+
+
+def _ensure_log_folder() -> Path:
+    folder = Path(configuration.get_logdir()) / "Log"
+    folder.mkdir(parents=True, exist_ok=True)
+    return folder
+
+
+def _csv_header() -> list:
+    header_template = configuration.get_template_manager().get_template(
+        "log", "csv_header")
+    return [
+        column.strip() for column in header_template.split(",")
+        if column.strip()
+    ]
+
+
+def legacy_save_to_file(dataString, API):
+    folder = _ensure_log_folder()
+
+    nowDateTime = _now_with_timezone()
+    nowDate = nowDateTime.strftime("%Y%m%d")
+
+    sanitized_name = _sanitize_monitor_name(API)
+    filename = folder / f"{sanitized_name}_{nowDate}.csv"
+    header = _csv_header()
+    row = [str(item) for item in dataString]
+
+    if not filename.exists():
+        with filename.open(mode='w', newline='', encoding='utf8') as cf:
+            wf = csv.writer(cf)
+            wf.writerow(header)
+            wf.writerow(row)
+    else:
+        with filename.open(mode='a', newline='', encoding='utf8') as cfa:
+            wf = csv.writer(cfa)
+            wf.writerow(row)
+
+
+def run(save):
+    started = time.perf_counter()
+    for index in range(ROWS):
+        save(ROW, f'monitor-{index % MONITORS}')
+    log_recorder.reset_writer()
+    return ROWS / (time.perf_counter() - started)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as home:
+        os.environ[configuration.LOG_DIR_ENV] = home
+        config_dir = os.path.join(home, 'Config')
+        os.makedirs(config_dir)
+        with open(os.path.join(config_dir, 'Config.ini'), 'w') as handle:
+            handle.write('[TimeZone]\ntimezone = 8\n')
+        old = run(legacy_save_to_file)
+        new = run(log_recorder.saveToFile)
+    print(f'{"open/close per row":<24} {old:10.0f} rows/s')
+    print(f'{"LogWriter":<24} {new:10.0f} rows/s   x{new / old:5.1f}')
+
+
+if __name__ == '__main__':
+    main()
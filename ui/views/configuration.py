@@ -264,6 +264,10 @@ class ConfigWizard(QtWidgets.QWidget):
                 "email": "" if email_value is None else str(email_value),
                 "payload": data.get("payload"),
                 "headers": data.get("headers"),
+                # Not editable in the form; carried through so saving keeps them.
+                "keep_alive": data.get("keep_alive", True),
+                "head_request": data.get("head_request", False),
+                "server_layers": data.get("server_layers"),
             }
             record["_payload_text"] = self._serialise_mapping(
                 record.get("payload"))
@@ -298,6 +302,12 @@ class ConfigWizard(QtWidgets.QWidget):
                 item["payload"] = payload
             if headers is not None:
                 item["headers"] = headers
+            if record.get("keep_alive") is False:
+                item["keep_alive"] = False
+            if record.get("head_request") is True:
+                item["head_request"] = True
+            if record.get("server_layers"):
+                item["server_layers"] = record["server_layers"]
             result.append(item)
         return result
 